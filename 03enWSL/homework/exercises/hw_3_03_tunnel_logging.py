@@ -19,9 +19,17 @@ Requirements:
 - Status display on demand
 - Log levels (DEBUG, INFO, WARNING, ERROR)
 
+Metrics layer (provided; your _relay_data and _check_idle_connections use it):
+- Relay threads add to counter shards they own: no lock, no timestamp and
+  no log call per chunk
+- Totals, byte-rate EWMAs and idle detection (a timer wheel) are computed
+  when metrics are read, about once per second
+- --metrics-port serves /metrics (Prometheus text) and /metrics.json
+
 Usage:
     python hw_3_03.py --listen-port PORT --target-host HOST --target-port PORT
                       [--max-connections N] [--timeout SECONDS] [--log-file FILE]
+                      [--metrics-port PORT]
 
 Example:
     python hw_3_03.py --listen-port 9090 --target-host 172.20.0.10 --target-port 8080
@@ -36,10 +44,13 @@ import threading
 import signal
 import sys
 import time
+import json
+import math
 import logging
 import argparse
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Hashable, List, Optional, Dict, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
@@ -47,6 +58,9 @@ from collections import defaultdict
 DEFAULT_BUFFER_SIZE = 4096
 DEFAULT_MAX_CONNECTIONS = 100
 DEFAULT_TIMEOUT = 300  # 5 minutes
+DEFAULT_EWMA_TAU = 10.0  # seconds; time constant of the byte-rate averages
+DEFAULT_IDLE_CHECKS = 4  # idle checks per timeout period
+DIRECTIONS = ("client->server", "server->client")
 
 
 @dataclass
@@ -202,6 +216,418 @@ class TunnelStats:
 
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# METRICS_LAYER
+# ═══════════════════════════════════════════════════════════════════════════════
+# Provided: the relay hot path only adds to a CounterCell its thread owns.
+# Totals, rates and idle detection are derived from those cells on read.
+
+class CounterCell:
+    """One shard of a counter; only the thread that owns it adds to it."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def add(self, n: int) -> None:
+        self.value += n
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class ShardedCounter:
+    """Counter made of single-writer shards, summed on read.
+
+    Each relay thread gets its own shard, so counting is a plain integer
+    addition with no lock. The lock is taken only to add, release or sum
+    shards. Released shards are folded into a retired total.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._shards: set = set()
+        self._retired = 0
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def shard(self) -> CounterCell:
+        """Create a shard for one writer."""
+        cell = CounterCell()
+        with self._lock:
+            self._shards.add(cell)
+        return cell
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def release(self, cell: CounterCell) -> None:
+        """Fold a finished writer's shard into the retired total."""
+        with self._lock:
+            if cell in self._shards:
+                self._shards.remove(cell)
+                self._retired += cell.value
+    
+    @property
+    def value(self) -> int:
+        with self._lock:
+            return self._retired + sum(cell.value for cell in self._shards)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class RateEWMA:
+    """Exponentially weighted rate of a growing total (bytes/second).
+
+    Fed with the running total at each tick; irregular tick spacing is
+    handled by weighting each sample with 1 - exp(-dt / tau).
+    """
+
+    def __init__(self, tau: float = DEFAULT_EWMA_TAU) -> None:
+        self.tau = tau
+        self.rate = 0.0
+        self._last_total: Optional[int] = None
+        self._last_time = 0.0
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA_PROCESSING
+# ═══════════════════════════════════════════════════════════════════════════════
+    def update(self, total: int, now: float) -> float:
+        if self._last_total is None:
+            self._last_total, self._last_time = total, now
+            return self.rate
+        dt = now - self._last_time
+        if dt <= 0:
+            return self.rate
+        instant = (total - self._last_total) / dt
+        self.rate += (1.0 - math.exp(-dt / self.tau)) * (instant - self.rate)
+        self._last_total, self._last_time = total, now
+        return self.rate
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class TimerWheel:
+    """Hashed timing wheel: O(1) schedule and cancel, expiry per tick.
+
+    A key scheduled further out than one turn of the wheel carries a
+    rounds count that is decremented each time its slot comes round.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, start: float = 0.0) -> None:
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}
+        self._cursor = 0
+        self._time = start
+    
+    def __len__(self) -> int:
+        return len(self._where)
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def schedule(self, key: Hashable, delay: float) -> None:
+        """(Re)schedule key to expire after delay seconds (rounded up to ticks)."""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self._cursor + ticks) % len(self._slots)
+        self._slots[slot][key] = (ticks - 1) // len(self._slots)
+        self._where[key] = slot
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def cancel(self, key: Hashable) -> None:
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel up to now; return the keys that expired."""
+        expired: List[Hashable] = []
+        while self._time + self.tick <= now:
+            self._time += self.tick
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            bucket = self._slots[self._cursor]
+            for key, rounds in list(bucket.items()):
+                if rounds:
+                    bucket[key] = rounds - 1
+                else:
+                    del bucket[key]
+                    del self._where[key]
+                    expired.append(key)
+        return expired
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class ConnectionMeter:
+    """Counters for one connection: a shard per direction, plus rates."""
+
+    __slots__ = ("conn_id", "source", "target", "opened", "cells", "rates", "seen", "quiet_checks")
+
+    def __init__(self, conn_id: str, source: Tuple[str, int], target: Tuple[str, int],
+                 opened: float, cells: Dict[str, CounterCell], tau: float) -> None:
+        self.conn_id = conn_id
+        self.source = source
+        self.target = target
+        self.opened = opened
+        self.cells = cells
+        self.rates = {d: RateEWMA(tau) for d in DIRECTIONS}
+        self.seen = 0           # total at the last idle check
+        self.quiet_checks = 0   # consecutive idle checks without traffic
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+    def cell(self, direction: str) -> CounterCell:
+        """The shard the relay thread for direction adds to."""
+        return self.cells[direction]
+    
+    @property
+    def total(self) -> int:
+        return sum(cell.value for cell in self.cells.values())
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class TunnelMetrics:
+    """Tunnel-wide metrics built from per-connection counter shards.
+
+    open()/close() run once per connection; tick() runs about once per
+    tick seconds and updates the rate EWMAs and the idle-check timer
+    wheel. Each connection is checked idle_checks times per idle_timeout
+    and reported idle after that many checks in a row without traffic, so
+    it is closed between idle_timeout and idle_timeout * (1 + 1/idle_checks)
+    after its last byte. The relay threads never read a clock.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_TIMEOUT, tick: float = 1.0,
+                 ewma_tau: float = DEFAULT_EWMA_TAU, idle_checks: int = DEFAULT_IDLE_CHECKS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.idle_timeout = idle_timeout
+        self.idle_checks = idle_checks
+        self.ewma_tau = ewma_tau
+        self.clock = clock
+        self.started = clock()
+        self.bytes = {d: ShardedCounter() for d in DIRECTIONS}
+        self.rates = {d: RateEWMA(ewma_tau) for d in DIRECTIONS}
+        self.connections: Dict[str, ConnectionMeter] = {}
+        self.total_connections = 0
+        self.peak_connections = 0
+        self.closed_connections = 0
+        self.idle_closed = 0
+        self.closed_duration = 0.0
+        self.wheel = TimerWheel(tick, start=self.started)
+        self._check_every = idle_timeout / idle_checks if idle_timeout > 0 else 0.0
+        self._lock = threading.Lock()
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NETWORK_OPERATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+    def open(self, conn_id: str, source: Tuple[str, int], target: Tuple[str, int]) -> ConnectionMeter:
+        meter = ConnectionMeter(conn_id, source, target, self.clock(),
+                                {d: self.bytes[d].shard() for d in DIRECTIONS}, self.ewma_tau)
+        with self._lock:
+            self.connections[conn_id] = meter
+            self.total_connections += 1
+            self.peak_connections = max(self.peak_connections, len(self.connections))
+            if self._check_every:
+                self.wheel.schedule(conn_id, self._check_every)
+        return meter
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NETWORK_OPERATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+    def close(self, conn_id: str) -> Optional[ConnectionMeter]:
+        """Retire a connection; its bytes stay in the tunnel totals."""
+        with self._lock:
+            meter = self.connections.pop(conn_id, None)
+            if meter is None:
+                return None
+            self.wheel.cancel(conn_id)
+            self.closed_connections += 1
+            self.closed_duration += self.clock() - meter.opened
+        for d in DIRECTIONS:
+            self.bytes[d].release(meter.cells[d])
+        return meter
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VERIFY_PREREQUISITES
+# ═══════════════════════════════════════════════════════════════════════════════
+    def tick(self, now: Optional[float] = None) -> List[str]:
+        """Update rates and return the connections that have gone idle."""
+        now = self.clock() if now is None else now
+        idle: List[str] = []
+        with self._lock:
+            for d in DIRECTIONS:
+                self.rates[d].update(self.bytes[d].value, now)
+            for meter in self.connections.values():
+                for d in DIRECTIONS:
+                    meter.rates[d].update(meter.cells[d].value, now)
+            for conn_id in self.wheel.advance(now):
+                meter = self.connections.get(conn_id)
+                if meter is None:
+                    continue
+                total = meter.total
+                if total != meter.seen:
+                    meter.seen = total
+                    meter.quiet_checks = 0
+                else:
+                    meter.quiet_checks += 1
+                if meter.quiet_checks >= self.idle_checks:
+                    self.idle_closed += 1
+                    idle.append(conn_id)
+                else:
+                    self.wheel.schedule(conn_id, self._check_every)
+        return idle
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTPUT_FORMATTING
+# ═══════════════════════════════════════════════════════════════════════════════
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view of every metric (served as /metrics.json)."""
+        now = self.clock()
+        with self._lock:
+            meters = list(self.connections.values())
+            closed, closed_duration = self.closed_connections, self.closed_duration
+            snap: Dict[str, Any] = {
+                "uptime_s": round(now - self.started, 3),
+                "connections": {
+                    "active": len(meters),
+                    "total": self.total_connections,
+                    "peak": self.peak_connections,
+                    "idle_closed": self.idle_closed,
+                },
+                "rate_bps": {d: round(self.rates[d].rate, 1) for d in DIRECTIONS},
+            }
+        snap["bytes"] = {d: self.bytes[d].value for d in DIRECTIONS}
+        snap["average_duration_s"] = round(closed_duration / closed, 3) if closed else 0.0
+        snap["per_connection"] = [
+            {
+                "id": m.conn_id,
+                "source": f"{m.source[0]}:{m.source[1]}",
+                "target": f"{m.target[0]}:{m.target[1]}",
+                "age_s": round(now - m.opened, 3),
+                "bytes": {d: m.cells[d].value for d in DIRECTIONS},
+                "rate_bps": {d: round(m.rates[d].rate, 1) for d in DIRECTIONS},
+            }
+            for m in meters
+        ]
+        return snap
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTPUT_FORMATTING
+# ═══════════════════════════════════════════════════════════════════════════════
+def render_prometheus(snap: Dict[str, Any]) -> str:
+    """Render a TunnelMetrics snapshot in the Prometheus text format."""
+    def label(direction: str) -> str:
+        return direction.replace("->", "_to_")
+
+    lines = [
+        "# HELP tunnel_uptime_seconds Seconds since the tunnel started.",
+        "# TYPE tunnel_uptime_seconds gauge",
+        f"tunnel_uptime_seconds {snap['uptime_s']}",
+        "# HELP tunnel_connections_active Connections currently relayed.",
+        "# TYPE tunnel_connections_active gauge",
+        f"tunnel_connections_active {snap['connections']['active']}",
+        "# HELP tunnel_connections_peak Highest number of concurrent connections.",
+        "# TYPE tunnel_connections_peak gauge",
+        f"tunnel_connections_peak {snap['connections']['peak']}",
+        "# HELP tunnel_connections_total Connections accepted.",
+        "# TYPE tunnel_connections_total counter",
+        f"tunnel_connections_total {snap['connections']['total']}",
+        "# HELP tunnel_idle_closed_total Connections closed for being idle.",
+        "# TYPE tunnel_idle_closed_total counter",
+        f"tunnel_idle_closed_total {snap['connections']['idle_closed']}",
+        "# HELP tunnel_bytes_total Bytes relayed.",
+        "# TYPE tunnel_bytes_total counter",
+    ]
+    lines += [f'tunnel_bytes_total{{direction="{label(d)}"}} {v}' for d, v in snap["bytes"].items()]
+    lines += ["# HELP tunnel_rate_bytes_per_second Byte rate (EWMA).",
+              "# TYPE tunnel_rate_bytes_per_second gauge"]
+    lines += [f'tunnel_rate_bytes_per_second{{direction="{label(d)}"}} {v}'
+              for d, v in snap["rate_bps"].items()]
+    lines += ["# HELP tunnel_connection_bytes_total Bytes relayed per active connection.",
+              "# TYPE tunnel_connection_bytes_total counter"]
+    for conn in snap["per_connection"]:
+        for d, v in conn["bytes"].items():
+            lines.append(f'tunnel_connection_bytes_total{{conn="{conn["id"]}",'
+                         f'source="{conn["source"]}",direction="{label(d)}"}} {v}')
+    return "\n".join(lines) + "\n"
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class MetricsServer:
+    """Serves /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+
+    def __init__(self, metrics: TunnelMetrics, host: str = "0.0.0.0", port: int = 9100) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    body = render_prometheus(metrics.snapshot()).encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/metrics.json":
+                    body = json.dumps(metrics.snapshot(), indent=2).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.address = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CLASS_DEFINITION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -215,7 +641,8 @@ class TunnelLogger:
     def __init__(self, name: str, log_file: Optional[str] = None,
                  level: int = logging.INFO):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
+        # Lowest level any handler emits, so isEnabledFor() skips the rest
+        self.logger.setLevel(logging.DEBUG if log_file else level)
         
         # Console handler
         console = logging.StreamHandler()
@@ -288,7 +715,9 @@ class TCPTunnelWithMetrics:
                  max_connections: int = DEFAULT_MAX_CONNECTIONS,
                  timeout: int = DEFAULT_TIMEOUT,
                  log_file: Optional[str] = None,
-                 debug: bool = False):
+                 debug: bool = False,
+                 metrics_port: int = 0,
+                 handle_signals: bool = True):
         self.listen_port = listen_port
         self.target_host = target_host
         self.target_port = target_port
@@ -300,6 +729,11 @@ class TCPTunnelWithMetrics:
         self.lock = threading.Lock()
         
         self.stats = TunnelStats()
+        self.metrics = TunnelMetrics(idle_timeout=timeout)
+        self.metrics_port = metrics_port
+        self.metrics_server: Optional[MetricsServer] = None
+        # conn_id -> (client socket, target socket), for closing idle connections
+        self.sockets: Dict[str, Tuple[socket.socket, socket.socket]] = {}
         self.logger = TunnelLogger(
             'tunnel',
             log_file=log_file,
@@ -309,11 +743,12 @@ class TCPTunnelWithMetrics:
         self.server_socket: Optional[socket.socket] = None
         
         # Signal handlers
-        signal.signal(signal.SIGINT, self._handle_shutdown)
-        signal.signal(signal.SIGTERM, self._handle_shutdown)
-        # SIGUSR1 for status display (Unix only)
-        if hasattr(signal, 'SIGUSR1'):
-            signal.signal(signal.SIGUSR1, self._handle_status)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._handle_shutdown)
+            signal.signal(signal.SIGTERM, self._handle_shutdown)
+            # SIGUSR1 for status display (Unix only)
+            if hasattr(signal, 'SIGUSR1'):
+                signal.signal(signal.SIGUSR1, self._handle_status)
     
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -333,6 +768,7 @@ class TCPTunnelWithMetrics:
     def _handle_status(self, signum, frame):
         """Handle status display request (SIGUSR1)."""
         print("\n" + self.stats.format_summary())
+        print(render_prometheus(self.metrics.snapshot()))
     
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -352,21 +788,26 @@ class TCPTunnelWithMetrics:
 # CORE_LOGIC
 # ═══════════════════════════════════════════════════════════════════════════════
     def _relay_data(self, source: socket.socket, destination: socket.socket,
-                    conn_stats: ConnectionStats, direction: str) -> None:
-        """Relay data between sockets with statistics.
+                    meter: ConnectionMeter, direction: str) -> None:
+        """Relay data between sockets, counting bytes on the connection's meter.
         
         TODO: Implement this method
-        - Read from source
+        - Read from source (recv_into a buffer allocated once)
         - Write to destination
-        - Update bytes_sent or bytes_received in conn_stats
-        - Update last_activity
-        - Log data transfer at DEBUG level
+        - Count the bytes with meter.cell(direction).add(n): the cell is
+          this thread's own counter shard, so no lock is needed
+        - Do not read the clock or check idleness per chunk:
+          TunnelMetrics.tick() and _check_idle_connections do that
+        - Log data transfer at DEBUG level (format the line only when
+          DEBUG is enabled)
+        - When the source closes, pass the FIN on with
+          destination.shutdown(socket.SHUT_WR)
         - Handle errors gracefully
         
         Args:
             source: Socket to read from
             destination: Socket to write to
-            conn_stats: Connection statistics object
+            meter: Connection meter returned by self.metrics.open()
             direction: Either 'client->server' or 'server->client'
         """
         # YOUR CODE HERE
@@ -386,9 +827,12 @@ class TCPTunnelWithMetrics:
         - Create ConnectionStats
         - Connect to target server
         - Log connection events
-        - Start relay threads
+        - Register with self.metrics.open() and record the sockets
+          in self.sockets (needed to close the connection when idle)
+        - Start relay threads (_relay_data, one per direction)
         - Wait for completion
-        - Update statistics
+        - Update statistics (self.metrics.close() returns the final
+          meter, whose cells hold the bytes for ConnectionStats)
         - Clean up
         """
         # YOUR CODE HERE
@@ -399,12 +843,15 @@ class TCPTunnelWithMetrics:
 # VERIFY_PREREQUISITES
 # ═══════════════════════════════════════════════════════════════════════════════
     def _check_idle_connections(self) -> None:
-        """Check for and close idle connections.
+        """Close the connections the metrics timer wheel reports as idle.
         
         TODO: Implement this method
-        - Iterate through active connections
-        - Close those exceeding timeout
-        - Log warnings for closed connections
+        - Call about once per second (e.g. from the accept loop with a
+          1 s socket timeout)
+        - self.metrics.tick() returns the IDs of connections idle for over
+          self.timeout; only connections whose check falls due are looked at
+        - Log a warning for each and shut down its sockets from
+          self.sockets (shutdown(SHUT_RDWR) ends both relay threads)
         """
         # YOUR CODE HERE
         pass
@@ -438,7 +885,8 @@ class TCPTunnelWithMetrics:
         - Log startup info
         - Accept connections in loop
         - Handle each in separate thread
-        - Periodically check idle connections
+        - Periodically check idle connections (_check_idle_connections)
+        - Stop the metrics server (self.metrics_server.stop()) on exit
         """
         self.logger.info("=" * 60)
         self.logger.info("TCP Tunnel with Metrics")
@@ -446,6 +894,10 @@ class TCPTunnelWithMetrics:
         self.logger.info(f"Forwarding to {self.target_host}:{self.target_port}")
         self.logger.info(f"Max connections: {self.max_connections}")
         self.logger.info(f"Idle timeout: {self.timeout}s")
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(self.metrics, port=self.metrics_port)
+            self.metrics_server.start()
+            self.logger.info(f"Metrics: http://0.0.0.0:{self.metrics_port}/metrics (and /metrics.json)")
         self.logger.info("=" * 60)
         
         # YOUR CODE HERE
@@ -505,6 +957,12 @@ def parse_arguments() -> argparse.Namespace:
         action='store_true',
         help="Enable debug logging"
     )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=0,
+        help="Serve /metrics and /metrics.json on this port (default: off)"
+    )
     return parser.parse_args()
 
 
@@ -523,7 +981,8 @@ def main():
         max_connections=args.max_connections,
         timeout=args.timeout,
         log_file=args.log_file,
-        debug=args.debug
+        debug=args.debug,
+        metrics_port=args.metrics_port
     )
     
     try:
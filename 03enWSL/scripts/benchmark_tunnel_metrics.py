@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tunnel Metrics Overhead Benchmark — Week 3
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Relays --size MB through --streams concurrent in-process relays
+(writer → socketpair → relay thread → socketpair → reader) with three
+accounting schemes on the same 4 KiB recv_into loop:
+
+    off       no metrics
+    current   the per-chunk design: ConnectionStats/TunnelStats updated
+              on every chunk (tunnel lock, time.time(), inline idle check,
+              logger.debug call)
+    sharded   the homework 3.3 metrics layer: one lock-free add to the
+              connection's counter shard, with TunnelMetrics.tick()
+              running once per second in the background
+
+Reported: MB/s per scheme and the accounting cost per chunk relative to off.
+
+Usage:
+    python scripts/benchmark_tunnel_metrics.py
+    python scripts/benchmark_tunnel_metrics.py --size 512 --streams 8 --json
+"""
+
+# ════════════════════════════════════════════════════════════════════════════════
+# IMPORTS AND CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import logging
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from homework.exercises.hw_3_03_tunnel_logging import (  # noqa: E402
+    DEFAULT_BUFFER_SIZE,
+    ConnectionStats,
+    TCPTunnelWithMetrics,
+)
+
+SCHEMES = ["off", "current", "sharded"]
+WRITE_CHUNK = 256 * 1024
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# RELAY LOOPS
+# ════════════════════════════════════════════════════════════════════════════════
+
+def relay_off(tunnel: TCPTunnelWithMetrics, src: socket.socket, dst: socket.socket,
+              conn_id: str) -> None:
+    buffer = bytearray(DEFAULT_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = src.recv_into(buffer)
+        if not n:
+            break
+        dst.sendall(view[:n])
+    dst.shutdown(socket.SHUT_WR)
+
+
+def relay_current(tunnel: TCPTunnelWithMetrics, src: socket.socket, dst: socket.socket,
+                  conn_id: str) -> None:
+    conn_stats = ConnectionStats(conn_id, ("127.0.0.1", 1), ("127.0.0.1", 2))
+    with tunnel.lock:
+        tunnel.stats.connections[conn_id] = conn_stats
+    buffer = bytearray(DEFAULT_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = src.recv_into(buffer)
+        if not n:
+            break
+        dst.sendall(view[:n])
+        conn_stats.bytes_sent += n
+        conn_stats.update_activity()
+        with tunnel.lock:
+            tunnel.stats.total_bytes_sent += n
+        if time.time() - conn_stats.last_activity > tunnel.timeout:
+            break
+        tunnel.logger.connection(conn_id, f"Relayed {n} bytes client->server", logging.DEBUG)
+    dst.shutdown(socket.SHUT_WR)
+
+
+def relay_sharded(tunnel: TCPTunnelWithMetrics, src: socket.socket, dst: socket.socket,
+                  conn_id: str) -> None:
+    meter = tunnel.metrics.open(conn_id, ("127.0.0.1", 1), ("127.0.0.1", 2))
+    cell = meter.cell("client->server")
+    debug = tunnel.logger.logger.isEnabledFor(logging.DEBUG)
+    buffer = bytearray(DEFAULT_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = src.recv_into(buffer)
+        if not n:
+            break
+        dst.sendall(view[:n])
+        cell.add(n)
+        if debug:
+            tunnel.logger.connection(conn_id, f"Relayed {n} bytes client->server", logging.DEBUG)
+    dst.shutdown(socket.SHUT_WR)
+    tunnel.metrics.close(conn_id)
+
+
+RELAYS: Dict[str, Callable] = {"off": relay_off, "current": relay_current, "sharded": relay_sharded}
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ════════════════════════════════════════════════════════════════════════════════
+
+def writer(sock: socket.socket, size: int) -> None:
+    payload = memoryview(bytes(WRITE_CHUNK))
+    left = size
+    while left:
+        n = min(left, WRITE_CHUNK)
+        sock.sendall(payload[:n])
+        left -= n
+    sock.shutdown(socket.SHUT_WR)
+
+
+def reader(sock: socket.socket, counts: List[int]) -> None:
+    buffer = bytearray(WRITE_CHUNK)
+    total = 0
+    while True:
+        n = sock.recv_into(buffer)
+        if not n:
+            break
+        total += n
+    counts.append(total)
+
+
+def run_scheme(scheme: str, size: int, streams: int) -> Dict[str, float]:
+    tunnel = TCPTunnelWithMetrics(0, "127.0.0.1", 1, timeout=300, handle_signals=False)
+    ticker_stop = threading.Event()
+
+    def ticker() -> None:
+        while not ticker_stop.wait(1.0):
+            tunnel.metrics.tick()
+
+    threading.Thread(target=ticker, daemon=True).start()
+    threads: List[threading.Thread] = []
+    sockets: List[socket.socket] = []
+    counts: List[int] = []
+    for i in range(streams):
+        a_write, a_read = socket.socketpair()
+        b_write, b_read = socket.socketpair()
+        sockets += [a_write, a_read, b_write, b_read]
+        threads += [
+            threading.Thread(target=writer, args=(a_write, size)),
+            threading.Thread(target=RELAYS[scheme], args=(tunnel, a_read, b_write, f"conn-{i:03d}")),
+            threading.Thread(target=reader, args=(b_read, counts)),
+        ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    ticker_stop.set()
+    for sock in sockets:
+        sock.close()
+
+    total = size * streams
+    result = {
+        "ok": counts == [size] * streams,
+        "seconds": round(elapsed, 3),
+        "mb_s": round(total / elapsed / 1e6, 1),
+        "chunks": total // DEFAULT_BUFFER_SIZE,
+    }
+    if scheme == "sharded":
+        result["counted"] = tunnel.metrics.snapshot()["bytes"]["client->server"]
+    elif scheme == "current":
+        result["counted"] = tunnel.stats.total_bytes_sent
+    return result
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ════════════════════════════════════════════════════════════════════════════════
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure tunnel metrics overhead on the relay path")
+    parser.add_argument("--size", type=int, default=256, help="MB per stream (default: 256)")
+    parser.add_argument("--streams", type=int, default=4, help="Concurrent relays (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scheme, best kept (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    size = args.size * 1024 * 1024
+    results: Dict[str, Dict[str, float]] = {}
+    for scheme in SCHEMES:
+        runs = [run_scheme(scheme, size, args.streams) for _ in range(args.repeat)]
+        results[scheme] = min(runs, key=lambda r: r["seconds"])
+    base = results["off"]["seconds"]
+    for r in results.values():
+        r["ns_per_chunk"] = round((r["seconds"] - base) / r["chunks"] * 1e9, 1)
+
+    if args.json:
+        print(json.dumps({"size_mb": args.size, "streams": args.streams,
+                          "chunk_bytes": DEFAULT_BUFFER_SIZE, "results": results}, indent=2))
+        return 0
+
+    print(f"{args.streams} relay(s) x {args.size} MB, {DEFAULT_BUFFER_SIZE}-byte chunks "
+          f"(best of {args.repeat})")
+    print(f"{'scheme':<10} {'MB/s':>8} {'seconds':>8} {'ns/chunk':>9} {'ok':>4}")
+    for scheme, r in results.items():
+        print(f"{scheme:<10} {r['mb_s']:>8.1f} {r['seconds']:>8.2f} {r['ns_per_chunk']:>9.1f} "
+              f"{str(r['ok']):>4}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
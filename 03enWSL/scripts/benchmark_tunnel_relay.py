@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+TCP Tunnel Relay Benchmark — Week 3
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Measures loopback throughput (GB/s) and tunnel CPU usage for each relay
+strategy of src/apps/tcp_tunnel.py. The tunnel runs as its own process
+(the real CLI, log output written to a temporary file); a sink process
+counts bytes behind it and the client streams --size MB through every
+tunnel, then waits for the sink's byte count to come back through the
+half-closed tunnel.
+
+Configurations:
+    classic + --log chunks   the original relay (4 KiB reads, a log line per chunk)
+    classic / copy / splice  with --log summary
+    each under --engine threads and --engine event
+
+CPU% is the tunnel process's user+system time over wall time (Linux
+/proc); 100% is one core.
+
+Usage:
+    python scripts/benchmark_tunnel_relay.py
+    python scripts/benchmark_tunnel_relay.py --size 2048 --tunnels 4 --json
+"""
+
+# ════════════════════════════════════════════════════════════════════════════════
+# IMPORTS AND CONFIGURATION
+# ════════════════════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.tcp_tunnel import ENGINES, SPLICE_AVAILABLE  # noqa: E402
+
+TUNNEL = PROJECT_ROOT / "src" / "apps" / "tcp_tunnel.py"
+CHUNK = 1024 * 1024
+
+CONFIGS: List[Tuple[str, str]] = [
+    ("classic", "chunks"),
+    ("classic", "summary"),
+    ("copy", "summary"),
+    ("splice", "summary"),
+]
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# PROCESSES
+# ════════════════════════════════════════════════════════════════════════════════
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def sink(port: int) -> None:
+    """Count bytes per connection; on EOF send the count back and close."""
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("127.0.0.1", port))
+    server.listen(128)
+
+    def drain(conn: socket.socket) -> None:
+        buf = bytearray(CHUNK)
+        total = 0
+        with conn:
+            while True:
+                n = conn.recv_into(buf)
+                if not n:
+                    break
+                total += n
+            conn.sendall(struct.pack("!Q", total))
+
+    while True:
+        conn, _ = server.accept()
+        threading.Thread(target=drain, args=(conn,), daemon=True).start()
+
+
+def cpu_seconds(pid: int) -> float:
+    """utime + stime of a process, from /proc/<pid>/stat."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# TRANSFER
+# ════════════════════════════════════════════════════════════════════════════════
+
+def stream(port: int, size: int, results: List[int]) -> None:
+    payload = memoryview(bytes(CHUNK))
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        left = size
+        while left:
+            n = min(left, CHUNK)
+            sock.sendall(payload[:n])
+            left -= n
+        sock.shutdown(socket.SHUT_WR)
+        reply = b""
+        while len(reply) < 8:
+            data = sock.recv(8 - len(reply))
+            if not data:
+                break
+            reply += data
+    results.append(struct.unpack("!Q", reply)[0] if len(reply) == 8 else -1)
+
+
+def run_config(engine: str, relay: str, log_mode: str, sink_port: int,
+               size: int, tunnels: int) -> Dict[str, float]:
+    port = free_port()
+    with tempfile.TemporaryFile() as log_file:
+        proc = subprocess.Popen(
+            [sys.executable, str(TUNNEL), "--listen", f"127.0.0.1:{port}",
+             "--target", f"127.0.0.1:{sink_port}", "--engine", engine,
+             "--relay", relay, "--log", log_mode],
+            stdout=log_file, stderr=subprocess.STDOUT)
+        try:
+            wait_for_port(port)
+            results: List[int] = []
+            clients = [threading.Thread(target=stream, args=(port, size, results))
+                       for _ in range(tunnels)]
+            cpu_before = cpu_seconds(proc.pid)
+            started = time.perf_counter()
+            for t in clients:
+                t.start()
+            for t in clients:
+                t.join()
+            wall = time.perf_counter() - started
+            cpu = cpu_seconds(proc.pid) - cpu_before
+        finally:
+            proc.terminate()
+            proc.wait()
+        log_bytes = log_file.tell()
+
+    total = size * tunnels
+    return {
+        "ok": results == [size] * tunnels,
+        "seconds": round(wall, 3),
+        "gb_s": round(total / wall / 1e9, 3),
+        "cpu_pct": round(100 * cpu / wall, 1),
+        "cpu_s_per_gb": round(cpu / (total / 1e9), 3),
+        "log_kb": round(log_bytes / 1024, 1),
+    }
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ════════════════════════════════════════════════════════════════════════════════
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the tcp_tunnel relay strategies")
+    parser.add_argument("--size", type=int, default=512, help="MB streamed per tunnel (default: 512)")
+    parser.add_argument("--tunnels", type=int, default=1, help="Concurrent tunnels (default: 1)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma-separated engines")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/stat"):
+        print("This benchmark reads CPU time from /proc (Linux only)")
+        return 1
+
+    size = args.size * 1024 * 1024
+    sink_port = free_port()
+    sink_proc = multiprocessing.Process(target=sink, args=(sink_port,), daemon=True)
+    sink_proc.start()
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        wait_for_port(sink_port)
+        for engine in (e.strip() for e in args.engines.split(",") if e.strip()):
+            if engine not in ENGINES:
+                parser.error(f"unknown engine: {engine}")
+            for relay, log_mode in CONFIGS:
+                if relay == "splice" and not SPLICE_AVAILABLE:
+                    continue
+                name = f"{engine}/{relay}/{log_mode}"
+                results[name] = run_config(engine, relay, log_mode, sink_port, size, args.tunnels)
+    finally:
+        sink_proc.terminate()
+        sink_proc.join()
+
+    if args.json:
+        print(json.dumps({"size_mb": args.size, "tunnels": args.tunnels,
+                          "results": results}, indent=2))
+        return 0
+
+    print(f"{args.tunnels} tunnel(s) x {args.size} MB over loopback")
+    print(f"{'engine/relay/log':<26} {'GB/s':>6} {'CPU %':>6} {'CPU s/GB':>9} {'log KB':>8} {'ok':>4}")
+    for name, r in results.items():
+        print(f"{name:<26} {r['gb_s']:>6.2f} {r['cpu_pct']:>6.1f} {r['cpu_s_per_gb']:>9.2f} "
+              f"{r['log_kb']:>8.1f} {str(r['ok']):>4}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
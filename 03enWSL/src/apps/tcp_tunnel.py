@@ -35,6 +35,18 @@ UTILIZARI PRACTICE:
     3. Debugging: intercepteaza trafic tonaliza
     4. Protocol transtotion: adapteaza intre protocoale
 
+RELAY ENGINES:
+    --engine threads   un thread per directie (pattern-ul de mai sus)
+    --engine event     un singur thread cu selectors serveste toate tunelurile
+
+    --relay splice     os.splice prin pipe: octetii nu mai trec prin Python (Linux)
+    --relay copy       recv_into intr-un buffer mare, refolosit
+    --relay classic    recv(4096) + sendall (varianta initiala)
+
+    --log summary      o linie per directie la inchidere (bytes, MB/s)
+    --log sample       plus cel mult o linie de progres pe secunda
+    --log chunks       o linie per chunk cu preview (forteaza --relay copy)
+
 RUtoRE (in Mininet extended topology):
     # Server echo pe b1:
     python3 ex04_echo_server.py --listen 0.0.0.0:8080
@@ -48,11 +60,20 @@ RUtoRE (in Mininet extended topology):
 from __future__ import annotations
 
 import argparse
+import errno
+import os
+import selectors
 import socket
 import sys
 import threading
+import time
 from datetime import datetime
-from typing import Tuple
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -63,6 +84,17 @@ BUFFER_SIZE = 4096
 DEFAULT_LISTEN = "0.0.0.0:9090"
 DEFAULT_TARGET = "127.0.0.1:8080"
 
+RELAY_BUFFER_SIZE = 256 * 1024      # buffer refolosit de --relay copy
+PIPE_SIZE = 1024 * 1024             # capacitate ceruta for pipe-ul de splice
+LOG_SAMPLE_INTERVAL = 1.0           # secunde intre liniile de progres (--log sample)
+CONNECT_TIMEOUT = 10.0
+
+SPLICE_AVAILABLE = sys.platform.startswith("linux") and hasattr(os, "splice")
+ENGINES = ("threads", "event")
+STRATEGIES = ("splice", "copy", "classic")
+LOG_MODES = ("summary", "sample", "chunks")
+DEFAULT_STRATEGY = "splice" if SPLICE_AVAILABLE else "copy"
+
 
 # ════════════════════════════════════════════════════════════════════════════
 #  UTILITY FUNCTIONS
@@ -84,6 +116,139 @@ def parse_addr(addr_str: str) -> Tuple[str, int]:
     return host, int(port_str)
 
 
+def resolve_strategy(strategy: str, log_mode: str = "summary") -> str:
+    """
+    Alege strategia efectiva de relay.
+
+    splice cade pe copy daca os.splice lipseste; --log chunks are nevoie
+    de octeti in Python for preview, deci nu poate folosi splice.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown relay strategy: {strategy}")
+    if log_mode not in LOG_MODES:
+        raise ValueError(f"Unknown log mode: {log_mode}")
+    if strategy == "splice" and (not SPLICE_AVAILABLE or log_mode == "chunks"):
+        return "copy"
+    return strategy
+
+
+class TransferLog:
+    """
+    Contoare de bytes for o directie a unui tunel.
+
+    In loc de o linie de log per chunk (care limita throughput-ul),
+    summary scrie o singura linie la inchidere, sample adauga cel mult
+    o linie de progres per interval, iar chunks pastreaza output-ul
+    initial cu preview de payload.
+    """
+
+    def __init__(self, tunnel_id: str, direction: str, mode: str = "summary",
+                 interval: float = LOG_SAMPLE_INTERVAL) -> None:
+        if mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode: {mode}")
+        self.tunnel_id = tunnel_id
+        self.direction = direction
+        self.mode = mode
+        self.interval = interval
+        self.bytes = 0
+        self.chunks = 0
+        self.started = time.monotonic()
+        self._next_sample = self.started + interval
+
+    def record(self, n: int, data=None) -> None:
+        self.bytes += n
+        self.chunks += 1
+        if self.mode == "summary":
+            return
+        if self.mode == "chunks":
+            if data is not None:
+                preview = bytes(data[:50]).decode("utf-8", errors="replace")
+                if n > 50:
+                    preview += "..."
+                log("DATA", self.tunnel_id, f"{self.direction}: {n} bytes: {preview!r}")
+            return
+        now = time.monotonic()
+        if now >= self._next_sample:
+            self._next_sample = now + self.interval
+            log("DATA", self.tunnel_id,
+                f"{self.direction}: {self.bytes} bytes so far ({self.rate_mb_s(now):.1f} MB/s)")
+
+    def rate_mb_s(self, now: Optional[float] = None) -> float:
+        elapsed = (now or time.monotonic()) - self.started
+        return self.bytes / elapsed / 1e6 if elapsed > 0 else 0.0
+
+    def close(self) -> None:
+        log("INFO", self.tunnel_id,
+            f"{self.direction}: Forwarding stopped. Total: {self.bytes} bytes "
+            f"in {self.chunks} chunks ({self.rate_mb_s():.1f} MB/s)")
+
+
+# ════════════════════════════════════════════════════════════════════════════
+#  STRATEGII DE RELAY (BLOCANTE, O DIRECTIE)
+# ════════════════════════════════════════════════════════════════════════════
+
+def open_pipe() -> Tuple[int, int, int]:
+    """Creeaza pipe-ul for splice; returneaza (read_fd, write_fd, capacitate)."""
+    r, w = os.pipe()
+    size = 64 * 1024
+    if fcntl is not None and hasattr(fcntl, "F_SETPIPE_SZ"):
+        try:
+            size = fcntl.fcntl(w, fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+        except OSError:
+            size = fcntl.fcntl(w, fcntl.F_GETPIPE_SZ)
+    return r, w, size
+
+
+def relay_classic(src: socket.socket, dst: socket.socket, xfer: TransferLog) -> None:
+    """recv(4096) + sendall: un obiect bytes nou for fiecare chunk."""
+    while True:
+        data = src.recv(BUFFER_SIZE)
+        if not data:
+            return
+        dst.sendall(data)
+        xfer.record(len(data), data)
+
+
+def relay_copy(src: socket.socket, dst: socket.socket, xfer: TransferLog) -> None:
+    """recv_into intr-un buffer mare refolosit; nicio alocare per chunk."""
+    buf = bytearray(RELAY_BUFFER_SIZE)
+    view = memoryview(buf)
+    while True:
+        n = src.recv_into(buf)
+        if not n:
+            return
+        dst.sendall(view[:n])
+        xfer.record(n, view[:n])
+
+
+def relay_splice(src: socket.socket, dst: socket.socket, xfer: TransferLog) -> None:
+    """
+    socket → pipe → socket cu os.splice: kernel-ul muta paginile, Python
+    doar numara bytes. Ambele socket-uri trebuie sa fie blocante.
+    """
+    r, w, size = open_pipe()
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    try:
+        while True:
+            n = os.splice(src_fd, w, size, flags=os.SPLICE_F_MOVE)
+            if n == 0:
+                return
+            left = n
+            while left:
+                left -= os.splice(r, dst_fd, left, flags=os.SPLICE_F_MOVE)
+            xfer.record(n)
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+RELAYS: Dict[str, Callable[[socket.socket, socket.socket, TransferLog], None]] = {
+    "splice": relay_splice,
+    "copy": relay_copy,
+    "classic": relay_classic,
+}
+
+
 # ════════════════════════════════════════════════════════════════════════════
 #  FORWARDING UNIDIRECTIONAL
 # ════════════════════════════════════════════════════════════════════════════
@@ -93,7 +258,9 @@ def forward_stream(
     dst: socket.socket,
     direction: str,
     tunnel_id: str,
-    on_close: threading.Event
+    on_close: threading.Event,
+    strategy: str = DEFAULT_STRATEGY,
+    log_mode: str = "summary"
 ) -> None:
     """
     Copiaza date from src to dst pana cand conexiunea se inchide.
@@ -102,6 +269,10 @@ def forward_stream(
     - Citeste chunk-uri din src
     - Le scrie in dst
     - Se opreste cand src returneaza 0 bytes (conexiune inchisa)
+
+    La EOF, inchiderea este propagata cu shutdown(SHUT_WR) pe dst, iar
+    cealalta directie continua (half-close). La eroare, on_close este
+    setat si ambele socket-uri sunt inchise, ca sa trezeasca celalalt thread.
     
     Args:
         src: Socket sursa (de citit)
@@ -109,29 +280,21 @@ def forward_stream(
         direction: String descriptiv (ex: "client→target")
         tunnel_id: ID for logging
         on_close: Event to semnato celuitolt thread sa se opreasca
+        strategy: splice, copy sau classic (vezi RELAYS)
+        log_mode: summary, sample sau chunks (vezi TransferLog)
     """
-    total_bytes = 0
+    xfer = TransferLog(tunnel_id, direction, log_mode)
+    relay = RELAYS[resolve_strategy(strategy, log_mode)]
+    failed = True
     
     try:
-        while not on_close.is_set():
-            # Citim date din sursa
-            data = src.recv(BUFFER_SIZE)
-            
-            if not data:
-                # 0 bytes = peer-ul a inchis conexiunea
-                log("INFO", tunnel_id, f"{direction}: Connection closed by peer")
-                break
-            
-            # Scriem datele in destinatie
-            dst.sendall(data)
-            total_bytes += len(data)
-            
-            # Logging detaliat (poate fi comentat for productie)
-            preview = data[:50].decode("utf-8", errors="replace")
-            if len(data) > 50:
-                preview += "..."
-            log("DATA", tunnel_id, f"{direction}: {len(data)} bytes: {preview!r}")
-            
+        relay(src, dst, xfer)
+        log("INFO", tunnel_id, f"{direction}: Connection closed by peer")
+        failed = False
+        try:
+            dst.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
     except ConnectionResetError:
         log("WARN", tunnel_id, f"{direction}: Connection reset by peer")
     except BrokenPipeError:
@@ -140,9 +303,15 @@ def forward_stream(
         if not on_close.is_set():
             log("ERROR", tunnel_id, f"{direction}: {e}")
     finally:
-        # Semnalam celuitolt thread sa se opreasca
-        on_close.set()
-        log("INFO", tunnel_id, f"{direction}: Forwarding stopped. Total: {total_bytes} bytes")
+        if failed:
+            # Semnalam celuitolt thread sa se opreasca
+            on_close.set()
+            for sock in (src, dst):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        xfer.close()
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -154,7 +323,9 @@ def handle_client(
     client_addr: Tuple[str, int],
     target_host: str,
     target_port: int,
-    tunnel_id: str
+    tunnel_id: str,
+    strategy: str = DEFAULT_STRATEGY,
+    log_mode: str = "summary"
 ) -> None:
     """
     Gestioneaza o conexiune client: open conexiune to target,
@@ -180,6 +351,7 @@ def handle_client(
         log("INFO", tunnel_id, f"Connecting to target {target_host}:{target_port}...")
         target_socket.connect((target_host, target_port))
         target_socket.settimeout(None)  # Dezactivam timeout for transfer
+        client_socket.settimeout(None)  # splice cere socket-uri blocante
         
         log("INFO", tunnel_id, f"Connection established with target {target_host}:{target_port}")
         
@@ -193,13 +365,15 @@ def handle_client(
         # ─────────────────────────────────────────────────────────────────────
         thread_client_to_target = threading.Thread(
             target=forward_stream,
-            args=(client_socket, target_socket, "client→target", tunnel_id, close_event),
+            args=(client_socket, target_socket, "client→target", tunnel_id, close_event,
+                  strategy, log_mode),
             daemon=True
         )
         
         thread_target_to_client = threading.Thread(
             target=forward_stream,
-            args=(target_socket, client_socket, "target→client", tunnel_id, close_event),
+            args=(target_socket, client_socket, "target→client", tunnel_id, close_event,
+                  strategy, log_mode),
             daemon=True
         )
         
@@ -238,60 +412,339 @@ def handle_client(
         log("INFO", tunnel_id, "Tunnel closed")
 
 
+# ════════════════════════════════════════════════════════════════════════════
+#  ENGINE EVENT (UN THREAD, MULTE TUNELURI)
+# ════════════════════════════════════════════════════════════════════════════
+
+_SPLICE_NONBLOCK = (os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK) if SPLICE_AVAILABLE else 0
+
+
+class _Direction:
+    """O directie a unui tunel: src → dst, cu bytes inca neexpediati."""
+
+    __slots__ = ("src", "dst", "xfer", "pipe", "pending", "left", "eof", "done")
+
+    def __init__(self, src: socket.socket, dst: socket.socket, xfer: TransferLog) -> None:
+        self.src = src
+        self.dst = dst
+        self.xfer = xfer
+        self.pipe: Optional[Tuple[int, int, int]] = None   # splice: (read_fd, write_fd, size)
+        self.pending = 0                                   # bytes cititi dar neexpediati
+        self.left = memoryview(b"")                        # copy: bytes-ii neexpediati
+        self.eof = False
+        self.done = False
+
+
+class _Tunnel:
+    """Starea unui tunel in bucla event: doua socket-uri, doua directii."""
+
+    __slots__ = ("id", "socks", "dirs", "events", "connecting", "opened", "closed")
+
+    def __init__(self, tunnel_id: str, client: socket.socket, target: socket.socket,
+                 log_mode: str) -> None:
+        self.id = tunnel_id
+        self.socks = (client, target)
+        self.dirs = (_Direction(client, target, TransferLog(tunnel_id, "client→target", log_mode)),
+                     _Direction(target, client, TransferLog(tunnel_id, "target→client", log_mode)))
+        self.events = [0, 0]
+        self.connecting = True
+        self.opened = time.monotonic()
+        self.closed = False
+
+
+class TunnelServer:
+    """
+    Server tunel pornit programatic (teste, benchmark) sau din run_tunnel.
+
+    engine="threads" porneste handle_client intr-un thread per client, cu
+    doua thread-uri de forwarding per tunel. engine="event" serveste toate
+    tunelurile dintr-un singur thread cu selectors: socket-uri non-blocante,
+    backpressure (nu se citeste din src cat timp dst nu a primit tot) si
+    acelasi relay, splice prin pipe sau un buffer de citire comun.
+
+    Args:
+        listen_host: Adresa de ascultare
+        listen_port: Port de ascultare (0 = port liber, vezi .address)
+        target_host: Serverul tinta
+        target_port: Portul tinta
+        engine: threads sau event
+        strategy: splice, copy sau classic (vezi resolve_strategy)
+        log_mode: summary, sample sau chunks
+    """
+
+    def __init__(self, listen_host: str, listen_port: int, target_host: str, target_port: int,
+                 engine: str = "threads", strategy: str = DEFAULT_STRATEGY,
+                 log_mode: str = "summary", backlog: int = 128,
+                 connect_timeout: float = CONNECT_TIMEOUT) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.strategy = resolve_strategy(strategy, log_mode)
+        self.log_mode = log_mode
+        self.target = (target_host, target_port)
+        self.connect_timeout = connect_timeout
+        self.tunnels_opened = 0
+        self._tunnels: set = set()
+        self._stopping = threading.Event()
+        self._done = threading.Event()
+
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.listener.bind((listen_host, listen_port))
+            self.listener.listen(backlog)
+        except OSError:
+            self.listener.close()
+            raise
+        self.address: Tuple[str, int] = self.listener.getsockname()[:2]
+
+    def serve_forever(self) -> None:
+        try:
+            if self.engine == "threads":
+                self._serve_threads()
+            else:
+                self._serve_event()
+        finally:
+            self.listener.close()
+            self._done.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Opreste bucla de accept (engine event: inchide si tunelurile active)."""
+        self._stopping.set()
+        self._done.wait(timeout)
+
+    def _next_id(self) -> str:
+        self.tunnels_opened += 1
+        return f"T{self.tunnels_opened:04d}"
+
+    # ── engine threads ─────────────────────────────────────────────────────
+
+    def _serve_threads(self) -> None:
+        self.listener.settimeout(0.5)
+        while not self._stopping.is_set():
+            try:
+                client_socket, client_addr = self.listener.accept()
+            except socket.timeout:
+                continue
+            except OSError as e:
+                log("ERROR", "MAIN", f"Error accept: {e}")
+                break
+            threading.Thread(
+                target=handle_client,
+                args=(client_socket, client_addr, *self.target, self._next_id(),
+                      self.strategy, self.log_mode),
+                daemon=True
+            ).start()
+
+    # ── engine event ───────────────────────────────────────────────────────
+
+    def _serve_event(self) -> None:
+        self._sel = selectors.DefaultSelector()
+        # Un singur buffer de citire: ce nu se poate trimite imediat se copiaza
+        self._buffer = bytearray(BUFFER_SIZE if self.strategy == "classic" else RELAY_BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self.listener.setblocking(False)
+        self._sel.register(self.listener, selectors.EVENT_READ, None)
+        next_sweep = time.monotonic() + 1.0
+        try:
+            while not self._stopping.is_set():
+                for key, mask in self._sel.select(0.5):
+                    if key.data is None:
+                        self._event_accept()
+                        continue
+                    tunnel, side = key.data
+                    if mask & selectors.EVENT_WRITE and not tunnel.closed:
+                        self._event_writable(tunnel, side)
+                    if mask & selectors.EVENT_READ and not tunnel.closed:
+                        self._event_pump(tunnel, tunnel.dirs[side])
+                now = time.monotonic()
+                if now >= next_sweep:
+                    next_sweep = now + 1.0
+                    for tunnel in [t for t in self._tunnels if t.connecting]:
+                        if now - tunnel.opened > self.connect_timeout:
+                            self._event_close(tunnel, "ERROR",
+                                              f"Timeout to conectare to {self.target[0]}:{self.target[1]}")
+        finally:
+            for tunnel in list(self._tunnels):
+                self._event_close(tunnel)
+            self._sel.close()
+
+    def _event_accept(self) -> None:
+        while True:
+            try:
+                client, addr = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                log("ERROR", "MAIN", f"Error accept: {e}")
+                return
+            tunnel_id = self._next_id()
+            log("INFO", tunnel_id, f"Client connected from {addr[0]}:{addr[1]}")
+            client.setblocking(False)
+            target = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target.setblocking(False)
+            err = target.connect_ex(self.target)
+            if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                log("ERROR", tunnel_id, f"Target {self.target[0]}:{self.target[1]}: {os.strerror(err)}")
+                client.close()
+                target.close()
+                continue
+            tunnel = _Tunnel(tunnel_id, client, target, self.log_mode)
+            self._tunnels.add(tunnel)
+            self._event_update(tunnel)
+
+    def _event_update(self, tunnel: _Tunnel) -> None:
+        """Recalculeaza interesul pe ambele socket-uri din starea directiilor."""
+        for side, sock in enumerate(tunnel.socks):
+            outgoing, incoming = tunnel.dirs[side], tunnel.dirs[1 - side]
+            if tunnel.connecting:
+                events = selectors.EVENT_WRITE if side == 1 else 0
+            else:
+                events = 0
+                if not outgoing.eof and not outgoing.pending:
+                    events |= selectors.EVENT_READ
+                if incoming.pending:
+                    events |= selectors.EVENT_WRITE
+            current = tunnel.events[side]
+            if events == current:
+                continue
+            if current == 0:
+                self._sel.register(sock, events, (tunnel, side))
+            elif events == 0:
+                self._sel.unregister(sock)
+            else:
+                self._sel.modify(sock, events, (tunnel, side))
+            tunnel.events[side] = events
+
+    def _event_writable(self, tunnel: _Tunnel, side: int) -> None:
+        if not tunnel.connecting:
+            self._event_flush(tunnel, tunnel.dirs[1 - side])
+            return
+        err = tunnel.socks[1].getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            self._event_close(tunnel, "ERROR",
+                              f"Target {self.target[0]}:{self.target[1]}: {os.strerror(err)}")
+            return
+        tunnel.connecting = False
+        log("INFO", tunnel.id, f"Connection established with target {self.target[0]}:{self.target[1]}")
+        if self.strategy == "splice":
+            for d in tunnel.dirs:
+                d.pipe = open_pipe()
+                os.set_blocking(d.pipe[0], False)
+                os.set_blocking(d.pipe[1], False)
+        self._event_update(tunnel)
+
+    def _event_pump(self, tunnel: _Tunnel, d: _Direction) -> None:
+        """src citibil: muta ce a sosit spre dst."""
+        try:
+            if d.pipe is not None:
+                n = os.splice(d.src.fileno(), d.pipe[1], d.pipe[2], flags=_SPLICE_NONBLOCK)
+            else:
+                n = d.src.recv_into(self._buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._event_close(tunnel, "WARN", f"{d.xfer.direction}: {e}")
+            return
+        if n == 0:
+            d.eof = True
+        elif d.pipe is not None:
+            d.pending = n
+            d.xfer.record(n)
+        else:
+            d.pending = n
+            d.left = self._view[:n]
+            d.xfer.record(n, d.left)
+        self._event_flush(tunnel, d)
+
+    def _event_flush(self, tunnel: _Tunnel, d: _Direction) -> None:
+        """Trimite spre dst cat accepta; la EOF complet propaga half-close."""
+        try:
+            if d.pipe is not None:
+                while d.pending:
+                    d.pending -= os.splice(d.pipe[0], d.dst.fileno(), d.pending, flags=_SPLICE_NONBLOCK)
+            else:
+                while d.pending:
+                    sent = d.dst.send(d.left)
+                    d.left = d.left[sent:]
+                    d.pending -= sent
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            self._event_close(tunnel, "WARN", f"{d.xfer.direction}: {e}")
+            return
+        if d.pending and d.left.obj is self._buffer:
+            # Buffer-ul comun va fi suprascris de urmatorul recv_into
+            d.left = memoryview(bytes(d.left))
+        if d.eof and not d.pending and not d.done:
+            d.done = True
+            log("INFO", tunnel.id, f"{d.xfer.direction}: Connection closed by peer")
+            try:
+                d.dst.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            if all(x.done for x in tunnel.dirs):
+                self._event_close(tunnel)
+                return
+        self._event_update(tunnel)
+
+    def _event_close(self, tunnel: _Tunnel, level: str = "", message: str = "") -> None:
+        if tunnel.closed:
+            return
+        tunnel.closed = True
+        self._tunnels.discard(tunnel)
+        if message:
+            log(level, tunnel.id, message)
+        for side, sock in enumerate(tunnel.socks):
+            if tunnel.events[side]:
+                self._sel.unregister(sock)
+            sock.close()
+        for d in tunnel.dirs:
+            if d.pipe is not None:
+                os.close(d.pipe[0])
+                os.close(d.pipe[1])
+                d.pipe = None
+            if not tunnel.connecting:
+                d.xfer.close()
+        log("INFO", tunnel.id, "Tunnel closed")
+
+
 # ════════════════════════════════════════════════════════════════════════════
 #  SERVER MAIN (ACCEPT LOOP)
 # ════════════════════════════════════════════════════════════════════════════
 
-def run_tunnel(listen_host: str, listen_port: int, target_host: str, target_port: int) -> int:
+def run_tunnel(listen_host: str, listen_port: int, target_host: str, target_port: int,
+               engine: str = "threads", strategy: str = DEFAULT_STRATEGY,
+               log_mode: str = "summary") -> int:
     """
     Porneste serverul tunnel care accepts connections and le redirectioneaza.
     
     for fiecare client:
     1. Accept conexiune
-    2. Porneste thread for handle_client
+    2. Porneste thread for handle_client (engine event: il adauga in bucla)
     3. Continua sa accepte alte connections
     """
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    
     try:
-        server_socket.bind((listen_host, listen_port))
-        server_socket.listen(10)  # Backlog de 10 connections in asteptare
-        
-        print(f"╔══════════════════════════════════════════════════════════════╗")
-        print(f"║  TCP Tunnel active                                            ║")
-        print(f"║  Listen: {listen_host}:{listen_port:<44}║")
-        print(f"║  Target: {target_host}:{target_port:<44}║")
-        print(f"╚══════════════════════════════════════════════════════════════╝")
-        print(f"[{timestamp()}] [INFO] Waiting for connections... (Ctrl+C to stop)")
-        
-        tunnel_counter = 0
-        
-        while True:
-            try:
-                client_socket, client_addr = server_socket.accept()
-                tunnel_counter += 1
-                tunnel_id = f"T{tunnel_counter:04d}"
-                
-                # Starting thread tocest client
-                client_thread = threading.Thread(
-                    target=handle_client,
-                    args=(client_socket, client_addr, target_host, target_port, tunnel_id),
-                    daemon=True
-                )
-                client_thread.start()
-                
-            except OSError as e:
-                log("ERROR", "MAIN", f"Error accept: {e}")
-                break
-                
-    except KeyboardInterrupt:
-        print(f"\n[{timestamp()}] [INFO] Stopping server (Ctrl+C)")
+        server = TunnelServer(listen_host, listen_port, target_host, target_port,
+                              engine=engine, strategy=strategy, log_mode=log_mode)
     except OSError as e:
         print(f"[{timestamp()}] [ERROR] Cannot bind on {listen_host}:{listen_port}: {e}")
         return 1
+
+    relay = f"{server.engine}, {server.strategy}, log {server.log_mode}"
+    print(f"╔══════════════════════════════════════════════════════════════╗")
+    print(f"║  TCP Tunnel active                                            ║")
+    print(f"║  Listen: {listen_host}:{listen_port:<44}║")
+    print(f"║  Target: {target_host}:{target_port:<44}║")
+    print(f"║  Relay:  {relay:<52}║")
+    print(f"╚══════════════════════════════════════════════════════════════╝")
+    print(f"[{timestamp()}] [INFO] Waiting for connections... (Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[{timestamp()}] [INFO] Stopping server (Ctrl+C)")
     finally:
-        server_socket.close()
         print(f"[{timestamp()}] [INFO] Server socket closed")
     
     return 0
@@ -327,6 +780,18 @@ Topologie tipica Mininet:
         "--target", default=DEFAULT_TARGET,
         help=f"Address serverului tinta (host:port), default: {DEFAULT_TARGET}"
     )
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="threads",
+        help="threads: doua thread-uri per tunel; event: un thread for toate (default: threads)"
+    )
+    parser.add_argument(
+        "--relay", choices=STRATEGIES, default=DEFAULT_STRATEGY,
+        help=f"Strategia de copiere a datelor, default: {DEFAULT_STRATEGY}"
+    )
+    parser.add_argument(
+        "--log", choices=LOG_MODES, default="summary", dest="log_mode",
+        help="summary: total la inchidere; sample: progres pe secunda; chunks: preview per chunk"
+    )
     
     args = parser.parse_args(argv)
     
@@ -337,7 +802,8 @@ Topologie tipica Mininet:
         print(f"Error: {e}")
         return 1
     
-    return run_tunnel(listen_host, listen_port, target_host, target_port)
+    return run_tunnel(listen_host, listen_port, target_host, target_port,
+                      engine=args.engine, strategy=args.relay, log_mode=args.log_mode)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Unit tests for the Week 3 TCP tunnel relay engines.
+
+These tests do not require Docker. They run TunnelServer on loopback in
+front of a small echo server and check, for every engine and relay
+strategy:
+- byte-exact forwarding of small and multi-megabyte payloads
+- half-close propagation (the reply still arrives after the client's FIN)
+- many concurrent tunnels, refused targets and shutdown
+- the summary/sample/chunks transfer logging
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import socket
+import threading
+import unittest
+from unittest import mock
+
+from src.apps import tcp_tunnel
+from src.apps.tcp_tunnel import (
+    ENGINES,
+    SPLICE_AVAILABLE,
+    STRATEGIES,
+    TransferLog,
+    TunnelServer,
+    resolve_strategy,
+)
+
+
+def _start_echo_server() -> tuple[socket.socket, tuple[str, int]]:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(64)
+
+    def serve(conn: socket.socket) -> None:
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                conn.sendall(data)
+
+    def accept_loop() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return server, server.getsockname()
+
+
+def _round_trip(address: tuple[str, int], payload: bytes) -> bytes:
+    """Send payload, half-close, and read until the tunnel closes."""
+    with socket.create_connection(address, timeout=10) as sock:
+        writer = threading.Thread(target=lambda: (sock.sendall(payload),
+                                                  sock.shutdown(socket.SHUT_WR)))
+        writer.start()
+        received = bytearray()
+        while True:
+            data = sock.recv(1 << 20)
+            if not data:
+                break
+            received += data
+        writer.join()
+    return bytes(received)
+
+
+class _TunnelCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.echo, self.echo_addr = _start_echo_server()
+        self.servers: list[TunnelServer] = []
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def tearDown(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+        self.echo.close()
+
+    def start(self, engine: str, strategy: str, target=None, **kwargs) -> TunnelServer:
+        host, port = target or self.echo_addr
+        server = TunnelServer("127.0.0.1", 0, host, port, engine=engine, strategy=strategy, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+
+class TestRelayStrategies(_TunnelCase):
+    """Every engine forwards bytes exactly with every relay strategy."""
+
+    def test_small_payload(self) -> None:
+        for engine in ENGINES:
+            for strategy in STRATEGIES:
+                with self.subTest(engine=engine, strategy=strategy):
+                    server = self.start(engine, strategy)
+                    self.assertEqual(_round_trip(server.address, b"TUNNEL_TEST"), b"TUNNEL_TEST")
+
+    def test_large_payload_with_half_close(self) -> None:
+        payload = os.urandom(4 * 1024 * 1024)
+        for engine in ENGINES:
+            for strategy in STRATEGIES:
+                with self.subTest(engine=engine, strategy=strategy):
+                    server = self.start(engine, strategy)
+                    self.assertEqual(_round_trip(server.address, payload), payload)
+
+    def test_interactive_echo_on_open_tunnel(self) -> None:
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                server = self.start(engine, "copy")
+                with socket.create_connection(server.address, timeout=5) as sock:
+                    for i in range(5):
+                        message = f"line {i}\n".encode()
+                        sock.sendall(message)
+                        self.assertEqual(sock.recv(1024), message)
+
+    def test_event_engine_serves_many_tunnels(self) -> None:
+        server = self.start("event", resolve_strategy("splice"))
+        payloads = [os.urandom(256 * 1024) for _ in range(20)]
+        results: dict[int, bytes] = {}
+
+        def client(i: int) -> None:
+            results[i] = _round_trip(server.address, payloads[i])
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(len(payloads))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([results[i] for i in range(len(payloads))], payloads)
+        self.assertEqual(server.tunnels_opened, len(payloads))
+
+
+class TestTunnelFailures(_TunnelCase):
+    """Refused targets and shutdown close the client side."""
+
+    def _closed_port(self) -> tuple[str, int]:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()
+
+    def test_refused_target_closes_client(self) -> None:
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                server = self.start(engine, "copy", target=self._closed_port())
+                with socket.create_connection(server.address, timeout=5) as sock:
+                    try:
+                        self.assertEqual(sock.recv(1), b"")
+                    except ConnectionResetError:
+                        pass
+
+    def test_event_shutdown_closes_open_tunnels(self) -> None:
+        server = self.start("event", "copy")
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(b"ping")
+            self.assertEqual(sock.recv(4), b"ping")
+            server.shutdown()
+            self.assertEqual(sock.recv(1), b"")
+
+    def test_unknown_engine_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            TunnelServer("127.0.0.1", 0, "127.0.0.1", 1, engine="forked")
+
+
+class TestTransferLogging(unittest.TestCase):
+    """Per-chunk output only in chunks mode."""
+
+    def _capture(self, mode: str, chunks: int, interval: float = 60.0) -> list[str]:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            xfer = TransferLog("T0001", "client→target", mode, interval=interval)
+            for _ in range(chunks):
+                xfer.record(100, b"x" * 100)
+            xfer.close()
+        return out.getvalue().splitlines()
+
+    def test_summary_logs_once(self) -> None:
+        lines = self._capture("summary", 1000)
+        self.assertEqual(len(lines), 1)
+        self.assertIn("Total: 100000 bytes in 1000 chunks", lines[0])
+
+    def test_chunks_logs_preview(self) -> None:
+        lines = self._capture("chunks", 3)
+        self.assertEqual(len(lines), 4)
+        self.assertIn("100 bytes: 'xxxx", lines[0])
+
+    def test_sample_is_rate_limited(self) -> None:
+        self.assertEqual(len(self._capture("sample", 1000, interval=60.0)), 1)
+        self.assertEqual(len(self._capture("sample", 3, interval=0.0)), 4)
+
+    def test_resolve_strategy(self) -> None:
+        self.assertEqual(resolve_strategy("splice", "chunks"), "copy")
+        self.assertEqual(resolve_strategy("classic", "chunks"), "classic")
+        with mock.patch.object(tcp_tunnel, "SPLICE_AVAILABLE", False):
+            self.assertEqual(resolve_strategy("splice"), "copy")
+        with self.assertRaises(ValueError):
+            resolve_strategy("sendfile")
+        with self.assertRaises(ValueError):
+            resolve_strategy("copy", "verbose")
+        if SPLICE_AVAILABLE:
+            self.assertEqual(resolve_strategy("splice"), "splice")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Unit tests for the homework 3.3 tunnel metrics layer.
+
+These tests do not require Docker. They cover:
+- sharded counters (exact totals from concurrent writers, retired shards)
+- byte-rate EWMAs and the hashed timer wheel
+- idle detection driven by the wheel, on a fake clock
+- the Prometheus/JSON snapshot endpoint
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import unittest
+import urllib.request
+
+from homework.exercises.hw_3_03_tunnel_logging import (
+    DIRECTIONS,
+    MetricsServer,
+    RateEWMA,
+    ShardedCounter,
+    TimerWheel,
+    TunnelMetrics,
+    render_prometheus,
+)
+
+UP, DOWN = DIRECTIONS
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestShardedCounter(unittest.TestCase):
+    def test_concurrent_writers_sum_exactly(self) -> None:
+        counter = ShardedCounter()
+
+        def work() -> None:
+            cell = counter.shard()
+            for _ in range(50_000):
+                cell.add(3)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(counter.value, 8 * 50_000 * 3)
+
+    def test_released_shard_kept_in_total(self) -> None:
+        counter = ShardedCounter()
+        a, b = counter.shard(), counter.shard()
+        a.add(10)
+        b.add(5)
+        counter.release(a)
+        counter.release(a)
+        a.add(100)  # no longer counted
+        self.assertEqual(counter.value, 15)
+
+
+class TestRateEWMA(unittest.TestCase):
+    def test_converges_to_steady_rate(self) -> None:
+        ewma = RateEWMA(tau=5.0)
+        total = 0
+        for second in range(60):
+            ewma.update(total, float(second))
+            total += 1000
+        self.assertAlmostEqual(ewma.rate, 1000.0, delta=1.0)
+
+    def test_decays_when_traffic_stops(self) -> None:
+        ewma = RateEWMA(tau=5.0)
+        for second in range(30):
+            ewma.update(second * 1000, float(second))
+        peak = ewma.rate
+        ewma.update(29_000, 34.0)
+        self.assertAlmostEqual(ewma.rate, peak * 0.3679, delta=5.0)
+
+
+class TestTimerWheel(unittest.TestCase):
+    def test_expiry_and_cancel(self) -> None:
+        wheel = TimerWheel(tick=1.0, slots=8, start=0.0)
+        wheel.schedule("a", 3)
+        wheel.schedule("b", 5)
+        wheel.schedule("c", 3)
+        wheel.cancel("c")
+        self.assertEqual(wheel.advance(2.5), [])
+        self.assertEqual(wheel.advance(3.0), ["a"])
+        self.assertEqual(wheel.advance(10.0), ["b"])
+        self.assertEqual(len(wheel), 0)
+
+    def test_delays_longer_than_one_turn(self) -> None:
+        wheel = TimerWheel(tick=1.0, slots=4, start=0.0)
+        wheel.schedule("far", 10)
+        wheel.schedule("turn", 4)
+        self.assertEqual(wheel.advance(4.0), ["turn"])
+        self.assertEqual(wheel.advance(9.0), [])
+        self.assertEqual(wheel.advance(10.0), ["far"])
+
+    def test_reschedule_replaces(self) -> None:
+        wheel = TimerWheel(tick=1.0, slots=8, start=0.0)
+        wheel.schedule("a", 2)
+        wheel.schedule("a", 6)
+        self.assertEqual(wheel.advance(5.0), [])
+        self.assertEqual(wheel.advance(6.0), ["a"])
+
+
+class TestTunnelMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.metrics = TunnelMetrics(idle_timeout=8, idle_checks=4, clock=self.clock)
+
+    def run_for(self, seconds: int, traffic=None) -> list:
+        idle = []
+        for _ in range(seconds):
+            if traffic:
+                traffic()
+            self.clock.now += 1
+            idle += self.metrics.tick()
+        return idle
+
+    def test_active_connection_never_idle(self) -> None:
+        meter = self.metrics.open("conn-001", ("10.0.0.1", 5000), ("10.0.0.2", 80))
+        self.assertEqual(self.run_for(60, lambda: meter.cell(UP).add(100)), [])
+        self.assertEqual(self.metrics.snapshot()["connections"]["idle_closed"], 0)
+
+    def test_idle_detected_within_bounds(self) -> None:
+        meter = self.metrics.open("conn-001", ("10.0.0.1", 5000), ("10.0.0.2", 80))
+        self.run_for(5, lambda: meter.cell(UP).add(100))
+        quiet = 0
+        idle = []
+        while not idle and quiet < 30:
+            quiet += 1
+            idle = self.run_for(1)
+        self.assertEqual(idle, ["conn-001"])
+        # Idle for at least the timeout, at most one check interval past it
+        self.assertGreaterEqual(quiet, 8 - 2)
+        self.assertLessEqual(quiet, 8 + 2 + 1)
+
+    def test_totals_survive_close(self) -> None:
+        a = self.metrics.open("conn-001", ("10.0.0.1", 1), ("10.0.0.2", 80))
+        b = self.metrics.open("conn-002", ("10.0.0.1", 2), ("10.0.0.2", 80))
+        a.cell(UP).add(100)
+        a.cell(DOWN).add(1000)
+        b.cell(UP).add(7)
+        self.clock.now += 4
+        self.metrics.close("conn-001")
+        snap = self.metrics.snapshot()
+        self.assertEqual(snap["bytes"], {UP: 107, DOWN: 1000})
+        self.assertEqual(snap["connections"], {"active": 1, "total": 2, "peak": 2, "idle_closed": 0})
+        self.assertEqual(snap["average_duration_s"], 4.0)
+        self.assertEqual([c["id"] for c in snap["per_connection"]], ["conn-002"])
+
+    def test_rates(self) -> None:
+        meter = self.metrics.open("conn-001", ("10.0.0.1", 1), ("10.0.0.2", 80))
+        self.run_for(120, lambda: meter.cell(DOWN).add(2000))
+        snap = self.metrics.snapshot()
+        self.assertAlmostEqual(snap["rate_bps"][DOWN], 2000, delta=20)
+        self.assertAlmostEqual(snap["per_connection"][0]["rate_bps"][DOWN], 2000, delta=20)
+        self.assertEqual(snap["rate_bps"][UP], 0)
+
+    def test_prometheus_text(self) -> None:
+        meter = self.metrics.open("conn-001", ("10.0.0.1", 1), ("10.0.0.2", 80))
+        meter.cell(UP).add(42)
+        text = render_prometheus(self.metrics.snapshot())
+        self.assertIn('tunnel_bytes_total{direction="client_to_server"} 42', text)
+        self.assertIn("# TYPE tunnel_connections_active gauge", text)
+        self.assertIn('tunnel_connection_bytes_total{conn="conn-001",source="10.0.0.1:1",'
+                      'direction="client_to_server"} 42', text)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_serves_prometheus_and_json(self) -> None:
+        metrics = TunnelMetrics(idle_timeout=60)
+        metrics.open("conn-001", ("10.0.0.1", 1), ("10.0.0.2", 80)).cell(DOWN).add(5)
+        server = MetricsServer(metrics, host="127.0.0.1", port=0)
+        server.start()
+        try:
+            base = f"http://127.0.0.1:{server.address[1]}"
+            with urllib.request.urlopen(f"{base}/metrics", timeout=5) as resp:
+                self.assertIn("text/plain", resp.headers["Content-Type"])
+                self.assertIn(b'direction="server_to_client"} 5', resp.read())
+            with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as resp:
+                self.assertEqual(json.load(resp)["bytes"][DOWN], 5)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1470 @@
+#!/usr/bin/env python3
+"""
+Week 4 Homework Assignment 2: Reliable UDP Protocol - Reference Solution
+========================================================================
+Computer Networks - Week 4 (WSL Environment)
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Reference solution for homework/exercises/hw_4_02_reliable_udp_transfer.py.
+Read homework/solutions/README.md before using it.
+
+Description:
+    Selective repeat over UDP: SACK blocks in the ACK payload, one
+    timer-wheel retransmission timer per segment, an RFC 6298 timeout
+    with Karn's rule and pluggable congestion control (fixed window,
+    AIMD, CUBIC). SelectiveRepeatSender / SelectiveRepeatReceiver hold
+    the protocol logic without sockets; ReliableSender / ReliableReceiver
+    run them over UDP, and simulate_transfer() over a simulated lossy
+    link in virtual time.
+
+File transfer:
+    send_file() prefixes the data with FILE_META (file size and SHA-256);
+    receive_file() strips it and verifies the hash.
+"""
+
+import socket
+import struct
+import threading
+import hashlib
+import heapq
+import itertools
+import math
+import time
+import random
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from collections import deque
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_PORT = 5420
+WINDOW_SIZE = 4              # Sliding window size
+INITIAL_TIMEOUT = 1.0        # Initial timeout in seconds
+MAX_RETRIES = 5              # Maximum retransmission attempts
+CHUNK_SIZE = 1024            # Payload size per packet
+ALPHA = 0.125                # EWMA coefficient for RTT estimation
+MIN_TIMEOUT = 0.2            # Floor of the RTT variance margin (Linux: 200 ms)
+MAX_TIMEOUT = 4.0            # Upper bound: several probes per receiver idle timeout
+MAX_RTO_BACKOFFS = 15        # Consecutive timeouts without progress before giving up
+DUP_ACK_THRESHOLD = 3        # Later segments ACKed before a hole counts as lost
+MAX_SACK_BLOCKS = 8          # SACK ranges carried in one ACK
+RECV_WINDOW = 1024           # Receiver buffer in packets (advertised window)
+INITIAL_CWND = 10            # Initial congestion window in packets
+TIMER_TICK = 0.01            # Retransmission timer granularity in seconds
+TIMER_SLOTS = 512
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PACKET_LOSS_SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════════ (for testing)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PacketLossSimulator:
+    """Simulate packet loss for testing reliability."""
+    
+    def __init__(self, loss_rate: float = 0.0, rng: Optional[random.Random] = None):
+        self.loss_rate = loss_rate
+        self.rng = rng or random  # pass random.Random(seed) for repeatable runs
+        self.packets_sent = 0
+        self.packets_dropped = 0
+    
+    def should_drop(self) -> bool:
+        """Determine if a packet should be dropped."""
+        self.packets_sent += 1
+        if self.rng.random() < self.loss_rate:
+            self.packets_dropped += 1
+            return True
+        return False
+    
+    def get_stats(self) -> dict:
+        """Get loss statistics."""
+        return {
+            "sent": self.packets_sent,
+            "dropped": self.packets_dropped,
+            "actual_loss_rate": self.packets_dropped / max(1, self.packets_sent)
+        }
+
+
+# Global simulator (set loss_rate > 0 for testing)
+loss_simulator = PacketLossSimulator(loss_rate=0.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROTOCOL_FLAGS
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Flags(IntEnum):
+    """Packet flags."""
+    DATA = 0x01      # Contains data
+    ACK = 0x02       # Acknowledgment
+    SYN = 0x04       # Synchronise (connection start)
+    FIN = 0x08       # Finish (connection end)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PACKET_STRUCTURE
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Header format:
+# Offset  Size  Field
+# 0       4     Sequence Number
+# 4       4     Acknowledgment Number
+# 8       1     Flags
+# 9       2     Window Size
+# 11      2     Payload Length
+# 13      4     Checksum (CRC32)
+# Total: 17 bytes
+
+HEADER_FORMAT = '!IIBHHI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+HEADER_STRUCT = struct.Struct(HEADER_FORMAT)
+HEADER_PREFIX = struct.Struct(HEADER_FORMAT[:-1])   # everything the checksum covers
+CHECKSUM_STRUCT = struct.Struct('!I')
+
+# File transfer: file size (8 bytes) + SHA-256 (32 bytes) ahead of the data
+FILE_META = struct.Struct('!Q32s')
+
+
+@dataclass
+class Packet:
+    """Reliable UDP packet structure."""
+    seq_num: int
+    ack_num: int
+    flags: int
+    window: int
+    payload: bytes
+    
+    def to_bytes(self) -> bytes:
+        """Serialize packet to bytes."""
+        prefix = HEADER_PREFIX.pack(self.seq_num, self.ack_num, self.flags,
+                                    self.window, len(self.payload))
+        checksum = calculate_checksum(self.payload, calculate_checksum(prefix))
+        return prefix + CHECKSUM_STRUCT.pack(checksum) + self.payload
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional['Packet']:
+        """
+        Deserialize packet from bytes.
+        
+        Returns:
+            Packet object if valid, None if checksum fails
+        """
+        if len(data) < HEADER_SIZE:
+            return None
+        seq_num, ack_num, flags, window, length, checksum = HEADER_STRUCT.unpack_from(data)
+        if length != len(data) - HEADER_SIZE:
+            return None
+        view = memoryview(data)
+        payload = view[HEADER_SIZE:]
+        if calculate_checksum(payload, calculate_checksum(view[:HEADER_PREFIX.size])) != checksum:
+            return None
+        return cls(seq_num, ack_num, flags, window, bytes(payload))
+    
+    def is_data(self) -> bool:
+        return bool(self.flags & Flags.DATA)
+    
+    def is_ack(self) -> bool:
+        return bool(self.flags & Flags.ACK)
+    
+    def is_syn(self) -> bool:
+        return bool(self.flags & Flags.SYN)
+    
+    def is_fin(self) -> bool:
+        return bool(self.flags & Flags.FIN)
+
+
+def calculate_checksum(data: bytes, start: int = 0) -> int:
+    """Calculate CRC32 checksum (start: CRC of the bytes before data)."""
+    import binascii
+    return binascii.crc32(data, start) & 0xFFFFFFFF
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RTT_ESTIMATION
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RTTEstimator:
+    """
+    Estimate round-trip time using Exponential Weighted Moving Average.
+    
+    Timeout rules follow RFC 6298: the first sample sets the estimate,
+    every timeout doubles the value (backoff) until a new sample arrives.
+    Karn's rule is the caller's job: never pass the RTT of a packet that
+    was retransmitted, the ACK could belong to either copy.
+    """
+    
+    def __init__(self, initial_rtt: float = INITIAL_TIMEOUT):
+        self.estimated_rtt = initial_rtt
+        self.dev_rtt = initial_rtt / 4  # RTT deviation
+        self.alpha = ALPHA
+        self.beta = 0.25
+        self.samples = 0
+        self.backoff_factor = 1
+    
+    def update(self, sample_rtt: float):
+        """Update RTT estimate with new sample."""
+        if self.samples == 0:
+            self.estimated_rtt = sample_rtt
+            self.dev_rtt = sample_rtt / 2
+        else:
+            # Deviation first: it compares the sample with the old estimate
+            self.dev_rtt = (1 - self.beta) * self.dev_rtt + self.beta * abs(sample_rtt - self.estimated_rtt)
+            self.estimated_rtt = (1 - self.alpha) * self.estimated_rtt + self.alpha * sample_rtt
+        self.samples += 1
+        self.backoff_factor = 1
+    
+    def get_timeout(self) -> float:
+        """Calculate timeout based on current estimates."""
+        # On a steady path dev_rtt tends to 0 and the timeout to the RTT
+        # itself; keep a margin for queueing jitter and timer granularity
+        timeout = (self.estimated_rtt + max(MIN_TIMEOUT, 4 * self.dev_rtt)) * self.backoff_factor
+        return min(MAX_TIMEOUT, timeout)
+    
+    def backoff(self):
+        """Double the timeout after a retransmission timeout."""
+        if self.get_timeout() < MAX_TIMEOUT:
+            self.backoff_factor *= 2
+    
+    def reset_backoff(self):
+        """Drop the backoff once data gets through again."""
+        self.backoff_factor = 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SACK_BLOCKS
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# An ACK carries the cumulative ack in ack_num (next expected sequence) and
+# up to MAX_SACK_BLOCKS ranges of segments received above it in the payload,
+# each as (start, end) with end exclusive. The first block is the one that
+# holds the segment this ACK answers (its seq_num is echoed in seq_num).
+
+SACK_BLOCK = struct.Struct('!II')
+
+
+def encode_sack(blocks: Iterable[Tuple[int, int]]) -> bytes:
+    """Pack SACK ranges into an ACK payload."""
+    return b''.join(SACK_BLOCK.pack(start, end) for start, end in blocks)
+
+
+def decode_sack(payload: bytes) -> List[Tuple[int, int]]:
+    """Unpack SACK ranges from an ACK payload (empty list if malformed)."""
+    if len(payload) % SACK_BLOCK.size:
+        return []
+    return [(start, end) for start, end in SACK_BLOCK.iter_unpack(payload) if start < end]
+
+
+class RangeSet:
+    """
+    Sorted, disjoint ranges [start, end) of sequence numbers.
+
+    The receiver keeps its buffered segments here (the SACK blocks), the
+    sender its selectively acknowledged ones. Adjacent ranges are merged.
+    """
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __contains__(self, seq: int) -> bool:
+        return self.find(seq) is not None
+
+    def find(self, seq: int) -> Optional[Tuple[int, int]]:
+        """Range holding seq, or None."""
+        i = bisect_right(self.starts, seq) - 1
+        if i >= 0 and seq < self.ends[i]:
+            return self.starts[i], self.ends[i]
+        return None
+
+    def add(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Merge [start, end) in; return the parts that were not covered yet."""
+        if start >= end:
+            return []
+        starts, ends = self.starts, self.ends
+        i = bisect_left(ends, start)      # first range ending at or after start
+        j = bisect_right(starts, end)     # ranges from i to j overlap or touch
+        new = []
+        cursor = start
+        for k in range(i, j):
+            if starts[k] > cursor:
+                new.append((cursor, starts[k]))
+            cursor = max(cursor, ends[k])
+        if cursor < end:
+            new.append((cursor, end))
+        if i < j:
+            start = min(start, starts[i])
+            end = max(end, ends[j - 1])
+        starts[i:j] = [start]
+        ends[i:j] = [end]
+        return new
+
+    def trim(self, below: int):
+        """Forget everything below a sequence number."""
+        i = bisect_right(self.ends, below)
+        del self.starts[:i]
+        del self.ends[:i]
+        if self.starts and self.starts[0] < below:
+            self.starts[0] = below
+
+    def pop_first(self) -> Tuple[int, int]:
+        return self.starts.pop(0), self.ends.pop(0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RETRANSMISSION_TIMERS
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TimerWheel:
+    """
+    Hashed timing wheel: O(1) schedule and cancel, expiry per tick.
+
+    One retransmission timer per segment in flight, so an ACK cancels a
+    timer instead of the sender scanning its whole buffer for deadlines.
+    A key scheduled further out than one turn of the wheel carries a
+    rounds count that is decremented each time its slot comes round.
+    """
+
+    def __init__(self, tick: float = TIMER_TICK, slots: int = TIMER_SLOTS, start: float = 0.0):
+        self.tick = tick
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}
+        self._cursor = 0
+        self._time = start
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    @property
+    def next_tick(self) -> Optional[float]:
+        """Time of the next tick, None while nothing is scheduled."""
+        return self._time + self.tick if self._where else None
+
+    def schedule(self, key: Hashable, delay: float):
+        """(Re)schedule key to expire after delay seconds (rounded up to ticks)."""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self._cursor + ticks) % len(self._slots)
+        self._slots[slot][key] = (ticks - 1) // len(self._slots)
+        self._where[key] = slot
+
+    def cancel(self, key: Hashable):
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel up to now; return the keys that expired."""
+        expired: List[Hashable] = []
+        while self._time + self.tick <= now:
+            self._time += self.tick
+            self._cursor = (self._cursor + 1) % len(self._slots)
+            bucket = self._slots[self._cursor]
+            for key, rounds in list(bucket.items()):
+                if rounds:
+                    bucket[key] = rounds - 1
+                else:
+                    del bucket[key]
+                    del self._where[key]
+                    expired.append(key)
+        return expired
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONGESTION_CONTROL
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CongestionControl:
+    """
+    Congestion window in packets, driven by the sender.
+
+    on_ack: packets newly delivered (cumulative or SACKed)
+    on_loss: a loss found from SACKs, at most once per window of data
+    on_timeout: a retransmission timeout, at most once per window of data
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.cwnd = float(INITIAL_CWND)
+
+    def on_ack(self, acked: int, now: float, rtt: float):
+        pass
+
+    def on_loss(self, now: float):
+        pass
+
+    def on_timeout(self, now: float):
+        pass
+
+
+class FixedWindow(CongestionControl):
+    """Constant window: the classic sliding window of WINDOW_SIZE packets."""
+
+    name = "fixed"
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.cwnd = float(window)
+
+
+class AIMDControl(CongestionControl):
+    """
+    Reno-style AIMD: slow start up to ssthresh, then one packet per RTT;
+    halve on loss, back to one packet on timeout.
+    """
+
+    name = "aimd"
+
+    def __init__(self, initial: int = INITIAL_CWND, decrease: float = 0.5):
+        self.cwnd = float(initial)
+        self.ssthresh = float('inf')
+        self.decrease = decrease
+
+    def on_ack(self, acked: int, now: float, rtt: float):
+        if self.cwnd < self.ssthresh:
+            self.cwnd += acked
+        else:
+            self.cwnd += acked / self.cwnd
+
+    def on_loss(self, now: float):
+        self.ssthresh = max(self.cwnd * self.decrease, 2.0)
+        self.cwnd = self.ssthresh
+
+    def on_timeout(self, now: float):
+        self.ssthresh = max(self.cwnd * self.decrease, 2.0)
+        self.cwnd = 1.0
+
+
+class CubicControl(CongestionControl):
+    """
+    CUBIC-like window growth (RFC 8312): after a loss the window follows
+    W(t) = C * (t - K)^3 + W_max, flat around the window where the loss
+    happened and probing faster away from it, so growth depends on time
+    since the loss rather than on the number of RTTs. Never slower than
+    the Reno estimate (TCP-friendly region); fast convergence lowers
+    W_max when losses come before the previous maximum was reached.
+    """
+
+    name = "cubic"
+    C = 0.4
+    BETA = 0.7
+
+    def __init__(self, initial: int = INITIAL_CWND):
+        self.cwnd = float(initial)
+        self.ssthresh = float('inf')
+        self.w_max = 0.0
+        self.k = 0.0
+        self.origin = 0.0
+        self.w_est = 0.0
+        self.epoch_start: Optional[float] = None
+
+    def on_ack(self, acked: int, now: float, rtt: float):
+        if self.cwnd < self.ssthresh:
+            self.cwnd += acked
+            return
+        if self.epoch_start is None:
+            self.epoch_start = now
+            self.origin = max(self.w_max, self.cwnd)
+            self.k = ((self.origin - self.cwnd) / self.C) ** (1 / 3)
+            self.w_est = self.cwnd
+        t = now - self.epoch_start + rtt
+        target = self.origin + self.C * (t - self.k) ** 3
+        self.w_est += acked * 3 * (1 - self.BETA) / (1 + self.BETA) / self.cwnd
+        target = min(max(target, self.w_est), 1.5 * self.cwnd)
+        if target > self.cwnd:
+            self.cwnd += (target - self.cwnd) / self.cwnd * acked
+        else:
+            self.cwnd += 0.01 * acked / self.cwnd
+
+    def _reduce(self):
+        if self.cwnd < self.w_max:
+            self.w_max = self.cwnd * (1 + self.BETA) / 2   # fast convergence
+        else:
+            self.w_max = self.cwnd
+        self.ssthresh = max(self.cwnd * self.BETA, 2.0)
+        self.epoch_start = None
+
+    def on_loss(self, now: float):
+        self._reduce()
+        self.cwnd = self.ssthresh
+
+    def on_timeout(self, now: float):
+        self._reduce()
+        self.cwnd = 1.0
+
+
+CONGESTION_CONTROLS = {
+    "fixed": FixedWindow,
+    "aimd": AIMDControl,
+    "cubic": CubicControl,
+}
+
+
+def make_congestion(name: str, window: int = WINDOW_SIZE) -> CongestionControl:
+    """Congestion control by name; window only applies to 'fixed'."""
+    if name not in CONGESTION_CONTROLS:
+        raise ValueError(f"Unknown congestion control: {name}")
+    if name == "fixed":
+        return FixedWindow(window)
+    return CONGESTION_CONTROLS[name]()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SELECTIVE_REPEAT
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+IN_FLIGHT, LOST = 0, 1
+
+
+class Segment:
+    """One data segment the sender has not seen acknowledged yet."""
+
+    __slots__ = ("payload", "sent_at", "order", "transmissions", "state")
+
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.sent_at = 0.0
+        self.order = 0              # transmission counter at the last send
+        self.transmissions = 0
+        self.state = IN_FLIGHT
+
+
+class SelectiveRepeatSender:
+    """
+    Sender side of selective repeat, without sockets or clocks.
+
+    poll(now) returns the packets to transmit, on_ack(packet, now) feeds
+    ACKs back, next_deadline() says when to call poll again if no ACK
+    comes. The window is min(congestion window, receiver window).
+
+    - A segment is lost once DUP_ACK_THRESHOLD segments transmitted after
+      it have been ACKed or SACKed (the SACK form of 3 duplicate ACKs;
+      it also catches lost retransmissions), or when its timer expires.
+    - Only lost segments are resent, lowest sequence first.
+    - RTT samples come from the segment an ACK answers, and only if it was
+      sent once (Karn). Each timeout doubles the RTO until segments get
+      acknowledged again.
+    - The congestion control reacts once per window: losses of segments
+      sent before the last reduction belong to the same congestion event.
+
+    Sequence numbers are absolute packet numbers (32 bits on the wire).
+    """
+
+    def __init__(self, data: bytes, chunk_size: int = CHUNK_SIZE,
+                 congestion: Optional[CongestionControl] = None,
+                 rtt: Optional[RTTEstimator] = None, first_seq: int = 0,
+                 max_backoffs: int = MAX_RTO_BACKOFFS):
+        self.data = memoryview(data)
+        self.chunk_size = chunk_size
+        self.cc = congestion or CubicControl()
+        self.rtt = rtt or RTTEstimator()
+        self.max_backoffs = max_backoffs
+
+        self.first_seq = first_seq
+        self.base = first_seq                 # lowest unacknowledged
+        self.next_seq = first_seq             # next new segment
+        self.end_seq = first_seq + (len(data) + chunk_size - 1) // chunk_size
+        self.peer_window = RECV_WINDOW
+
+        self.segments: Dict[int, Segment] = {}
+        self.sacked = RangeSet()
+        self.pipe = 0                         # segments believed in flight
+        self.timers: Optional[TimerWheel] = None
+        self._lost: List[int] = []            # heap of LOST sequence numbers
+        self._sent_order: deque = deque()     # (order, seq) per transmission
+        self._order = 0
+        self._delivered_order = -1
+        self._reduced_at = float('-inf')      # last congestion reaction
+        self._timeout_at = float('-inf')      # last RTO backoff
+        self._backoffs = 0
+
+        self.stats = {
+            "transmissions": 0,
+            "retransmissions": 0,
+            "fast_retransmits": 0,
+            "timeouts": 0,
+            "rtt_samples": 0,
+        }
+
+    @property
+    def done(self) -> bool:
+        return self.base >= self.end_seq
+
+    @property
+    def window(self) -> int:
+        return max(1, min(int(self.cc.cwnd), self.peer_window))
+
+    def can_send(self) -> bool:
+        """True if poll() would transmit something right now."""
+        if self.pipe >= self.window:
+            return False
+        self._skip_stale_lost()
+        return bool(self._lost) or self._may_send_new()
+
+    def next_deadline(self) -> Optional[float]:
+        return self.timers.next_tick if self.timers else None
+
+    def poll(self, now: float) -> List[Tuple[Packet, bool]]:
+        """Expire timers, then fill the window: (packet, is_retransmission) list."""
+        if self.timers is None:
+            self.timers = TimerWheel(start=now)
+        for seq in self.timers.advance(now):
+            self._on_timeout(seq, now)
+
+        out = []
+        window = self.window
+        while self.pipe < window:
+            self._skip_stale_lost()
+            if self._lost:
+                seq = heapq.heappop(self._lost)
+                out.append((self._transmit(seq, now), True))
+            elif self._may_send_new():
+                seq = self.next_seq
+                offset = (seq - self.first_seq) * self.chunk_size
+                self.segments[seq] = Segment(bytes(self.data[offset:offset + self.chunk_size]))
+                self.next_seq += 1
+                out.append((self._transmit(seq, now), False))
+            else:
+                break
+        return out
+
+    def on_ack(self, ack: Packet, now: float) -> int:
+        """Process an ACK; return how many segments it newly acknowledged."""
+        if ack.window:
+            self.peer_window = ack.window
+        sample = self.segments.get(ack.seq_num)
+        newly = 0
+
+        cumulative = min(ack.ack_num, self.next_seq)
+        if cumulative > self.base:
+            for seq in range(self.base, cumulative):
+                newly += self._acknowledge(seq)
+            self.base = cumulative
+            self.sacked.trim(cumulative)
+        for start, end in decode_sack(ack.payload):
+            start, end = max(start, self.base), min(end, self.next_seq)
+            for new_start, new_end in self.sacked.add(start, end):
+                for seq in range(new_start, new_end):
+                    newly += self._acknowledge(seq)
+
+        if not newly:
+            return 0
+        if sample is not None and sample.transmissions == 1 and ack.seq_num not in self.segments:
+            self.rtt.update(now - sample.sent_at)
+            self.stats["rtt_samples"] += 1
+        self._backoffs = 0
+        self.rtt.reset_backoff()   # progress, even without a sample (Karn)
+        self.cc.on_ack(newly, now, self.rtt.estimated_rtt)
+        if self.cc.cwnd > self.peer_window:
+            self.cc.cwnd = float(self.peer_window)   # no growth while not window-limited
+        self._detect_losses(now)
+        return newly
+
+    def _may_send_new(self) -> bool:
+        return self.next_seq < self.end_seq and self.next_seq < self.base + self.peer_window
+
+    def _skip_stale_lost(self):
+        lost = self._lost
+        while lost and (lost[0] not in self.segments or self.segments[lost[0]].state != LOST):
+            heapq.heappop(lost)
+
+    def _transmit(self, seq: int, now: float) -> Packet:
+        segment = self.segments[seq]
+        segment.sent_at = now
+        segment.order = self._order
+        segment.transmissions += 1
+        segment.state = IN_FLIGHT
+        self._sent_order.append((self._order, seq))
+        self._order += 1
+        self.pipe += 1
+        self.timers.schedule(seq, self.rtt.get_timeout())
+        self.stats["transmissions"] += 1
+        if segment.transmissions > 1:
+            self.stats["retransmissions"] += 1
+        return Packet(seq_num=seq, ack_num=0, flags=Flags.DATA, window=0, payload=segment.payload)
+
+    def _acknowledge(self, seq: int) -> int:
+        segment = self.segments.pop(seq, None)
+        if segment is None:
+            return 0
+        if segment.state == IN_FLIGHT:
+            self.pipe -= 1
+            self.timers.cancel(seq)
+        # Only first transmissions move the loss detector: an ACK for a
+        # resent segment may belong to the original copy (Karn again)
+        if segment.transmissions == 1 and segment.order > self._delivered_order:
+            self._delivered_order = segment.order
+        return 1
+
+    def _mark_lost(self, seq: int, segment: Segment):
+        segment.state = LOST
+        self.pipe -= 1
+        heapq.heappush(self._lost, seq)
+
+    def _detect_losses(self, now: float):
+        sent = self._sent_order
+        while sent and sent[0][0] + DUP_ACK_THRESHOLD <= self._delivered_order:
+            order, seq = sent.popleft()
+            segment = self.segments.get(seq)
+            if segment is None or segment.state != IN_FLIGHT or segment.order != order:
+                continue
+            self.timers.cancel(seq)
+            self._mark_lost(seq, segment)
+            self.stats["fast_retransmits"] += 1
+            if segment.sent_at >= self._reduced_at:
+                self.cc.on_loss(now)
+                self._reduced_at = now
+
+    def _on_timeout(self, seq: int, now: float):
+        segment = self.segments.get(seq)
+        if segment is None or segment.state != IN_FLIGHT:
+            return
+        self._mark_lost(seq, segment)
+        self.stats["timeouts"] += 1
+        if segment.sent_at >= self._timeout_at:
+            self._backoffs += 1
+            if self._backoffs > self.max_backoffs:
+                raise TimeoutError(f"No progress after {self.max_backoffs} retransmission timeouts")
+            self.rtt.backoff()
+            self.cc.on_timeout(now)
+            self._timeout_at = self._reduced_at = now
+
+
+class SelectiveRepeatReceiver:
+    """
+    Receiver side of selective repeat: buffers out-of-order segments
+    inside its window, delivers in order and answers every data packet
+    with an ACK carrying the cumulative ack and SACK blocks.
+    """
+
+    def __init__(self, first_seq: int = 0, window: int = RECV_WINDOW,
+                 max_sack_blocks: int = MAX_SACK_BLOCKS):
+        self.expected = first_seq
+        self.window = window
+        self.max_sack_blocks = max_sack_blocks
+        self.buffer: Dict[int, bytes] = {}
+        self.ranges = RangeSet()
+        self.delivered: List[bytes] = []
+        self.stats = {"out_of_order": 0, "duplicates": 0, "beyond_window": 0}
+
+    def on_data(self, packet: Packet) -> Packet:
+        """Accept a data packet; return the ACK to send back."""
+        seq = packet.seq_num
+        if seq == self.expected:
+            self.delivered.append(packet.payload)
+            self.expected += 1
+            if self.ranges and self.ranges.starts[0] == self.expected:
+                start, end = self.ranges.pop_first()
+                self.delivered.extend(self.buffer.pop(s) for s in range(start, end))
+                self.expected = end
+        elif seq < self.expected or seq in self.buffer:
+            self.stats["duplicates"] += 1
+        elif seq >= self.expected + self.window:
+            self.stats["beyond_window"] += 1
+        else:
+            self.buffer[seq] = packet.payload
+            self.ranges.add(seq, seq + 1)
+            self.stats["out_of_order"] += 1
+        return Packet(seq_num=seq, ack_num=self.expected, flags=Flags.ACK,
+                      window=self.window, payload=encode_sack(self.sack_blocks(seq)))
+
+    def sack_blocks(self, seq: int) -> List[Tuple[int, int]]:
+        """Block holding seq first, then the lowest others (RFC 2018 order)."""
+        first = self.ranges.find(seq)
+        blocks = [first] if first else []
+        for block in self.ranges:
+            if len(blocks) >= self.max_sack_blocks:
+                break
+            if block != first:
+                blocks.append(block)
+        return blocks
+
+    def take(self) -> bytes:
+        """In-order data delivered since the last call."""
+        data = b''.join(self.delivered)
+        self.delivered.clear()
+        return data
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RELIABLE_SENDER
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ReliableSender:
+    """
+    Reliable UDP sender with sliding window.
+    
+    Runs a SelectiveRepeatSender over the socket: the ACK thread feeds it
+    ACKs, send_data() transmits what it releases and sleeps until the
+    next ACK or retransmission timer tick.
+    """
+    
+    def __init__(self, dest_host: str, dest_port: int = DEFAULT_PORT,
+                 congestion: str = "cubic"):
+        self.dest_host = dest_host
+        self.dest_port = dest_port
+        self.socket: Optional[socket.socket] = None
+        
+        # Sliding window state
+        self.base = 0              # Oldest unacknowledged sequence number
+        self.next_seq = 0          # Next sequence number to use
+        self.window_size = WINDOW_SIZE
+        self.congestion = congestion
+        
+        # Unacknowledged segments live in the engine of the current transfer
+        self.engine: Optional[SelectiveRepeatSender] = None
+        self.buffer_lock = threading.Lock()
+        self.wakeup = threading.Condition(self.buffer_lock)
+        self.fin_seq: Optional[int] = None
+        self.fin_acked = False
+        
+        # RTT estimation
+        self.rtt_estimator = RTTEstimator()
+        
+        # Statistics
+        self.stats = {
+            "packets_sent": 0,
+            "retransmissions": 0,
+            "bytes_sent": 0,
+            "acks_received": 0,
+            "duplicate_acks": 0,
+            "fast_retransmits": 0,
+            "timeouts": 0
+        }
+        
+        # Receiver thread for ACKs
+        self.running = False
+        self.ack_thread: Optional[threading.Thread] = None
+    
+    def connect(self):
+        """Initialise UDP socket and start ACK receiver."""
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.settimeout(0.1)  # Non-blocking for receiver thread
+        
+        # Start ACK receiver thread
+        self.running = True
+        self.ack_thread = threading.Thread(target=self._ack_receiver)
+        self.ack_thread.daemon = True
+        self.ack_thread.start()
+        
+        # No handshake: the first DATA segment opens the transfer, FIN ends it
+        print(f"Connected to {self.dest_host}:{self.dest_port}")
+    
+    def disconnect(self):
+        """Close connection."""
+        if self.socket and self.running:
+            self._send_fin()
+        self.running = False
+        if self.ack_thread:
+            self.ack_thread.join(timeout=2.0)
+        if self.socket:
+            self.socket.close()
+    
+    def _ack_receiver(self):
+        """Background thread to receive ACKs."""
+        while self.running:
+            try:
+                data, addr = self.socket.recvfrom(HEADER_SIZE + SACK_BLOCK.size * MAX_SACK_BLOCKS)
+                packet = Packet.from_bytes(data)
+                
+                if packet and packet.is_ack():
+                    self._process_ack(packet)
+                    
+            except socket.timeout:
+                continue
+            except Exception as e:
+                if self.running:
+                    print(f"ACK receiver error: {e}")
+    
+    def _process_ack(self, ack_packet: Packet):
+        """Process received ACK."""
+        with self.wakeup:
+            self.stats["acks_received"] += 1
+            if self.fin_seq is not None and ack_packet.ack_num > self.fin_seq:
+                self.fin_acked = True
+            elif self.engine is not None:
+                # RTT sample (Karn), cumulative + SACK, loss detection
+                if not self.engine.on_ack(ack_packet, time.monotonic()):
+                    self.stats["duplicate_acks"] += 1
+                self.base = self.engine.base
+            self.wakeup.notify()
+    
+    def _send_packet(self, packet: Packet, retransmit: bool = False):
+        """Send a packet (possibly retransmission)."""
+        # Apply packet loss simulation
+        if loss_simulator.should_drop():
+            print(f"[SIM] Dropped packet seq={packet.seq_num}")
+            return
+        
+        data = packet.to_bytes()
+        self.socket.sendto(data, (self.dest_host, self.dest_port))
+        
+        # Update statistics
+        self.stats["packets_sent"] += 1
+        if retransmit:
+            self.stats["retransmissions"] += 1
+        else:
+            self.stats["bytes_sent"] += len(packet.payload)
+    
+    def _check_timeouts(self):
+        """Check for timed-out packets and retransmit."""
+        # Expired timers come off the wheel, no scan of the send buffer;
+        # then send whatever the window allows (lost segments first)
+        with self.buffer_lock:
+            packets = self.engine.poll(time.monotonic())
+        for packet, retransmit in packets:
+            self._send_packet(packet, retransmit)
+    
+    def send_data(self, data: bytes):
+        """
+        Send data reliably.
+        
+        This is the main sending interface.
+        
+        Raises:
+            TimeoutError: the receiver stopped answering
+        """
+        with self.buffer_lock:
+            self.engine = SelectiveRepeatSender(
+                data, congestion=make_congestion(self.congestion, self.window_size),
+                rtt=self.rtt_estimator, first_seq=self.next_seq)
+        
+        while True:
+            self._check_timeouts()
+            with self.wakeup:
+                if self.engine.done:
+                    break
+                if not self.engine.can_send():
+                    deadline = self.engine.next_deadline()
+                    wait = INITIAL_TIMEOUT if deadline is None else deadline - time.monotonic()
+                    self.wakeup.wait(max(0.0, wait))
+        
+        self.stats["fast_retransmits"] += self.engine.stats["fast_retransmits"]
+        self.stats["timeouts"] += self.engine.stats["timeouts"]
+        self.base = self.next_seq = self.engine.end_seq
+    
+    def _send_fin(self):
+        """Send FIN after the data; give up quietly after MAX_RETRIES."""
+        with self.wakeup:
+            self.fin_seq = self.next_seq
+            self.fin_acked = False
+        fin = Packet(seq_num=self.next_seq, ack_num=0, flags=Flags.FIN, window=0, payload=b'')
+        for attempt in range(MAX_RETRIES + 1):
+            self._send_packet(fin, retransmit=attempt > 0)
+            with self.wakeup:
+                self.wakeup.wait_for(lambda: self.fin_acked, timeout=self.rtt_estimator.get_timeout())
+                if self.fin_acked:
+                    return
+        # All data was acknowledged already: a lost FIN/ACK costs nothing
+        print("FIN not acknowledged, closing anyway")
+    
+    def send_file(self, filepath: str) -> dict:
+        """
+        Send a file reliably.
+        
+        Returns:
+            Transfer statistics including SHA-256 hash
+        """
+        with open(filepath, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content)
+        
+        started = time.monotonic()
+        self.send_data(FILE_META.pack(len(content), digest.digest()) + content)
+        elapsed = time.monotonic() - started
+        
+        return {
+            **self.get_stats(),
+            "file_size": len(content),
+            "sha256": digest.hexdigest(),
+            "time": elapsed,
+            "throughput": len(content) / 1024 / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def get_stats(self) -> dict:
+        """Get transfer statistics."""
+        return {
+            **self.stats,
+            "loss_simulation": loss_simulator.get_stats()
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RELIABLE_RECEIVER
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ReliableReceiver:
+    """
+    Reliable UDP receiver.
+    """
+    
+    def __init__(self, port: int = DEFAULT_PORT):
+        self.port = port
+        self.socket: Optional[socket.socket] = None
+        
+        # Receiver state
+        self.expected_seq = 0      # Next expected sequence number
+        self.recv_window = RECV_WINDOW
+        
+        # Buffer for out-of-order packets (SelectiveRepeatReceiver.buffer)
+        self.engine: Optional[SelectiveRepeatReceiver] = None
+        
+        # Received data
+        self.received_data = bytearray()
+        
+        # Statistics
+        self.stats = {
+            "packets_received": 0,
+            "bytes_received": 0,
+            "acks_sent": 0,
+            "out_of_order": 0,
+            "duplicates": 0
+        }
+        
+        self.running = False
+    
+    def start(self):
+        """Start receiver."""
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('0.0.0.0', self.port))
+        self.running = True
+        
+        print(f"Receiver listening on port {self.port}")
+    
+    def stop(self):
+        """Stop receiver."""
+        self.running = False
+        if self.socket:
+            self.socket.close()
+    
+    def _send_ack(self, ack_num: int, dest_addr: tuple, seq_num: int = 0, sack: bytes = b''):
+        """Send ACK for received packet (seq_num echoes it, sack = SACK blocks)."""
+        # Apply packet loss simulation to ACKs too
+        if loss_simulator.should_drop():
+            print(f"[SIM] Dropped ACK for seq={ack_num}")
+            return
+        
+        ack_packet = Packet(
+            seq_num=seq_num,
+            ack_num=ack_num,
+            flags=Flags.ACK,
+            window=self.recv_window,
+            payload=sack
+        )
+        
+        self.socket.sendto(ack_packet.to_bytes(), dest_addr)
+        self.stats["acks_sent"] += 1
+    
+    def receive_data(self, timeout: float = 30.0) -> bytes:
+        """
+        Receive data reliably.
+        
+        Returns:
+            Complete received data, once the sender's FIN arrives
+        
+        Raises:
+            TimeoutError: nothing arrived for timeout seconds
+        """
+        self.engine = SelectiveRepeatReceiver(self.expected_seq, self.recv_window)
+        self.socket.settimeout(timeout)
+        
+        while self.running:
+            try:
+                data, addr = self.socket.recvfrom(HEADER_SIZE + CHUNK_SIZE)
+            except socket.timeout:
+                raise TimeoutError(f"No packets for {timeout:.0f}s") from None
+            packet = Packet.from_bytes(data)
+            if packet is None:
+                continue  # corrupted: the sender's timer or SACKs recover it
+            
+            if packet.is_fin():
+                if packet.seq_num == self.engine.expected:
+                    self._send_ack(packet.seq_num + 1, addr, packet.seq_num)
+                    break
+            elif packet.is_data():
+                self.stats["packets_received"] += 1
+                ack = self.engine.on_data(packet)
+                self._send_ack(ack.ack_num, addr, ack.seq_num, ack.payload)
+                self.received_data += self.engine.take()
+        
+        self.expected_seq = self.engine.expected
+        self.stats["bytes_received"] = len(self.received_data)
+        self.stats["out_of_order"] = self.engine.stats["out_of_order"]
+        self.stats["duplicates"] = self.engine.stats["duplicates"]
+        return bytes(self.received_data)
+    
+    def receive_file(self, output_path: str, timeout: float = 60.0) -> dict:
+        """
+        Receive a file reliably.
+        
+        Returns:
+            Transfer statistics including verification result
+        """
+        data = self.receive_data(timeout)
+        if len(data) < FILE_META.size:
+            raise ValueError(f"Transfer of {len(data)} bytes has no file header")
+        size, expected = FILE_META.unpack_from(data)
+        content = data[FILE_META.size:]
+        digest = hashlib.sha256(content)
+        
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        
+        return {
+            **self.stats,
+            "file_size": len(content),
+            "sha256": digest.hexdigest(),
+            "verified": len(content) == size and digest.digest() == expected
+        }
+    
+    def get_stats(self) -> dict:
+        """Get reception statistics."""
+        return self.stats
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LINK_SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def simulate_transfer(size: int = 1 << 20, loss_rate: float = 0.0, rtt: float = 0.1,
+                      bandwidth: float = 1000.0, queue: int = 64, congestion: str = "cubic",
+                      window: int = WINDOW_SIZE, seed: int = 1,
+                      time_limit: float = 3600.0) -> dict:
+    """
+    Transfer size bytes between the selective-repeat engines in virtual time.
+    
+    The data path is a bottleneck of `bandwidth` packets/s with a FIFO of
+    `queue` packets (tail drop) and rtt/2 propagation delay each way; on
+    top of that PacketLossSimulator drops data and ACKs at loss_rate.
+    Nothing sleeps, so a minute-long transfer simulates in about a second.
+    
+    Returns:
+        loss_rate, throughput (goodput in KB/s), retransmissions and time
+        as analyze_performance() expects, plus detail counters
+    """
+    rng = random.Random(seed)
+    data_loss = PacketLossSimulator(loss_rate, random.Random(rng.random()))
+    ack_loss = PacketLossSimulator(loss_rate, random.Random(rng.random()))
+    pattern = bytes(rng.getrandbits(8) for _ in range(4093))  # prime length: no two chunks alike
+    data = (pattern * (size // len(pattern) + 1))[:size]
+    
+    sender = SelectiveRepeatSender(data, congestion=make_congestion(congestion, window))
+    receiver = SelectiveRepeatReceiver()
+    delay = rtt / 2
+    events: list = []          # (arrival time, tie-break, packet, to_receiver)
+    counter = itertools.count()
+    link_free = 0.0
+    queue_drops = 0
+    delivered: List[bytes] = []
+    
+    def transmit(packets: List[Tuple[Packet, bool]], now: float):
+        nonlocal link_free, queue_drops
+        for packet, _ in packets:
+            if data_loss.should_drop():
+                continue
+            start = max(now, link_free)
+            if (start - now) * bandwidth >= queue:
+                queue_drops += 1
+                continue
+            link_free = start + 1.0 / bandwidth
+            heapq.heappush(events, (link_free + delay, next(counter), packet, True))
+    
+    now = 0.0
+    aborted = False
+    try:
+        transmit(sender.poll(now), now)
+        while not sender.done and now < time_limit:
+            deadline = sender.next_deadline()
+            if events and (deadline is None or events[0][0] <= deadline):
+                now, _, packet, to_receiver = heapq.heappop(events)
+                if to_receiver:
+                    ack = receiver.on_data(packet)
+                    delivered.append(receiver.take())
+                    if not ack_loss.should_drop():
+                        heapq.heappush(events, (now + delay, next(counter), ack, False))
+                    continue
+                sender.on_ack(packet, now)
+            elif deadline is not None:
+                now = deadline
+            else:
+                raise RuntimeError("Simulation stalled: nothing in flight, nothing to send")
+            transmit(sender.poll(now), now)
+    except TimeoutError:
+        aborted = True
+    
+    received = b''.join(delivered)
+    stats = sender.stats
+    return {
+        "loss_rate": loss_rate,
+        "rtt": rtt,
+        "congestion": congestion,
+        "complete": sender.done and received == data,
+        "aborted": aborted,
+        "time": now,
+        "throughput": len(received) / max(now, 1e-9) / 1024,
+        "segments": sender.end_seq,
+        "transmissions": stats["transmissions"],
+        "retransmissions": stats["retransmissions"],
+        "retransmit_ratio": stats["retransmissions"] / max(1, sender.end_seq),
+        "fast_retransmits": stats["fast_retransmits"],
+        "timeouts": stats["timeouts"],
+        "queue_drops": queue_drops,
+        "random_drops": data_loss.packets_dropped + ack_loss.packets_dropped,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_FUNCTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_packet_serialization():
+    """Test packet serialization and deserialization."""
+    packet = Packet(
+        seq_num=12345,
+        ack_num=0,
+        flags=Flags.DATA,
+        window=WINDOW_SIZE,
+        payload=b"Hello, reliable UDP!"
+    )
+    
+    data = packet.to_bytes()
+    recovered = Packet.from_bytes(data)
+    
+    assert recovered is not None, "Deserialization returned None"
+    assert recovered.seq_num == packet.seq_num
+    assert recovered.ack_num == packet.ack_num
+    assert recovered.flags == packet.flags
+    assert recovered.payload == packet.payload
+    
+    print("Packet serialization test passed!")
+
+
+def test_checksum_corruption():
+    """Test that corrupted packets are detected."""
+    packet = Packet(
+        seq_num=1,
+        ack_num=0,
+        flags=Flags.DATA,
+        window=4,
+        payload=b"Test data"
+    )
+    
+    data = bytearray(packet.to_bytes())
+    
+    # Corrupt one byte
+    data[5] ^= 0xFF
+    
+    recovered = Packet.from_bytes(bytes(data))
+    assert recovered is None, "Corrupted packet should return None"
+    
+    print("Checksum corruption test passed!")
+
+
+def test_rtt_estimation():
+    """Test RTT estimation."""
+    estimator = RTTEstimator(initial_rtt=1.0)
+    
+    # Simulate some RTT samples
+    samples = [0.8, 0.9, 1.1, 0.95, 1.0]
+    
+    for sample in samples:
+        estimator.update(sample)
+        timeout = estimator.get_timeout()
+        print(f"  Sample: {sample:.2f}s -> Timeout: {timeout:.2f}s")
+    
+    # Timeout should be reasonable (not too high or low)
+    final_timeout = estimator.get_timeout()
+    assert 0.5 < final_timeout < 5.0, f"Timeout {final_timeout} seems unreasonable"
+    
+    print("RTT estimation test passed!")
+
+
+def test_simulated_transfer():
+    """Test selective repeat over the simulated lossy link."""
+    for congestion in CONGESTION_CONTROLS:
+        result = simulate_transfer(size=200_000, loss_rate=0.1, rtt=0.05, congestion=congestion)
+        assert result["complete"], f"{congestion}: data corrupted or incomplete"
+        print(f"  {congestion:<6} {result['throughput']:8.1f} KB/s, "
+              f"{result['retransmissions']} retransmissions")
+    
+    print("Simulated transfer test passed!")
+
+
+def test_local_transfer():
+    """Test local transfer (requires running receiver)."""
+    print("\nStarting local transfer test...")
+    print("Note: Start receiver first: python hw_4_02.py receiver")
+    
+    sender = ReliableSender('localhost')
+    sender.connect()
+    
+    try:
+        test_data = b"Hello, this is a test of reliable UDP transfer! " * 100
+        print(f"Sending {len(test_data)} bytes...")
+        
+        sender.send_data(test_data)
+        
+        print("Transfer complete!")
+        print(f"Statistics: {sender.get_stats()}")
+        
+    finally:
+        sender.disconnect()
+
+
+def test_with_loss(loss_rate: float = 0.1):
+    """Test transfer with simulated packet loss."""
+    global loss_simulator
+    loss_simulator = PacketLossSimulator(loss_rate=loss_rate)
+    
+    print(f"\nTesting with {loss_rate*100:.0f}% packet loss...")
+    test_local_transfer()
+    
+    print(f"\nLoss simulation stats: {loss_simulator.get_stats()}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PERFORMANCE_ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def analyze_performance(results: list[dict]) -> None:
+    """
+    Analyse and display performance results.
+    
+    Args:
+        results: List of test results with different loss rates
+    """
+    print("\n" + "=" * 60)
+    print("Performance Analysis")
+    print("=" * 60)
+    
+    print(f"{'Loss Rate':>12} {'Throughput':>12} {'Retrans':>12} {'Time':>12}")
+    print("-" * 60)
+    
+    for r in results:
+        print(f"{r['loss_rate']*100:>10.0f}% "
+              f"{r['throughput']:>10.2f} KB/s "
+              f"{r['retransmissions']:>10} "
+              f"{r['time']:>10.2f}s")
+    
+    print("=" * 60)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    """Main entry point."""
+    import sys
+    
+    if len(sys.argv) < 2:
+        print("Usage: python hw_4_02.py <sender|receiver|test|benchmark>")
+        print("")
+        print("Commands:")
+        print("  sender [host] [file]  - Send data/file to receiver")
+        print("  receiver [output]     - Receive data/file")
+        print("  test                  - Run unit tests")
+        print("  benchmark             - Run performance benchmark")
+        sys.exit(1)
+    
+    command = sys.argv[1]
+    
+    if command == "sender":
+        host = sys.argv[2] if len(sys.argv) > 2 else 'localhost'
+        filepath = sys.argv[3] if len(sys.argv) > 3 else None
+        
+        sender = ReliableSender(host)
+        sender.connect()
+        
+        try:
+            if filepath:
+                print(f"Sending file: {filepath}")
+                stats = sender.send_file(filepath)
+                print(f"File transfer statistics: {stats}")
+            else:
+                # Interactive mode
+                print("Enter data to send (Ctrl+D to finish):")
+                data = sys.stdin.buffer.read()
+                sender.send_data(data)
+                print(f"Statistics: {sender.get_stats()}")
+        finally:
+            sender.disconnect()
+    
+    elif command == "receiver":
+        output_path = sys.argv[2] if len(sys.argv) > 2 else None
+        
+        receiver = ReliableReceiver()
+        receiver.start()
+        
+        try:
+            if output_path:
+                print(f"Receiving file to: {output_path}")
+                stats = receiver.receive_file(output_path)
+                print(f"File reception statistics: {stats}")
+            else:
+                print("Receiving data...")
+                data = receiver.receive_data()
+                print(f"Received {len(data)} bytes")
+                print(f"Statistics: {receiver.get_stats()}")
+        except KeyboardInterrupt:
+            print("\nReceiver stopped.")
+        finally:
+            receiver.stop()
+    
+    elif command == "test":
+        print("Running unit tests...")
+        print("-" * 40)
+        
+        # Tests that don't require network
+        test_packet_serialization()
+        test_checksum_corruption()
+        test_rtt_estimation()
+        test_simulated_transfer()
+        
+        print("-" * 40)
+        print("For network tests, start receiver first.")
+    
+    elif command == "benchmark":
+        print("Running performance benchmark...")
+        print("Simulated link: 1 MiB, 100 ms RTT, 1000 packets/s bottleneck, CUBIC")
+        print("(scripts/benchmark_reliable_udp.py sweeps RTT and congestion control)")
+        
+        results = []
+        
+        for loss_rate in [0.0, 0.05, 0.10, 0.20, 0.30]:
+            print(f"Testing with {loss_rate*100:.0f}% loss...")
+            results.append(simulate_transfer(loss_rate=loss_rate))
+        
+        analyze_performance(results)
+    
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Binary Protocol Codec Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Measures messages per second for encoding and decoding binary protocol
+messages (src/utils/proto_common.py) at several payload sizes, without any
+sockets:
+
+    legacy   the original codec: struct.pack with a format string twice per
+             message, CRC over header + payload concatenated, and the header
+             repacked from the decoded BinHeader to validate
+    single   pack_bin_message / unpack_bin_header + validate_bin_message
+    batch    pack_bin_messages / unpack_bin_messages + validate_bin_message
+             over --batch messages framed in one buffer
+
+Decoding includes CRC validation. Every variant must produce the same bytes
+and decode to the same messages.
+
+Usage:
+    python3 scripts/benchmark_codec.py
+    python3 scripts/benchmark_codec.py --sizes 16,1024 --budget 0.5 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from proto_common import (  # noqa: E402
+    BIN_HEADER_LEN, BIN_MAX_PAYLOAD, TYPE_PUT_REQ, BinHeader,
+    pack_bin_message, pack_bin_messages, unpack_bin_header, unpack_bin_messages,
+    validate_bin_message,
+)
+
+Message = Tuple[int, bytes, int]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LEGACY_CODEC
+# ═══════════════════════════════════════════════════════════════════════════════
+def legacy_pack(mtype: int, payload: bytes, seq: int) -> bytes:
+    header_wo_crc = struct.pack("!2sBBHI", b"NP", 1, mtype, len(payload), seq)
+    msg_crc = zlib.crc32(header_wo_crc + payload) & 0xFFFFFFFF
+    header = struct.pack("!2sBBHII", b"NP", 1, mtype, len(payload), seq, msg_crc)
+    return header + payload
+
+
+def legacy_decode(data: bytes) -> List[Message]:
+    out = []
+    offset = 0
+    while offset < len(data):
+        magic, ver, mtype, plen, seq, msg_crc = struct.unpack("!2sBBHII", data[offset:offset + BIN_HEADER_LEN])
+        header = BinHeader(magic=magic, version=ver, mtype=mtype, payload_len=plen, seq=seq, crc=msg_crc)
+        payload = data[offset + BIN_HEADER_LEN:offset + BIN_HEADER_LEN + plen]
+        header_wo_crc = struct.pack("!2sBBHI", header.magic, header.version, header.mtype,
+                                    header.payload_len, header.seq)
+        if zlib.crc32(header_wo_crc + payload) & 0xFFFFFFFF != header.crc:
+            raise ValueError("CRC mismatch")
+        out.append((header.mtype, payload, header.seq))
+        offset += BIN_HEADER_LEN + plen
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CODECS_UNDER_TEST
+# ═══════════════════════════════════════════════════════════════════════════════
+def single_encode(messages: List[Message]) -> bytes:
+    return b"".join([pack_bin_message(m, p, s) for m, p, s in messages])
+
+
+def single_decode(data: bytes) -> List[Message]:
+    out = []
+    offset = 0
+    while offset < len(data):
+        header = unpack_bin_header(data[offset:offset + BIN_HEADER_LEN])
+        payload = data[offset + BIN_HEADER_LEN:offset + BIN_HEADER_LEN + header.payload_len]
+        if not validate_bin_message(header, payload):
+            raise ValueError("CRC mismatch")
+        out.append((header.mtype, payload, header.seq))
+        offset += BIN_HEADER_LEN + header.payload_len
+    return out
+
+
+def batch_decode(data: bytes) -> List[Message]:
+    messages, _ = unpack_bin_messages(data)
+    out = []
+    for header, payload in messages:
+        if not validate_bin_message(header, payload):
+            raise ValueError("CRC mismatch")
+        out.append((header.mtype, payload, header.seq))
+    return out
+
+
+ENCODERS: Dict[str, Callable[[List[Message]], bytes]] = {
+    "legacy": lambda messages: b"".join([legacy_pack(m, p, s) for m, p, s in messages]),
+    "single": single_encode,
+    "batch": pack_bin_messages,
+}
+
+DECODERS: Dict[str, Callable[[bytes], List[Message]]] = {
+    "legacy": legacy_decode,
+    "single": single_decode,
+    "batch": batch_decode,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def rate(fn: Callable, arg, count: int, budget: float) -> float:
+    """Messages per second for fn(arg) handling `count` messages per call."""
+    fn(arg)
+    rounds = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < budget or rounds == 0:
+        fn(arg)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+    return rounds * count / elapsed
+
+
+def bench_size(size: int, batch: int, budget: float) -> Dict[str, object]:
+    payload = bytes(i & 0xFF for i in range(size))
+    messages = [(TYPE_PUT_REQ, payload, seq) for seq in range(batch)]
+    data = ENCODERS["legacy"](messages)
+    result: Dict[str, object] = {"payload": size, "batch": batch}
+    agree = True
+    for name, encode in ENCODERS.items():
+        agree &= encode(messages) == data
+        result[f"encode_{name}"] = round(rate(encode, messages, batch, budget))
+    for name, decode in DECODERS.items():
+        agree &= decode(data) == messages
+        result[f"decode_{name}"] = round(rate(decode, data, batch, budget))
+    result["agree"] = agree
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the binary protocol codec")
+    parser.add_argument("--sizes", default=f"16,1024,{BIN_MAX_PAYLOAD}",
+                        help="Comma-separated payload sizes (default: 16 B, 1 KB, 64 KB - 1)")
+    parser.add_argument("--batch", type=int, default=256, help="Messages per buffer (default: 256)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds per measurement (default: 1)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    if any(not 0 <= s <= BIN_MAX_PAYLOAD for s in sizes):
+        parser.error(f"payload sizes must be 0..{BIN_MAX_PAYLOAD}")
+    results = [bench_size(size, args.batch, args.budget) for size in sizes]
+
+    if args.json:
+        print(json.dumps({"results": results}, indent=2))
+        return 0
+
+    print(f"Messages per second, {args.batch} messages per buffer (decode includes CRC check)")
+    print(f"{'payload':>8} {'op':<7} {'legacy':>11} {'single':>11} {'batch':>11} {'speedup':>8}")
+    for r in results:
+        for op in ("encode", "decode"):
+            legacy, single, batch = (r[f"{op}_{name}"] for name in ("legacy", "single", "batch"))
+            print(f"{r['payload']:>8} {op:<7} {legacy:>11,} {single:>11,} {batch:>11,} "
+                  f"{batch / legacy:>7.2f}x")
+        if not r["agree"]:
+            print(f"{'':>8} MISMATCH between codecs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
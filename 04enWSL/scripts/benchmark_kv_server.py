@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Binary Protocol KV Server Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Starts src/apps/binary_proto_server.py on a loopback port for each server
+configuration and drives it with 1-64 concurrent clients running a mixed
+GET/PUT workload over a pre-populated keyspace. Each client is a thread
+with its own connection, one request in flight; client threads are spread
+over --procs processes so the load generator is not limited to one GIL.
+
+Configurations:
+    legacy   --workers 0 --shards 1   thread per connection, one global lock
+    sharded  --workers 0              thread per connection, sharded store
+    pool     (defaults)               selector + bounded worker pool, sharded store
+
+Reported per configuration and client count: operations per second and
+p50/p99 latency.
+
+Usage:
+    python3 scripts/benchmark_kv_server.py
+    python3 scripts/benchmark_kv_server.py --clients 1,8,64 --duration 3 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from binary_proto_client import BinaryClient  # noqa: E402
+
+SERVER = PROJECT_ROOT / "src" / "apps" / "binary_proto_server.py"
+
+CONFIGS: Dict[str, List[str]] = {
+    "legacy": ["--workers", "0", "--shards", "1"],
+    "sharded": ["--workers", "0"],
+    "pool": [],
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVER_PROCESS
+# ═══════════════════════════════════════════════════════════════════════════════
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD_GENERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+def client_thread(port: int, keys: int, get_ratio: float, start: float, stop: float,
+                  seed: int, out: List[float], errors: List[int]) -> None:
+    rng = random.Random(seed)
+    client = BinaryClient("127.0.0.1", port)
+    client.connect()
+    latencies = []
+    failed = 0
+    try:
+        while time.time() < start:
+            time.sleep(0.001)
+        while time.time() < stop:
+            key = f"key{rng.randrange(keys):06d}"
+            t0 = time.perf_counter()
+            try:
+                if rng.random() < get_ratio:
+                    client.get(key)
+                else:
+                    client.put(key, "value-" + key)
+            except Exception:
+                failed += 1
+                break
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        client.close()
+    out.extend(latencies)
+    errors.append(failed)
+
+
+def client_process(port: int, threads: int, keys: int, get_ratio: float, start: float,
+                   stop: float, seed: int, results: "multiprocessing.Queue") -> None:
+    latencies: List[float] = []
+    errors: List[int] = []
+    workers = [
+        threading.Thread(target=client_thread,
+                         args=(port, keys, get_ratio, start, stop, seed + i, latencies, errors))
+        for i in range(threads)
+    ]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    results.put((latencies, sum(errors)))
+
+
+def run_load(port: int, clients: int, procs: int, keys: int, get_ratio: float,
+             duration: float) -> Dict[str, float]:
+    procs = max(1, min(procs, clients))
+    start = time.time() + 0.5
+    stop = start + duration
+    results: "multiprocessing.Queue" = multiprocessing.Queue()
+    share = [clients // procs + (1 if i < clients % procs else 0) for i in range(procs)]
+    workers = [
+        multiprocessing.Process(target=client_process,
+                                args=(port, n, keys, get_ratio, start, stop, 1000 * i, results))
+        for i, n in enumerate(share)
+    ]
+    for p in workers:
+        p.start()
+    latencies: List[float] = []
+    errors = 0
+    for _ in workers:
+        lat, err = results.get()
+        latencies.extend(lat)
+        errors += err
+    for p in workers:
+        p.join()
+
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        if not latencies:
+            return 0.0
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e6, 1)
+
+    return {
+        "ops_s": round(len(latencies) / duration),
+        "p50_us": pct(0.50),
+        "p99_us": pct(0.99),
+        "errors": errors,
+    }
+
+
+def bench_config(name: str, extra: List[str], client_counts: List[int], procs: int,
+                 keys: int, get_ratio: float, duration: float) -> Dict[int, Dict[str, float]]:
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER), "--host", "127.0.0.1", "--port", str(port),
+         "--backlog", "256", *extra],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        loader = BinaryClient("127.0.0.1", port)
+        loader.connect()
+        for i in range(keys):
+            loader.put(f"key{i:06d}", f"value-key{i:06d}")
+        loader.close()
+        return {n: run_load(port, n, procs, keys, get_ratio, duration) for n in client_counts}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the binary protocol KV server")
+    parser.add_argument("--clients", default="1,4,16,64", help="Comma-separated client counts")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help="Comma-separated configurations")
+    parser.add_argument("--procs", type=int, default=os.cpu_count() or 1,
+                        help="Load generator processes (default: CPU count)")
+    parser.add_argument("--keys", type=int, default=1000, help="Keyspace size (default: 1000)")
+    parser.add_argument("--get-ratio", type=float, default=0.8, help="Fraction of GETs (default: 0.8)")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds per run (default: 2)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    client_counts = [int(n) for n in args.clients.split(",") if n.strip()]
+    results: Dict[str, Dict[int, Dict[str, float]]] = {}
+    for name in (c.strip() for c in args.configs.split(",") if c.strip()):
+        if name not in CONFIGS:
+            parser.error(f"unknown configuration: {name}")
+        results[name] = bench_config(name, CONFIGS[name], client_counts, args.procs,
+                                     args.keys, args.get_ratio, args.duration)
+
+    if args.json:
+        print(json.dumps({"get_ratio": args.get_ratio, "keys": args.keys,
+                          "duration_s": args.duration, "results": results}, indent=2))
+        return 0
+
+    print(f"GET/PUT {args.get_ratio:.0%}/{1 - args.get_ratio:.0%}, {args.keys} keys, "
+          f"{args.duration:.0f}s per run, {args.procs} load process(es)")
+    print(f"{'config':<9} {'clients':>7} {'ops/s':>9} {'p50 us':>9} {'p99 us':>9} {'errors':>7}")
+    for name, runs in results.items():
+        for n, r in runs.items():
+            print(f"{name:<9} {n:>7} {r['ops_s']:>9,} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f} "
+                  f"{r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Binary Protocol Pipelining Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Starts src/apps/binary_proto_server.py on a loopback port and measures
+operations per second on ONE connection as a function of pipeline depth
+(requests in flight). Depth 1 with BinaryClient is the original
+request-response loop; PipelinedClient is run at each --depths value with
+its bulk API (put_many / get_many).
+
+Usage:
+    python3 scripts/benchmark_pipeline.py
+    python3 scripts/benchmark_pipeline.py --ops 50000 --depths 1,16,256 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from binary_proto_client import BinaryClient, PipelinedClient  # noqa: E402
+
+SERVER = PROJECT_ROOT / "src" / "apps" / "binary_proto_server.py"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVER_PROCESS
+# ═══════════════════════════════════════════════════════════════════════════════
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_sync(port: int, ops: int) -> Dict[str, float]:
+    client = BinaryClient("127.0.0.1", port)
+    client.connect()
+    try:
+        started = time.perf_counter()
+        for i in range(ops // 2):
+            client.put(f"key{i:07d}", "value")
+        for i in range(ops // 2):
+            client.get(f"key{i:07d}")
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+    return {"ops_s": round(ops / elapsed), "seconds": round(elapsed, 3)}
+
+
+def bench_pipelined(port: int, ops: int, depth: int) -> Dict[str, float]:
+    client = PipelinedClient("127.0.0.1", port)
+    client.connect()
+    try:
+        items = [(f"key{i:07d}", "value") for i in range(ops // 2)]
+        keys = [k for k, _ in items]
+        started = time.perf_counter()
+        ok = all(client.put_many(items, depth=depth))
+        values = client.get_many(keys, depth=depth)
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+    return {"ops_s": round(ops / elapsed), "seconds": round(elapsed, 3),
+            "ok": ok and values == ["value"] * len(keys)}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipelined binary protocol requests")
+    parser.add_argument("--ops", type=int, default=40000, help="Operations per run, half PUT half GET")
+    parser.add_argument("--depths", default="1,2,4,8,16,32,64,128,256", help="Comma-separated depths")
+    parser.add_argument("--server-args", default="", help="Extra arguments for the server")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    depths: List[int] = [int(d) for d in args.depths.split(",") if d.strip()]
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER), "--host", "127.0.0.1", "--port", str(port),
+         *args.server_args.split()],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        wait_for_port(port)
+        results["sync"] = bench_sync(port, args.ops)
+        for depth in depths:
+            results[f"depth {depth}"] = bench_pipelined(port, args.ops, depth)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps({"ops": args.ops, "results": results}, indent=2))
+        return 0
+
+    base = results["sync"]["ops_s"]
+    print(f"{args.ops} operations (PUT then GET) on one connection")
+    print(f"{'client':<12} {'ops/s':>9} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['ops_s']:>9,} {r['ops_s'] / base:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
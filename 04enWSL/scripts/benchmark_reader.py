@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Socket Reader Throughput Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Streams messages through a socket pair (a writer thread sends them in
+64 KiB writes) and measures how fast each reader takes them apart:
+
+    line     newline-terminated lines
+             old: io_utils.recv_line (one recv() per byte)
+             new: BufferedSocketReader.read_line
+    framed   2-byte big-endian length + payload
+             old: io_utils.recv_exact for the length, then for the payload
+             new: BufferedSocketReader.read_frame
+    text     the text protocol server's "<LEN> <PAYLOAD>" frames
+             old: text_proto_server.recv_framed(conn)
+             new: text_proto_server.recv_framed(conn, reader)
+
+Usage:
+    python3 scripts/benchmark_reader.py
+    python3 scripts/benchmark_reader.py --messages 50000 --size 256 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from io_utils import BufferedSocketReader, recv_exact, recv_line  # noqa: E402
+from text_proto_server import recv_framed  # noqa: E402
+
+CHUNK = 64 * 1024
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKLOADS
+# ═══════════════════════════════════════════════════════════════════════════════
+def encode_stream(workload: str, payload: bytes, count: int) -> bytes:
+    if workload == "line":
+        return (payload + b"\n") * count
+    if workload == "framed":
+        return (len(payload).to_bytes(2, "big") + payload) * count
+    return (f"{len(payload)} ".encode() + payload) * count
+
+
+def old_reader(workload: str, sock: socket.socket) -> Callable[[], object]:
+    if workload == "line":
+        return lambda: recv_line(sock)
+    if workload == "framed":
+        return lambda: recv_exact(sock, int.from_bytes(recv_exact(sock, 2), "big"))
+    return lambda: recv_framed(sock)
+
+
+def new_reader(workload: str, sock: socket.socket) -> Callable[[], object]:
+    reader = BufferedSocketReader(sock)
+    if workload == "line":
+        return reader.read_line
+    if workload == "framed":
+        return reader.read_frame
+    return lambda: recv_framed(sock, reader)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def run(workload: str, make_reader: Callable, payload: bytes, count: int) -> Dict[str, float]:
+    data = encode_stream(workload, payload, count)
+    writer, receiver = socket.socketpair()
+
+    def send() -> None:
+        view = memoryview(data)
+        for pos in range(0, len(view), CHUNK):
+            writer.sendall(view[pos:pos + CHUNK])
+
+    try:
+        read = make_reader(workload, receiver)
+        sender = threading.Thread(target=send, daemon=True)
+        started = time.perf_counter()
+        sender.start()
+        first = read()
+        for _ in range(count - 1):
+            read()
+        elapsed = time.perf_counter() - started
+        sender.join()
+    finally:
+        writer.close()
+        receiver.close()
+    expected = payload.decode() if isinstance(first, str) else payload
+    return {
+        "msgs_s": round(count / elapsed),
+        "mb_s": round(len(data) / elapsed / 1e6, 1),
+        "ok": first == expected,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark old and buffered socket readers")
+    parser.add_argument("--messages", type=int, default=20000, help="Messages per run (default: 20000)")
+    parser.add_argument("--size", type=int, default=64, help="Payload bytes per message (default: 64)")
+    parser.add_argument("--workloads", default="line,framed,text", help="Comma-separated workloads")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    payload = b"x" * args.size
+    workloads: List[str] = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for workload in workloads:
+        if workload not in ("line", "framed", "text"):
+            parser.error(f"unknown workload: {workload}")
+        results[workload] = {
+            "old": run(workload, old_reader, payload, args.messages),
+            "new": run(workload, new_reader, payload, args.messages),
+        }
+
+    if args.json:
+        print(json.dumps({"messages": args.messages, "size": args.size, "results": results}, indent=2))
+        return 0
+
+    print(f"{args.messages} messages of {args.size} B over a socket pair")
+    print(f"{'workload':<9} {'reader':<6} {'msgs/s':>11} {'MB/s':>8} {'speedup':>8}")
+    for workload, runs in results.items():
+        base = runs["old"]["msgs_s"]
+        for name, r in runs.items():
+            flag = "" if r["ok"] else "  MISMATCH"
+            print(f"{workload:<9} {name:<6} {r['msgs_s']:>11,} {r['mb_s']:>8} "
+                  f"{r['msgs_s'] / base:>7.1f}x{flag}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Reliable UDP Transfer Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Runs the selective-repeat engine of the homework 4.2 reference solution
+(homework/solutions/hw_4_02_reliable_udp_transfer_solution.py) over its
+simulated link: a bottleneck of --bandwidth packets/s with a --queue
+packet FIFO, plus random loss of data and ACKs from PacketLossSimulator.
+Everything runs in virtual time, so long transfers at high RTT take seconds.
+
+For every loss rate x RTT x congestion control it reports goodput (KB/s
+of data delivered in order), the retransmission ratio (retransmitted
+packets per data packet) and how many losses were found by SACK versus
+by a retransmission timeout. Results are averaged over --seeds runs.
+
+    fixed   constant window of WINDOW_SIZE (4) packets, the assignment baseline
+    aimd    Reno-style slow start, +1 packet per RTT, halve on loss
+    cubic   CUBIC-like growth from the window of the last loss
+
+It also times one retransmission-timer check with N packets in flight:
+a scan of the send buffer (the original _check_timeouts design) against
+the timer wheel the engine uses.
+
+Usage:
+    python3 scripts/benchmark_reliable_udp.py
+    python3 scripts/benchmark_reliable_udp.py --loss 0,0.02 --rtt 50 --size 4194304 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from homework.solutions.hw_4_02_reliable_udp_transfer_solution import (  # noqa: E402
+    CONGESTION_CONTROLS,
+    TimerWheel,
+    simulate_transfer,
+)
+
+TIMER_SIZES = [64, 512, 4096]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def run(size: int, loss: float, rtt: float, congestion: str, bandwidth: float,
+        queue: int, seeds: int) -> Dict[str, float]:
+    runs = [simulate_transfer(size=size, loss_rate=loss, rtt=rtt, bandwidth=bandwidth,
+                              queue=queue, congestion=congestion, seed=seed)
+            for seed in range(1, seeds + 1)]
+
+    def mean(key: str) -> float:
+        return sum(r[key] for r in runs) / len(runs)
+
+    return {
+        "goodput_kbps": round(mean("throughput"), 1),
+        "retransmit_ratio": round(mean("retransmit_ratio"), 3),
+        "time_s": round(mean("time"), 2),
+        "sack_losses": round(mean("fast_retransmits"), 1),
+        "timeouts": round(mean("timeouts"), 1),
+        "queue_drops": round(mean("queue_drops"), 1),
+        "complete": all(r["complete"] for r in runs),
+    }
+
+
+def time_timer_checks(in_flight: int, rounds: int = 2000) -> Dict[str, float]:
+    """Microseconds per timeout check with in_flight packets outstanding."""
+    now = 1000.0
+    rto = 0.5
+    buffer = {seq: now + seq * 1e-4 for seq in range(in_flight)}   # seq -> send time
+    started = time.perf_counter()
+    for i in range(rounds):
+        t = now + i * 1e-4
+        expired = [seq for seq, sent in buffer.items() if t - sent > rto]
+        assert not expired
+    scan = (time.perf_counter() - started) / rounds
+
+    wheel = TimerWheel(start=now)
+    for seq in range(in_flight):
+        wheel.schedule(seq, rto)
+    started = time.perf_counter()
+    for i in range(rounds):
+        # Each round: one ACK cancels a timer, its replacement is armed, tick
+        wheel.cancel(i % in_flight)
+        wheel.schedule(i % in_flight, rto)
+        wheel.advance(now + i * 1e-4)
+    wheel_s = (time.perf_counter() - started) / rounds
+    return {"scan_us": round(scan * 1e6, 2), "wheel_us": round(wheel_s * 1e6, 2)}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark selective repeat with SACK over a simulated lossy link")
+    parser.add_argument("--size", type=int, default=1 << 20, help="Bytes per transfer (default: 1 MiB)")
+    parser.add_argument("--loss", default="0,0.01,0.05,0.1", help="Comma-separated loss rates (default: 0,1%%,5%%,10%%)")
+    parser.add_argument("--rtt", default="20,100,300", help="Comma-separated RTTs in ms (default: 20,100,300)")
+    parser.add_argument("--cc", default=",".join(CONGESTION_CONTROLS), help="Congestion controls to compare")
+    parser.add_argument("--bandwidth", type=float, default=1000.0,
+                        help="Bottleneck rate in packets/s of 1 KiB (default: 1000)")
+    parser.add_argument("--queue", type=int, default=64, help="Bottleneck queue in packets (default: 64)")
+    parser.add_argument("--seeds", type=int, default=3, help="Runs averaged per setting (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    losses = [float(x) for x in args.loss.split(",") if x.strip()]
+    rtts = [float(x) / 1000 for x in args.rtt.split(",") if x.strip()]
+    controls: List[str] = [name.strip() for name in args.cc.split(",") if name.strip()]
+    for name in controls:
+        if name not in CONGESTION_CONTROLS:
+            parser.error(f"unknown congestion control: {name}")
+    if args.seeds < 1 or args.size < 1:
+        parser.error("--seeds and --size must be >= 1")
+
+    results = []
+    for rtt in rtts:
+        for loss in losses:
+            for name in controls:
+                results.append({"rtt_ms": rtt * 1000, "loss": loss, "cc": name,
+                                **run(args.size, loss, rtt, name, args.bandwidth, args.queue, args.seeds)})
+    timers = {n: time_timer_checks(n) for n in TIMER_SIZES}
+
+    if args.json:
+        print(json.dumps({"size": args.size, "bandwidth": args.bandwidth, "queue": args.queue,
+                          "seeds": args.seeds, "results": results, "timer_check": timers}, indent=2))
+        return 0
+
+    print(f"{args.size:,} bytes over {args.bandwidth:g} packets/s, queue {args.queue}, "
+          f"{args.seeds} seed(s) per setting")
+    print(f"{'rtt ms':>6} {'loss':>5} {'cc':<6} {'KB/s':>7} {'retx':>6} {'sack':>6} {'rto':>6} "
+          f"{'qdrop':>6} {'time s':>7}")
+    for r in results:
+        flag = "" if r["complete"] else "  incomplete"
+        print(f"{r['rtt_ms']:>6g} {r['loss'] * 100:>4g}% {r['cc']:<6} {r['goodput_kbps']:>7} "
+              f"{r['retransmit_ratio']:>6} {r['sack_losses']:>6} {r['timeouts']:>6} "
+              f"{r['queue_drops']:>6} {r['time_s']:>7}{flag}")
+    print("\nTimeout check per call (µs):")
+    for n, t in timers.items():
+        print(f"  {n:>5} in flight: buffer scan {t['scan_us']:>8}   timer wheel {t['wheel_us']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Sensor Statistics Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Feeds synthetic readings (a daily cycle plus noise per sensor) into the
+UDP sensor server's per-sensor aggregate and compares:
+
+    legacy   the original SensorStats: every reading appended to a list,
+             avg/min/max (and here the quantiles) recomputed from the list
+    stream   udp_sensor_server.SensorStats: Welford mean/variance, P²
+             quantiles and a bucketed time window in constant memory
+
+For each size it reports ingest rate (readings/s), the time to produce one
+statistics report for all sensors, the memory held by the aggregates
+(a walk of the objects each one keeps) and the largest quantile error against the exact value.
+
+Usage:
+    python3 scripts/benchmark_sensor_stats.py
+    python3 scripts/benchmark_sensor_stats.py --readings 100000,1000000 --sensors 16 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import gc
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from udp_sensor_server import DEFAULT_QUANTILES, SensorStats  # noqa: E402
+
+Reading = Tuple[int, float, float]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LEGACY_AGGREGATE
+# ═══════════════════════════════════════════════════════════════════════════════
+class LegacySensorStats:
+    """The list-based SensorStats, extended with sorted-list quantiles."""
+
+    def __init__(self) -> None:
+        self.readings: List[float] = []
+        self.last_location = ""
+        self.last_reading = None
+
+    def add(self, temp: float, location: str, now: float) -> None:
+        self.readings.append(temp)
+        self.last_location = location
+        self.last_reading = datetime.now()
+
+    def report(self, now: float) -> tuple:
+        data = self.readings
+        ordered = sorted(data)
+        return (len(data), sum(data) / len(data), min(data), max(data),
+                [exact_quantile(ordered, q) for q in DEFAULT_QUANTILES])
+
+
+def stream_report(s: SensorStats, now: float) -> tuple:
+    return (s.count, s.avg, s.min_temp, s.max_temp,
+            [s.quantile(q) for q in DEFAULT_QUANTILES], s.window(now))
+
+
+def exact_quantile(ordered: List[float], p: float) -> float:
+    pos = p * (len(ordered) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKLOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+def synth_readings(count: int, sensors: int, rate: float, seed: int = 4) -> List[Reading]:
+    """(sensor_id, temp, monotonic time) arriving at `rate` readings/s in total."""
+    rng = random.Random(seed)
+    base = [rng.uniform(15.0, 25.0) for _ in range(sensors)]
+    out = []
+    for i in range(count):
+        t = i / rate
+        sensor = rng.randrange(sensors)
+        temp = base[sensor] + 4.0 * math.sin(2 * math.pi * t / 86400.0) + rng.gauss(0.0, 0.8)
+        out.append((sensor, temp, t))
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def retained_bytes(root: object) -> int:
+    """Bytes held by an aggregate: the object, its containers and their floats."""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (type, str, int)):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for name in getattr(type(obj), "__slots__", ()):
+            stack.append(getattr(obj, name, None))
+    return total
+
+
+def run(make: Callable[[], object], report: Callable, readings: List[Reading]) -> Tuple[Dict[str, float], dict]:
+    stats: dict = {}
+    for sensor, _, _ in readings:
+        if sensor not in stats:
+            stats[sensor] = make()
+    gc.collect()
+    started = time.perf_counter()
+    for sensor, temp, t in readings:
+        stats[sensor].add(temp, "Lab", t)
+    ingest = time.perf_counter() - started
+
+    now = readings[-1][2]
+    started = time.perf_counter()
+    for s in stats.values():
+        report(s, now)
+    report_s = time.perf_counter() - started
+    return {
+        "ingest_per_s": round(len(readings) / ingest),
+        "report_ms": round(report_s * 1000, 2),
+        "memory_kib": round(sum(retained_bytes(s) for s in stats.values()) / 1024, 1),
+    }, stats
+
+
+def quantile_error(legacy: dict, stream: dict) -> float:
+    """Largest |estimate - exact| over every sensor and tracked quantile (°C)."""
+    worst = 0.0
+    for sensor, old in legacy.items():
+        ordered = sorted(old.readings)
+        for q in DEFAULT_QUANTILES:
+            worst = max(worst, abs(stream[sensor].quantile(q) - exact_quantile(ordered, q)))
+    return worst
+
+
+def bench(count: int, sensors: int, rate: float) -> Dict[str, object]:
+    readings = synth_readings(count, sensors, rate)
+    legacy, legacy_stats = run(LegacySensorStats, LegacySensorStats.report, readings)
+    stream, stream_stats = run(SensorStats, stream_report, readings)
+    return {
+        "readings": count,
+        "legacy": legacy,
+        "stream": stream,
+        "max_quantile_error": round(quantile_error(legacy_stats, stream_stats), 4),
+        "max_mean_error": max(abs(stream_stats[k].avg - sum(v.readings) / len(v.readings))
+                              for k, v in legacy_stats.items()),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark list-based and streaming sensor statistics")
+    parser.add_argument("--readings", default="10000,100000,1000000",
+                        help="Comma-separated total readings per run (default: 10k,100k,1M)")
+    parser.add_argument("--sensors", type=int, default=8, help="Number of sensors (default: 8)")
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="Readings per second across all sensors, for timestamps (default: 100)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.readings.split(",") if c.strip()]
+    if args.sensors < 1 or any(c < args.sensors for c in counts):
+        parser.error("need at least one sensor and one reading per sensor")
+    results = [bench(count, args.sensors, args.rate) for count in counts]
+
+    if args.json:
+        print(json.dumps({"sensors": args.sensors, "results": results}, indent=2))
+        return 0
+
+    print(f"{args.sensors} sensors, quantiles {', '.join(f'p{q * 100:g}' for q in DEFAULT_QUANTILES)}")
+    print(f"{'readings':>10} {'stats':<7} {'ingest/s':>11} {'report ms':>10} {'memory KiB':>11}")
+    for r in results:
+        for name in ("legacy", "stream"):
+            m = r[name]
+            print(f"{r['readings']:>10,} {name:<7} {m['ingest_per_s']:>11,} "
+                  f"{m['report_ms']:>10} {m['memory_kib']:>11,}")
+        print(f"{'':>10} max quantile error {r['max_quantile_error']:.3f} °C, "
+              f"max mean error {r['max_mean_error']:.1e} °C")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+UDP Sensor Ingestion Benchmark
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Blasts sensor datagrams (scripts/udp_blaster.py, in a separate process)
+at a local socket and compares two receive loops feeding the same
+per-sensor statistics (udp_sensor_server.SensorStats):
+
+    legacy    the original server loop: recvfrom(1024), length check,
+              unpack_udp_sensor with format-string struct calls and the CRC
+              over a repacked header, one SensorStats.add per datagram
+    batched   udp_sensor_server.ingest_batch: io_utils.DatagramBatch drains
+              the socket into preallocated slots, unpack_udp_sensors decodes
+              the batch with iter_unpack, one add_many per sensor per batch
+
+For each loop it reports datagrams sent, received, dropped by the kernel
+(socket receive queue full, from /proc/net/udp) and the receive rate.
+
+Usage:
+    python3 scripts/benchmark_udp_ingest.py
+    python3 scripts/benchmark_udp_ingest.py --count 500000 --rate 50000 --rcvbuf 0 --json
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import multiprocessing
+import socket
+import struct
+import sys
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from io_utils import DatagramBatch, udp_drops  # noqa: E402
+from proto_common import UDP_LEN, UDP_SLOT  # noqa: E402
+from udp_sensor_server import DEFAULT_BATCH, DEFAULT_RCVBUF, SensorStats, ingest_batch  # noqa: E402
+from udp_blaster import blast  # noqa: E402
+
+IDLE = 0.5  # seconds without datagrams after the sender exits = done
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LEGACY_LOOP
+# ═══════════════════════════════════════════════════════════════════════════════
+def legacy_unpack(data: bytes) -> Tuple[int, int, float, str]:
+    ver, sensor_id, temp_c, loc_b, received_crc = struct.unpack("!BIf10sI", data)
+    base = struct.pack("!BIf10s", ver, sensor_id, temp_c, loc_b)
+    if zlib.crc32(base) & 0xFFFFFFFF != received_crc:
+        raise ValueError("CRC mismatch")
+    return ver, sensor_id, temp_c, loc_b.decode("utf-8", errors="replace").rstrip("\x00")
+
+
+def legacy_receive(sock: socket.socket, stats: Dict[int, SensorStats], batch: int,
+                   sender_alive: Callable[[], bool]) -> Tuple[int, int, float, float]:
+    sock.settimeout(IDLE)
+    received = valid = 0
+    first = last = 0.0
+    while True:
+        try:
+            data, _ = sock.recvfrom(1024)
+        except socket.timeout:
+            if not sender_alive():
+                break
+            continue
+        last = time.perf_counter()
+        if not received:
+            first = last
+        received += 1
+        if len(data) != UDP_LEN:
+            continue
+        try:
+            _, sensor_id, temp_c, location = legacy_unpack(data)
+        except ValueError:
+            continue
+        valid += 1
+        stats[sensor_id].add(temp_c, location)
+    return received, valid, first, last
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATCHED_LOOP
+# ═══════════════════════════════════════════════════════════════════════════════
+def batched_receive(sock: socket.socket, stats: Dict[int, SensorStats], batch: int,
+                    sender_alive: Callable[[], bool]) -> Tuple[int, int, float, float]:
+    receiver = DatagramBatch(sock, UDP_SLOT.size, batch)
+    received = valid = 0
+    first = last = 0.0
+    while True:
+        count = receiver.drain(IDLE)
+        if not count:
+            if not sender_alive():
+                break
+            continue
+        last = time.perf_counter()
+        if not received:
+            first = last
+        received += count
+        valid += ingest_batch(receiver, count, stats)[0]
+    return received, valid, first, last
+
+
+LOOPS: Dict[str, Callable] = {"legacy": legacy_receive, "batched": batched_receive}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def _sender(port: int, count: int, rate: float, sensors: int, results: multiprocessing.Queue) -> None:
+    results.put(blast("127.0.0.1", port, count=count, rate=rate, sensors=sensors))
+
+
+def run(loop: str, count: int, rate: float, sensors: int, batch: int, rcvbuf: int) -> Dict[str, float]:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if rcvbuf > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.bind(("127.0.0.1", 0))
+    results: multiprocessing.Queue = multiprocessing.Queue()
+    sender = multiprocessing.Process(target=_sender, args=(sock.getsockname()[1], count, rate, sensors, results))
+    stats: Dict[int, SensorStats] = defaultdict(SensorStats)
+    try:
+        sender.start()
+        received, valid, first, last = LOOPS[loop](sock, stats, batch, sender.is_alive)
+        drops = udp_drops(sock)
+        sent = results.get(timeout=10)
+        sender.join()
+    finally:
+        sock.close()
+    return {
+        "sent": sent["sent"],
+        "send_per_s": round(sent["sent"] / max(sent["elapsed"], 1e-9)),
+        "received": received,
+        "valid": valid,
+        "kernel_drops": drops,
+        "lost_pct": round(100.0 * (sent["sent"] - received) / max(sent["sent"], 1), 2),
+        "recv_per_s": round(received / (last - first)) if last > first else 0,
+        "counted": sum(s.count for s in stats.values()),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark legacy and batched UDP sensor ingestion")
+    parser.add_argument("--count", type=int, default=200000, help="Datagrams per run (default: 200000)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Send rate in datagrams/s, 0 = unlimited")
+    parser.add_argument("--sensors", type=int, default=16, help="Simulated sensors (default: 16)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help=f"Datagrams per drain for the batched loop (default: {DEFAULT_BATCH})")
+    parser.add_argument("--rcvbuf", type=int, default=DEFAULT_RCVBUF,
+                        help=f"SO_RCVBUF in bytes, 0 = system default (default: {DEFAULT_RCVBUF})")
+    parser.add_argument("--loops", default="legacy,batched", help="Comma-separated loops to run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    loops: List[str] = [name.strip() for name in args.loops.split(",") if name.strip()]
+    for name in loops:
+        if name not in LOOPS:
+            parser.error(f"unknown loop: {name}")
+    results = {name: run(name, args.count, args.rate, args.sensors, args.batch, args.rcvbuf) for name in loops}
+
+    if args.json:
+        print(json.dumps({"count": args.count, "rate": args.rate, "rcvbuf": args.rcvbuf,
+                          "results": results}, indent=2))
+        return 0
+
+    target = f"{args.rate:,.0f}/s" if args.rate > 0 else "unlimited"
+    print(f"{args.count:,} datagrams from {args.sensors} sensors, send rate {target}, "
+          f"SO_RCVBUF {args.rcvbuf or 'default'}")
+    print(f"{'loop':<8} {'sent':>9} {'sent/s':>9} {'received':>9} {'drops':>8} {'lost %':>7} {'recv/s':>9}")
+    for name, r in results.items():
+        drops = "n/a" if r["kernel_drops"] is None else f"{r['kernel_drops']:,}"
+        print(f"{name:<8} {r['sent']:>9,} {r['send_per_s']:>9,} {r['received']:>9,} {drops:>8} "
+              f"{r['lost_pct']:>7} {r['recv_per_s']:>9,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+UDP Sensor Blaster
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Load generator for the UDP sensor server: sends valid sensor datagrams
+(src/utils/proto_common.pack_udp_sensor) from many simulated sensors as
+fast as possible, or at a fixed rate, and reports how many were sent.
+
+Datagrams are packed once up front, so the send loop is one send() per
+datagram on a connected socket. Optionally a fraction of them is
+corrupted (bad CRC) to exercise the validation path.
+
+Usage:
+    python3 scripts/udp_blaster.py --port 5402 --count 200000
+    python3 scripts/udp_blaster.py --port 5402 --rate 20000 --duration 10 --sensors 64
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import json
+import random
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from proto_common import pack_udp_sensor  # noqa: E402
+
+VARIANTS = 4096  # distinct datagrams cycled by the send loop
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKLOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+def build_datagrams(sensors: int, corrupt: float = 0.0, seed: int = 7) -> List[bytes]:
+    """Pre-packed datagrams: sensors 1..N with plausible temperatures."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(VARIANTS):
+        sensor_id = i % sensors + 1
+        data = pack_udp_sensor(sensor_id, rng.gauss(21.0, 3.0), f"Room{sensor_id:04d}")
+        if rng.random() < corrupt:
+            data = data[:-1] + bytes([data[-1] ^ 0xFF])
+        out.append(data)
+    return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NETWORK_OPERATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+def blast(host: str, port: int, count: int = 0, duration: float = 0.0, rate: float = 0.0,
+          sensors: int = 16, corrupt: float = 0.0) -> Dict[str, float]:
+    """
+    Send until `count` datagrams or `duration` seconds (whichever is set
+    and reached first). rate = datagrams/s, 0 = as fast as possible.
+
+    Returns sent, failed (ENOBUFS and similar) and elapsed seconds.
+    """
+    if count <= 0 and duration <= 0:
+        raise ValueError("set count or duration")
+    datagrams = build_datagrams(sensors, corrupt)
+    limit = count if count > 0 else sys.maxsize
+    deadline = time.perf_counter() + duration if duration > 0 else float("inf")
+    burst = max(1, int(rate / 1000)) if rate > 0 else 256  # paced in ~1 ms bursts
+    sent = failed = 0
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect((host, port))
+        send = sock.send
+        started = time.perf_counter()
+        while sent + failed < limit:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if rate > 0:
+                ahead = (sent + failed) / rate - (now - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+            for i in range(sent + failed, min(sent + failed + burst, limit)):
+                try:
+                    send(datagrams[i % VARIANTS])
+                    sent += 1
+                except OSError:
+                    failed += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        sock.close()
+    return {"sent": sent, "failed": failed, "elapsed": elapsed}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Send UDP sensor datagrams at high rate")
+    parser.add_argument("--host", default="127.0.0.1", help="Server address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5402, help="Server UDP port (default: 5402)")
+    parser.add_argument("--count", type=int, default=0, help="Datagrams to send (default: 100000 if no --duration)")
+    parser.add_argument("--duration", type=float, default=0.0, help="Seconds to send for")
+    parser.add_argument("--rate", type=float, default=0.0, help="Datagrams per second, 0 = unlimited (default: 0)")
+    parser.add_argument("--sensors", type=int, default=16, help="Simulated sensors (default: 16)")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Fraction sent with a bad CRC (default: 0)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.sensors < 1 or not 0.0 <= args.corrupt <= 1.0:
+        parser.error("--sensors must be >= 1 and --corrupt in [0, 1]")
+    count = args.count if args.count > 0 or args.duration > 0 else 100000
+    result = blast(args.host, args.port, count, args.duration, args.rate, args.sensors, args.corrupt)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(f"[BLAST] {result['sent']:,} datagrams to {args.host}:{args.port} in {result['elapsed']:.2f}s "
+          f"({result['sent'] / max(result['elapsed'], 1e-9):,.0f}/s), {result['failed']} send errors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
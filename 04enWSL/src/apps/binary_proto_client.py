@@ -22,6 +22,20 @@ SCRIPTED USAGE:
 -----------------------
   python3 binary_proto_client.py --host localhost --port 5401 \\
       --command "put name Alice" --command "get name"
+
+PIPELINING:
+-----------
+  BinaryClient waits for each response before sending the next request,
+  so one connection does at most 1/RTT operations per second.
+  PipelinedClient sends requests back to back and matches responses to
+  requests by the header's seq field:
+
+      client = PipelinedClient("localhost", 5401)
+      client.connect()
+      client.put_many([("a", "1"), ("b", "2")], depth=64)
+      client.get_many(["a", "b"])            # ['1', '2']
+      future = client.submit(TYPE_GET_REQ, encode_key("a"))
+      client.get("a")                        # same sync API as BinaryClient
 """
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -30,9 +44,14 @@ SCRIPTED USAGE:
 from __future__ import annotations
 
 import argparse
+import os
 import socket
 import struct
 import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Iterable, Sequence
 
 # Add utils directory to path
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0] + '/utils')
@@ -50,8 +69,10 @@ from proto_common import (
     TYPE_COUNT_REQ, TYPE_COUNT_RESP,
     TYPE_KEYS_REQ, TYPE_KEYS_RESP,
     TYPE_ERR,
+    KEYS_PAGE_MAX,
     unpack_bin_header, pack_bin_message, validate_bin_message,
-    encode_kv, encode_key
+    pack_bin_messages, unpack_bin_messages,
+    encode_kv, encode_key, encode_keys_request, decode_keys_page
 )
 
 
@@ -148,29 +169,250 @@ class BinaryClient:
         return struct.unpack("!I", resp)[0]
     
     def keys(self) -> list[str]:
-        """Returns lista cheilor."""
-        rtype, resp = self._send_recv(TYPE_KEYS_REQ, b"")
+        """Returns lista cheilor (sortata), cerand pagini pana la ultima."""
+        keys: list[str] = []
+        after: str | None = None
+        while True:
+            page, more = self.keys_page(after=after)
+            keys.extend(page)
+            if not more or not page:
+                return keys
+            after = page[-1]
+    
+    def keys_page(self, limit: int = KEYS_PAGE_MAX, after: str | None = None) -> tuple[list[str], bool]:
+        """Returns o pagina of keys dupa `after` and flag-ul more."""
+        payload = b"" if after is None and limit == KEYS_PAGE_MAX else encode_keys_request(limit, after)
+        rtype, resp = self._send_recv(TYPE_KEYS_REQ, payload)
         if rtype == TYPE_ERR:
             raise RuntimeError(f"Server error: {resp.decode()}")
         
-        # Decodam: num_keys(2B) + [key_len(1B) + key(N)]...
-        if len(resp) < 2:
-            return []
-        
-        num_keys = struct.unpack("!H", resp[:2])[0]
-        keys = []
-        offset = 2
+        # Decodam: num_keys(2B) + [key_len(1B) + key(N)]... + more(1B)
+        return decode_keys_page(resp)
+
+
+# Buffers per sendmsg() call (the kernel rejects more than IOV_MAX)
+try:
+    IOV_MAX = min(os.sysconf("SC_IOV_MAX"), 1024)
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 16
+
+RECV_BUFFER = 256 * 1024
+
+
+class PipelinedClient(BinaryClient):
+    """
+    Client with many requests in flight on one connection.
+    
+    submit() assigns the next seq, registers a Future under it and queues
+    the packed messages. Whichever thread finds the queue idle writes
+    everything queued with one sendmsg() (writev), so requests submitted
+    together leave in one system call. A reader thread parses responses
+    out of a large receive buffer and completes the Future with the same
+    seq, so responses may arrive in any order.
+    
+    The BinaryClient methods (echo, put, get, count, keys) work unchanged
+    and may be called from several threads at once; put_many, get_many
+    and request_many keep up to `depth` requests in flight.
+    """
+    
+    def __init__(self, host: str, port: int, timeout: float = 30.0):
+        super().__init__(host, port)
+        self.timeout = timeout
+        self._pending: dict[int, Future] = {}
+        self._seq_lock = threading.Lock()
+        self._out_lock = threading.Lock()
+        self._outbox: list[bytes] = []
+        self._flushing = False
+        self._reader: threading.Thread | None = None
+        self._error: Exception | None = None
+    
+    def connect(self) -> None:
+        super().connect()
+        self.conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._error = None
+        self._reader = threading.Thread(target=self._read_loop, name="bin-client-reader", daemon=True)
+        self._reader.start()
+    
+    def close(self) -> None:
+        if self.conn:
+            try:
+                self.conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        super().close()
+        if self._reader is not None:
+            self._reader.join(5)
+            self._reader = None
+    
+    # ─── Submission ──────────────────────────────────────────────────────────
+    
+    def submit(self, mtype: int, payload: bytes) -> Future:
+        """Send one request; the Future resolves to (response_type, payload)."""
+        return self.submit_many([(mtype, payload)])[0]
+    
+    def submit_many(self, requests: Iterable[tuple[int, bytes]]) -> list[Future]:
+        """Send several requests with one write; one Future per request."""
+        return [future for _, future in self._submit_many(requests)]
+    
+    def _submit_many(self, requests: Iterable[tuple[int, bytes]]) -> list[tuple[int, Future]]:
+        """submit_many, also returning the seq each Future is registered under."""
+        if not self.conn:
+            raise ConnectionError("Not connected")
+        submitted = []
+        messages = []
+        with self._seq_lock:
+            # Checked under the lock the reader takes to fail everything
+            # pending, so no Future can be added after that sweep
+            if self._error is not None:
+                raise ConnectionError(f"connection failed: {self._error}")
+            for mtype, payload in requests:
+                self.seq = self.seq % 0xFFFFFFFF + 1
+                future: Future = Future()
+                self._pending[self.seq] = future
+                submitted.append((self.seq, future))
+                messages.append((mtype, payload, self.seq))
+        self._send([pack_bin_messages(messages)])
+        return submitted
+    
+    def _wait(self, submitted: Sequence[tuple[int, Future]], timeout: float | None) -> tuple[int, bytes]:
+        """
+        Result of the first submitted request.
         
-        for _ in range(num_keys):
-            if offset >= len(resp):
-                break
-            klen = resp[offset]
-            offset += 1
-            key = resp[offset:offset+klen].decode("utf-8")
-            keys.append(key)
-            offset += klen
+        On timeout every submitted seq still pending is dropped from the
+        map (a late response is then ignored) before TimeoutError is raised.
+        """
+        try:
+            return submitted[0][1].result(timeout)
+        except FutureTimeout:
+            with self._seq_lock:
+                for seq, future in submitted:
+                    if self._pending.get(seq) is future:
+                        del self._pending[seq]
+            raise
+    
+    def _send_recv(self, mtype: int, payload: bytes) -> tuple[int, bytes]:
+        return self._wait(self._submit_many([(mtype, payload)]), self.timeout)
+    
+    def _send(self, messages: list[bytes]) -> None:
+        """Queue messages; flush unless another thread is already flushing."""
+        with self._out_lock:
+            self._outbox.extend(messages)
+            if self._flushing:
+                return
+            self._flushing = True
+        try:
+            while True:
+                with self._out_lock:
+                    batch, self._outbox = self._outbox, []
+                    if not batch:
+                        self._flushing = False
+                        return
+                self._write_all(batch)
+        except BaseException:
+            with self._out_lock:
+                self._flushing = False
+            raise
+    
+    def _write_all(self, buffers: list[bytes]) -> None:
+        """Write buffers with sendmsg (gather write), handling short writes."""
+        if not hasattr(self.conn, "sendmsg"):
+            self.conn.sendall(b"".join(buffers))
+            return
+        views = [memoryview(b) for b in buffers]
+        first = 0
+        while first < len(views):
+            sent = self.conn.sendmsg(views[first:first + IOV_MAX])
+            while first < len(views) and sent >= len(views[first]):
+                sent -= len(views[first])
+                first += 1
+            if sent:
+                views[first] = views[first][sent:]
+    
+    # ─── Responses ───────────────────────────────────────────────────────────
+    
+    def _read_loop(self) -> None:
+        """Reader thread: split the byte stream into responses."""
+        conn = self.conn
+        chunk = bytearray(RECV_BUFFER)
+        buf = bytearray()
+        try:
+            while True:
+                n = conn.recv_into(chunk)
+                if not n:
+                    raise ConnectionError("server closed connection")
+                buf += memoryview(chunk)[:n]
+                messages, offset = unpack_bin_messages(buf)
+                for header, payload in messages:
+                    if not header.is_valid_protocol():
+                        raise ConnectionError("bad protocol from server")
+                    self._complete(header, payload)
+                del buf[:offset]
+        except Exception as e:
+            with self._seq_lock:
+                self._error = e
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection failed: {e}"))
+    
+    def _complete(self, header, payload: bytes) -> None:
+        with self._seq_lock:
+            future = self._pending.pop(header.seq, None)
+        if future is None:
+            return
+        if not validate_bin_message(header, payload):
+            future.set_exception(ValueError("Response CRC mismatch"))
+        else:
+            future.set_result((header.mtype, payload))
+    
+    # ─── Bulk API ────────────────────────────────────────────────────────────
+    
+    def request_many(self, requests: Sequence[tuple[int, bytes]], depth: int = 64) -> list[tuple[int, bytes]]:
+        """
+        Run requests with up to `depth` in flight; results in request order.
         
-        return keys
+        Each refill sends every request that fits in the window with one
+        write, after collecting all responses that have already arrived.
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be >= 1, got {depth}")
+        results: list[tuple[int, bytes] | None] = [None] * len(requests)
+        # (request index, seq, future); on a timeout all of them are dropped
+        inflight: deque[tuple[int, int, Future]] = deque()
+        sent = 0
+        while sent < len(requests) or inflight:
+            room = depth - len(inflight)
+            if room and sent < len(requests):
+                chunk = requests[sent:sent + room]
+                inflight.extend((index, seq, future) for index, (seq, future)
+                                in zip(range(sent, sent + len(chunk)), self._submit_many(chunk)))
+                sent += len(chunk)
+            results[inflight[0][0]] = self._wait([(seq, f) for _, seq, f in inflight], self.timeout)
+            inflight.popleft()
+            while inflight and inflight[0][2].done():
+                index, _, future = inflight.popleft()
+                results[index] = future.result()
+        return results  # type: ignore[return-value]
+    
+    def put_many(self, items: Iterable[tuple[str, str]], depth: int = 64) -> list[bool]:
+        """Store many key-value pairs; True for each PUT_RESP."""
+        replies = self.request_many([(TYPE_PUT_REQ, encode_kv(k, v)) for k, v in items], depth)
+        for rtype, resp in replies:
+            if rtype == TYPE_ERR:
+                raise RuntimeError(f"Server error: {resp.decode()}")
+        return [rtype == TYPE_PUT_RESP for rtype, _ in replies]
+    
+    def get_many(self, keys: Iterable[str], depth: int = 64) -> list[str | None]:
+        """Fetch many keys; None where a key does not exist."""
+        values: list[str | None] = []
+        for rtype, resp in self.request_many([(TYPE_GET_REQ, encode_key(k)) for k in keys], depth):
+            if rtype == TYPE_ERR:
+                if b"not_found" in resp:
+                    values.append(None)
+                    continue
+                raise RuntimeError(f"Server error: {resp.decode()}")
+            values.append(resp.decode("utf-8"))
+        return values
 
 
 def interactive_mode(client: BinaryClient) -> None:
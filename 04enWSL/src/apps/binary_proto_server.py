@@ -25,7 +25,7 @@ Payload (variable):
   - For GET: key_len(1B) + key(N)
   - For ECHO: any bytes
   - For COUNT: empty
-  - For KEYS: empty
+  - For KEYS: empty, or limit(2B) [+ key_len(1B) + after_key(N)] for paging
 
 MESSAGE TYPES:
 --------------
@@ -33,7 +33,8 @@ MESSAGE TYPES:
   PUT_REQ(3)    → PUT_RESP(4): store key-value
   GET_REQ(5)    → GET_RESP(6): return value
   COUNT_REQ(9)  → COUNT_RESP(10): number of keys
-  KEYS_REQ(7)   → KEYS_RESP(8): list of keys
+  KEYS_REQ(7)   → KEYS_RESP(8): sorted keys, one page at a time
+                  num_keys(2B) + [key_len(1B) + key(N)]... + more(1B)
   ERROR(255)    → error
 
 WHY THIS DESIGN:
@@ -43,9 +44,20 @@ WHY THIS DESIGN:
 - CRC32 detects transmission errors
 - Big-endian (network byte order) for interoperability
 
+CONCURRENCY:
+------------
+- The store is split into shards (--shards), each with its own lock and
+  a sorted key list, so PUTs to different shards do not serialise and
+  KEYS merges the shard lists instead of sorting every key
+- A selector thread watches all idle connections, buffers what arrives
+  and hands a connection to a bounded pool of worker threads (--workers)
+  only once a whole message is in, so a client that stalls mid-message
+  cannot pin a worker; --workers 0 keeps the original thread per connection
+
 USAGE:
 ------
   python3 binary_proto_server.py --port 4444 --verbose
+  python3 binary_proto_server.py --port 5401 --workers 16 --shards 32 --backlog 512
 
 Pair Programming Notes:
 - Driver: Implement message handling logic
@@ -59,15 +71,21 @@ from __future__ import annotations
 # IMPORT_DEPENDENCIES
 # ═══════════════════════════════════════════════════════════════════════════════
 import argparse
+import bisect
+import heapq
+import queue
+import select
+import selectors
 import socket
 import threading
 import struct
 import sys
-from typing import Dict, Tuple
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
 
 # Add utils directory to path
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0] + '/utils')
-from io_utils import recv_exact
+from io_utils import BufferedSocketReader, recv_exact
 from proto_common import (
     BIN_HEADER_LEN, BIN_MAGIC, BIN_VERSION,
     TYPE_ECHO_REQ, TYPE_ECHO_RESP,
@@ -77,84 +95,194 @@ from proto_common import (
     TYPE_KEYS_REQ, TYPE_KEYS_RESP,
     TYPE_ERR,
     unpack_bin_header, pack_bin_message, validate_bin_message,
-    decode_kv, decode_key
+    decode_kv, decode_key, decode_keys_request, encode_keys_page
 )
 
+DEFAULT_SHARDS = 16
+DEFAULT_WORKERS = 8
+DEFAULT_BACKLOG = 128
+# Messages served back to back from one connection before it is requeued
+MAX_BURST = 64
+# While no other connection is waiting, a worker keeps its connection this
+# long for the next request instead of handing it back to the selector
+LINGER = 0.002
+POLL_INTERVAL = 0.5
+# Send timeout for a pool-mode client that stops reading its responses
+CLIENT_TIMEOUT = 30.0
+
+# Selector data for a client connection: its address and its reader
+_ConnState = Tuple[Tuple[str, int], BufferedSocketReader]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KEY_VALUE_STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _Shard:
+    """One slice of the store: values, sorted key list and their lock."""
+    
+    __slots__ = ("data", "keys", "lock")
+    
+    def __init__(self) -> None:
+        self.data: Dict[str, str] = {}
+        self.keys: List[str] = []
+        self.lock = threading.Lock()
+
+
+class ShardedStore:
+    """
+    Key-value store split into independently locked shards.
+    
+    A key lives in shard hash(key) % shards. Writers take only their
+    shard's lock; GET is a single dict lookup, which is atomic in
+    CPython, so readers take no lock at all. Each shard keeps its keys
+    sorted (bisect on insert of a new key), so a KEYS page is a k-way
+    merge of the shard lists starting after the cursor.
+    """
+    
+    def __init__(self, shards: int = DEFAULT_SHARDS) -> None:
+        if shards < 1:
+            raise ValueError(f"shards must be >= 1, got {shards}")
+        self._shards = [_Shard() for _ in range(shards)]
+    
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def put(self, key: str, value: str) -> None:
+        shard = self._shard(key)
+        with shard.lock:
+            if key not in shard.data:
+                bisect.insort(shard.keys, key)
+            shard.data[key] = value
+    
+    def get(self, key: str) -> Optional[str]:
+        return self._shard(key).data.get(key)
+    
+    def __len__(self) -> int:
+        return sum(len(shard.data) for shard in self._shards)
+    
+    def keys_page(self, after: Optional[str] = None, limit: int = 65535) -> List[str]:
+        """
+        Return up to `limit` keys in sorted order, strictly after `after`.
+        
+        Copies at most `limit` keys from each shard (under its lock) and
+        merges them; cost does not depend on the total number of keys.
+        """
+        runs = []
+        for shard in self._shards:
+            with shard.lock:
+                start = 0 if after is None else bisect.bisect_right(shard.keys, after)
+                runs.append(shard.keys[start:start + limit])
+        return list(islice(heapq.merge(*runs), limit))
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CLIENT_HANDLER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def handle_client(
+def handle_message(
     conn: socket.socket,
     addr: Tuple[str, int],
-    state: Dict[str, str],
-    lock: threading.Lock,
-    verbose: bool
-) -> None:
+    store: ShardedStore,
+    verbose: bool,
+    out: Optional[List[bytes]] = None,
+    reader: Optional[BufferedSocketReader] = None
+) -> bool:
     """
-    Handle communication with a single client.
+    Read, process and answer one message.
     
-    Message processing loop:
+    With `out` the response is appended there instead of being sent, so
+    the caller can answer a run of pipelined requests with one write.
+    With `reader` (the connection's BufferedSocketReader) header and
+    payload come from its buffer instead of separate recv() calls.
+    
+    Steps:
     1. Read header (14 bytes)
     2. Validate magic and version
     3. Read payload (payload_len bytes)
     4. Verify CRC
     5. Process command
     6. Send response
+    
+    Returns:
+        True if the connection should stay open
+    """
+    read = reader.read_exact if reader is not None else lambda n: recv_exact(conn, n)
+    
+    # 1. Read header
+    try:
+        header_bytes = read(BIN_HEADER_LEN)
+    except ConnectionError:
+        return False
+    
+    # 2. Parse header
+    try:
+        header = unpack_bin_header(header_bytes)
+    except Exception as e:
+        if verbose:
+            print(f"[BIN] ! invalid header from {addr}: {e}")
+        return False
+    
+    # 3. Validate protocol
+    if not header.is_valid_protocol():
+        if verbose:
+            print(f"[BIN] ! protocol mismatch from {addr}")
+        resp = pack_bin_message(TYPE_ERR, b"bad_protocol", header.seq)
+        _reply(conn, resp, out)
+        return False
+    
+    # 4. Read payload
+    payload = read(header.payload_len)
+    
+    # 5. Verify CRC
+    if not validate_bin_message(header, payload):
+        if verbose:
+            print(f"[BIN] ! CRC mismatch from {addr}")
+        resp = pack_bin_message(TYPE_ERR, b"crc_mismatch", header.seq)
+        _reply(conn, resp, out)
+        return True
+    
+    if verbose:
+        print(f"[BIN] < {addr[0]}:{addr[1]}: type={header.type_name} seq={header.seq} len={header.payload_len}")
+    
+    # 6. Process command
+    resp = process_request(header.mtype, header.seq, payload, store)
+    
+    # 7. Send response
+    _reply(conn, resp, out)
+    
+    if verbose:
+        resp_header = unpack_bin_header(resp[:BIN_HEADER_LEN])
+        print(f"[BIN] > {addr[0]}:{addr[1]}: type={resp_header.type_name} seq={resp_header.seq}")
+    return True
+
+
+def _reply(conn: socket.socket, resp: bytes, out: Optional[List[bytes]]) -> None:
+    if out is None:
+        conn.sendall(resp)
+    else:
+        out.append(resp)
+
+
+def handle_client(
+    conn: socket.socket,
+    addr: Tuple[str, int],
+    store: ShardedStore,
+    verbose: bool
+) -> None:
+    """
+    Handle communication with a single client (thread per connection).
+    
+    Loops over handle_message() until the client disconnects.
     """
     with conn:
         if verbose:
             print(f"[BIN] + connected {addr[0]}:{addr[1]}")
         
+        reader = BufferedSocketReader(conn)
         try:
-            while True:
-                # 1. Read header
-                try:
-                    header_bytes = recv_exact(conn, BIN_HEADER_LEN)
-                except ConnectionError:
-                    break
-                
-                # 2. Parse header
-                try:
-                    header = unpack_bin_header(header_bytes)
-                except Exception as e:
-                    if verbose:
-                        print(f"[BIN] ! invalid header from {addr}: {e}")
-                    break
-                
-                # 3. Validate protocol
-                if not header.is_valid_protocol():
-                    if verbose:
-                        print(f"[BIN] ! protocol mismatch from {addr}")
-                    resp = pack_bin_message(TYPE_ERR, b"bad_protocol", header.seq)
-                    conn.sendall(resp)
-                    break
-                
-                # 4. Read payload
-                payload = recv_exact(conn, header.payload_len)
-                
-                # 5. Verify CRC
-                if not validate_bin_message(header, payload):
-                    if verbose:
-                        print(f"[BIN] ! CRC mismatch from {addr}")
-                    resp = pack_bin_message(TYPE_ERR, b"crc_mismatch", header.seq)
-                    conn.sendall(resp)
-                    continue
-                
-                if verbose:
-                    print(f"[BIN] < {addr[0]}:{addr[1]}: type={header.type_name} seq={header.seq} len={header.payload_len}")
-                
-                # 6. Process command
-                resp = process_request(header.mtype, header.seq, payload, state, lock)
-                
-                # 7. Send response
-                conn.sendall(resp)
-                
-                if verbose:
-                    resp_header = unpack_bin_header(resp[:BIN_HEADER_LEN])
-                    print(f"[BIN] > {addr[0]}:{addr[1]}: type={resp_header.type_name} seq={resp_header.seq}")
-                    
+            while handle_message(conn, addr, store, verbose, reader=reader):
+                pass
         except Exception as e:
             if verbose:
                 print(f"[BIN] ! error handling {addr}: {e}")
@@ -171,8 +299,7 @@ def process_request(
     mtype: int,
     seq: int,
     payload: bytes,
-    state: Dict[str, str],
-    lock: threading.Lock
+    store: ShardedStore
 ) -> bytes:
     """
     Process a request and return the packed response.
@@ -188,8 +315,7 @@ def process_request(
         except Exception as e:
             return pack_bin_message(TYPE_ERR, f"bad_put_payload: {e}".encode(), seq)
         
-        with lock:
-            state[key] = value
+        store.put(key, value)
         
         return pack_bin_message(TYPE_PUT_RESP, b"OK", seq)
     
@@ -200,38 +326,304 @@ def process_request(
         except Exception as e:
             return pack_bin_message(TYPE_ERR, f"bad_get_payload: {e}".encode(), seq)
         
-        with lock:
-            value = state.get(key, "")
+        value = store.get(key)
         
-        if not value and key not in state:
+        if value is None:
             return pack_bin_message(TYPE_ERR, b"not_found", seq)
         
         return pack_bin_message(TYPE_GET_RESP, value.encode("utf-8"), seq)
     
     # COUNT - number of keys
     if mtype == TYPE_COUNT_REQ:
-        with lock:
-            count = len(state)
         # Return count as unsigned int (4 bytes, big-endian)
-        return pack_bin_message(TYPE_COUNT_RESP, struct.pack("!I", count), seq)
+        return pack_bin_message(TYPE_COUNT_RESP, struct.pack("!I", len(store)), seq)
     
-    # KEYS - list of keys
+    # KEYS - one page of keys in sorted order
     if mtype == TYPE_KEYS_REQ:
-        with lock:
-            keys = list(state.keys())
+        try:
+            limit, after = decode_keys_request(payload)
+        except Exception as e:
+            return pack_bin_message(TYPE_ERR, f"bad_keys_payload: {e}".encode(), seq)
         
-        # Encode list: num_keys(2B) + [key_len(1B) + key(N)]...
-        parts = [struct.pack("!H", len(keys))]
-        for key in sorted(keys):
-            kb = key.encode("utf-8")
-            parts.append(struct.pack("!B", len(kb)) + kb)
+        # One extra key tells whether another page exists
+        keys = store.keys_page(after, limit + 1)
+        body, _ = encode_keys_page(keys[:limit], more=len(keys) > limit)
         
-        return pack_bin_message(TYPE_KEYS_RESP, b"".join(parts), seq)
+        return pack_bin_message(TYPE_KEYS_RESP, body, seq)
     
     # Unknown type
     return pack_bin_message(TYPE_ERR, f"unknown_type: {mtype}".encode(), seq)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _flush(conn: socket.socket, out: List[bytes]) -> None:
+    if out:
+        conn.sendall(b"".join(out))
+        out.clear()
+
+
+def _pending_bytes(reader: BufferedSocketReader) -> int:
+    """Bytes still missing before the next message is fully buffered."""
+    if reader.buffered < BIN_HEADER_LEN:
+        return BIN_HEADER_LEN - reader.buffered
+    header = unpack_bin_header(reader.peek(BIN_HEADER_LEN))
+    if not header.is_valid_protocol():
+        return 0  # handle_message rejects it from the header alone
+    return max(0, BIN_HEADER_LEN + header.payload_len - reader.buffered)
+
+
+def _receive(reader: BufferedSocketReader) -> bool:
+    """One recv_into() towards the next message; False once the peer closed."""
+    try:
+        return reader.fill(reader.buffered + _pending_bytes(reader)) > 0
+    except (BlockingIOError, InterruptedError):
+        return True
+
+
+def _wait_readable(conn: socket.socket, wait: float) -> bool:
+    """
+    Wait up to `wait` seconds for conn to become readable.
+    
+    select() cannot take descriptors at or above FD_SETSIZE (1024), and a
+    pool serving many idle clients gets there, so poll() is used where it
+    exists. Windows has no poll(), but its select() limits the number of
+    sockets per call rather than their value.
+    """
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(conn, select.POLLIN)
+        return bool(poller.poll(wait * 1000))
+    readable, _, _ = select.select([conn], [], [], wait)
+    return bool(readable)
+
+
+class BinaryProtoServer:
+    """
+    Binary protocol server with a bounded worker pool.
+    
+    The serving thread runs a selector over the listening socket and every
+    idle client connection. When a connection is readable, the selector
+    thread reads what arrived into its buffer; only once a whole message
+    is buffered (or the peer closed) is the connection unregistered and
+    queued for a worker. The worker serves messages from it while more are
+    already buffered (up to MAX_BURST) and then hands it back through a
+    wake-up socket pair to be registered again. Workers never wait on a
+    partial message, so clients that stall mid-frame cannot starve the
+    pool. Any number of idle clients costs no threads; at most `workers`
+    requests run at once. With workers=0 every connection gets its own
+    thread instead.
+    
+    Each connection keeps one BufferedSocketReader, so pipelined requests
+    that arrived together are parsed from one recv_into() instead of two
+    recv() calls each.
+    """
+    
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 5401,
+        store: Optional[ShardedStore] = None,
+        workers: int = DEFAULT_WORKERS,
+        backlog: int = DEFAULT_BACKLOG,
+        verbose: bool = False
+    ) -> None:
+        self.store = store if store is not None else ShardedStore()
+        self.workers = workers
+        self.verbose = verbose
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(backlog)
+        self.address: Tuple[str, int] = self.sock.getsockname()
+        self._running = threading.Event()
+        self._started = False
+        self._done = threading.Event()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._rearm: List[Tuple[socket.socket, _ConnState]] = []
+        self._rearm_lock = threading.Lock()
+        self._jobs: "queue.Queue[Optional[Tuple[socket.socket, _ConnState]]]" = queue.Queue(
+            maxsize=max(1, workers) * 4)
+        self._threads: List[threading.Thread] = []
+    
+    def serve_forever(self) -> None:
+        """Accept and serve clients until shutdown()."""
+        self._started = True
+        self._running.set()
+        try:
+            if self.workers > 0:
+                self._serve_pool()
+            else:
+                self._serve_threads()
+        finally:
+            self._done.set()
+    
+    def shutdown(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._running.clear()
+        self._wake()
+        if self._started:
+            self._done.wait(5)
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(5)
+        for sock in (self.sock, self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except OSError:
+                pass
+    
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+    
+    def _serve_threads(self) -> None:
+        """Original model: one thread per connection."""
+        self.sock.settimeout(POLL_INTERVAL)
+        while self._running.is_set():
+            try:
+                conn, addr = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            threading.Thread(
+                target=handle_client,
+                args=(conn, addr, self.store, self.verbose),
+                daemon=True
+            ).start()
+    
+    def _serve_pool(self) -> None:
+        """Selector loop dispatching readable connections to the workers."""
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"bin-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        
+        sel = selectors.DefaultSelector()
+        self.sock.setblocking(False)
+        sel.register(self.sock, selectors.EVENT_READ, None)
+        sel.register(self._wake_r, selectors.EVENT_READ, None)
+        try:
+            while self._running.is_set():
+                for key, _ in sel.select(POLL_INTERVAL):
+                    if key.fileobj is self.sock:
+                        self._accept(sel)
+                    elif key.fileobj is self._wake_r:
+                        self._drain_wakeups(sel)
+                    else:
+                        self._on_readable(sel, key.fileobj, key.data)
+        finally:
+            for key in list(sel.get_map().values()):
+                if key.fileobj not in (self.sock, self._wake_r):
+                    key.fileobj.close()
+            sel.close()
+    
+    def _accept(self, sel: selectors.BaseSelector) -> None:
+        while True:
+            try:
+                conn, addr = self.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            # Reads only happen once data is there; the timeout bounds sendall
+            conn.settimeout(CLIENT_TIMEOUT)
+            if self.verbose:
+                print(f"[BIN] + connected {addr[0]}:{addr[1]}")
+            sel.register(conn, selectors.EVENT_READ, (addr, BufferedSocketReader(conn)))
+    
+    def _on_readable(self, sel: selectors.BaseSelector, conn: socket.socket,
+                     state: _ConnState) -> None:
+        """Buffer what arrived; queue the connection once a message is complete."""
+        try:
+            closed = not _receive(state[1])
+        except OSError:
+            closed = True
+        # On close the worker still serves complete messages, then drops it
+        if closed or not _pending_bytes(state[1]):
+            sel.unregister(conn)
+            self._jobs.put((conn, state))
+    
+    def _drain_wakeups(self, sel: selectors.BaseSelector) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        with self._rearm_lock:
+            ready, self._rearm = self._rearm, []
+        for conn, state in ready:
+            # A message already in the reader's buffer will not wake the selector
+            if not _pending_bytes(state[1]):
+                self._jobs.put((conn, state))
+            else:
+                sel.register(conn, selectors.EVENT_READ, state)
+    
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            conn, (addr, reader) = job
+            if self._serve_burst(conn, addr, reader) and self._running.is_set():
+                with self._rearm_lock:
+                    self._rearm.append(job)
+                self._wake()
+            else:
+                if self.verbose:
+                    print(f"[BIN] - disconnected {addr[0]}:{addr[1]}")
+                conn.close()
+    
+    def _message_ready(self, conn: socket.socket, reader: BufferedSocketReader,
+                       wait: float) -> bool:
+        """
+        True once the next message is fully buffered, or the peer closed
+        (handle_message then sees the EOF). Reads only data already there.
+        """
+        if not _pending_bytes(reader):
+            return True
+        if not _wait_readable(conn, wait):
+            return False
+        return not _receive(reader) or not _pending_bytes(reader)
+    
+    def _serve_burst(self, conn: socket.socket, addr: Tuple[str, int],
+                     reader: BufferedSocketReader) -> bool:
+        """
+        Serve buffered messages from one connection; False means close it.
+        
+        Responses to requests that were already waiting are collected and
+        sent with one write once the input runs dry. A partly received
+        message goes back to the selector instead of being waited for.
+        """
+        out: List[bytes] = []
+        try:
+            for _ in range(MAX_BURST):
+                if not handle_message(conn, addr, self.store, self.verbose, out, reader):
+                    _flush(conn, out)
+                    return False
+                if self._message_ready(conn, reader, 0):
+                    continue
+                _flush(conn, out)
+                if not self._jobs.empty():
+                    return True
+                if not self._message_ready(conn, reader, LINGER):
+                    return True
+            _flush(conn, out)
+            return True
+        except Exception as e:
+            if self.verbose:
+                print(f"[BIN] ! error handling {addr}: {e}")
+            return False
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ENTRY_POINT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -244,31 +636,30 @@ def main() -> int:
     parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=5401, help="Listen port (default: 5401 - WEEK4 standard)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Display processed messages")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker threads, 0 = thread per connection (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS,
+                        help=f"Store shards, each with its own lock (default: {DEFAULT_SHARDS})")
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG,
+                        help=f"Listen backlog (default: {DEFAULT_BACKLOG})")
     
     args = parser.parse_args()
     
-    state: Dict[str, str] = {}
-    lock = threading.Lock()
-    
-    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    
+    server: Optional[BinaryProtoServer] = None
     try:
-        srv.bind((args.host, args.port))
-        srv.listen(16)
+        server = BinaryProtoServer(
+            args.host, args.port, ShardedStore(args.shards),
+            workers=args.workers, backlog=args.backlog, verbose=args.verbose
+        )
         
+        model = f"{args.workers} workers" if args.workers > 0 else "thread per connection"
         print(f"[BIN] Server listening on {args.host}:{args.port}")
         print(f"[BIN] Protocol: binary header (14B) + CRC32")
+        print(f"[BIN] Concurrency: {model}, {args.shards} store shards, backlog {args.backlog}")
         print(f"[BIN] Press Ctrl+C to stop")
         
-        while True:
-            conn, addr = srv.accept()
-            t = threading.Thread(
-                target=handle_client,
-                args=(conn, addr, state, lock, args.verbose),
-                daemon=True
-            )
-            t.start()
+        server.serve_forever()
+        return 0
             
     except KeyboardInterrupt:
         print("\n[BIN] Shutting down...")
@@ -277,10 +668,8 @@ def main() -> int:
         print(f"[BIN] Error: {e}")
         return 1
     finally:
-        try:
-            srv.close()
-        except Exception:
-            pass
+        if server is not None:
+            server.shutdown()
 
 
 if __name__ == "__main__":
@@ -50,7 +50,7 @@ from typing import Dict
 
 # Add utils directory to path
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0] + '/utils')
-from io_utils import recv_until, recv_exact
+from io_utils import BufferedSocketReader, recv_until, recv_exact
 
 
 
@@ -58,19 +58,25 @@ from io_utils import recv_until, recv_exact
 # ═══════════════════════════════════════════════════════════════════════════════
 # CORE_LOGIC
 # ═══════════════════════════════════════════════════════════════════════════════
-def recv_framed(conn: socket.socket) -> str:
+def recv_framed(conn: socket.socket, reader: BufferedSocketReader | None = None) -> str:
     """
     Receive a message with length-prefix framing.
     
     Format: <LEN> <PAYLOAD>
     Where LEN is the length in bytes (ASCII digits) followed by space.
     
+    Without `reader` the prefix is read one byte per recv(); pass the
+    connection's BufferedSocketReader to parse from its buffer instead.
+    
     Raises:
         ConnectionError: If connection is closed
         ValueError: If format does not match
     """
     # Read until space (separator after length)
-    raw = recv_until(conn, b" ", max_bytes=16)
+    if reader is not None:
+        raw = reader.read_until(b" ", max_bytes=16)
+    else:
+        raw = recv_until(conn, b" ", max_bytes=16)
     len_str = raw[:-1].decode("ascii").strip()
     
     if not len_str.isdigit():
@@ -80,7 +86,7 @@ def recv_framed(conn: socket.socket) -> str:
     if payload_len > 65535:
         raise ValueError(f"payload too large: {payload_len}")
     
-    payload_bytes = recv_exact(conn, payload_len)
+    payload_bytes = reader.read_exact(payload_len) if reader is not None else recv_exact(conn, payload_len)
     return payload_bytes.decode("utf-8", errors="replace")
 
 
@@ -175,11 +181,12 @@ def handle_client(
         if verbose:
             print(f"[TEXT] + connected {addr[0]}:{addr[1]}")
         
+        reader = BufferedSocketReader(conn)
         try:
             while True:
                 # 1. Receive message
                 try:
-                    line = recv_framed(conn)
+                    line = recv_framed(conn, reader)
                 except (ConnectionError, ValueError) as e:
                     if verbose:
                         print(f"[TEXT] ! recv error from {addr}: {e}")
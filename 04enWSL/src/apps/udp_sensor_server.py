@@ -17,15 +17,19 @@ Datagram format (23 bytes):
   crc32: checksum peste primii 19 bytes
 
 COMPORTAMENT:
-- Receive datagrame of to senzori
+- Receive datagrame of to senzori in loturi: tot ce este in coada
+  socket-ului se citeste into un buffer prealocat (DatagramBatch) and se
+  decodeaza dintr-o trecere (unpack_udp_sensors)
 - Verify CRC and valideaza format
 - Logheaza citirile valide
 - Ignora pachetele corupte (with log warning)
-- Calculate statistici (medie, min, max)
+- Calculate statistici in memorie constanta per senzor: medie, abatere
+  standard, min, max, cuantile (P²) and medie pe ultimele --window secunde
 
 UTILIZARE:
 ----------
   python3 udp_sensor_server.py --port 5402 --verbose
+  python3 udp_sensor_server.py --rcvbuf 8388608 --batch 512
 """
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -36,13 +40,22 @@ from __future__ import annotations
 import argparse
 import socket
 import sys
+import time
 from datetime import datetime
 from collections import defaultdict
-from typing import Dict, List, NamedTuple
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
 
 # Add utils directory to path
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0] + '/utils')
-from proto_common import unpack_udp_sensor, UDP_LEN, format_sensor_reading
+from proto_common import unpack_udp_sensors, UDP_LEN, UDP_SLOT, format_sensor_reading
+from io_utils import DatagramBatch, udp_drops
+from stream_stats import P2Quantile, RunningStats, WindowedStats
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+DEFAULT_WINDOW = 60.0
+WINDOW_BUCKETS = 12
+DEFAULT_BATCH = 256                 # datagrame citite per drain()
+DEFAULT_RCVBUF = 4 * 1024 * 1024    # coada kernel; plafonata of net.core.rmem_max
 
 
 
@@ -59,37 +72,125 @@ class SensorReading(NamedTuple):
 
 
 class SensorStats:
-    """Statistici for un senzor."""
+    """
+    Statistici for un senzor, in memorie constanta.
+    
+    Citirile nu se pastreaza: fiecare add() actualizeaza agregate of
+    dimensiune fixa (Welford for medie/varianta, P² for cuantile, ring
+    of bucket-uri for fereastra of timp), deci memoria nu creste in timp
+    si fiecare proprietate se citeste in O(1).
+    """
     
-    def __init__(self):
-        self.readings: List[float] = []
+    def __init__(
+        self,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        window: float = DEFAULT_WINDOW,
+        buckets: int = WINDOW_BUCKETS
+    ):
+        self.running = RunningStats()
+        self.quantiles: Dict[float, P2Quantile] = {q: P2Quantile(q) for q in quantiles}
+        self.recent = WindowedStats(window, buckets)
         self.last_location: str = ""
         self.last_reading: datetime | None = None
     
-    def add(self, temp: float, location: str) -> None:
-        self.readings.append(temp)
+    def add(self, temp: float, location: str, now: Optional[float] = None) -> None:
+        """Adauga o citire; `now` este un timp time.monotonic() (implicit acum)."""
+        self.running.add(temp)
+        for estimator in self.quantiles.values():
+            estimator.add(temp)
+        self.recent.add(temp, time.monotonic() if now is None else now)
+        self.last_location = location
+        self.last_reading = datetime.now()
+    
+    def add_many(self, temps: Sequence[float], location: str, now: Optional[float] = None) -> None:
+        """Adauga citirile primite in acelasi lot (acelasi moment)."""
+        self.running.add_many(temps)
+        for estimator in self.quantiles.values():
+            estimator.add_many(temps)
+        self.recent.add_many(temps, time.monotonic() if now is None else now)
         self.last_location = location
         self.last_reading = datetime.now()
     
     @property
     def count(self) -> int:
-        return len(self.readings)
+        return self.running.count
     
     @property
     def avg(self) -> float:
-        return sum(self.readings) / len(self.readings) if self.readings else 0.0
+        return self.running.mean
+    
+    @property
+    def stdev(self) -> float:
+        return self.running.stdev
     
     @property
     def min_temp(self) -> float:
-        return min(self.readings) if self.readings else 0.0
+        return self.running.min if self.running.count else 0.0
     
     @property
     def max_temp(self) -> float:
-        return max(self.readings) if self.readings else 0.0
+        return self.running.max if self.running.count else 0.0
+    
+    def quantile(self, q: float) -> float:
+        """Cuantila estimata; q trebuie sa fie una din cele urmarite."""
+        return self.quantiles[q].value
+    
+    def window(self, now: Optional[float] = None) -> Tuple[int, Optional[float], Optional[float], Optional[float]]:
+        """(count, avg, min, max) pe ultima fereastra of timp."""
+        return self.recent.snapshot(time.monotonic() if now is None else now)
 
 
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def ingest_batch(
+    batch: DatagramBatch,
+    count: int,
+    stats: Dict[int, SensorStats],
+    verbose: bool = False
+) -> Tuple[int, int]:
+    """
+    Decodeaza primele `count` datagrame din lot and actualizeaza statisticile.
+    
+    Citirile se grupeaza pe senzor and intra in SensorStats with un singur
+    add_many() per senzor per lot.
+    
+    Returns:
+        (valide, invalide)
+    """
+    readings: Dict[int, Tuple[str, list]] = {}
+    invalid = 0
+    for i, reading in enumerate(unpack_udp_sensors(batch.view, batch.lengths[:count])):
+        if reading is None:
+            invalid += 1
+            if verbose:
+                length = batch.lengths[i]
+                if length != UDP_LEN:
+                    size = f"{length}" if length < batch.slot_size else f">{UDP_LEN}"
+                    print(f"[UDP] ! Invalid size from {batch.addrs[i]}: {size} bytes (expected {UDP_LEN})")
+                else:
+                    print(f"[UDP] ! Invalid packet from {batch.addrs[i]}: CRC mismatch")
+            continue
+        
+        _, sensor_id, temp_c, location = reading
+        entry = readings.get(sensor_id)
+        if entry is None or entry[0] != location:
+            entry = readings[sensor_id] = (location, entry[1] if entry else [])
+        entry[1].append(temp_c)
+        
+        if verbose:
+            addr = batch.addrs[i]
+            print(f"[UDP] < {addr[0]}:{addr[1]} {format_sensor_reading(sensor_id, temp_c, location)}")
+    
+    now = time.monotonic()
+    for sensor_id, (location, temps) in readings.items():
+        stats[sensor_id].add_many(temps, location, now)
+    return count - invalid, invalid
+
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ENTRY_POINT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -101,11 +202,17 @@ def main() -> int:
     parser.add_argument("--port", type=int, default=5402, help="Portul UDP")
     parser.add_argument("--verbose", "-v", action="store_true", help="Afiseaza fiecare citire")
     parser.add_argument("--stats-interval", type=int, default=10, help="Afiseaza statistici to fiecare N citiri")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW,
+                        help=f"Fereastra (secunde) for statisticile recente (default: {DEFAULT_WINDOW:.0f})")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help=f"Datagrame citite per lot (default: {DEFAULT_BATCH})")
+    parser.add_argument("--rcvbuf", type=int, default=DEFAULT_RCVBUF,
+                        help=f"SO_RCVBUF in bytes, 0 = implicit sistem (default: {DEFAULT_RCVBUF})")
     
     args = parser.parse_args()
     
     # Statistici per senzor
-    stats: Dict[int, SensorStats] = defaultdict(SensorStats)
+    stats: Dict[int, SensorStats] = defaultdict(lambda: SensorStats(window=args.window))
     total_received = 0
     total_valid = 0
     total_invalid = 0
@@ -113,75 +220,78 @@ def main() -> int:
     # Creare socket UDP
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if args.rcvbuf > 0:
+        # O coada mai mare absoarbe rafalele cat timp procesam un lot
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.rcvbuf)
     
     try:
         sock.bind((args.host, args.port))
+        # Slot = UDP_LEN + 1 bytes: o datagrama prea mare umple slot-ul
+        batch = DatagramBatch(sock, UDP_SLOT.size, max(1, args.batch))
         
         print(f"[UDP] Sensor server listening on {args.host}:{args.port}")
         print(f"[UDP] Expected datagram size: {UDP_LEN} bytes")
+        print(f"[UDP] Receive buffer: {sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)} bytes, "
+              f"batches of up to {len(batch.lengths)} datagrams")
         print(f"[UDP] Press Ctrl+C to stop and see statistics")
         print()
         
         while True:
             try:
-                data, addr = sock.recvfrom(1024)  # Buffer generos
-                total_received += 1
-                
-                # Validare dimensiune
-                if len(data) != UDP_LEN:
-                    total_invalid += 1
-                    if args.verbose:
-                        print(f"[UDP] ! Invalid size from {addr}: {len(data)} bytes (expected {UDP_LEN})")
-                    continue
-                
-                # Decodare and validare CRC
-                try:
-                    ver, sensor_id, temp_c, location = unpack_udp_sensor(data)
-                except ValueError as e:
-                    total_invalid += 1
-                    if args.verbose:
-                        print(f"[UDP] ! Invalid packet from {addr}: {e}")
+                count = batch.drain()
+                if not count:
                     continue
+                valid, invalid = ingest_batch(batch, count, stats, args.verbose)
+                before = total_valid
+                total_received += count
+                total_valid += valid
+                total_invalid += invalid
                 
-                # Citire valida
-                total_valid += 1
-                stats[sensor_id].add(temp_c, location)
-                
-                if args.verbose:
-                    reading = format_sensor_reading(sensor_id, temp_c, location)
-                    print(f"[UDP] < {addr[0]}:{addr[1]} {reading}")
-                
-                # Afisare statistici periodice
-                if args.stats_interval > 0 and total_valid % args.stats_interval == 0:
-                    print_stats(stats, total_received, total_valid, total_invalid)
+                # Afisare statistici periodice (cel mult o data per lot)
+                if args.stats_interval > 0 and total_valid // args.stats_interval > before // args.stats_interval:
+                    print_stats(stats, total_received, total_valid, total_invalid, udp_drops(sock))
                     
             except Exception as e:
                 print(f"[UDP] ! Error: {e}")
                 
     except KeyboardInterrupt:
         print("\n")
-        print_stats(stats, total_received, total_valid, total_invalid)
+        print_stats(stats, total_received, total_valid, total_invalid, udp_drops(sock))
         print("\n[UDP] Server stopped")
         return 0
     finally:
         sock.close()
 
 
-def print_stats(stats: Dict[int, SensorStats], received: int, valid: int, invalid: int) -> None:
-    """Afiseaza statistici agregate."""
+def print_stats(
+    stats: Dict[int, SensorStats],
+    received: int,
+    valid: int,
+    invalid: int,
+    drops: Optional[int] = None
+) -> None:
+    """Afiseaza statistici agregate (drops = datagrame aruncate of kernel, daca se cunosc)."""
     print()
     print("=" * 60)
     print(f"STATISTICS: {received} received, {valid} valid, {invalid} invalid ({invalid*100/max(received,1):.1f}% error rate)")
+    if drops is not None:
+        print(f"KERNEL: {drops} datagrams dropped (socket receive queue full)")
     print("-" * 60)
     
     if not stats:
         print("  (no valid readings yet)")
     else:
+        now = time.monotonic()
         for sensor_id in sorted(stats.keys()):
             s = stats[sensor_id]
             print(f"  Sensor {sensor_id:04d} ({s.last_location:10s}): "
-                  f"{s.count} readings, avg={s.avg:+.1f}°C, "
+                  f"{s.count} readings, avg={s.avg:+.1f}°C, sd={s.stdev:.1f}, "
                   f"min={s.min_temp:+.1f}°C, max={s.max_temp:+.1f}°C")
+            line = ", ".join(f"p{q * 100:g}={e.value:+.1f}°C" for q, e in s.quantiles.items())
+            recent, recent_avg, _, _ = s.window(now)
+            if recent:
+                line += f"; last {s.recent.window:.0f}s: {recent} readings, avg={recent_avg:+.1f}°C"
+            print(f"  {'':26s}{line}")
     
     print("=" * 60)
     print()
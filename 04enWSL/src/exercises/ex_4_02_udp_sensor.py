@@ -53,6 +53,9 @@ DATAGRAM_SIZE = 23
 DATAGRAM_VERSION = 1
 DEFAULT_PORT = 5556
 REPORT_INTERVAL = 5  # secunde
+BATCH_SIZE = 256  # datagrame citite dintr-o data din coada socket-ului
+RCVBUF_SIZE = 4 * 1024 * 1024  # coada kernel (plafonata of net.core.rmem_max)
+DATAGRAM_STRUCT = struct.Struct('>BIf10sI')  # format precompilat, refolosit
 
 
 @dataclass
@@ -124,7 +127,8 @@ def parse_sensor_datagram(datagram: bytes) -> Optional[Tuple[int, float, str]]:
     TODO: Implementati aceasta function
     Hints:
     - Verificati lungimea datagramei (DATAGRAM_SIZE = 23)
-    - Folositi struct.unpack() with format '>BIf10sI' for big-endian
+    - Folositi DATAGRAM_STRUCT.unpack() (format '>BIf10sI', big-endian,
+      compilat o singura data)
     - Verificati versiunea (trebuie sa fie DATAGRAM_VERSION = 1)
     - Extrageti location and faceti strip() for a elimina spatiile of padding
     - Validati CRC32 folosind calculate_crc32() pe primii 19 bytes
@@ -138,8 +142,8 @@ def parse_sensor_datagram(datagram: bytes) -> Optional[Tuple[int, float, str]]:
     # 
     # Pasul 2: Unpacking
     # try:
-    #     version, sensor_id, temperature, location_bytes, received_crc = struct.unpack(
-    #         '>BIf10sI', datagram
+    #     version, sensor_id, temperature, location_bytes, received_crc = DATAGRAM_STRUCT.unpack(
+    #         datagram
     #     )
     # except struct.error as e:
     #     print(f"[!] Eroare unpacking: {e}")
@@ -324,27 +328,40 @@ def run_aggregator(host: str = '0.0.0.0',
     TODO: Implementati aceasta function
     Hints:
     - Creati socket UDP: socket.socket(AF_INET, SOCK_DGRAM)
-    - Folositi recvfrom() for a primi datagrame
+    - Un recvfrom() per datagrama nu tine pasul la rate mari: kernel-ul
+      arunca datagramele cand coada socket-ului se umple. Cititi in loturi:
+      socket non-blocking, select() asteapta date, apoi recvfrom_into()
+      in slot-uri dintr-un bytearray prealocat pana la BlockingIOError
     - Apelati parse_sensor_datagram() and update_statistics()
     - Optional: porniti thread for raportare periodica
+    - Referinta: src/apps/udp_sensor_server.py (DatagramBatch + iter_unpack)
     
-    # 💭 PREDICTION: What happens when recvfrom() times out after 1 second?
-    #    Does it raise an exception, return empty data, or something else?
-    #    Why do we need a timeout in the first place?
+    # 💭 PREDICTION: What does select() return when no datagram arrives
+    #    within 1 second? And what does recvfrom_into() do on a non-blocking
+    #    socket whose queue is empty? Why do we need a timeout at all?
     """
     
-    # 💭 PREDICTION: What happens when recvfrom() times out after 1 second?
-    #    Does it raise an exception, return empty data, or something else?
-    #    Why do we need a timeout in the first place?
+    # 💭 PREDICTION: What does select() return when no datagram arrives
+    #    within 1 second? And what does recvfrom_into() do on a non-blocking
+    #    socket whose queue is empty? Why do we need a timeout at all?
     # Statistici globale
     stats: Dict[int, SensorStats] = {}
     
     # TODO: Implementare
     # 
-    # # Creare socket UDP
+    # import select
+    # 
+    # # Creare socket UDP, non-blocking, with coada kernel mai mare
     # sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_SIZE)
     # sock.bind((host, port))
-    # sock.settimeout(1.0)  # Timeout for a putea verifica stop
+    # sock.setblocking(False)
+    # 
+    # # Buffer prealocat: BATCH_SIZE slot-uri; un byte in plus per slot
+    # # face vizibile datagramele prea mari (lungime = DATAGRAM_SIZE + 1)
+    # slot_size = DATAGRAM_SIZE + 1
+    # buffer = bytearray(slot_size * BATCH_SIZE)
+    # slots = [memoryview(buffer)[i * slot_size:(i + 1) * slot_size] for i in range(BATCH_SIZE)]
     # 
     # print(f"[*] Agregator UDP pornit pe {host}:{port}")
     # print(f"[*] Raportare to fiecare {report_interval} secunde")
@@ -361,19 +378,26 @@ def run_aggregator(host: str = '0.0.0.0',
     # 
     # try:
     #     while True:
+    #         # Asteptam max 1 s (for a putea verifica Ctrl+C), apoi golim coada
+    #         if not select.select([sock], [], [], 1.0)[0]:
+    #             continue
+    #         batch = []
     #         try:
-    #             datagram, addr = sock.recvfrom(DATAGRAM_SIZE + 100)  # Buffer with margine
-    #             
-    #             result = parse_sensor_datagram(datagram)
+    #             for slot in slots:
+    #                 nbytes, addr = sock.recvfrom_into(slot)
+    #                 batch.append((nbytes, addr))
+    #         except BlockingIOError:
+    #             pass  # Coada goala: procesam lotul
+    #         
+    #         for i, (nbytes, addr) in enumerate(batch):
+    #             result = parse_sensor_datagram(bytes(slots[i][:nbytes]))
     #             if result:
     #                 sensor_id, temperature, location = result
     #                 update_statistics(stats, sensor_id, temperature, location)
-    #                 print(f"[+] Senzor {sensor_id} @ {location}: {temperature:.1f}°C")
     #             else:
     #                 print(f"[-] Datagrama invalida of to {addr}")
-    #                 
-    #         except socket.timeout:
-    #             continue  # Normal, verificam periodic for Ctrl+C
+    #         # Un print per citire ar costa mai mult decat receptia: sumar per lot
+    #         print(f"[+] {len(batch)} datagrame primite")
     #             
     # except KeyboardInterrupt:
     #     print("\n[*] Oprire...")
@@ -15,6 +15,8 @@ Concepte cheie:
 # SETUP_ENVIRONMENT
 # ═══════════════════════════════════════════════════════════════════════════════
 from __future__ import annotations
+import os
+import select
 import socket
 from typing import Optional, List, Dict, Tuple, Any
 
@@ -71,7 +73,8 @@ def recv_until(sock: socket.socket, delim: bytes, max_bytes: int = 1024 * 1024)
     Util for protocoale text bazate pe delimitatori (ex: newline, space).
     
     ATENTIE: Reads byte with byte, deci ineficient for volume mari.
-    In productie, s-ar folosi buffering or select/poll.
+    Fara buffer nu putem citi dincolo of delimitator (bytes in plus s-ar
+    pierde); for trafic real folositi BufferedSocketReader.read_until.
     
     Args:
         sock: Socket-ul of pe care citim
@@ -115,6 +118,219 @@ def recv_line(sock: socket.socket, max_bytes: int = 65536) -> str:
 
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class BufferedSocketReader:
+    """
+    Cititor buffered for un socket: un recv_into() aduce cat a sosit, iar
+    mesajele se decupeaza din buffer fara alte apeluri sistem.
+    
+    Problema rezolvata: recv_until face un recv() per byte, iar recv_exact
+    face cel putin doua recv() per mesaj (header + payload). Cu buffer,
+    un singur recv_into poate aduce zeci of mesaje trimise in pipeline.
+    
+    Buffer-ul creste cand un mesaj nu incape si se compacteaza (datele
+    necitite sunt mutate la inceput) cand se umple coada lui.
+    
+    Un reader apartine unei singure conexiuni pe toata durata ei: bytes
+    deja bufferati nu mai pot fi cititi direct of pe socket.
+    """
+    
+    def __init__(self, sock: socket.socket, bufsize: int = 65536) -> None:
+        self.sock = sock
+        self._buf = bytearray(bufsize)
+        self._start = 0  # primul byte necitit
+        self._end = 0    # sfarsitul datelor primite
+    
+    @property
+    def buffered(self) -> int:
+        """Numarul of bytes primiti dar inca necititi."""
+        return self._end - self._start
+    
+    def _fill(self, need: int) -> int:
+        """
+        Un recv_into() in spatiul liber, cu loc for cel putin `need` bytes
+        necititi. Returns numarul of bytes primiti (0 = peer-ul a inchis).
+        """
+        size = self._end - self._start
+        if size == 0:
+            self._start = self._end = 0
+        elif len(self._buf) - self._start < need or self._end == len(self._buf):
+            if need > len(self._buf):
+                grown = bytearray(max(need, 2 * len(self._buf)))
+                grown[:size] = self._buf[self._start:self._end]
+                self._buf = grown
+            else:
+                self._buf[:size] = self._buf[self._start:self._end]
+            self._start, self._end = 0, size
+        n = self.sock.recv_into(memoryview(self._buf)[self._end:])
+        self._end += n
+        return n
+    
+    def fill(self, need: int = 1) -> int:
+        """
+        Un singur recv_into(), cu loc for cel putin `need` bytes necititi.
+        
+        Pentru servere cu selector: se apeleaza doar cand socket-ul este
+        readable, deci nu blocheaza. Returns numarul of bytes primiti
+        (0 = peer-ul a inchis).
+        """
+        return self._fill(need)
+    
+    def peek(self, n: int) -> bytes:
+        """Primii n bytes necititi (sau cati sunt), fara a-i consuma."""
+        return bytes(self._buf[self._start:min(self._start + n, self._end)])
+    
+    def read_exact(self, n: int) -> bytes:
+        """
+        Returns exact n bytes (echivalentul buffered al recv_exact).
+        
+        Raises:
+            ConnectionError: Daca peer-ul inchide conexiunea inainte of n bytes
+        """
+        while self._end - self._start < n:
+            if not self._fill(n):
+                raise ConnectionError(f"peer closed connection, got {self.buffered}/{n} bytes")
+        start = self._start
+        self._start = start + n
+        return bytes(self._buf[start:start + n])
+    
+    def read_until(self, delim: bytes, max_bytes: int = 1024 * 1024) -> bytes:
+        """
+        Reads pana to delimitator, INCLUSIV delimitatorul (ca recv_until).
+        
+        Fiecare byte este cautat o singura data: dupa un recv_into nou,
+        cautarea continua of unde a ramas.
+        
+        Raises:
+            ConnectionError: Daca peer-ul inchide conexiunea
+            ValueError: Daca peste max_bytes nu apare delimitatorul
+        """
+        scanned = 0  # bytes necititi deja verificati, relativ la _start
+        while True:
+            pos = self._buf.find(delim, self._start + scanned, self._end)
+            if pos >= 0:
+                if pos - self._start > max_bytes:
+                    break
+                end = pos + len(delim)
+                data = bytes(self._buf[self._start:end])
+                self._start = end
+                return data
+            size = self._end - self._start
+            if size > max_bytes:
+                break
+            scanned = max(0, size - len(delim) + 1)
+            if not self._fill(size + 1):
+                raise ConnectionError("peer closed connection before delimiter")
+        raise ValueError(f"read_until exceeded {max_bytes} bytes without finding delimiter")
+    
+    def read_line(self, max_bytes: int = 65536) -> str:
+        """
+        Reads o linie terminata with newline (ca recv_line).
+        
+        Conventie: linia returnata NU include newline-ul.
+        """
+        raw = self.read_until(b"\n", max_bytes)
+        return raw[:-1].decode("utf-8", errors="replace")
+    
+    def read_frame(self, length_size: int = 2, max_bytes: int = 65535) -> bytes:
+        """
+        Reads un frame length-prefixed: lungime big-endian pe
+        `length_size` bytes urmata of payload. Returns doar payload-ul.
+        
+        Raises:
+            ConnectionError: Daca peer-ul inchide conexiunea
+            ValueError: Daca lungimea anuntata depaseste max_bytes
+        """
+        length = int.from_bytes(self.read_exact(length_size), "big")
+        if length > max_bytes:
+            raise ValueError(f"frame too large: {length} > {max_bytes}")
+        return self.read_exact(length)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class DatagramBatch:
+    """
+    Receptie UDP in loturi: dupa ce socket-ul devine citibil, datagramele
+    din coada kernel-ului sunt copiate with recvfrom_into() in slot-uri
+    of dimensiune fixa dintr-un buffer prealocat, pana cand coada se
+    goleste (socket non-blocking) sau slot-urile se termina.
+    
+    Problema rezolvata: o bucla recvfrom() aloca un obiect bytes per
+    datagrama si se intoarce in select/blocare dupa fiecare; la rate mari
+    coada socket-ului se umple si kernel-ul arunca datagrame.
+    
+    Slot-ul i ocupa bytes [i*slot_size, (i+1)*slot_size) din `buffer`, iar
+    lengths[i] / addrs[i] dau lungimea primita si expeditorul. O datagrama
+    mai mare decat slot-ul este trunchiata of kernel: alegeti slot_size =
+    lungimea asteptata + 1, astfel lengths[i] == slot_size o marcheaza.
+    
+    Continutul slot-urilor este valid pana la urmatorul drain().
+    """
+    
+    def __init__(self, sock: socket.socket, slot_size: int, slots: int = 256) -> None:
+        if slot_size < 1 or slots < 1:
+            raise ValueError("slot_size and slots must be >= 1")
+        sock.setblocking(False)
+        self.sock = sock
+        self.slot_size = slot_size
+        self.buffer = bytearray(slot_size * slots)
+        self.view = memoryview(self.buffer)
+        self._slots = [self.view[i * slot_size:(i + 1) * slot_size] for i in range(slots)]
+        self.lengths: List[int] = [0] * slots
+        self.addrs: List[Any] = [None] * slots
+    
+    def drain(self, timeout: float | None = None) -> int:
+        """
+        Asteapta max `timeout` secunde (None = oricat) sa soseasca date,
+        apoi citeste tot ce este in coada. Returns numarul of datagrame
+        primite in slot-urile 0..n-1 (0 = timeout).
+        """
+        if not select.select([self.sock], [], [], timeout)[0]:
+            return 0
+        recv = self.sock.recvfrom_into
+        lengths = self.lengths
+        addrs = self.addrs
+        count = 0
+        try:
+            for slot in self._slots:
+                lengths[count], addrs[count] = recv(slot)
+                count += 1
+        except (BlockingIOError, ConnectionResetError):
+            # Coada goala; pe Windows un ICMP port unreachable apare ca reset
+            pass
+        return count
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# NETWORK_OPERATIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+def udp_drops(sock: socket.socket) -> Optional[int]:
+    """
+    Numarul of datagrame aruncate of kernel for acest socket (coada plina),
+    citit din coloana "drops" a /proc/net/udp(6), dupa inode-ul socket-ului.
+    
+    Returns None daca informatia nu este disponibila (alt sistem decat Linux).
+    """
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+        for table in ("/proc/net/udp", "/proc/net/udp6"):
+            with open(table) as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    if fields[9] == inode:
+                        return int(fields[-1])
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # NETWORK_OPERATIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -20,8 +20,8 @@ Key concepts illustrated:
 from __future__ import annotations
 import struct
 import zlib
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Union
 
 
 # ==============================================================================
@@ -43,6 +43,14 @@ BIN_VERSION = 1
 # 2s = 2 bytes string, B = unsigned byte, H = unsigned short, I = unsigned int
 BIN_HEADER_FMT = "!2sBBHII"
 BIN_HEADER_LEN = struct.calcsize(BIN_HEADER_FMT)  # = 14 bytes
+BIN_MAX_PAYLOAD = 65535
+
+# Precompiled codecs: the format string is parsed once, not on every call.
+# BIN_PREFIX is the header without the CRC field, i.e. the bytes the CRC
+# covers before the payload.
+BIN_HEADER = struct.Struct(BIN_HEADER_FMT)
+BIN_PREFIX = struct.Struct("!2sBBHI")
+BIN_PREFIX_LEN = BIN_PREFIX.size  # = 10 bytes
 
 # Message types
 TYPE_ECHO_REQ = 1
@@ -99,6 +107,10 @@ class BinHeader:
     Decoded binary message header.
     
     frozen=True makes instances immutable (best practice for data).
+    
+    prefix_crc is the CRC32 of the first BIN_PREFIX_LEN header bytes as
+    received; validate_bin_message continues from it instead of
+    repacking the header. It is None for headers built by hand.
     """
     magic: bytes
     version: int
@@ -106,6 +118,7 @@ class BinHeader:
     payload_len: int
     seq: int
     crc: int
+    prefix_crc: Optional[int] = field(default=None, repr=False, compare=False)
     
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -137,8 +150,8 @@ def pack_bin_message(mtype: int, payload: bytes, seq: int) -> bytes:
     Steps:
     1. Validate payload
     2. Build header without CRC
-    3. Calculate CRC over header + payload
-    4. Rebuild header with CRC
+    3. Calculate CRC over header, then continue it over the payload
+    4. Build header with CRC
     5. Concatenate header + payload
     
     Args:
@@ -149,21 +162,19 @@ def pack_bin_message(mtype: int, payload: bytes, seq: int) -> bytes:
     Returns:
         bytes: Complete message, ready to send
     """
-    if not isinstance(payload, (bytes, bytearray)):
+    if not isinstance(payload, (bytes, bytearray, memoryview)):
         raise TypeError(f"payload must be bytes, got {type(payload)}")
-    if len(payload) > 65535:
-        raise ValueError(f"payload too large: {len(payload)} > 65535")
-    
-    # Partial header (without CRC) for CRC calculation
-    header_wo_crc = struct.pack("!2sBBHI", BIN_MAGIC, BIN_VERSION, mtype, len(payload), seq)
+    n = len(payload)
+    if n > BIN_MAX_PAYLOAD:
+        raise ValueError(f"payload too large: {n} > {BIN_MAX_PAYLOAD}")
     
-    # CRC is calculated over header (without CRC field) + payload
-    msg_crc = crc32(header_wo_crc + payload)
+    # CRC is calculated over header (without CRC field) + payload; crc32
+    # continues from the prefix value, so the two are never concatenated
+    prefix = BIN_PREFIX.pack(BIN_MAGIC, BIN_VERSION, mtype, n, seq)
+    msg_crc = zlib.crc32(payload, zlib.crc32(prefix))
     
-    # Complete header with CRC
-    header = struct.pack(BIN_HEADER_FMT, BIN_MAGIC, BIN_VERSION, mtype, len(payload), seq, msg_crc)
-    
-    return header + payload
+    # Complete header with CRC; the only copy of the payload is this one
+    return BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, mtype, n, seq, msg_crc) + payload
 
 
 
@@ -186,8 +197,10 @@ def unpack_bin_header(header_bytes: bytes) -> BinHeader:
     if len(header_bytes) != BIN_HEADER_LEN:
         raise ValueError(f"invalid header length: {len(header_bytes)} != {BIN_HEADER_LEN}")
     
-    magic, ver, mtype, plen, seq, crc = struct.unpack(BIN_HEADER_FMT, header_bytes)
-    return BinHeader(magic=magic, version=ver, mtype=mtype, payload_len=plen, seq=seq, crc=crc)
+    magic, ver, mtype, plen, seq, crc = BIN_HEADER.unpack(header_bytes)
+    prefix_crc = zlib.crc32(header_bytes[:BIN_PREFIX_LEN])
+    return BinHeader(magic=magic, version=ver, mtype=mtype, payload_len=plen, seq=seq, crc=crc,
+                     prefix_crc=prefix_crc)
 
 
 
@@ -198,11 +211,110 @@ def validate_bin_message(header: BinHeader, payload: bytes) -> bool:
     """
     Verify message integrity using CRC32.
     
-    Recalculates CRC and compares with the one in header.
+    Recalculates CRC and compares with the one in header. Headers from
+    unpack_bin_header carry the CRC of their prefix, so only the payload
+    is hashed here.
+    """
+    start = header.prefix_crc
+    if start is None:
+        start = zlib.crc32(BIN_PREFIX.pack(header.magic, header.version, header.mtype,
+                                           header.payload_len, header.seq))
+    return zlib.crc32(payload, start) == header.crc
+
+
+# ==============================================================================
+# BATCH CODEC
+# ==============================================================================
+# pack_bin_messages frames many messages into one buffer (one send call);
+# unpack_bin_messages splits a receive buffer into every complete message
+# it holds, reading headers in place through a memoryview, and reports how
+# many bytes were consumed so the caller can keep the partial tail.
+# ==============================================================================
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def pack_bin_messages(messages: Iterable[Tuple[int, bytes, int]]) -> bytes:
+    """
+    Build many binary messages back to back in one buffer.
+    
+    Args:
+        messages: (mtype, payload, seq) tuples
+        
+    Returns:
+        bytes: The concatenated messages, identical to joining the
+        results of pack_bin_message
+    """
+    parts = []
+    append = parts.append
+    pack_prefix = BIN_PREFIX.pack
+    pack_header = BIN_HEADER.pack
+    crc = zlib.crc32
+    for mtype, payload, seq in messages:
+        if not isinstance(payload, (bytes, bytearray, memoryview)):
+            raise TypeError(f"payload must be bytes, got {type(payload)}")
+        n = len(payload)
+        if n > BIN_MAX_PAYLOAD:
+            raise ValueError(f"payload too large: {n} > {BIN_MAX_PAYLOAD}")
+        prefix = pack_prefix(BIN_MAGIC, BIN_VERSION, mtype, n, seq)
+        append(pack_header(BIN_MAGIC, BIN_VERSION, mtype, n, seq, crc(payload, crc(prefix))))
+        append(payload)
+    return b"".join(parts)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def unpack_bin_messages(data: Union[bytes, bytearray, memoryview], offset: int = 0,
+                        copy: bool = True) -> Tuple[List[Tuple[BinHeader, bytes]], int]:
+    """
+    Decode every complete message in a stream buffer.
+    
+    Headers are decoded in place (no slice per header) and carry their
+    prefix CRC, so validate_bin_message only hashes the payload. CRCs are
+    not checked here.
+    
+    A header with the wrong magic or version ends the batch: it is
+    returned with an empty payload, since its length cannot be trusted.
+    
+    Args:
+        data: Received bytes, possibly ending in a partial message
+        offset: Where the first message starts
+        copy: If False, payloads are memoryview slices of data (valid only
+            while data is not modified)
+        
+    Returns:
+        Tuple of ([(header, payload), ...], offset after the last
+        complete message)
     """
-    header_wo_crc = struct.pack("!2sBBHI", header.magic, header.version, header.mtype, header.payload_len, header.seq)
-    computed_crc = crc32(header_wo_crc + payload)
-    return computed_crc == header.crc
+    view = memoryview(data)
+    size = len(view)
+    messages = []
+    append = messages.append
+    unpack_from = BIN_HEADER.unpack_from
+    crc = zlib.crc32
+    try:
+        while size - offset >= BIN_HEADER_LEN:
+            magic, ver, mtype, plen, seq, msg_crc = unpack_from(view, offset)
+            start = offset + BIN_HEADER_LEN
+            header = BinHeader(magic, ver, mtype, plen, seq, msg_crc,
+                               crc(view[offset:offset + BIN_PREFIX_LEN]))
+            if magic != BIN_MAGIC or ver != BIN_VERSION:
+                append((header, b""))
+                offset = start
+                break
+            end = start + plen
+            if end > size:
+                break
+            append((header, view[start:end].tobytes() if copy else view[start:end]))
+            offset = end
+    finally:
+        if copy:
+            view.release()
+    return messages, offset
 
 
 # ==============================================================================
@@ -267,6 +379,95 @@ def decode_key(payload: bytes) -> str:
     return payload[1:1+klen].decode("utf-8", errors="replace")
 
 
+# ==============================================================================
+# KEYS PAGING
+# ==============================================================================
+# KEYS request: empty (first page, as many keys as fit)
+#               or limit(2) [+ key_len(1) + after_key(N)]
+# KEYS response: num_keys(2) + [key_len(1) + key(N)]... + more(1)
+# A client asks for the next page with after_key = last key received while
+# more == 1. Clients that stop after num_keys entries ignore the flag.
+# ==============================================================================
+
+KEYS_PAGE_MAX = 65535
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def encode_keys_request(limit: int = KEYS_PAGE_MAX, after: str | None = None) -> bytes:
+    """Encode a KEYS page request (keys strictly after `after`, in order)."""
+    if not 0 < limit <= KEYS_PAGE_MAX:
+        raise ValueError(f"limit out of range: {limit}")
+    head = struct.pack("!H", limit)
+    return head if after is None else head + encode_key(after)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def decode_keys_request(payload: bytes) -> Tuple[int, str | None]:
+    """Decode a KEYS request into (limit, after_key or None)."""
+    if not payload:
+        return KEYS_PAGE_MAX, None
+    if len(payload) < 2:
+        raise ValueError("truncated KEYS request")
+    limit = struct.unpack("!H", payload[:2])[0]
+    if limit == 0:
+        raise ValueError("KEYS limit must be positive")
+    after = decode_key(payload[2:]) if len(payload) > 2 else None
+    return limit, after
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def encode_keys_page(keys: List[str], more: bool) -> Tuple[bytes, int]:
+    """
+    Encode a KEYS response, stopping before the payload limit.
+    
+    Returns:
+        Tuple of (payload, number of keys encoded); when fewer than
+        len(keys) fit, the more flag is set regardless of `more`.
+    """
+    parts = []
+    size = 3  # num_keys + more flag
+    for key in keys:
+        kb = key.encode("utf-8")
+        if size + 1 + len(kb) > 65535 or len(parts) == KEYS_PAGE_MAX:
+            more = True
+            break
+        parts.append(bytes((len(kb),)) + kb)
+        size += 1 + len(kb)
+    payload = struct.pack("!H", len(parts)) + b"".join(parts) + (b"\x01" if more else b"\x00")
+    return payload, len(parts)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def decode_keys_page(payload: bytes) -> Tuple[List[str], bool]:
+    """Decode a KEYS response into (keys, more); a missing flag means no more."""
+    if len(payload) < 2:
+        return [], False
+    num_keys = struct.unpack("!H", payload[:2])[0]
+    keys = []
+    offset = 2
+    for _ in range(num_keys):
+        if offset >= len(payload):
+            break
+        klen = payload[offset]
+        offset += 1
+        keys.append(payload[offset:offset + klen].decode("utf-8", errors="replace"))
+        offset += klen
+    more = offset < len(payload) and payload[offset] == 1
+    return keys, more
+
+
 # ==============================================================================
 # UDP SENSOR PROTOCOL
 # ==============================================================================
@@ -282,6 +483,11 @@ UDP_VER = 1
 UDP_FMT_WO_CRC = "!BIf10s"  # without CRC, for calculation
 UDP_FMT = "!BIf10sI"        # complete format
 UDP_LEN = struct.calcsize(UDP_FMT)  # = 23 bytes
+UDP_STRUCT = struct.Struct(UDP_FMT)
+UDP_PREFIX = struct.Struct(UDP_FMT_WO_CRC)
+UDP_PREFIX_LEN = UDP_PREFIX.size  # = 19 bytes, covered by the CRC
+# Receive slot for batched decoding: one spare byte reveals oversized datagrams
+UDP_SLOT = struct.Struct(UDP_FMT + "x")  # = 24 bytes
 
 
 
@@ -305,13 +511,10 @@ def pack_udp_sensor(sensor_id: int, temp_c: float, location: str) -> bytes:
     loc_b = loc_b.ljust(10, b"\x00")
     
     # Build payload without CRC
-    base = struct.pack(UDP_FMT_WO_CRC, UDP_VER, sensor_id, temp_c, loc_b)
-    
-    # Calculate CRC
-    c = crc32(base)
+    base = UDP_PREFIX.pack(UDP_VER, sensor_id, temp_c, loc_b)
     
-    # Complete message
-    return struct.pack(UDP_FMT, UDP_VER, sensor_id, temp_c, loc_b, c)
+    # Calculate CRC and append it
+    return base + crc32(base).to_bytes(4, "big")
 
 
 
@@ -334,11 +537,10 @@ def unpack_udp_sensor(data: bytes) -> Tuple[int, int, float, str]:
     if len(data) != UDP_LEN:
         raise ValueError(f"invalid datagram length: {len(data)} != {UDP_LEN}")
     
-    ver, sensor_id, temp_c, loc_b, received_crc = struct.unpack(UDP_FMT, data)
+    ver, sensor_id, temp_c, loc_b, received_crc = UDP_STRUCT.unpack(data)
     
-    # Recalculate CRC for verification
-    base = struct.pack(UDP_FMT_WO_CRC, ver, sensor_id, temp_c, loc_b)
-    computed_crc = crc32(base)
+    # Recalculate CRC over the received bytes that precede it
+    computed_crc = crc32(data[:UDP_PREFIX_LEN])
     
     if computed_crc != received_crc:
         raise ValueError(f"CRC mismatch: computed {computed_crc:08x}, received {received_crc:08x}")
@@ -350,6 +552,45 @@ def unpack_udp_sensor(data: bytes) -> Tuple[int, int, float, str]:
 
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# CORE_LOGIC
+# ═══════════════════════════════════════════════════════════════════════════════
+def unpack_udp_sensors(buffer: Union[bytes, bytearray, memoryview],
+                       lengths: List[int]) -> List[Optional[Tuple[int, int, float, str]]]:
+    """
+    Decode a batch of datagrams stored in consecutive UDP_SLOT.size slots
+    (as filled by io_utils.DatagramBatch with slot_size=UDP_SLOT.size).
+    
+    All slots are unpacked by one UDP_SLOT.iter_unpack() pass and each CRC
+    is computed over a memoryview of the slot, without copying it.
+    
+    Args:
+        buffer: Slot buffer; slot i starts at i * UDP_SLOT.size
+        lengths: Bytes received in each slot (one entry per datagram)
+        
+    Returns:
+        One entry per slot: (version, sensor_id, temperature, location) as
+        from unpack_udp_sensor, or None if the length or CRC is wrong
+    """
+    view = memoryview(buffer)
+    slot = UDP_SLOT.size
+    crc = zlib.crc32
+    locations: dict = {}
+    out: List[Optional[Tuple[int, int, float, str]]] = []
+    offset = 0
+    for (ver, sensor_id, temp_c, loc_b, received_crc), length in zip(
+            UDP_SLOT.iter_unpack(view[:len(lengths) * slot]), lengths):
+        if length != UDP_LEN or crc(view[offset:offset + UDP_PREFIX_LEN]) != received_crc:
+            out.append(None)
+        else:
+            loc = locations.get(loc_b)
+            if loc is None:
+                loc = locations[loc_b] = loc_b.decode("utf-8", errors="replace").rstrip("\x00")
+            out.append((ver, sensor_id, temp_c, loc))
+        offset += slot
+    return out
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # FILE_OPERATIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Streaming statistics in constant memory.
+
+Aggregates for an unbounded stream of readings (e.g. UDP sensors) without
+keeping the readings: every estimator has a fixed size, add() is O(1) and
+reading a result is O(1) (O(buckets) for the time window).
+
+Key concepts illustrated:
+- Welford's algorithm: numerically stable running mean and variance
+- P² (Jain & Chlamtac, 1985): quantile estimate from five markers
+- Ring buckets: rolling statistics over the last N seconds
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+from __future__ import annotations
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class RunningStats:
+    """
+    Count, mean, variance, min and max of a stream (Welford).
+
+    The naive sum/sum-of-squares formula loses precision when the
+    variance is small compared to the mean; Welford updates the mean and
+    the sum of squared deviations (m2) incrementally instead.
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Same result as add() for each value, with the state kept in locals."""
+        count, mean, m2, lo, hi = self.count, self.mean, self.m2, self.min, self.max
+        for x in values:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+        self.count, self.mean, self.m2, self.min, self.max = count, mean, m2, lo, hi
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1); 0.0 for fewer than two readings."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class P2Quantile:
+    """
+    Streaming estimate of one quantile with the P² algorithm.
+
+    Five markers track the minimum, p/2, p, (1+p)/2 and the maximum. Each
+    new reading shifts the marker positions; a marker that drifts from its
+    desired position by one or more is moved and its height adjusted with
+    a piecewise-parabolic (or, failing that, linear) interpolation.
+
+    Until five readings have arrived the quantile is exact (linear
+    interpolation between order statistics, like statistics.quantiles
+    with method="inclusive").
+
+    Accuracy is best on stationary or cyclic streams; a long monotonic
+    trend (or sorted input) leaves the markers for low quantiles behind.
+    """
+
+    __slots__ = ("p", "_q", "_n", "_np", "_dn", "_count")
+
+    def __init__(self, p: float) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"quantile must be in (0, 1), got {p}")
+        self.p = p
+        self._q: List[float] = []                   # marker heights
+        self._n = [0, 1, 2, 3, 4]                   # marker positions
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # desired positions
+        self._dn = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def add(self, x: float) -> None:
+        self._count += 1
+        q = self._q
+        if self._count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        # 1. Find the cell k with q[k] <= x < q[k+1], extending the extremes
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        elif x < q[2]:
+            k = 0 if x < q[1] else 1
+        else:
+            k = 2 if x < q[3] else 3
+
+        # 2. Shift positions above the cell and the desired positions
+        #    (the two ends are pinned to 0 and count - 1)
+        n = self._n
+        if k == 0:
+            n[1] += 1
+            n[2] += 1
+            n[3] += 1
+        elif k == 1:
+            n[2] += 1
+            n[3] += 1
+        elif k == 2:
+            n[3] += 1
+        n[4] += 1
+        np_ = self._np
+        dn = self._dn
+        d1 = np_[1] + dn[1]
+        d2 = np_[2] + dn[2]
+        d3 = np_[3] + dn[3]
+        np_[1] = d1
+        np_[2] = d2
+        np_[3] = d3
+
+        # 3. Move the three middle markers that drifted by one or more;
+        #    most readings move none, so test that first
+        if -1.0 < d1 - n[1] < 1.0 and -1.0 < d2 - n[2] < 1.0 and -1.0 < d3 - n[3] < 1.0:
+            return
+        self._adjust()
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """
+        Same result as add() for each value, with the markers kept in
+        local variables for the whole batch.
+        """
+        it = iter(values)
+        if self._count < 5:
+            for x in it:
+                self.add(x)
+                if self._count == 5:
+                    break
+            else:
+                return
+        q, n, np_ = self._q, self._n, self._np
+        q0, q1, q2, q3, q4 = q
+        _, n1, n2, n3, n4 = n
+        _, d1, d2, d3, _ = np_
+        _, i1, i2, i3, _ = self._dn
+        count = self._count
+        for x in it:
+            count += 1
+            if x < q0:
+                q0 = x
+                n1 += 1
+                n2 += 1
+                n3 += 1
+            elif x >= q4:
+                q4 = x
+            elif x < q2:
+                if x < q1:
+                    n1 += 1
+                n2 += 1
+                n3 += 1
+            elif x < q3:
+                n3 += 1
+            n4 += 1
+            d1 += i1
+            d2 += i2
+            d3 += i3
+            if -1.0 < d1 - n1 < 1.0 and -1.0 < d2 - n2 < 1.0 and -1.0 < d3 - n3 < 1.0:
+                continue
+            # Step 3 of add(), unrolled over the locals (marker 0 sits at 0)
+            m = d1 - n1
+            if (m >= 1.0 and n2 - n1 > 1) or (m <= -1.0 and n1 > 1):
+                s = 1 if m > 0 else -1
+                q1 = _p2_move(q0, q1, q2, 0, n1, n2, s)
+                n1 += s
+            m = d2 - n2
+            if (m >= 1.0 and n3 - n2 > 1) or (m <= -1.0 and n1 - n2 < -1):
+                s = 1 if m > 0 else -1
+                q2 = _p2_move(q1, q2, q3, n1, n2, n3, s)
+                n2 += s
+            m = d3 - n3
+            if (m >= 1.0 and n4 - n3 > 1) or (m <= -1.0 and n2 - n3 < -1):
+                s = 1 if m > 0 else -1
+                q3 = _p2_move(q2, q3, q4, n2, n3, n4, s)
+                n3 += s
+        q[:] = q0, q1, q2, q3, q4
+        n[1:] = n1, n2, n3, n4
+        np_[1:4] = d1, d2, d3
+        self._count = count
+
+    def _adjust(self) -> None:
+        """Step 3 of add(): parabolic (or linear) move of drifted markers."""
+        q, n, np_ = self._q, self._n, self._np
+        for i in (1, 2, 3):
+            d = np_[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1) or (d <= -1.0 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                q[i] = _p2_move(q[i - 1], q[i], q[i + 1], n[i - 1], n[i], n[i + 1], s)
+                n[i] += s
+
+    @property
+    def value(self) -> float:
+        """Current estimate; 0.0 before the first reading."""
+        q = self._q
+        if self._count > 5:
+            return q[2]
+        if not q:
+            return 0.0
+        pos = self.p * (len(q) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(q) - 1)
+        return q[lo] + (q[hi] - q[lo]) * (pos - lo)
+
+
+def _p2_move(qa: float, qi: float, qb: float, na: int, ni: int, nb: int, s: int) -> float:
+    """New height of a marker moved by s (+1/-1) between neighbours a and b."""
+    qn = qi + s / (nb - na) * (
+        (ni - na + s) * (qb - qi) / (nb - ni)
+        + (nb - ni - s) * (qi - qa) / (ni - na))
+    if qa < qn < qb:
+        return qn
+    # Parabolic estimate left the bracket: interpolate linearly instead
+    if s > 0:
+        return qi + s * (qb - qi) / (nb - ni)
+    return qi + s * (qa - qi) / (na - ni)
+
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLASS_DEFINITION
+# ═══════════════════════════════════════════════════════════════════════════════
+class WindowedStats:
+    """
+    Count, mean, min and max over the last `window` seconds.
+
+    Time is cut into `buckets` slots of window/buckets seconds kept in a
+    ring; a slot is cleared when the clock reaches it again. Results cover
+    the current slot and the ones before it, so the window edge moves in
+    steps of one slot.
+
+    Timestamps are seconds from any monotonic clock (time.monotonic()).
+    """
+
+    __slots__ = ("window", "width", "_slot_id", "_count", "_total", "_min", "_max")
+
+    def __init__(self, window: float = 60.0, buckets: int = 12) -> None:
+        if window <= 0 or buckets < 1:
+            raise ValueError("window must be positive and buckets >= 1")
+        self.window = window
+        self.width = window / buckets
+        self._slot_id = [-1] * buckets   # which time slot each bucket holds
+        self._count = [0] * buckets
+        self._total = [0.0] * buckets
+        self._min = [math.inf] * buckets
+        self._max = [-math.inf] * buckets
+
+    def add(self, x: float, now: float) -> None:
+        slot = int(now // self.width)
+        i = slot % len(self._slot_id)
+        if self._slot_id[i] != slot:
+            self._slot_id[i] = slot
+            self._count[i] = 0
+            self._total[i] = 0.0
+            self._min[i] = math.inf
+            self._max[i] = -math.inf
+        self._count[i] += 1
+        self._total[i] += x
+        if x < self._min[i]:
+            self._min[i] = x
+        if x > self._max[i]:
+            self._max[i] = x
+
+    def add_many(self, values: Sequence[float], now: float) -> None:
+        """Add readings that arrived together (one slot lookup for all)."""
+        if not values:
+            return
+        slot = int(now // self.width)
+        i = slot % len(self._slot_id)
+        if self._slot_id[i] != slot:
+            self._slot_id[i] = slot
+            self._count[i] = 0
+            self._total[i] = 0.0
+            self._min[i] = math.inf
+            self._max[i] = -math.inf
+        self._count[i] += len(values)
+        self._total[i] += sum(values)
+        self._min[i] = min(self._min[i], min(values))
+        self._max[i] = max(self._max[i], max(values))
+
+    def snapshot(self, now: float) -> Tuple[int, Optional[float], Optional[float], Optional[float]]:
+        """Return (count, mean, min, max) for the window ending at `now`."""
+        newest = int(now // self.width)
+        oldest = newest - len(self._slot_id)
+        count = 0
+        total = 0.0
+        lo = math.inf
+        hi = -math.inf
+        for i, slot in enumerate(self._slot_id):
+            if oldest < slot <= newest:
+                count += self._count[i]
+                total += self._total[i]
+                lo = min(lo, self._min[i])
+                hi = max(hi, self._max[i])
+        if not count:
+            return 0, None, None, None
+        return count, total / count, lo, hi
+
+
+if __name__ == "__main__":
+    # Module loaded directly - display module info
+    print(f"Module {__name__} loaded successfully.")
+    print(f"This module provides utility functions for the networking laboratory.")
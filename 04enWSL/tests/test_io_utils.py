@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Buffered Socket Reader Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Tests BufferedSocketReader from io_utils.py over socket pairs: exact reads,
+delimiters split across recv() calls, buffer growth, limits and EOF, plus
+the text protocol server answering pipelined frames through it.
+
+Usage:
+    python tests/test_io_utils.py
+    python -m pytest tests/test_io_utils.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import random
+import socket
+import threading
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from io_utils import BufferedSocketReader, recv_exact
+from text_proto_server import handle_client
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_BUFFERED_READER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestBufferedSocketReader(unittest.TestCase):
+    """Framing primitives on top of one buffered recv_into()."""
+
+    def pair(self, bufsize=64):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        return a, BufferedSocketReader(b, bufsize)
+
+    def send_in_pieces(self, sock, data, seed=0):
+        """Send data in random small writes from another thread."""
+        rng = random.Random(seed)
+
+        def run():
+            pos = 0
+            while pos < len(data):
+                step = rng.randrange(1, 50)
+                sock.sendall(data[pos:pos + step])
+                pos += step
+
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        self.addCleanup(t.join, 5)
+
+    def test_read_exact_and_buffered(self):
+        writer, reader = self.pair()
+        writer.sendall(b"abcdefgh")
+        self.assertEqual(reader.read_exact(3), b"abc")
+        self.assertEqual(reader.buffered, 5)
+        self.assertEqual(reader.read_exact(0), b"")
+        self.assertEqual(reader.read_exact(5), b"defgh")
+        self.assertEqual(reader.buffered, 0)
+
+    def test_grows_for_large_reads(self):
+        writer, reader = self.pair(bufsize=16)
+        data = bytes(range(256)) * 40
+        self.send_in_pieces(writer, data)
+        self.assertEqual(reader.read_exact(7), data[:7])
+        self.assertEqual(reader.read_exact(len(data) - 7), data[7:])
+
+    def test_lines_split_across_recvs(self):
+        writer, reader = self.pair(bufsize=32)
+        lines = [f"line {i} " + "x" * (i % 70) for i in range(300)]
+        self.send_in_pieces(writer, "".join(line + "\n" for line in lines).encode(), seed=1)
+        self.assertEqual([reader.read_line() for _ in lines], lines)
+
+    def test_multibyte_delimiter(self):
+        writer, reader = self.pair(bufsize=8)
+        messages = [b"GET / HTTP/1.1", b"Host: a", b"", b"tail"]
+        self.send_in_pieces(writer, b"\r\n".join(messages) + b"\r\n", seed=2)
+        self.assertEqual([reader.read_until(b"\r\n") for _ in messages],
+                         [m + b"\r\n" for m in messages])
+
+    def test_frames(self):
+        writer, reader = self.pair(bufsize=16)
+        payloads = [bytes([i]) * (i * 37 % 300) for i in range(100)]
+        self.send_in_pieces(writer, b"".join(len(p).to_bytes(2, "big") + p for p in payloads), seed=3)
+        self.assertEqual([reader.read_frame() for _ in payloads], payloads)
+
+    def test_limits(self):
+        writer, reader = self.pair()
+        writer.sendall(b"0123456789abcdef\n")
+        with self.assertRaises(ValueError):
+            reader.read_until(b"\n", max_bytes=10)
+        writer2, reader2 = self.pair()
+        writer2.sendall(b"\x01\x00" + b"x" * 256)
+        with self.assertRaises(ValueError):
+            reader2.read_frame(max_bytes=255)
+
+    def test_delimiter_at_limit(self):
+        writer, reader = self.pair()
+        writer.sendall(b"12345 ")
+        self.assertEqual(reader.read_until(b" ", max_bytes=5), b"12345 ")
+
+    def test_eof(self):
+        writer, reader = self.pair()
+        writer.sendall(b"partial")
+        writer.shutdown(socket.SHUT_WR)
+        with self.assertRaises(ConnectionError):
+            reader.read_line()
+        writer2, reader2 = self.pair()
+        writer2.sendall(b"abc")
+        writer2.shutdown(socket.SHUT_WR)
+        with self.assertRaises(ConnectionError):
+            reader2.read_exact(4)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_TEXT_SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestTextServerPipelining(unittest.TestCase):
+    """handle_client answers frames that arrive together, in order."""
+
+    def test_pipelined_frames(self):
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        state = {}
+        t = threading.Thread(target=handle_client,
+                             args=(server, ("pair", 0), state, threading.Lock(), False),
+                             daemon=True)
+        t.start()
+        commands = [f"SET k{i} v{i}" for i in range(50)] + ["COUNT", "QUIT"]
+        client.sendall(b"".join(f"{len(c.encode())} {c}".encode() for c in commands))
+        replies = []
+        for _ in commands:
+            prefix = b""
+            while not prefix.endswith(b" "):
+                prefix += recv_exact(client, 1)
+            replies.append(recv_exact(client, int(prefix)).decode())
+        t.join(5)
+        self.assertEqual(replies[:2], ["OK stored k0", "OK stored k1"])
+        self.assertEqual(replies[-2:], ["OK 50 keys", "OK bye"])
+        self.assertEqual(len(state), 50)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Binary Protocol KV Server Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Tests the sharded store, KEYS paging and both concurrency models of
+binary_proto_server.py on loopback ports (no Docker needed).
+
+Usage:
+    python tests/test_kv_server.py
+    python -m pytest tests/test_kv_server.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import socket
+import threading
+import time
+import unittest
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from binary_proto_client import BinaryClient, PipelinedClient
+from binary_proto_server import BinaryProtoServer, ShardedStore, process_request
+from proto_common import (
+    BIN_HEADER_LEN, TYPE_ECHO_REQ, TYPE_ECHO_RESP, TYPE_KEYS_REQ, TYPE_ERR,
+    pack_bin_message, unpack_bin_header, encode_keys_request, decode_keys_page, encode_keys_page
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SHARDED_STORE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestShardedStore(unittest.TestCase):
+    """Store semantics and the sorted key index."""
+
+    def test_put_get_overwrite(self):
+        store = ShardedStore(4)
+        store.put("a", "1")
+        store.put("a", "2")
+        self.assertEqual(store.get("a"), "2")
+        self.assertIsNone(store.get("missing"))
+        self.assertEqual(len(store), 1)
+
+    def test_empty_value_is_found(self):
+        store = ShardedStore(4)
+        store.put("empty", "")
+        self.assertEqual(store.get("empty"), "")
+
+    def test_concurrent_writers(self):
+        store = ShardedStore(8)
+
+        def writer(t):
+            for i in range(2000):
+                store.put(f"t{t}-{i:04d}", str(i))
+
+        threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(store), 16000)
+        keys = store.keys_page(limit=20000)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(keys), 16000)
+
+    def test_pages_follow_cursor(self):
+        store = ShardedStore(5)
+        names = [f"k{i:03d}" for i in range(250)]
+        for name in reversed(names):
+            store.put(name, "v")
+        self.assertEqual(store.keys_page(limit=3), names[:3])
+        self.assertEqual(store.keys_page("k100", 2), ["k101", "k102"])
+        self.assertEqual(store.keys_page("k099x", 1), ["k100"])
+        self.assertEqual(store.keys_page("k249", 10), [])
+
+    def test_rejects_zero_shards(self):
+        with self.assertRaises(ValueError):
+            ShardedStore(0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_KEYS_PAGING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestKeysPaging(unittest.TestCase):
+    """KEYS request/response encoding and server-side paging."""
+
+    def keys_request(self, store, payload):
+        resp = process_request(TYPE_KEYS_REQ, 1, payload, store)
+        header = unpack_bin_header(resp[:BIN_HEADER_LEN])
+        return header.mtype, resp[BIN_HEADER_LEN:]
+
+    def test_limit_and_more_flag(self):
+        store = ShardedStore(3)
+        for i in range(10):
+            store.put(f"key{i}", "v")
+        _, body = self.keys_request(store, encode_keys_request(4))
+        self.assertEqual(decode_keys_page(body), (["key0", "key1", "key2", "key3"], True))
+        _, body = self.keys_request(store, encode_keys_request(4, "key7"))
+        self.assertEqual(decode_keys_page(body), (["key8", "key9"], False))
+
+    def test_page_stops_at_payload_limit(self):
+        store = ShardedStore(4)
+        for i in range(1000):
+            store.put(f"{i:04d}" + "x" * 196, "v")
+        _, body = self.keys_request(store, b"")
+        keys, more = decode_keys_page(body)
+        self.assertTrue(more)
+        self.assertLessEqual(len(body), 65535)
+        self.assertEqual(len(keys), (65535 - 3) // 201)
+
+    def test_bad_request(self):
+        mtype, _ = self.keys_request(ShardedStore(1), b"\x00")
+        self.assertEqual(mtype, TYPE_ERR)
+
+    def test_old_clients_ignore_flag(self):
+        body, n = encode_keys_page(["a", "b"], more=False)
+        self.assertEqual(n, 2)
+        self.assertEqual(body[:2], b"\x00\x02")
+        self.assertEqual(decode_keys_page(body[:-1]), (["a", "b"], False))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestServer(unittest.TestCase):
+    """Both concurrency models over loopback."""
+
+    def start(self, workers):
+        server = BinaryProtoServer("127.0.0.1", 0, ShardedStore(4), workers=workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        return server
+
+    def connect(self, server):
+        client = BinaryClient(*server.address)
+        client.connect()
+        self.addCleanup(client.close)
+        return client
+
+    def test_commands(self):
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                client = self.connect(self.start(workers))
+                self.assertEqual(client.echo(b"hi"), b"hi")
+                self.assertTrue(client.put("b", "2"))
+                self.assertTrue(client.put("a", "1"))
+                self.assertEqual(client.get("a"), "1")
+                self.assertIsNone(client.get("zz"))
+                self.assertEqual(client.count(), 2)
+                self.assertEqual(client.keys(), ["a", "b"])
+
+    def test_keys_across_pages(self):
+        server = self.start(2)
+        names = [f"key-{i:05d}-" + "p" * 40 for i in range(3000)]
+        for name in names:
+            server.store.put(name, "v")
+        self.assertEqual(self.connect(server).keys(), names)
+
+    def test_more_clients_than_workers(self):
+        server = self.start(2)
+        errors = []
+
+        def run(n):
+            try:
+                client = BinaryClient(*server.address)
+                client.connect()
+                for i in range(50):
+                    client.put(f"c{n}-{i}", str(i))
+                    if client.get(f"c{n}-{i}") != str(i):
+                        errors.append((n, i))
+                client.close()
+            except Exception as e:
+                errors.append(e)
+
+        # 20 open connections share two workers; an idle connection
+        # must not pin a worker
+        clients = [threading.Thread(target=run, args=(n,)) for n in range(20)]
+        for t in clients:
+            t.start()
+        for t in clients:
+            t.join(30)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(server.store), 20 * 50)
+
+    def test_stalled_clients_do_not_block_workers(self):
+        server = self.start(2)
+        stalled = []
+        for _ in range(3):
+            sock = socket.create_connection(server.address)
+            self.addCleanup(sock.close)
+            sock.sendall(pack_bin_message(TYPE_ECHO_REQ, b"partial", 1)[:3])
+            stalled.append(sock)
+        client = self.connect(server)
+        client.conn.settimeout(3)
+        self.assertEqual(client.echo(b"alive"), b"alive")
+        # A stalled client that finishes its frame is still answered
+        stalled[0].sendall(pack_bin_message(TYPE_ECHO_REQ, b"partial", 1)[3:])
+        stalled[0].settimeout(3)
+        header = unpack_bin_header(_recv_exact(stalled[0], BIN_HEADER_LEN))
+        self.assertEqual((header.mtype, header.seq), (TYPE_ECHO_RESP, 1))
+        self.assertEqual(_recv_exact(stalled[0], header.payload_len), b"partial")
+
+    @unittest.skipUnless(resource is not None, "needs the resource module")
+    def test_descriptors_above_fd_setsize(self):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < 2048:
+            if hard != resource.RLIM_INFINITY and hard < 2048:
+                self.skipTest("RLIMIT_NOFILE too low for 1024+ descriptors")
+            resource.setrlimit(resource.RLIMIT_NOFILE, (2048, hard))
+            self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+        server = self.start(2)
+        # 600 idle clients: both ends live in this process, so the server's
+        # descriptor for the last client is well above 1024
+        for _ in range(600):
+            sock = socket.create_connection(server.address)
+            self.addCleanup(sock.close)
+        client = self.connect(server)
+        self.assertGreater(client.conn.fileno(), 1024)
+        client.conn.settimeout(3)
+        self.assertTrue(client.put("late", "1"))
+        self.assertEqual(client.get("late"), "1")
+
+    def test_message_split_across_segments(self):
+        server = self.start(1)
+        sock = socket.create_connection(server.address)
+        self.addCleanup(sock.close)
+        sock.settimeout(3)
+        msg = pack_bin_message(TYPE_ECHO_REQ, b"x" * 5000, 9)
+        for i in range(0, len(msg), 700):
+            sock.sendall(msg[i:i + 700])
+            time.sleep(0.005)
+        header = unpack_bin_header(_recv_exact(sock, BIN_HEADER_LEN))
+        self.assertEqual(header.seq, 9)
+        self.assertEqual(_recv_exact(sock, header.payload_len), b"x" * 5000)
+
+    def test_pipelined_requests_answered_in_order(self):
+        server = self.start(1)
+        client = self.connect(server)
+        sock = client.conn
+        sock.sendall(b"".join(pack_bin_message(TYPE_ECHO_REQ, f"m{i}".encode(), i)
+                              for i in range(100)))
+        for i in range(100):
+            header = unpack_bin_header(_recv_exact(sock, BIN_HEADER_LEN))
+            self.assertEqual(header.seq, i)
+            self.assertEqual(_recv_exact(sock, header.payload_len), f"m{i}".encode())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_PIPELINED_CLIENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestPipelinedClient(unittest.TestCase):
+    """Many requests in flight, matched to responses by seq."""
+
+    def setUp(self):
+        self.server = BinaryProtoServer("127.0.0.1", 0, ShardedStore(4), workers=2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.shutdown)
+        self.client = PipelinedClient(*self.server.address, timeout=10)
+        self.client.connect()
+        self.addCleanup(self.client.close)
+
+    def test_sync_api(self):
+        self.assertEqual(self.client.echo(b"hi"), b"hi")
+        self.assertTrue(self.client.put("k", "v"))
+        self.assertEqual(self.client.get("k"), "v")
+        self.assertIsNone(self.client.get("nope"))
+        self.assertEqual(self.client.count(), 1)
+        self.assertEqual(self.client.keys(), ["k"])
+
+    def test_bulk_in_order(self):
+        items = [(f"k{i:05d}", "v" * (i % 300)) for i in range(3000)]
+        for depth in (1, 7, 256):
+            with self.subTest(depth=depth):
+                self.assertTrue(all(self.client.put_many(items, depth=depth)))
+                keys = [k for k, _ in items] + ["missing"]
+                self.assertEqual(self.client.get_many(keys, depth=depth),
+                                 [v for _, v in items] + [None])
+
+    def test_shared_between_threads(self):
+        errors = []
+
+        def run(t):
+            for i in range(200):
+                key = f"t{t}-{i}"
+                self.client.put(key, key)
+                if self.client.get(key) != key:
+                    errors.append(key)
+
+        threads = [threading.Thread(target=run, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.client.count(), 1600)
+
+    def test_rejects_bad_depth(self):
+        with self.assertRaises(ValueError):
+            self.client.request_many([(TYPE_ECHO_REQ, b"")], depth=0)
+
+
+class TestPipelinedClientOrdering(unittest.TestCase):
+    """Responses are matched by seq, not by arrival order."""
+
+    def fake_server(self, behaviour):
+        srv = socket.socket()
+        srv.bind(("127.0.0.1", 0))
+        srv.listen(1)
+        self.addCleanup(srv.close)
+
+        def run():
+            conn, _ = srv.accept()
+            with conn:
+                behaviour(conn)
+
+        threading.Thread(target=run, daemon=True).start()
+        return srv.getsockname()
+
+    def read_requests(self, conn, n):
+        requests = []
+        for _ in range(n):
+            header = unpack_bin_header(_recv_exact(conn, BIN_HEADER_LEN))
+            requests.append((header.seq, _recv_exact(conn, header.payload_len)))
+        return requests
+
+    def test_out_of_order_responses(self):
+        def reverse(conn):
+            for seq, payload in reversed(self.read_requests(conn, 10)):
+                conn.sendall(pack_bin_message(TYPE_ECHO_RESP, payload, seq))
+            conn.recv(1)
+
+        client = PipelinedClient(*self.fake_server(reverse), timeout=10)
+        client.connect()
+        self.addCleanup(client.close)
+        replies = client.request_many([(TYPE_ECHO_REQ, f"m{i}".encode()) for i in range(10)], depth=10)
+        self.assertEqual([p for _, p in replies], [f"m{i}".encode() for i in range(10)])
+
+    def test_pending_fail_when_server_closes(self):
+        client = PipelinedClient(*self.fake_server(lambda conn: self.read_requests(conn, 1)), timeout=10)
+        client.connect()
+        self.addCleanup(client.close)
+        future = client.submit(TYPE_ECHO_REQ, b"lost")
+        with self.assertRaises(ConnectionError):
+            future.result(10)
+        with self.assertRaises(ConnectionError):
+            client.submit(TYPE_ECHO_REQ, b"after")
+
+    def test_timed_out_requests_leave_pending(self):
+        def silent(conn):
+            self.read_requests(conn, 4)
+            conn.recv(1)
+
+        client = PipelinedClient(*self.fake_server(silent), timeout=0.2)
+        client.connect()
+        self.addCleanup(client.close)
+        with self.assertRaises(TimeoutError):
+            client.echo(b"slow")
+        self.assertEqual(client._pending, {})
+        with self.assertRaises(TimeoutError):
+            client.request_many([(TYPE_ECHO_REQ, b"x")] * 3, depth=3)
+        self.assertEqual(client._pending, {})
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("closed")
+        data += chunk
+    return data
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
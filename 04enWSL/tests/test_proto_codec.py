@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Binary Codec Round-Trip Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Property tests for the binary protocol codec in proto_common.py: random
+messages must survive pack/unpack singly and in batches, a stream split at
+arbitrary points must decode to the same messages, and the precompiled
+codec must produce exactly the bytes of the original two-pass packing.
+
+Usage:
+    python tests/test_proto_codec.py
+    python -m pytest tests/test_proto_codec.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import random
+import struct
+import zlib
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from proto_common import (
+    BIN_HEADER_LEN, BIN_MAX_PAYLOAD, BinHeader,
+    pack_bin_message, pack_bin_messages, unpack_bin_header, unpack_bin_messages,
+    validate_bin_message,
+)
+
+
+def random_messages(rng, count, max_len=300):
+    """(mtype, payload, seq) tuples with random payloads of 0..max_len bytes."""
+    messages = []
+    for _ in range(count):
+        n = rng.randrange(max_len)
+        payload = rng.getrandbits(8 * n).to_bytes(n, "big") if n else b""
+        messages.append((rng.randrange(256), payload, rng.getrandbits(32)))
+    return messages
+
+
+def legacy_pack(mtype, payload, seq):
+    """The original implementation: pack twice, CRC over a concatenation."""
+    header_wo_crc = struct.pack("!2sBBHI", b"NP", 1, mtype, len(payload), seq)
+    msg_crc = zlib.crc32(header_wo_crc + payload) & 0xFFFFFFFF
+    return struct.pack("!2sBBHII", b"NP", 1, mtype, len(payload), seq, msg_crc) + payload
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SINGLE_MESSAGE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSingleMessage(unittest.TestCase):
+    """pack_bin_message / unpack_bin_header / validate_bin_message."""
+
+    def test_matches_legacy_bytes(self):
+        rng = random.Random(1)
+        for mtype, payload, seq in random_messages(rng, 500):
+            self.assertEqual(pack_bin_message(mtype, payload, seq), legacy_pack(mtype, payload, seq))
+
+    def test_round_trip(self):
+        rng = random.Random(2)
+        for mtype, payload, seq in random_messages(rng, 500):
+            msg = pack_bin_message(mtype, payload, seq)
+            header = unpack_bin_header(msg[:BIN_HEADER_LEN])
+            self.assertEqual((header.mtype, header.payload_len, header.seq), (mtype, len(payload), seq))
+            self.assertTrue(header.is_valid_protocol())
+            self.assertTrue(validate_bin_message(header, msg[BIN_HEADER_LEN:]))
+
+    def test_limits(self):
+        self.assertEqual(len(pack_bin_message(1, b"x" * BIN_MAX_PAYLOAD, 0)), BIN_HEADER_LEN + BIN_MAX_PAYLOAD)
+        with self.assertRaises(ValueError):
+            pack_bin_message(1, b"x" * (BIN_MAX_PAYLOAD + 1), 0)
+        with self.assertRaises(TypeError):
+            pack_bin_message(1, "text", 0)
+
+    def test_hand_built_header_validates(self):
+        msg = pack_bin_message(5, b"payload", 42)
+        parsed = unpack_bin_header(msg[:BIN_HEADER_LEN])
+        manual = BinHeader(parsed.magic, parsed.version, parsed.mtype,
+                           parsed.payload_len, parsed.seq, parsed.crc)
+        self.assertIsNone(manual.prefix_crc)
+        self.assertEqual(manual, parsed)
+        self.assertTrue(validate_bin_message(manual, b"payload"))
+        self.assertFalse(validate_bin_message(manual, b"paylaod"))
+
+    def test_any_flipped_bit_is_detected(self):
+        rng = random.Random(3)
+        msg = bytearray(pack_bin_message(3, bytes(range(64)), 0xDEADBEEF))
+        # Bits of type, seq and payload; magic/version/length change framing
+        positions = [3] + list(range(6, 10)) + list(range(BIN_HEADER_LEN, len(msg)))
+        for pos in positions:
+            corrupt = bytearray(msg)
+            corrupt[pos] ^= 1 << rng.randrange(8)
+            header = unpack_bin_header(bytes(corrupt[:BIN_HEADER_LEN]))
+            self.assertFalse(validate_bin_message(header, bytes(corrupt[BIN_HEADER_LEN:])), pos)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_BATCH_CODEC
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestBatchCodec(unittest.TestCase):
+    """pack_bin_messages / unpack_bin_messages."""
+
+    def test_batch_equals_joined_singles(self):
+        messages = random_messages(random.Random(4), 300)
+        self.assertEqual(pack_bin_messages(messages),
+                         b"".join(pack_bin_message(*m) for m in messages))
+        self.assertEqual(pack_bin_messages([]), b"")
+
+    def test_round_trip(self):
+        messages = random_messages(random.Random(5), 300)
+        data = pack_bin_messages(messages)
+        decoded, consumed = unpack_bin_messages(data)
+        self.assertEqual(consumed, len(data))
+        self.assertEqual([(h.mtype, p, h.seq) for h, p in decoded], messages)
+        self.assertTrue(all(validate_bin_message(h, p) for h, p in decoded))
+
+    def test_stream_split_anywhere(self):
+        rng = random.Random(6)
+        messages = random_messages(rng, 200)
+        data = pack_bin_messages(messages)
+        for _ in range(20):
+            buf = bytearray()
+            received = []
+            pos = 0
+            while pos < len(data):
+                step = rng.choice([1, 7, BIN_HEADER_LEN, 100, 1000, 5000])
+                buf += data[pos:pos + step]
+                pos += step
+                decoded, consumed = unpack_bin_messages(buf)
+                received.extend((h.mtype, p, h.seq) for h, p in decoded)
+                del buf[:consumed]
+            self.assertEqual(received, messages)
+            self.assertEqual(buf, b"")
+
+    def test_offset_and_views(self):
+        data = b"junk" + pack_bin_messages([(1, b"abc", 1), (2, b"defg", 2)]) + b"NP"
+        decoded, consumed = unpack_bin_messages(data, offset=4, copy=False)
+        self.assertEqual([bytes(p) for _, p in decoded], [b"abc", b"defg"])
+        self.assertIsInstance(decoded[0][1], memoryview)
+        self.assertEqual(consumed, len(data) - 2)
+
+    def test_bad_magic_stops_batch(self):
+        good = pack_bin_message(1, b"ok", 1)
+        data = good + b"XX" + good[2:] + good
+        decoded, consumed = unpack_bin_messages(data)
+        self.assertEqual(len(decoded), 2)
+        self.assertFalse(decoded[1][0].is_valid_protocol())
+        self.assertEqual(decoded[1][1], b"")
+        self.assertEqual(consumed, len(good) + BIN_HEADER_LEN)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
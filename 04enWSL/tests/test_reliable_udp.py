@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Reliable UDP Transfer Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Tests the selective-repeat engine of the homework 4.2 reference solution
+(homework/solutions/hw_4_02_reliable_udp_transfer_solution.py): packet
+codec, RTT estimation and Karn's rule, SACK ranges, the retransmission
+timer wheel, congestion control, loss recovery driven in virtual time, the
+simulated lossy link and transfers over loopback sockets.
+
+Usage:
+    python tests/test_reliable_udp.py
+    python -m pytest tests/test_reliable_udp.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import heapq
+import itertools
+import os
+import random
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import homework.solutions.hw_4_02_reliable_udp_transfer_solution as hw
+from homework.solutions.hw_4_02_reliable_udp_transfer_solution import (
+    AIMDControl,
+    CubicControl,
+    FixedWindow,
+    Flags,
+    MAX_TIMEOUT,
+    MIN_TIMEOUT,
+    Packet,
+    PacketLossSimulator,
+    RangeSet,
+    ReliableReceiver,
+    ReliableSender,
+    RTTEstimator,
+    SelectiveRepeatReceiver,
+    SelectiveRepeatSender,
+    TimerWheel,
+    decode_sack,
+    encode_sack,
+    make_congestion,
+    simulate_transfer,
+)
+
+
+def transfer(data, drop=(), congestion="aimd", rtt=0.05, chunk_size=100, max_backoffs=15):
+    """
+    Drive sender and receiver in virtual time over a fixed-delay path.
+
+    drop: {(seq, n)} loses the n-th transmission of seq. Returns the
+    sender, the delivered bytes and the transmissions per seq.
+    """
+    sender = SelectiveRepeatSender(data, chunk_size=chunk_size, congestion=make_congestion(congestion),
+                                   max_backoffs=max_backoffs)
+    receiver = SelectiveRepeatReceiver()
+    sent = Counter()
+    events = []
+    order = itertools.count()
+    delivered = []
+    now = 0.0
+
+    def push(packets):
+        for packet, _ in packets:
+            sent[packet.seq_num] += 1
+            if (packet.seq_num, sent[packet.seq_num]) not in drop:
+                heapq.heappush(events, (now + rtt / 2, next(order), packet))
+
+    push(sender.poll(now))
+    while not sender.done:
+        deadline = sender.next_deadline()
+        if events and (deadline is None or events[0][0] <= deadline):
+            now, _, packet = heapq.heappop(events)
+            if packet.is_data():
+                heapq.heappush(events, (now + rtt / 2, next(order), receiver.on_data(packet)))
+                delivered.append(receiver.take())
+                continue
+            sender.on_ack(packet, now)
+        else:
+            now = deadline
+        push(sender.poll(now))
+    return sender, b"".join(delivered), sent
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_PACKET
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestPacket(unittest.TestCase):
+    """Header + payload serialisation with CRC32."""
+
+    def test_round_trip(self):
+        for payload in (b"", b"x", bytes(range(256)) * 4):
+            packet = Packet(seq_num=2**32 - 1, ack_num=7, flags=Flags.DATA | Flags.FIN, window=1024, payload=payload)
+            data = packet.to_bytes()
+            self.assertEqual(len(data), hw.HEADER_SIZE + len(payload))
+            self.assertEqual(Packet.from_bytes(data), packet)
+
+    def test_detects_corruption(self):
+        data = Packet(seq_num=1, ack_num=0, flags=Flags.DATA, window=4, payload=b"Test data").to_bytes()
+        for i in range(len(data)):
+            corrupt = bytearray(data)
+            corrupt[i] ^= 0x10
+            self.assertIsNone(Packet.from_bytes(bytes(corrupt)), i)
+
+    def test_rejects_short_and_length_mismatch(self):
+        data = Packet(seq_num=1, ack_num=0, flags=Flags.DATA, window=4, payload=b"abc").to_bytes()
+        self.assertIsNone(Packet.from_bytes(data[:10]))
+        self.assertIsNone(Packet.from_bytes(data[:-1]))
+        self.assertIsNone(Packet.from_bytes(data + b"\x00"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_RTT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRTTEstimator(unittest.TestCase):
+    """RFC 6298 estimate, backoff and bounds."""
+
+    def test_first_sample_and_ewma(self):
+        rtt = RTTEstimator(initial_rtt=1.0)
+        rtt.update(0.4)
+        self.assertEqual((rtt.estimated_rtt, rtt.dev_rtt), (0.4, 0.2))
+        self.assertAlmostEqual(rtt.get_timeout(), 0.4 + 0.8)
+        rtt.update(0.8)
+        self.assertAlmostEqual(rtt.dev_rtt, 0.75 * 0.2 + 0.25 * 0.4)
+        self.assertAlmostEqual(rtt.estimated_rtt, 0.875 * 0.4 + 0.125 * 0.8)
+
+    def test_margin_floor_on_steady_path(self):
+        rtt = RTTEstimator()
+        for _ in range(200):
+            rtt.update(0.3)
+        self.assertAlmostEqual(rtt.get_timeout(), 0.3 + MIN_TIMEOUT, places=3)
+
+    def test_backoff_doubles_until_cap_and_resets(self):
+        rtt = RTTEstimator()
+        rtt.update(0.1)
+        base = rtt.get_timeout()
+        rtt.backoff()
+        self.assertAlmostEqual(rtt.get_timeout(), 2 * base)
+        for _ in range(20):
+            rtt.backoff()
+        self.assertEqual(rtt.get_timeout(), MAX_TIMEOUT)
+        rtt.update(0.1)
+        self.assertLess(rtt.get_timeout(), 2 * base)
+
+    def test_karn_skips_retransmitted_segments(self):
+        # Segment 5 is resent: its ACK gives no sample, every other one does
+        sender, data, sent = transfer(bytes(3000), drop={(5, 1)})
+        self.assertEqual(sent[5], 2)
+        self.assertEqual(sender.stats["rtt_samples"], 29)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SACK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRangeSet(unittest.TestCase):
+    """Merged ranges against a plain set of sequence numbers."""
+
+    def test_against_brute_force(self):
+        rng = random.Random(5)
+        ranges, covered = RangeSet(), set()
+        for _ in range(2000):
+            start = rng.randrange(500)
+            end = start + rng.randrange(1, 12)
+            new = ranges.add(start, end)
+            fresh = set(range(start, end)) - covered
+            self.assertEqual({s for a, b in new for s in range(a, b)}, fresh)
+            covered |= fresh
+            self.assertEqual({s for a, b in ranges for s in range(a, b)}, covered)
+            self.assertTrue(all(b < c for (_, b), (c, _) in zip(ranges, list(ranges)[1:])))
+            if rng.random() < 0.02:
+                below = rng.randrange(500)
+                ranges.trim(below)
+                covered = {s for s in covered if s >= below}
+
+    def test_find(self):
+        ranges = RangeSet()
+        ranges.add(10, 20)
+        ranges.add(30, 31)
+        self.assertEqual(ranges.find(15), (10, 20))
+        self.assertEqual(ranges.find(30), (30, 31))
+        self.assertIsNone(ranges.find(20))
+        self.assertNotIn(9, ranges)
+
+
+class TestSackBlocks(unittest.TestCase):
+    """ACK payload encoding and the receiver's block order."""
+
+    def test_encode_decode(self):
+        blocks = [(5, 9), (12, 13), (2**32 - 2, 2**32 - 1)]
+        self.assertEqual(decode_sack(encode_sack(blocks)), blocks)
+        self.assertEqual(decode_sack(b""), [])
+        self.assertEqual(decode_sack(b"\x00" * 7), [])
+
+    def test_receiver_reports_newest_block_first(self):
+        receiver = SelectiveRepeatReceiver(max_sack_blocks=3)
+        data = lambda seq: Packet(seq_num=seq, ack_num=0, flags=Flags.DATA, window=0, payload=bytes([seq]))
+        for seq in (2, 3, 6, 9, 12):
+            ack = receiver.on_data(data(seq))
+        self.assertEqual(ack.ack_num, 0)
+        self.assertEqual(decode_sack(ack.payload), [(12, 13), (2, 4), (6, 7)])
+        ack = receiver.on_data(data(0))
+        self.assertEqual((ack.ack_num, decode_sack(ack.payload)), (1, [(2, 4), (6, 7), (9, 10)]))
+        ack = receiver.on_data(data(1))
+        self.assertEqual(ack.ack_num, 4)
+        self.assertEqual(receiver.take(), bytes([0, 1, 2, 3]))
+        receiver.on_data(data(2))
+        self.assertEqual(receiver.stats["duplicates"], 1)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_TIMERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestTimerWheel(unittest.TestCase):
+    """Retransmission timers: expiry, cancel, delays beyond one turn."""
+
+    def test_expiry_and_cancel(self):
+        wheel = TimerWheel(tick=0.01, slots=8, start=100.0)
+        wheel.schedule("a", 0.03)
+        wheel.schedule("b", 0.05)
+        wheel.schedule("c", 0.5)          # several turns of an 8-slot wheel
+        wheel.cancel("b")
+        self.assertEqual(wheel.advance(100.025), [])
+        self.assertEqual(wheel.advance(100.031), ["a"])
+        self.assertEqual(wheel.advance(100.49), [])
+        self.assertEqual(wheel.advance(100.51), ["c"])
+        self.assertEqual(len(wheel), 0)
+        self.assertIsNone(wheel.next_tick)
+
+    def test_reschedule_replaces(self):
+        wheel = TimerWheel(tick=0.01, start=0.0)
+        wheel.schedule(1, 0.02)
+        wheel.schedule(1, 0.2)
+        self.assertEqual(wheel.advance(0.1), [])
+        self.assertEqual(wheel.advance(0.21), [1])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_CONGESTION_CONTROL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestCongestionControl(unittest.TestCase):
+    """Window reactions of the three controllers."""
+
+    def test_fixed(self):
+        cc = FixedWindow(4)
+        cc.on_ack(100, 1.0, 0.1)
+        cc.on_loss(1.0)
+        cc.on_timeout(1.0)
+        self.assertEqual(cc.cwnd, 4.0)
+
+    def test_aimd(self):
+        cc = AIMDControl(initial=10)
+        cc.on_ack(10, 0.1, 0.1)
+        self.assertEqual(cc.cwnd, 20.0)       # slow start doubles per RTT
+        cc.on_loss(0.2)
+        self.assertEqual((cc.cwnd, cc.ssthresh), (10.0, 10.0))
+        cc.on_ack(10, 0.3, 0.1)
+        self.assertAlmostEqual(cc.cwnd, 11.0)  # +1 per window
+        cc.on_timeout(0.4)
+        self.assertEqual((cc.cwnd, cc.ssthresh), (1.0, 5.5))
+
+    def test_cubic_recovers_to_last_maximum(self):
+        cc = CubicControl()
+        cc.cwnd = 100.0
+        cc.on_loss(0.0)
+        self.assertAlmostEqual(cc.cwnd, 70.0)
+        k = (30 / CubicControl.C) ** (1 / 3)
+        now, rtt, trace = 0.0, 0.1, []
+        while now < 2 * k:
+            now += rtt
+            cc.on_ack(int(cc.cwnd), now, rtt)
+            trace.append((now, cc.cwnd))
+        at = lambda t: min(trace, key=lambda p: abs(p[0] - t))[1]
+        self.assertTrue(85 < at(k / 2) < 100)
+        self.assertTrue(95 < at(k) < 106)          # plateau near W_max
+        self.assertGreater(at(2 * k), 110)          # then probing beyond it
+
+    def test_cubic_fast_convergence(self):
+        cc = CubicControl()
+        cc.cwnd = 100.0
+        cc.on_loss(0.0)
+        cc.cwnd = 90.0
+        cc.on_loss(1.0)                             # lost before regaining 100
+        self.assertAlmostEqual(cc.w_max, 90 * (1 + CubicControl.BETA) / 2)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            make_congestion("vegas")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SELECTIVE_REPEAT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSelectiveRepeat(unittest.TestCase):
+    """Loss recovery of the engines, in virtual time."""
+
+    DATA = bytes(random.Random(9).getrandbits(8) for _ in range(2950))   # 30 segments
+
+    def test_lossless(self):
+        sender, data, sent = transfer(self.DATA)
+        self.assertEqual(data, self.DATA)
+        self.assertEqual(sender.stats["retransmissions"], 0)
+        self.assertEqual(set(sent.values()), {1})
+
+    def test_single_loss_resends_only_that_segment(self):
+        sender, data, sent = transfer(self.DATA, drop={(5, 1)})
+        self.assertEqual(data, self.DATA)
+        self.assertEqual(+sent - Counter(range(30)), Counter({5: 1}))
+        self.assertEqual((sender.stats["fast_retransmits"], sender.stats["timeouts"]), (1, 0))
+
+    def test_lost_retransmission_found_by_sack(self):
+        sender, data, sent = transfer(self.DATA, drop={(5, 1), (5, 2)})
+        self.assertEqual(data, self.DATA)
+        self.assertEqual(sent[5], 3)
+        self.assertEqual(sender.stats["timeouts"], 0)
+
+    def test_tail_loss_needs_timeout(self):
+        sender, data, sent = transfer(self.DATA, drop={(29, 1)})
+        self.assertEqual(data, self.DATA)
+        self.assertEqual(sender.stats["timeouts"], 1)
+
+    def test_burst_loss(self):
+        drop = {(seq, 1) for seq in range(8, 20)}
+        for cc in ("fixed", "aimd", "cubic"):
+            sender, data, sent = transfer(self.DATA, drop=drop, congestion=cc)
+            self.assertEqual(data, self.DATA, cc)
+            self.assertEqual(sender.stats["retransmissions"], 12, cc)
+
+    def test_gives_up_without_acks(self):
+        drop = {(seq, n) for seq in range(30) for n in range(1, 30)}
+        with self.assertRaises(TimeoutError):
+            transfer(self.DATA, drop=drop, max_backoffs=4)
+
+    def test_clamps_ack_to_sent_data(self):
+        sender = SelectiveRepeatSender(self.DATA, chunk_size=100)
+        sender.poll(0.0)
+        bogus = Packet(seq_num=0, ack_num=500, flags=Flags.ACK, window=0, payload=encode_sack([(400, 450)]))
+        self.assertEqual(sender.on_ack(bogus, 0.1), sender.next_seq)
+        self.assertEqual(sender.base, sender.next_seq)
+        self.assertEqual(sender.pipe, 0)
+
+    def test_respects_receiver_window(self):
+        sender = SelectiveRepeatSender(self.DATA, chunk_size=100, congestion=FixedWindow(20))
+        sender.peer_window = 3
+        self.assertEqual(len(sender.poll(0.0)), 3)
+
+    def test_simulated_link(self):
+        for cc in ("fixed", "aimd", "cubic"):
+            for loss in (0.0, 0.1, 0.3):
+                result = simulate_transfer(size=100_000, loss_rate=loss, rtt=0.05, congestion=cc, seed=3)
+                self.assertTrue(result["complete"], (cc, loss))
+                self.assertEqual(result["segments"], 98)
+        self.assertGreater(simulate_transfer(loss_rate=0.0, congestion="cubic")["queue_drops"], 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SOCKETS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestLoopbackTransfer(unittest.TestCase):
+    """ReliableSender -> ReliableReceiver over UDP on 127.0.0.1."""
+
+    def run_transfer(self, data, congestion):
+        receiver = ReliableReceiver(port=0)
+        receiver.start()
+        self.addCleanup(receiver.stop)
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(data=receiver.receive_data(timeout=20)))
+        thread.start()
+        sender = ReliableSender("127.0.0.1", receiver.socket.getsockname()[1], congestion=congestion)
+        sender.connect()
+        try:
+            sender.send_data(data)
+        finally:
+            sender.disconnect()
+        thread.join(20)
+        self.assertEqual(result.get("data"), data)
+        self.assertEqual(receiver.get_stats()["bytes_received"], len(data))
+        return sender
+
+    def test_lossless(self):
+        sender = self.run_transfer(bytes(range(256)) * 400, "cubic")
+        self.assertEqual(sender.base, 100)
+
+    def test_with_simulated_loss(self):
+        saved = hw.loss_simulator
+        hw.loss_simulator = PacketLossSimulator(0.1, random.Random(1))
+        self.addCleanup(setattr, hw, "loss_simulator", saved)
+        sender = self.run_transfer(bytes(range(256)) * 80, "aimd")
+        self.assertGreater(sender.stats["retransmissions"], 0)
+
+    def test_file_transfer_verified(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        source = os.path.join(workdir.name, "in.bin")
+        target = os.path.join(workdir.name, "out.bin")
+        content = random.Random(3).randbytes(50_000)
+        with open(source, "wb") as f:
+            f.write(content)
+        receiver = ReliableReceiver(port=0)
+        receiver.start()
+        self.addCleanup(receiver.stop)
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(receiver.receive_file(target, timeout=20)))
+        thread.start()
+        sender = ReliableSender("127.0.0.1", receiver.socket.getsockname()[1])
+        sender.connect()
+        try:
+            sent = sender.send_file(source)
+        finally:
+            sender.disconnect()
+        thread.join(20)
+        self.assertTrue(result.get("verified"))
+        self.assertEqual(result["sha256"], sent["sha256"])
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), content)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Streaming Statistics Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Checks the constant-memory estimators in stream_stats.py and the
+SensorStats aggregate of udp_sensor_server.py against exact computation
+over the full list of readings.
+
+Usage:
+    python tests/test_stream_stats.py
+    python -m pytest tests/test_stream_stats.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import math
+import random
+import statistics
+import tracemalloc
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from stream_stats import P2Quantile, RunningStats, WindowedStats
+from udp_sensor_server import SensorStats
+
+
+def exact_quantile(sorted_data, p):
+    """Linear interpolation between order statistics."""
+    pos = p * (len(sorted_data) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_data) - 1)
+    return sorted_data[lo] + (sorted_data[hi] - sorted_data[lo]) * (pos - lo)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_RUNNING_STATS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRunningStats(unittest.TestCase):
+    """Welford mean/variance and running extremes."""
+
+    def test_matches_exact(self):
+        rng = random.Random(1)
+        data = [rng.gauss(21.5, 3.0) for _ in range(20000)]
+        stats = RunningStats()
+        for x in data:
+            stats.add(x)
+        self.assertEqual(stats.count, len(data))
+        self.assertAlmostEqual(stats.mean, statistics.fmean(data), places=9)
+        self.assertAlmostEqual(stats.variance, statistics.variance(data), places=7)
+        self.assertEqual((stats.min, stats.max), (min(data), max(data)))
+
+    def test_stable_with_large_offset(self):
+        # The sum-of-squares formula loses every digit here
+        data = [1e9 + x for x in (4.0, 7.0, 13.0, 16.0)]
+        stats = RunningStats()
+        for x in data:
+            stats.add(x)
+        self.assertAlmostEqual(stats.variance, 30.0, places=6)
+
+    def test_add_many_identical_to_add(self):
+        data = [random.Random(7).uniform(-5, 35) for _ in range(1000)]
+        single, batched = RunningStats(), RunningStats()
+        for x in data:
+            single.add(x)
+        batched.add_many(data[:3])
+        batched.add_many(data[3:])
+        self.assertEqual((batched.count, batched.mean, batched.m2, batched.min, batched.max),
+                         (single.count, single.mean, single.m2, single.min, single.max))
+
+    def test_empty_and_single(self):
+        stats = RunningStats()
+        self.assertEqual((stats.count, stats.variance), (0, 0.0))
+        stats.add(5.0)
+        self.assertEqual((stats.mean, stats.variance, stats.min, stats.max), (5.0, 0.0, 5.0, 5.0))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_P2_QUANTILE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestP2Quantile(unittest.TestCase):
+    """P² estimates against the sorted readings."""
+
+    def check(self, data, tolerance):
+        ordered = sorted(data)
+        spread = ordered[-1] - ordered[0]
+        for p in (0.05, 0.25, 0.5, 0.9, 0.95, 0.99):
+            estimator = P2Quantile(p)
+            for x in data:
+                estimator.add(x)
+            exact = exact_quantile(ordered, p)
+            self.assertLess(abs(estimator.value - exact), tolerance * spread, (p, estimator.value, exact))
+
+    def test_distributions(self):
+        rng = random.Random(2)
+        n = 50000
+        with self.subTest("normal"):
+            self.check([rng.gauss(20, 5) for _ in range(n)], 0.005)
+        with self.subTest("uniform"):
+            self.check([rng.uniform(-10, 40) for _ in range(n)], 0.005)
+        with self.subTest("exponential"):
+            self.check([rng.expovariate(0.5) for _ in range(n)], 0.01)
+        with self.subTest("diurnal"):
+            self.check([20 + 3 * math.sin(i / 2000) + rng.gauss(0, 0.5) for i in range(n)], 0.02)
+
+    def test_add_many_identical_to_add(self):
+        rng = random.Random(6)
+        data = [rng.gauss(20, 5) for _ in range(5000)] + [rng.expovariate(1) for _ in range(5000)]
+        for p in (0.05, 0.5, 0.99):
+            single, batched = P2Quantile(p), P2Quantile(p)
+            for x in data:
+                single.add(x)
+            pos = 0
+            while pos < len(data):
+                step = rng.randrange(0, 40)
+                batched.add_many(data[pos:pos + step])
+                pos += step
+            self.assertEqual((batched.count, batched.value, batched._q, batched._n),
+                             (single.count, single.value, single._q, single._n))
+
+    def test_exact_below_five(self):
+        data = [3.0, 1.0, 4.0, 1.5]
+        estimator = P2Quantile(0.5)
+        self.assertEqual(estimator.value, 0.0)
+        for i, x in enumerate(data, 1):
+            estimator.add(x)
+            self.assertAlmostEqual(estimator.value, exact_quantile(sorted(data[:i]), 0.5))
+
+    def test_constant_stream(self):
+        estimator = P2Quantile(0.9)
+        for _ in range(1000):
+            estimator.add(7.0)
+        self.assertEqual(estimator.value, 7.0)
+
+    def test_rejects_bad_quantile(self):
+        for p in (0.0, 1.0, 1.5):
+            with self.assertRaises(ValueError):
+                P2Quantile(p)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_WINDOWED_STATS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestWindowedStats(unittest.TestCase):
+    """Ring buckets against a brute-force filter on the timestamps."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(3)
+        window = WindowedStats(window=10.0, buckets=5)
+        events = []
+        now = 0.0
+        for _ in range(5000):
+            now += rng.expovariate(50)
+            x = rng.gauss(20, 4)
+            window.add(x, now)
+            events.append((now, x))
+            if rng.random() < 0.05:
+                # Window = current 2 s slot and the four before it
+                start = (math.floor(now / 2.0) - 4) * 2.0
+                inside = [v for t, v in events if t >= start]
+                count, mean, lo, hi = window.snapshot(now)
+                self.assertEqual(count, len(inside))
+                self.assertAlmostEqual(mean, statistics.fmean(inside), places=9)
+                self.assertEqual((lo, hi), (min(inside), max(inside)))
+
+    def test_add_many_matches_add(self):
+        single, batched = WindowedStats(10.0, 5), WindowedStats(10.0, 5)
+        for now, values in ((0.5, [3.0, 1.0]), (1.0, []), (2.5, [7.0]), (13.0, [4.0, 9.0, -2.0])):
+            for x in values:
+                single.add(x, now)
+            batched.add_many(values, now)
+            self.assertEqual(batched.snapshot(now), single.snapshot(now))
+
+    def test_expires_after_idle(self):
+        window = WindowedStats(window=60.0, buckets=12)
+        window.add(10.0, 100.0)
+        self.assertEqual(window.snapshot(100.0), (1, 10.0, 10.0, 10.0))
+        self.assertEqual(window.snapshot(170.0), (0, None, None, None))
+        window.add(30.0, 1000.0)
+        self.assertEqual(window.snapshot(1000.0), (1, 30.0, 30.0, 30.0))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_SENSOR_STATS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestSensorStats(unittest.TestCase):
+    """The server's per-sensor aggregate."""
+
+    def test_against_exact(self):
+        rng = random.Random(4)
+        data = [rng.gauss(22, 2) for _ in range(20000)]
+        stats = SensorStats(window=60.0)
+        for i, x in enumerate(data):
+            stats.add(x, "Lab", now=i * 0.01)
+        ordered = sorted(data)
+        self.assertEqual(stats.count, len(data))
+        self.assertAlmostEqual(stats.avg, statistics.fmean(data), places=9)
+        self.assertAlmostEqual(stats.stdev, statistics.stdev(data), places=7)
+        self.assertEqual((stats.min_temp, stats.max_temp), (ordered[0], ordered[-1]))
+        self.assertLess(abs(stats.quantile(0.95) - exact_quantile(ordered, 0.95)), 0.05)
+        count, avg, _, _ = stats.window(now=(len(data) - 1) * 0.01)
+        self.assertEqual(count, 6000)  # twelve 5 s slots: t = 140.00 .. 199.99
+        self.assertAlmostEqual(avg, statistics.fmean(data[-6000:]), places=9)
+        self.assertEqual(stats.last_location, "Lab")
+
+    def test_empty(self):
+        stats = SensorStats()
+        self.assertEqual((stats.count, stats.avg, stats.min_temp, stats.max_temp), (0, 0.0, 0.0, 0.0))
+
+    def test_memory_does_not_grow(self):
+        stats = SensorStats()
+        for i in range(1000):
+            stats.add(20.0 + i % 7, "Lab", now=float(i))
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(10000):
+                stats.add(20.0 + i % 11, "Lab", now=1000.0 + i * 0.01)
+            grown = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLess(grown, 4096)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Batched UDP Ingestion Tests
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Tests DatagramBatch and udp_drops from io_utils.py, the batch decoder
+unpack_udp_sensors from proto_common.py and ingest_batch from
+udp_sensor_server.py over real loopback UDP sockets, including corrupt,
+short and oversized datagrams.
+
+Usage:
+    python tests/test_udp_ingest.py
+    python -m pytest tests/test_udp_ingest.py -v
+"""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT_DEPENDENCIES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+import sys
+import os
+import socket
+import struct
+import time
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "apps"))
+sys.path.insert(0, str(PROJECT_ROOT / "src" / "utils"))
+
+from io_utils import DatagramBatch, udp_drops
+from proto_common import UDP_LEN, UDP_SLOT, crc32, pack_udp_sensor, unpack_udp_sensor, unpack_udp_sensors
+from udp_sensor_server import SensorStats, ingest_batch
+
+
+def udp_pair(rcvbuf=0):
+    """(sender connected to receiver, bound receiver) on loopback."""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if rcvbuf:
+        receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    receiver.bind(("127.0.0.1", 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.connect(receiver.getsockname())
+    return sender, receiver
+
+
+def drain_all(batch, expected, timeout=2.0):
+    """Drain until `expected` datagrams arrived; returns one batch worth (list of (len, bytes))."""
+    got = []
+    deadline = time.monotonic() + timeout
+    while len(got) < expected and time.monotonic() < deadline:
+        count = batch.drain(0.2)
+        got.extend((batch.lengths[i], bytes(batch.view[i * batch.slot_size:i * batch.slot_size + batch.lengths[i]]))
+                   for i in range(count))
+    return got
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_DECODER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestUdpCodec(unittest.TestCase):
+    """Precompiled single and batch decoders agree with the wire format."""
+
+    def test_pack_matches_format(self):
+        data = pack_udp_sensor(42, 21.5, "Lab1")
+        base = struct.pack("!BIf10s", 1, 42, 21.5, b"Lab1".ljust(10, b"\x00"))
+        self.assertEqual(data, base + struct.pack("!I", crc32(base)))
+        self.assertEqual(unpack_udp_sensor(data), (1, 42, 21.5, "Lab1"))
+
+    def test_batch_matches_single(self):
+        datagrams = [pack_udp_sensor(i, 20.0 + i / 4, f"Room{i % 3}") for i in range(50)]
+        corrupt = bytearray(datagrams[7])
+        corrupt[5] ^= 0x01
+        datagrams[7] = bytes(corrupt)
+        slot = UDP_SLOT.size
+        buffer = bytearray(slot * len(datagrams))
+        for i, d in enumerate(datagrams):
+            buffer[i * slot:i * slot + len(d)] = d
+        lengths = [UDP_LEN] * len(datagrams)
+        lengths[3] = 20          # short datagram
+        lengths[9] = slot        # truncated: bigger than UDP_LEN
+        decoded = unpack_udp_sensors(buffer, lengths)
+        self.assertEqual(len(decoded), len(datagrams))
+        for i, d in enumerate(datagrams):
+            if i in (3, 7, 9):
+                self.assertIsNone(decoded[i], i)
+            else:
+                self.assertEqual(decoded[i], unpack_udp_sensor(d))
+
+    def test_empty_batch(self):
+        self.assertEqual(unpack_udp_sensors(bytearray(UDP_SLOT.size * 4), []), [])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_DATAGRAM_BATCH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestDatagramBatch(unittest.TestCase):
+    """Draining a real UDP socket into preallocated slots."""
+
+    def setUp(self):
+        self.sender, self.receiver = udp_pair(rcvbuf=1024 * 1024)
+        self.addCleanup(self.sender.close)
+        self.addCleanup(self.receiver.close)
+
+    def test_drains_queue_in_order(self):
+        batch = DatagramBatch(self.receiver, UDP_SLOT.size, slots=64)
+        sent = [pack_udp_sensor(i, float(i), "A") for i in range(100)]
+        for d in sent:
+            self.sender.send(d)
+        got = drain_all(batch, len(sent))
+        self.assertEqual([d for _, d in got], sent)
+        self.assertEqual(batch.addrs[0], self.sender.getsockname())
+
+    def test_oversized_and_short(self):
+        batch = DatagramBatch(self.receiver, UDP_SLOT.size, slots=8)
+        self.sender.send(b"x" * 100)
+        self.sender.send(b"short")
+        got = drain_all(batch, 2)
+        self.assertEqual([n for n, _ in got], [UDP_SLOT.size, 5])
+
+    def test_timeout_returns_zero(self):
+        batch = DatagramBatch(self.receiver, UDP_SLOT.size, slots=8)
+        started = time.monotonic()
+        self.assertEqual(batch.drain(0.05), 0)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_rejects_bad_sizes(self):
+        with self.assertRaises(ValueError):
+            DatagramBatch(self.receiver, 0)
+
+    @unittest.skipUnless(os.path.exists("/proc/net/udp"), "needs Linux /proc/net/udp")
+    def test_kernel_drops(self):
+        sender, receiver = udp_pair(rcvbuf=4096)
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        self.assertEqual(udp_drops(receiver), 0)
+        for _ in range(2000):
+            sender.send(pack_udp_sensor(1, 1.0, "A"))
+        self.assertGreater(udp_drops(receiver), 0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_INGEST
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestIngestBatch(unittest.TestCase):
+    """ingest_batch updates the same statistics as one add() per reading."""
+
+    def test_matches_per_reading_stats(self):
+        sender, receiver = udp_pair(rcvbuf=1024 * 1024)
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        batch = DatagramBatch(receiver, UDP_SLOT.size, slots=32)
+        readings = [(i % 5 + 1, 18.0 + (i * 7 % 13) / 2, f"Loc{i % 5}") for i in range(300)]
+        for sensor_id, temp, loc in readings:
+            sender.send(pack_udp_sensor(sensor_id, temp, loc))
+        sender.send(b"garbage")
+
+        stats = defaultdict(SensorStats)
+        valid = invalid = 0
+        deadline = time.monotonic() + 2.0
+        while valid + invalid < len(readings) + 1 and time.monotonic() < deadline:
+            count = batch.drain(0.2)
+            v, bad = ingest_batch(batch, count, stats)
+            valid += v
+            invalid += bad
+        self.assertEqual((valid, invalid), (len(readings), 1))
+
+        expected = defaultdict(SensorStats)
+        for sensor_id, temp, loc in readings:
+            expected[sensor_id].add(struct.unpack("!f", struct.pack("!f", temp))[0], loc)
+        for sensor_id, exp in expected.items():
+            got = stats[sensor_id]
+            self.assertEqual((got.count, got.min_temp, got.max_temp, got.last_location),
+                             (exp.count, exp.min_temp, exp.max_temp, exp.last_location))
+            self.assertAlmostEqual(got.avg, exp.avg, places=9)
+            self.assertEqual(got.quantile(0.95), exp.quantile(0.95))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Packet Filter Benchmark — Week 7
+================================
+Computer Networks - ASE Bucharest, CSIE | by ing. dr. Antonio Clim
+
+Two measurements for src/apps/packet_filter.py:
+
+decisions    allow/block decisions per second against --rules random
+             CIDR/port-range rules (default 10 000), for source addresses
+             drawn from --sources distinct clients:
+                 linear   scan every rule, keep the most specific match
+                 trie     radix trie lookup, no cache
+                 cached   RuleEngine.decide (trie + per-source plan cache)
+             All three must agree on every decision.
+
+connections  connections per second through the filter process: each
+             client connects, sends a line, reads the echo and closes,
+             with --block-count blocked addresses configured and the log
+             written to a file. --filter runs another copy of the script
+             (for example a previous version) with the same arguments.
+
+Usage:
+    python3 scripts/benchmark_packet_filter.py
+    python3 scripts/benchmark_packet_filter.py --only decisions --rules 50000 --json
+    python3 scripts/benchmark_packet_filter.py --only connections --filter /tmp/old_packet_filter.py
+"""
+
+from __future__ import annotations
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SETUP_ENVIRONMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+import argparse
+import ipaddress
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.packet_filter import ALL_PORTS, Rule, RuleEngine  # noqa: E402
+
+FILTER = PROJECT_ROOT / "src" / "apps" / "packet_filter.py"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DECISIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+def random_rules(rng: random.Random, count: int) -> List[Rule]:
+    """Random IPv4 rules inside 10.0.0.0/8, 30% with a source port range."""
+    rules = []
+    for _ in range(count):
+        prefix = rng.choice([12, 16, 20, 24, 24, 28, 32, 32])
+        addr = 0x0A000000 | rng.getrandbits(24)
+        ports = ALL_PORTS
+        if rng.random() < 0.3:
+            lo = rng.randrange(1024, 60000)
+            ports = (lo, lo + rng.randrange(0, 4096))
+        rules.append(Rule(rng.choice(["allow", "block"]),
+                          ipaddress.ip_network((addr, prefix), strict=False), ports))
+    return rules
+
+
+class LinearRules:
+    """Reference: integer mask compare against every rule."""
+
+    def __init__(self, rules: List[Rule], default: str) -> None:
+        self.default = default
+        self.rules = [
+            (int(r.network.network_address), int(r.network.netmask), r.network.prefixlen,
+             r.ports[0], r.ports[1], r.action)
+            for r in rules
+        ]
+
+    def decide(self, ip: str, port: int) -> str:
+        addr = int(ipaddress.IPv4Address(ip))
+        best = None
+        for net, mask, prefix, lo, hi, action in self.rules:
+            if addr & mask == net and lo <= port <= hi:
+                key = (-prefix, hi - lo, action != "block")
+                if best is None or key < best[0]:
+                    best = (key, action)
+        return best[1] if best else self.default
+
+
+def time_decisions(decide, queries: List[Tuple[str, int]], budget: float) -> Tuple[float, List[str]]:
+    """Run queries (repeating within budget seconds) and return decisions/s."""
+    answers = [decide(ip, port) for ip, port in queries]
+    done = len(queries)
+    started = time.perf_counter()
+    elapsed = 0.0
+    rounds = 0
+    while elapsed < budget or rounds == 0:
+        for ip, port in queries:
+            decide(ip, port)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+    return rounds * done / elapsed, answers
+
+
+def bench_decisions(rule_count: int, sources: int, queries: int, budget: float) -> Dict[str, object]:
+    rng = random.Random(42)
+    rules = random_rules(rng, rule_count)
+    clients = [str(ipaddress.IPv4Address(0x0A000000 | rng.getrandbits(24))) for _ in range(sources)]
+    workload = [(rng.choice(clients), rng.randrange(1024, 65536)) for _ in range(queries)]
+
+    started = time.perf_counter()
+    cached = RuleEngine(rules)
+    compile_ms = (time.perf_counter() - started) * 1000
+    uncached = RuleEngine(rules, cache_size=0)
+    linear = LinearRules(rules, cached.default)
+
+    results: Dict[str, object] = {"rules": rule_count, "sources": sources,
+                                  "compile_ms": round(compile_ms, 1)}
+    answers = {}
+    # The linear scan is slow; a tenth of the workload is enough for a rate
+    for name, decide, work in (("linear", linear.decide, workload[: max(1, queries // 10)]),
+                               ("trie", uncached.decide, workload),
+                               ("cached", cached.decide, workload)):
+        rate, answers[name] = time_decisions(decide, work, budget)
+        results[f"{name}_per_s"] = round(rate)
+    n = len(answers["linear"])
+    results["agree"] = (answers["linear"] == answers["trie"][:n]
+                        and answers["trie"] == answers["cached"])
+    results["cache_misses"] = cached.misses
+    return results
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONNECTIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+def echo_server() -> socket.socket:
+    """One-line echo upstream on an ephemeral port (accept loop in a thread)."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1024)
+
+    def serve(conn: socket.socket) -> None:
+        with conn:
+            data = conn.recv(1024)
+            if data:
+                conn.sendall(data)
+
+    def accept_loop() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return server
+
+
+def client(port: int, count: int, failures: List[int]) -> None:
+    bad = 0
+    for _ in range(count):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+                sock.sendall(b"ping\n")
+                if sock.recv(16) != b"ping\n":
+                    bad += 1
+        except OSError:
+            bad += 1
+    failures.append(bad)
+
+
+def bench_connections(filter_path: Path, block_count: int, clients: int,
+                      per_client: int) -> Dict[str, object]:
+    rng = random.Random(1)
+    blocked = ",".join(str(ipaddress.IPv4Address(0x0A000000 | rng.getrandbits(24)))
+                       for _ in range(block_count))
+    upstream = echo_server()
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "packet_filter.log"
+        proc = subprocess.Popen(
+            [sys.executable, str(filter_path), "--listen-host", "127.0.0.1",
+             "--listen-port", str(port), "--upstream-host", "127.0.0.1",
+             "--upstream-port", str(upstream.getsockname()[1]),
+             "--block", blocked, "--log", str(log_path)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            time.sleep(0.2)
+            failures: List[int] = []
+            threads = [threading.Thread(target=client, args=(port, per_client, failures))
+                       for _ in range(clients)]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            proc.terminate()
+            proc.wait()
+            upstream.close()
+        log_lines = len(log_path.read_text(encoding="utf-8").splitlines()) if log_path.exists() else 0
+
+    total = clients * per_client
+    return {
+        "filter": str(filter_path),
+        "connections": total,
+        "failed": sum(failures),
+        "seconds": round(elapsed, 3),
+        "conn_per_s": round(total / elapsed),
+        "log_lines": log_lines,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Week 7 packet filter")
+    parser.add_argument("--only", choices=["decisions", "connections"], help="Run one measurement")
+    parser.add_argument("--rules", type=int, default=10000, help="Rules for decisions (default: 10000)")
+    parser.add_argument("--sources", type=int, default=2000, help="Distinct source IPs (default: 2000)")
+    parser.add_argument("--queries", type=int, default=50000, help="Decision workload size (default: 50000)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds per decision run (default: 1)")
+    parser.add_argument("--filter", type=Path, default=FILTER, help="packet_filter.py to run for connections")
+    parser.add_argument("--block-count", type=int, default=1000, help="Blocked IPs for connections (default: 1000)")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument("--per-client", type=int, default=250, help="Connections per client (default: 250)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, object]] = {}
+    if args.only in (None, "decisions"):
+        results["decisions"] = bench_decisions(args.rules, args.sources, args.queries, args.budget)
+    if args.only in (None, "connections"):
+        results["connections"] = bench_connections(args.filter, args.block_count,
+                                                   args.clients, args.per_client)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    if "decisions" in results:
+        d = results["decisions"]
+        print(f"Decisions: {d['rules']} rules, {d['sources']} sources "
+              f"(trie compiled in {d['compile_ms']} ms, agree: {d['agree']})")
+        for name in ("linear", "trie", "cached"):
+            print(f"  {name:<8} {d[f'{name}_per_s']:>12,} decisions/s")
+    if "connections" in results:
+        c = results["connections"]
+        print(f"Connections: {c['connections']} through {c['filter']}")
+        print(f"  {c['conn_per_s']:>8,} conn/s  {c['failed']} failed  {c['log_lines']} log lines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
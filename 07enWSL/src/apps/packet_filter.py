@@ -6,9 +6,14 @@ Computer Networks - ASE Bucharest, CSIE | by ing. dr. Antonio Clim
 
 This is an educational tool demonstrating:
 - Interception at the application layer (user space)
-- Allow/block lists based on source IP
+- Allow/block rules on source networks (CIDR) and source port ranges
 - Bidirectional TCP proxying
 
+Rules are compiled into a binary radix trie: the most specific matching
+prefix decides, and at equal prefixes block beats allow. Decisions are
+cached per source address. Log lines are written in batches by a
+background thread.
+
 It is NOT a replacement for iptables-based filtering:
 - iptables works at kernel level (faster, more secure)
 - This proxy only sees connections that reach it
@@ -26,11 +31,31 @@ from __future__ import annotations
 # SETUP_ENVIRONMENT
 # ═══════════════════════════════════════════════════════════════════════════════
 import argparse
+import ipaddress
+import queue
 import socket
+import sys
 import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple, Union
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════════════════════════════════
+PIPE_BUFFER = 64 * 1024         # recv_into buffer per forwarding direction
+DECISION_CACHE_SIZE = 65536     # source addresses with a cached decision plan
+LOG_QUEUE_SIZE = 10000          # pending log lines before new ones are dropped
+LOG_BATCH = 256                 # lines written per batch
+LISTEN_BACKLOG = 256
+ACTIONS = ("allow", "block")
+ALL_PORTS = (0, 65535)
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+Address = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+PortEntry = Tuple[int, int, str]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -72,12 +97,24 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--allow", 
         default="", 
-        help="Comma-separated allowed source IPs (empty = allow all)"
+        help="Comma-separated allowed sources: IP, CIDR, optionally @PORT or @LO-HI "
+             "(source port); empty = allow all"
     )
     p.add_argument(
         "--block", 
         default="", 
-        help="Comma-separated blocked source IPs (empty = block none)"
+        help="Comma-separated blocked sources, same syntax as --allow (empty = block none)"
+    )
+    p.add_argument(
+        "--rules", 
+        default="", 
+        help="Rule file: one 'allow SPEC' or 'block SPEC' per line, # for comments"
+    )
+    p.add_argument(
+        "--default", 
+        choices=ACTIONS, 
+        default=None, 
+        help="Action when no rule matches (default: block if any allow rule exists, else allow)"
     )
     p.add_argument(
         "--log", 
@@ -98,13 +135,13 @@ def build_parser() -> argparse.ArgumentParser:
 # ═══════════════════════════════════════════════════════════════════════════════
 def parse_ip_set(s: str) -> Set[str]:
     """
-    Parse comma-separated IP list into a set.
+    Parse a comma-separated rule list into a set.
     
     Args:
-        s: Comma-separated string of IP addresses
+        s: Comma-separated string of rule specifications (IPs or CIDRs)
         
     Returns:
-        Set of IP address strings
+        Set of specification strings
     """
     out: Set[str] = set()
     for part in s.split(","):
@@ -114,43 +151,404 @@ def parse_ip_set(s: str) -> Set[str]:
     return out
 
 
-def log_line(path: Optional[Path], line: str) -> None:
+class LogWriter:
+    """
+    Batched, non-blocking log output.
+    
+    log() only timestamps the line and puts it on a bounded queue. A
+    background thread drains up to `batch` lines at a time and writes them
+    to stdout and to the log file (opened once) with one write and one
+    flush per batch. When the queue is full the line is dropped and
+    counted, so a slow disk or terminal never stalls connection handling;
+    the number of dropped lines is reported once the writer catches up.
+    """
+    
+    def __init__(
+        self, 
+        path: Optional[Path] = None, 
+        echo: bool = True, 
+        max_queue: int = LOG_QUEUE_SIZE, 
+        batch: int = LOG_BATCH, 
+        stream: Optional[TextIO] = None
+    ) -> None:
+        """
+        Open the log file and start the writer thread.
+        
+        Args:
+            path: Optional log file path (appended to)
+            echo: Also write lines to `stream`
+            max_queue: Pending lines before new ones are dropped
+            batch: Maximum lines per write
+            stream: Console stream (default: sys.stdout)
+        """
+        self.path = path
+        self.echo = echo
+        self.batch = batch
+        self.dropped = 0
+        self._reported = 0
+        self._drop_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queue)
+        self._stream = stream if stream is not None else sys.stdout
+        self._file: Optional[TextIO] = None
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, line: str) -> None:
+        """
+        Queue a timestamped line without blocking.
+        
+        Args:
+            line: Message to log
+        """
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            self._queue.put_nowait(f"[{stamp}] {line}\n")
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write everything still queued, stop the thread and close the file.
+        
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._file:
+            self._file.close()
+
+    def _run(self) -> None:
+        """Writer thread: drain the queue in batches until close()."""
+        while True:
+            item = self._queue.get()
+            stop = item is None
+            lines: List[str] = [] if stop else [item]
+            while not stop and len(lines) < self.batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    lines.append(item)
+            dropped = self.dropped
+            if dropped != self._reported:
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                lines.append(f"[{stamp}] log queue full: dropped {dropped - self._reported} line(s)\n")
+                self._reported = dropped
+            self._write("".join(lines))
+            if stop:
+                return
+
+    def _write(self, text: str) -> None:
+        """Write one batch to the console and the file."""
+        if not text:
+            return
+        try:
+            if self.echo:
+                self._stream.write(text)
+                self._stream.flush()
+            if self._file:
+                self._file.write(text)
+                self._file.flush()
+        except (OSError, ValueError):
+            pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RULE_ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+@dataclass(frozen=True)
+class Rule:
+    """
+    A single filter rule.
+    
+    Attributes:
+        action: "allow" or "block"
+        network: Source network (a single IP is a /32 or /128)
+        ports: Inclusive source port range
+    """
+    action: str
+    network: Network
+    ports: Tuple[int, int] = ALL_PORTS
+
+
+def parse_rule(spec: str, action: str) -> Rule:
+    """
+    Parse a rule specification.
+    
+    Accepted forms: 10.0.0.5, 10.0.0.0/8, 10.0.0.0/8@1024-65535,
+    192.168.1.7@22 and the IPv6 equivalents (2001:db8::/32@80). The
+    port part matches the client's source port.
+    
+    Args:
+        spec: Rule specification
+        action: "allow" or "block"
+        
+    Returns:
+        Parsed Rule
+        
+    Raises:
+        ValueError: On an unknown action, bad address or bad port range
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"unknown action: {action!r}")
+    net_part, _, port_part = spec.strip().partition("@")
+    network = ipaddress.ip_network(net_part, strict=False)
+    ports = ALL_PORTS
+    if port_part:
+        lo, _, hi = port_part.partition("-")
+        ports = (int(lo), int(hi or lo))
+        if not 0 <= ports[0] <= ports[1] <= 65535:
+            raise ValueError(f"bad port range: {port_part!r}")
+    return Rule(action, network, ports)
+
+
+def load_rules(path: Path) -> List[Rule]:
     """
-    Log a message to console and optionally to file.
+    Load rules from a file.
+    
+    One rule per line, "allow SPEC" or "block SPEC"; blank lines and
+    text after # are ignored.
     
     Args:
-        path: Optional path to log file (None for console only)
-        line: Message to log
+        path: Rule file
+        
+    Returns:
+        Rules in file order
+        
+    Raises:
+        ValueError: On a malformed line (message includes the line number)
+    """
+    rules: List[Rule] = []
+    for lineno, raw in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 2:
+            raise ValueError(f"{path}:{lineno}: expected 'allow SPEC' or 'block SPEC'")
+        try:
+            rules.append(parse_rule(parts[1], parts[0].lower()))
+        except ValueError as exc:
+            raise ValueError(f"{path}:{lineno}: {exc}") from None
+    return rules
+
+
+class _TrieNode:
+    """Radix trie node: two children and the rules for exactly this prefix."""
+    
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: List[Optional[_TrieNode]] = [None, None]
+        self.entries: List[PortEntry] = []
+
+
+class RuleTrie:
+    """
+    Binary radix trie over source prefixes, one root per IP version.
+    
+    A rule for a.b.c.d/n is stored at depth n on the path spelled by the
+    first n address bits, as a (low_port, high_port, action) entry. A
+    lookup walks at most 32 (IPv4) or 128 (IPv6) nodes, however many
+    rules are loaded.
+    """
+    
+    BITS = {4: 32, 6: 128}
+
+    def __init__(self) -> None:
+        self._roots = {4: _TrieNode(), 6: _TrieNode()}
+        self.size = 0
+
+    def insert(self, rule: Rule) -> None:
+        """
+        Add a rule.
+        
+        Args:
+            rule: Rule to store at its prefix node
+        """
+        net = rule.network
+        bits = self.BITS[net.version]
+        addr = int(net.network_address)
+        node = self._roots[net.version]
+        for shift in range(bits - 1, bits - 1 - net.prefixlen, -1):
+            bit = (addr >> shift) & 1
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = _TrieNode()
+            node = child
+        node.entries.append((rule.ports[0], rule.ports[1], rule.action))
+        # Narrowest port range first; block before allow on the same range
+        node.entries.sort(key=lambda e: (e[1] - e[0], e[2] != "block"))
+        self.size += 1
+
+    def matches(self, address: Address) -> List[PortEntry]:
+        """
+        Collect the entries of every prefix containing an address.
+        
+        Args:
+            address: Source address
+            
+        Returns:
+            Entries in precedence order: longest prefix first, then the
+            per-node order (narrowest port range, block first)
+        """
+        node: Optional[_TrieNode] = self._roots[address.version]
+        addr = int(address)
+        shift = self.BITS[address.version] - 1
+        found: List[List[PortEntry]] = []
+        while node is not None:
+            if node.entries:
+                found.append(node.entries)
+            if shift < 0:
+                break
+            node = node.children[(addr >> shift) & 1]
+            shift -= 1
+        out: List[PortEntry] = []
+        for entries in reversed(found):
+            out.extend(entries)
+        return out
+
+
+class RuleEngine:
+    """
+    Allow/block decisions with a per-source cache.
+    
+    The most specific rule decides: longest matching prefix, then the
+    narrowest port range, and block wins a tie. With no matching rule the
+    default applies: block if any allow rule exists, else allow (the
+    behaviour of the original --allow/--block IP sets).
+    
+    A trie lookup is reduced to a plan for the source address: the
+    candidate entries in precedence order, cut after the first one that
+    covers every port. If the whole plan leads to a single action it is
+    stored as just that action. Plans are cached by source IP string, so
+    a returning client costs one dict lookup, plus a short port-range
+    scan only when port-specific rules apply to it.
     """
-    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    msg = f"[{stamp}] {line}"
-    print(msg, flush=True)
-    if path:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as f:
-            f.write(msg + "\n")
+
+    def __init__(
+        self, 
+        rules: Iterable[Rule] = (), 
+        default: Optional[str] = None, 
+        cache_size: int = DECISION_CACHE_SIZE
+    ) -> None:
+        """
+        Compile rules into the trie.
+        
+        Args:
+            rules: Rules in any order (precedence does not depend on order)
+            default: Action when nothing matches (None = derive as above)
+            cache_size: Maximum cached source addresses, oldest evicted (0 = no cache)
+        """
+        if default is not None and default not in ACTIONS:
+            raise ValueError(f"unknown default action: {default!r}")
+        self.trie = RuleTrie()
+        has_allow = False
+        for rule in rules:
+            self.trie.insert(rule)
+            has_allow = has_allow or rule.action == "allow"
+        self.default = default or ("block" if has_allow else "allow")
+        self.cache_size = cache_size
+        self.misses = 0
+        self._cache: Dict[str, Union[str, Tuple[PortEntry, ...]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_specs(
+        cls, 
+        allow: Iterable[str] = (), 
+        block: Iterable[str] = (), 
+        rules: Iterable[Rule] = (), 
+        default: Optional[str] = None
+    ) -> "RuleEngine":
+        """
+        Build an engine from --allow/--block specifications and loaded rules.
+        
+        Raises:
+            ValueError: On a malformed specification
+        """
+        compiled = list(rules)
+        compiled += [parse_rule(spec, "allow") for spec in allow]
+        compiled += [parse_rule(spec, "block") for spec in block]
+        return cls(compiled, default)
+
+    def decide(self, ip: str, port: int = 0) -> str:
+        """
+        Decide a connection.
+        
+        Args:
+            ip: Source IP as reported by accept()
+            port: Source port
+            
+        Returns:
+            "allow" or "block"
+        """
+        plan = self._cache.get(ip)
+        if plan is None:
+            plan = self._plan(ip)
+            with self._lock:
+                self.misses += 1
+                if self.cache_size > 0:
+                    if len(self._cache) >= self.cache_size:
+                        del self._cache[next(iter(self._cache))]
+                    self._cache[ip] = plan
+        if isinstance(plan, str):
+            return plan
+        for lo, hi, action in plan:
+            if lo <= port <= hi:
+                return action
+        return self.default
+
+    def allows(self, ip: str, port: int = 0) -> bool:
+        """Return True if a connection from ip:port may pass."""
+        return self.decide(ip, port) == "allow"
+
+    def _plan(self, ip: str) -> Union[str, Tuple[PortEntry, ...]]:
+        """Build the cached decision plan for one source address."""
+        plan: List[PortEntry] = []
+        for entry in self.trie.matches(ipaddress.ip_address(ip)):
+            plan.append(entry)
+            if entry[:2] == ALL_PORTS:
+                break
+        else:
+            plan.append((*ALL_PORTS, self.default))
+        if len({action for _, _, action in plan}) == 1:
+            return plan[0][2]
+        return tuple(plan)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA_FORWARDING
 # ═══════════════════════════════════════════════════════════════════════════════
-def pipe(src: socket.socket, dst: socket.socket, buf: int = 4096) -> None:
+def pipe(src: socket.socket, dst: socket.socket, buf: int = PIPE_BUFFER) -> None:
     """
     Forward data from source socket to destination socket.
     
-    Runs until source closes or error occurs.
+    Runs until source closes or error occurs. Reads go into one
+    preallocated buffer (recv_into), so a busy connection does not
+    allocate a new bytes object per read.
     
     Args:
         src: Source socket to read from
         dst: Destination socket to write to
         buf: Buffer size for reads
     """
+    buffer = bytearray(buf)
+    view = memoryview(buffer)
     try:
         while True:
-            data = src.recv(buf)
-            if not data:
+            n = src.recv_into(buffer)
+            if not n:
                 break
-            dst.sendall(data)
+            dst.sendall(view[:n])
     except Exception:
         pass
     finally:
@@ -167,24 +565,22 @@ def handle(
     conn: socket.socket, 
     addr: Tuple[str, int], 
     upstream: Tuple[str, int], 
-    allow: Set[str], 
-    block: Set[str], 
-    log_path: Optional[Path], 
+    engine: RuleEngine, 
+    logger: LogWriter, 
     timeout: float
 ) -> None:
     """
     Handle a single client connection.
     
-    Checks allow/block lists, then forwards traffic bidirectionally
+    Checks the rule engine, then forwards traffic bidirectionally
     between client and upstream server.
     
     Args:
         conn: Client socket
         addr: Client address (ip, port)
         upstream: Upstream server (host, port)
-        allow: Set of allowed IPs (empty = allow all)
-        block: Set of blocked IPs
-        log_path: Optional log file path
+        engine: Compiled allow/block rules
+        logger: Log writer
         timeout: Socket timeout
     """
     src_ip = addr[0]
@@ -193,15 +589,15 @@ def handle(
     # ═══════════════════════════════════════════════════════════════════════════
     # CHECK_ACCESS_POLICY
     # ═══════════════════════════════════════════════════════════════════════════
-    if src_ip in block or (allow and src_ip not in allow):
-        log_line(log_path, f"BLOCKED connection from {src_ip}:{addr[1]}")
+    if not engine.allows(src_ip, addr[1]):
+        logger.log(f"BLOCKED connection from {src_ip}:{addr[1]}")
         try:
             conn.close()
         except Exception:
             pass
         return
 
-    log_line(log_path, f"ALLOWED connection from {src_ip}:{addr[1]} -> {upstream[0]}:{upstream[1]}")
+    logger.log(f"ALLOWED connection from {src_ip}:{addr[1]} -> {upstream[0]}:{upstream[1]}")
 
     # ═══════════════════════════════════════════════════════════════════════════
     # CONNECT_TO_UPSTREAM
@@ -211,22 +607,21 @@ def handle(
     try:
         up.connect(upstream)
     except Exception as exc:
-        log_line(log_path, f"upstream connect failed: {exc}")
+        logger.log(f"upstream connect failed: {exc}")
         try:
             conn.close()
         except Exception:
             pass
+        up.close()
         return
 
     # ═══════════════════════════════════════════════════════════════════════════
     # BIDIRECTIONAL_FORWARDING
     # ═══════════════════════════════════════════════════════════════════════════
     t1 = threading.Thread(target=pipe, args=(conn, up), daemon=True)
-    t2 = threading.Thread(target=pipe, args=(up, conn), daemon=True)
     t1.start()
-    t2.start()
+    pipe(up, conn)
     t1.join()
-    t2.join()
 
     # ═══════════════════════════════════════════════════════════════════════════
     # CLEANUP_CONNECTIONS
@@ -240,7 +635,7 @@ def handle(
     except Exception:
         pass
 
-    log_line(log_path, f"connection closed for {src_ip}:{addr[1]}")
+    logger.log(f"connection closed for {src_ip}:{addr[1]}")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -256,10 +651,16 @@ def main() -> int:
     Returns:
         Exit code (always 0)
     """
-    args = build_parser().parse_args()
+    parser = build_parser()
+    args = parser.parse_args()
     allow = parse_ip_set(args.allow)
     block = parse_ip_set(args.block)
-    log_path = Path(args.log) if args.log else None
+    try:
+        rules = load_rules(Path(args.rules)) if args.rules else []
+        engine = RuleEngine.from_specs(allow, block, rules, args.default)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    logger = LogWriter(Path(args.log) if args.log else None)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # CREATE_PROXY_SOCKET
@@ -267,18 +668,18 @@ def main() -> int:
     srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     srv.bind((args.listen_host, args.listen_port))
-    srv.listen(50)
+    srv.listen(LISTEN_BACKLOG)
 
     upstream = (args.upstream_host, args.upstream_port)
-    log_line(
-        log_path, 
-        f"proxy listening on {args.listen_host}:{args.listen_port} -> {upstream[0]}:{upstream[1]}"
-    )
+    logger.log(f"proxy listening on {args.listen_host}:{args.listen_port} -> {upstream[0]}:{upstream[1]}")
     
     if allow:
-        log_line(log_path, f"allow list: {', '.join(sorted(allow))}")
+        logger.log(f"allow list: {', '.join(sorted(allow))}")
     if block:
-        log_line(log_path, f"block list: {', '.join(sorted(block))}")
+        logger.log(f"block list: {', '.join(sorted(block))}")
+    if rules:
+        logger.log(f"rule file: {len(rules)} rule(s) from {args.rules}")
+    logger.log(f"{engine.trie.size} rule(s) compiled, default action: {engine.default}")
 
     # ═══════════════════════════════════════════════════════════════════════════
     # ACCEPT_LOOP
@@ -288,12 +689,12 @@ def main() -> int:
             conn, addr = srv.accept()
             th = threading.Thread(
                 target=handle, 
-                args=(conn, addr, upstream, allow, block, log_path, args.timeout), 
+                args=(conn, addr, upstream, engine, logger, args.timeout), 
                 daemon=True
             )
             th.start()
     except KeyboardInterrupt:
-        log_line(log_path, "interrupted")
+        logger.log("interrupted")
         
     # ═══════════════════════════════════════════════════════════════════════════
     # CLEANUP_PROXY
@@ -303,7 +704,8 @@ def main() -> int:
             srv.close()
         except Exception:
             pass
-        log_line(log_path, "proxy stopped")
+        logger.log("proxy stopped")
+        logger.close()
         
     return 0
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Packet Filter Rule Engine Tests — Week 7
+=========================================
+NETWORKING class - ASE, Informatics | by ing. dr. Antonio Clim
+
+Unit tests for the user-space proxy filter: CIDR/port-range rule parsing,
+radix trie precedence (checked against a brute-force reference), the
+per-source decision cache, the batched log writer, and an end-to-end run
+of the proxy with a loopback source that is blocked.
+
+Usage:
+    python3 -m pytest tests/test_packet_filter.py -v
+"""
+
+from __future__ import annotations
+
+import io
+import ipaddress
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.packet_filter import (  # noqa: E402
+    LogWriter,
+    Rule,
+    RuleEngine,
+    load_rules,
+    parse_rule,
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def reference_decide(rules: list[Rule], default: str, ip: str, port: int) -> str:
+    """Linear scan with the documented precedence."""
+    address = ipaddress.ip_address(ip)
+    candidates = [
+        r for r in rules
+        if address.version == r.network.version and address in r.network
+        and r.ports[0] <= port <= r.ports[1]
+    ]
+    if not candidates:
+        return default
+    best = min(candidates, key=lambda r: (-r.network.prefixlen, r.ports[1] - r.ports[0],
+                                          r.action != "block"))
+    return best.action
+
+
+def random_rules(rng: random.Random, count: int) -> list[Rule]:
+    rules = []
+    for _ in range(count):
+        prefix = rng.choice([8, 12, 16, 20, 24, 28, 32])
+        net = ipaddress.ip_network((rng.getrandbits(32) & 0x0AFFFFFF, prefix), strict=False)
+        ports = (0, 65535)
+        if rng.random() < 0.3:
+            lo = rng.randrange(0, 65000)
+            ports = (lo, lo + rng.randrange(0, 500))
+        rules.append(Rule(rng.choice(["allow", "block"]), net, ports))
+    return rules
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_tcp(port: int, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return True
+        time.sleep(0.05)
+    return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RULE PARSING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_parse_rule_forms():
+    assert parse_rule("10.0.0.5", "block") == Rule("block", ipaddress.ip_network("10.0.0.5/32"))
+    assert parse_rule("10.1.2.3/8", "allow").network == ipaddress.ip_network("10.0.0.0/8")
+    assert parse_rule("10.0.0.0/8@1024-65535", "allow").ports == (1024, 65535)
+    assert parse_rule("192.168.1.7@22", "block").ports == (22, 22)
+    assert parse_rule("2001:db8::/32@80", "allow").network.version == 6
+
+
+@pytest.mark.parametrize("spec,action", [
+    ("10.0.0.300", "allow"),
+    ("10.0.0.0/33", "allow"),
+    ("10.0.0.0/8@2000-1000", "block"),
+    ("10.0.0.0/8@70000", "block"),
+    ("10.0.0.0/8", "drop"),
+])
+def test_parse_rule_rejects(spec, action):
+    with pytest.raises(ValueError):
+        parse_rule(spec, action)
+
+
+def test_load_rules_file(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("# lab rules\nallow 10.0.0.0/8\n\nblock 10.9.0.0/16@1-1023  # low ports\n")
+    rules = load_rules(path)
+    assert [r.action for r in rules] == ["allow", "block"]
+    path.write_text("allow 10.0.0.0/8\nreject 10.0.0.1\n")
+    with pytest.raises(ValueError, match=":2:"):
+        load_rules(path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DECISIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_ip_sets_keep_original_semantics():
+    engine = RuleEngine.from_specs(allow=["127.0.0.1", "10.0.0.1"], block=["10.0.0.1"])
+    assert engine.decide("127.0.0.1") == "allow"
+    assert engine.decide("10.0.0.1") == "block"      # block wins over allow
+    assert engine.decide("10.0.0.2") == "block"      # allow list means default deny
+    only_block = RuleEngine.from_specs(block=["10.0.0.1"])
+    assert only_block.decide("10.0.0.2") == "allow"
+    assert RuleEngine().decide("::1") == "allow"
+
+
+def test_most_specific_rule_wins():
+    engine = RuleEngine.from_specs(
+        allow=["10.0.0.0/8", "10.1.2.3"],
+        block=["10.1.0.0/16", "10.0.0.0/8@1-1023"],
+        default="block",
+    )
+    assert engine.decide("10.2.0.1", 50000) == "allow"
+    assert engine.decide("10.2.0.1", 80) == "block"
+    assert engine.decide("10.1.9.9", 50000) == "block"
+    assert engine.decide("10.1.2.3", 80) == "allow"
+    assert engine.decide("11.0.0.1", 50000) == "block"
+
+
+def test_trie_matches_reference_scan():
+    rng = random.Random(7)
+    rules = random_rules(rng, 2000)
+    engine = RuleEngine(rules, default="allow")
+    for _ in range(5000):
+        ip = str(ipaddress.IPv4Address(rng.getrandbits(32) & 0x0AFFFFFF))
+        port = rng.randrange(0, 65536)
+        assert engine.decide(ip, port) == reference_decide(rules, "allow", ip, port), (ip, port)
+
+
+def test_decision_cache_bounded():
+    engine = RuleEngine.from_specs(block=["10.0.0.0/8@1-1023"])
+    engine.cache_size = 4
+    for i in range(10):
+        assert engine.decide(f"10.0.0.{i}", 80) == "block"
+        assert engine.decide(f"10.0.0.{i}", 8080) == "allow"
+    assert engine.misses == 10
+    assert len(engine._cache) == 4
+    assert engine._cache["10.0.0.9"] == ((1, 1023, "block"), (0, 65535, "allow"))
+    assert engine._cache.get("192.0.2.1") is None
+    engine.decide("192.0.2.1", 80)
+    assert engine._cache["192.0.2.1"] == "allow"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOG WRITER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_log_writer_writes_file_and_console(tmp_path):
+    console = io.StringIO()
+    path = tmp_path / "logs" / "filter.log"
+    writer = LogWriter(path, stream=console)
+    for i in range(1000):
+        writer.log(f"line {i}")
+    writer.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1000
+    assert lines[0].endswith("] line 0") and lines[-1].endswith("] line 999")
+    assert console.getvalue().splitlines() == lines
+    assert writer.dropped == 0
+
+
+def test_log_writer_drops_when_full():
+    release = threading.Event()
+
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            release.wait(5)
+            return super().write(text)
+
+    stream = SlowStream()
+    writer = LogWriter(stream=stream, max_queue=10)
+    started = time.perf_counter()
+    for i in range(1000):
+        writer.log(f"line {i}")
+    assert time.perf_counter() - started < 1.0
+    assert writer.dropped >= 1000 - 10 - 1
+    release.set()
+    writer.close()
+    assert f"dropped {writer.dropped} line(s)" in stream.getvalue()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# END TO END
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def test_proxy_blocks_by_source(tmp_path):
+    upstream = socket.socket()
+    upstream.bind(("127.0.0.1", 0))
+    upstream.listen(16)
+
+    def echo() -> None:
+        while True:
+            try:
+                conn, _ = upstream.accept()
+            except OSError:
+                return
+            with conn:
+                data = conn.recv(1024)
+                conn.sendall(data)
+
+    threading.Thread(target=echo, daemon=True).start()
+    port = _free_port()
+    log_path = tmp_path / "filter.log"
+    proxy = subprocess.Popen(
+        [sys.executable, "src/apps/packet_filter.py", "--listen-host", "0.0.0.0",
+         "--listen-port", str(port), "--upstream-host", "127.0.0.1",
+         "--upstream-port", str(upstream.getsockname()[1]),
+         "--block", "127.0.0.2/32", "--log", str(log_path)],
+        cwd=str(PROJECT_ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert _wait_tcp(port), "Packet filter did not start"
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"hello")
+            assert sock.recv(1024) == b"hello"
+        with socket.create_connection(("127.0.0.1", port), timeout=5,
+                                      source_address=("127.0.0.2", 0)) as sock:
+            try:
+                assert sock.recv(1024) == b""
+            except ConnectionResetError:
+                pass
+    finally:
+        proxy.terminate()
+        proxy.wait(timeout=5)
+        upstream.close()
+    log = log_path.read_text()
+    assert "BLOCKED connection from 127.0.0.2" in log
+    assert "ALLOWED connection from 127.0.0.1" in log
@@ -0,0 +1,76 @@
+"""On-disk cache of capture analysis results.
+
+Entries are keyed by (sha256 of the capture, validator version): a capture
+that has not changed is never parsed twice, and bumping the validator
+version invalidates every entry at once. Each entry is one small JSON file,
+written atomically so several validator processes can share a directory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .pcap_tools import CaptureIndex
+
+
+class AnalysisCache:
+    """CaptureIndex summaries stored as `<sha256>-<version>.json` files."""
+
+    def __init__(self, directory: Path, version: str) -> None:
+        self.directory = Path(directory)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, sha256: str) -> Path:
+        return self.directory / f"{sha256}-{self.version}.json"
+
+    def load(
+        self,
+        sha256: str,
+        needles: Iterable[str] = (),
+        header_names: Iterable[str] = (),
+    ) -> Optional[CaptureIndex]:
+        """Return the cached index, or None if absent or missing a needle/header."""
+        try:
+            entry = json.loads(self.path_for(sha256).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        summary = entry.get("summary") or {}
+        covered = (
+            entry.get("sha256") == sha256
+            and entry.get("validator_version") == self.version
+            and set(needles) <= set(summary.get("needles") or {})
+            and {h.lower() for h in header_names} <= set(summary.get("headers") or {})
+        )
+        if not covered:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return CaptureIndex.from_summary(summary)
+
+    def store(self, sha256: str, index: CaptureIndex, header_names: Iterable[str] = ()) -> None:
+        entry = {
+            "sha256": sha256,
+            "validator_version": self.version,
+            "summary": index.summary(header_names),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self.path_for(sha256))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
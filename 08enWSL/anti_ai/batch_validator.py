@@ -0,0 +1,159 @@
+"""Batch validation of a directory of Week 8 submissions.
+
+Every sub-directory holding a challenge file is treated as one submission
+(laid out as the project root would be) and validated in a process pool.
+Capture analysis results go into an on-disk `AnalysisCache`, so re-running
+over the same directory only parses captures that changed.
+
+Usage:
+    python -m anti_ai.batch_validator submissions/
+    python -m anti_ai.batch_validator submissions/ --workers 8 --cache-dir .anti_ai_cache --json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analysis_cache import AnalysisCache
+from .submission_validator import VALIDATOR_VERSION, ValidationResult, validate_submission
+
+
+DEFAULT_CHALLENGE = Path("artifacts/anti_ai/challenge_week08.json")
+DEFAULT_EVIDENCE = Path("artifacts/anti_ai/evidence.json")
+DEFAULT_CACHE_DIR = Path(".anti_ai_cache")
+
+
+def find_submissions(root: Path, challenge_rel: Path = DEFAULT_CHALLENGE) -> List[Path]:
+    """Sub-directories of root that contain a challenge file, sorted by name."""
+    return sorted(p for p in root.iterdir() if p.is_dir() and (p / challenge_rel).is_file())
+
+
+def _validate_one(job: Tuple[Path, Path, Path, Optional[Path], Optional[str], bool]) -> Tuple[ValidationResult, int, int]:
+    submission, challenge_rel, evidence_rel, cache_dir, secret, strict = job
+    cache = AnalysisCache(cache_dir, VALIDATOR_VERSION) if cache_dir is not None else None
+    try:
+        result = validate_submission(
+            project_root=submission,
+            challenge_path=submission / challenge_rel,
+            evidence_path=submission / evidence_rel,
+            secret=secret,
+            strict_signature=strict,
+            cache=cache,
+        )
+    except Exception as exc:  # one malformed submission must not stop the batch
+        result = ValidationResult(False, [f"Validator error: {type(exc).__name__}: {exc}"], {})
+    if cache is None:
+        return result, 0, 0
+    return result, cache.hits, cache.misses
+
+
+def validate_batch(
+    root: Path,
+    *,
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    secret: Optional[str] = None,
+    strict_signature: bool = False,
+    challenge_rel: Path = DEFAULT_CHALLENGE,
+    evidence_rel: Path = DEFAULT_EVIDENCE,
+) -> Dict[str, Any]:
+    """Validate every submission under root.
+
+    workers=1 validates in this process; otherwise a process pool of that
+    size is used (default: CPU count). cache_dir=None disables the cache.
+    """
+
+    submissions = find_submissions(root, challenge_rel)
+    jobs = [(s, challenge_rel, evidence_rel, cache_dir, secret, strict_signature) for s in submissions]
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        outcomes = [_validate_one(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            outcomes = list(pool.map(_validate_one, jobs))
+    elapsed = time.perf_counter() - start
+
+    results = {s.name: r for s, (r, _, _) in zip(submissions, outcomes)}
+    return {
+        "submissions": len(results),
+        "passed": sum(1 for r in results.values() if r.ok),
+        "failed": sum(1 for r in results.values() if not r.ok),
+        "workers": workers,
+        "validator_version": VALIDATOR_VERSION,
+        "cache_hits": sum(hits for _, hits, _ in outcomes),
+        "cache_misses": sum(misses for _, _, misses in outcomes),
+        "elapsed_s": round(elapsed, 3),
+        "results": results,
+    }
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate a directory of Week 8 anti-AI submissions")
+    parser.add_argument("root", help="Directory with one sub-directory per submission")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="Capture analysis cache directory",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Analyse every capture")
+    parser.add_argument(
+        "--challenge",
+        default=str(DEFAULT_CHALLENGE),
+        help="Challenge path inside each submission",
+    )
+    parser.add_argument(
+        "--evidence",
+        default=str(DEFAULT_EVIDENCE),
+        help="Evidence path inside each submission",
+    )
+    parser.add_argument("--secret", default=None, help="Optional CI secret for signature validation")
+    parser.add_argument(
+        "--strict-signature",
+        action="store_true",
+        help="Fail submissions whose challenge is not correctly signed",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    summary = validate_batch(
+        Path(args.root),
+        workers=args.workers,
+        cache_dir=None if args.no_cache else Path(args.cache_dir),
+        secret=args.secret,
+        strict_signature=bool(args.strict_signature),
+        challenge_rel=Path(args.challenge),
+        evidence_rel=Path(args.evidence),
+    )
+
+    if args.json:
+        out = dict(summary)
+        out["results"] = {name: asdict(r) for name, r in summary["results"].items()}
+        print(json.dumps(out, indent=2))
+    else:
+        for name, result in summary["results"].items():
+            print(f"{'PASS' if result.ok else 'FAIL'}  {name}")
+            for issue in result.issues:
+                print(f"      - {issue}")
+        print(
+            f"{summary['passed']}/{summary['submissions']} passed in {summary['elapsed_s']:.2f}s "
+            f"({summary['workers']} workers, cache {summary['cache_hits']} hits / "
+            f"{summary['cache_misses']} misses)"
+        )
+
+    return 0 if summary["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,39 @@
 """PCAP parsing utilities (no external dependencies).
 
 This module supports classic PCAP and PCAPNG captures with Ethernet + IPv4
-frames.
+or IPv6 frames.
+
+Captures are streamed through a memory map (or chunked reads where mapping
+is not possible) and packets are handed out as memoryview slices, so memory
+use does not grow with the capture size.
 
 It is intentionally not a full protocol stack, it extracts enough information
 to validate:
   - ports and basic TCP flags (handshake)
-  - presence of student-specific header values in HTTP payloads
+  - presence of student-specific header values in HTTP payloads, read from
+    reassembled TCP streams
 
 If `tshark` is available you should prefer using it, but this module is useful
 as a fallback in constrained environments.
+
+The query helpers accept either a capture path (one parse per call) or a
+`CaptureIndex`, which answers all of them from a single streaming pass.
 """
 
 from __future__ import annotations
 
+import hashlib
+import mmap
 import re
+import socket
 import struct
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import (
+    Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union,
+)
 
 
 PCAP_MAGIC_BE = 0xA1B2C3D4
@@ -27,6 +42,27 @@ PCAP_MAGIC_BE_NS = 0xA1B23C4D
 PCAP_MAGIC_LE_NS = 0x4D3CB2A1
 PCAPNG_BLOCK_TYPE_SHB = 0x0A0D0D0A
 
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+IPV6_FRAGMENT = 44
+IPV6_AH = 51
+# Hop-by-hop, routing, fragment, AH, destination options
+_IPV6_EXTENSION_HEADERS = frozenset({0, 43, IPV6_FRAGMENT, IPV6_AH, 60})
+
+TCP_FIN = 0x01
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+_SEQ_MASK = 0xFFFFFFFF
+_SEQ_HALF = 1 << 31
+
+_HTTP_MAX_HEAD = 64 * 1024
+_HTTP_REQUEST_LINE_RE = re.compile(rb"[A-Z]{3,10} \S")
+
+
+Buffer = Union[bytes, memoryview]
+
 
 @dataclass(frozen=True)
 class TcpSegment:
@@ -40,36 +76,159 @@ class TcpSegment:
     payload: bytes
 
 
-def _read_u32(buf: bytes, offset: int, endian: str) -> int:
-    return struct.unpack_from(endian + "I", buf, offset)[0]
-
-
-def _read_u16(buf: bytes, offset: int, endian: str) -> int:
-    return struct.unpack_from(endian + "H", buf, offset)[0]
-
-
-def _inet_ntoa(b: bytes) -> str:
-    return ".".join(str(x) for x in b)
-
+# Records are read through precompiled structs, one per byte order
+_U32 = {"<": struct.Struct("<I"), ">": struct.Struct(">I")}
+_U16 = {"<": struct.Struct("<H"), ">": struct.Struct(">H")}
+_PCAP_RECORD = {"<": struct.Struct("<IIII"), ">": struct.Struct(">IIII")}
+_EPB_HEADER = {"<": struct.Struct("<IIIII"), ">": struct.Struct(">IIIII")}
+_BLOCK_HEADER = {"<": struct.Struct("<II"), ">": struct.Struct(">II")}
+_OPTION_HEADER = {"<": struct.Struct("<HH"), ">": struct.Struct(">HH")}
+_U64 = {"<": struct.Struct("<q"), ">": struct.Struct(">q")}
+_ETHERTYPE = struct.Struct("!H")
+_PORTS_SEQ = struct.Struct("!HHI")
+
+LINKTYPE_ETHERNET = 1
+PCAPNG_BLOCK_TYPE_IDB = 0x00000001
+PCAPNG_BLOCK_TYPE_SPB = 0x00000003
+PCAPNG_BLOCK_TYPE_EPB = 0x00000006
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_OPT_IF_TSRESOL = 9
+PCAPNG_OPT_IF_TSOFFSET = 14
+
+_CHUNK_SIZE = 1 << 20
+# Mapped pages behind the read position are dropped every this many bytes,
+# so resident memory stays flat however large the capture is
+_RELEASE_EVERY = 8 << 20
+
+
+class _CaptureBuffer:
+    """Forward-only access to a capture file as memoryview slices.
+
+    The file is memory-mapped when possible; otherwise it is read in chunks
+    and only the unread tail of the current chunk is kept. Offsets passed
+    to `view` must not go backwards. A view stays valid after later calls,
+    but should not be kept once iteration has finished.
+    """
 
-def _parse_ethernet(frame: bytes) -> Tuple[int, int]:
+    def __init__(self, f: BinaryIO) -> None:
+        self._file = f
+        self._mmap: Optional[mmap.mmap] = None
+        self._released = 0
+        try:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError, AttributeError):
+            # Empty files, pipes and some file systems cannot be mapped
+            self._mmap = None
+        if self._mmap is not None:
+            if hasattr(self._mmap, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+            self._view = memoryview(self._mmap)
+            self._start = 0
+        else:
+            self._view = memoryview(b"")
+            self._start = 0
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path) -> Iterator["_CaptureBuffer"]:
+        with path.open("rb") as f:
+            buf = cls(f)
+            try:
+                yield buf
+            finally:
+                buf.close()
+
+    @property
+    def mapped(self) -> bool:
+        return self._mmap is not None
+
+    def view(self, offset: int, length: int) -> Optional[memoryview]:
+        """Bytes [offset, offset + length), or None if the file ends first."""
+        rel = offset - self._start
+        end = rel + length
+        if end > len(self._view):
+            if self._mmap is not None:
+                return None
+            self._refill(rel, length)
+            rel, end = 0, length
+            if end > len(self._view):
+                return None
+        if self._mmap is not None and offset - self._released > _RELEASE_EVERY:
+            self._release_before(offset)
+        return self._view[rel:end]
+
+    def _refill(self, rel: int, length: int) -> None:
+        if rel > len(self._view):
+            self._file.seek(rel - len(self._view), 1)
+        tail = bytes(self._view[rel:])
+        more = self._file.read(max(_CHUNK_SIZE, length - len(tail)))
+        self._start += rel
+        self._view = memoryview(tail + more if tail else more)
+
+    def _release_before(self, offset: int) -> None:
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            self._released = offset
+            return
+        page = mmap.PAGESIZE
+        upto = (offset // page) * page
+        if upto > self._released:
+            self._mmap.madvise(mmap.MADV_DONTNEED, self._released, upto - self._released)
+        self._released = upto
+
+    def sha256(self) -> str:
+        """Hash the whole file, leaving the buffer ready to be read from the start.
+
+        A mapped file is hashed in place, so the parse that follows reads the
+        same pages rather than the disk; released pages stay in the page cache.
+        """
+        h = hashlib.sha256()
+        if self._mmap is not None:
+            size = len(self._view)
+            for start in range(0, size, _RELEASE_EVERY):
+                end = min(start + _RELEASE_EVERY, size)
+                h.update(self._view[start:end])
+                self._release_before(end)
+            self._released = 0
+            return h.hexdigest()
+        self._file.seek(0)
+        while True:
+            chunk = self._file.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+        self._file.seek(0)
+        self._view = memoryview(b"")
+        self._start = 0
+        return h.hexdigest()
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes with it
+            pass
+
+
+def _parse_ethernet(frame: Buffer) -> Tuple[int, int]:
     """Return (ethertype, payload_offset). Supports 802.1Q VLAN."""
     if len(frame) < 14:
         return 0, 0
 
-    ethertype = struct.unpack_from("!H", frame, 12)[0]
+    ethertype = _ETHERTYPE.unpack_from(frame, 12)[0]
     offset = 14
 
     # VLAN tag
     if ethertype == 0x8100 and len(frame) >= 18:
-        ethertype = struct.unpack_from("!H", frame, 16)[0]
+        ethertype = _ETHERTYPE.unpack_from(frame, 16)[0]
         offset = 18
 
     return ethertype, offset
 
 
-def _parse_ipv4(packet: bytes, offset: int) -> Optional[Tuple[str, str, int, int]]:
-    """Return (src_ip, dst_ip, proto, header_len)."""
+def _parse_ipv4(packet: Buffer, offset: int) -> Optional[Tuple[str, str, int, int, int]]:
+    """Return (src_ip, dst_ip, proto, header_len, packet_end)."""
     if len(packet) < offset + 20:
         return None
     vihl = packet[offset]
@@ -80,32 +239,72 @@ def _parse_ipv4(packet: bytes, offset: int) -> Optional[Tuple[str, str, int, int
     if ihl < 20 or len(packet) < offset + ihl:
         return None
 
+    # Total length excludes Ethernet padding on short frames
+    total_len = _ETHERTYPE.unpack_from(packet, offset + 2)[0]
+    end = min(len(packet), offset + total_len) if total_len >= ihl else len(packet)
     proto = packet[offset + 9]
-    src_ip = _inet_ntoa(packet[offset + 12 : offset + 16])
-    dst_ip = _inet_ntoa(packet[offset + 16 : offset + 20])
-    return src_ip, dst_ip, proto, ihl
+    src_ip = socket.inet_ntoa(packet[offset + 12 : offset + 16])
+    dst_ip = socket.inet_ntoa(packet[offset + 16 : offset + 20])
+    return src_ip, dst_ip, proto, ihl, end
+
 
+def _parse_ipv6(packet: Buffer, offset: int) -> Optional[Tuple[str, str, int, int, int]]:
+    """Return (src_ip, dst_ip, proto, header_len, packet_end).
 
-def _parse_tcp(packet: bytes, offset: int) -> Optional[Tuple[int, int, int, int, bytes]]:
+    Hop-by-hop, routing, destination options and AH headers are skipped;
+    non-initial fragments and ESP yield None.
+    """
+    if len(packet) < offset + 40 or packet[offset] >> 4 != 6:
+        return None
+    payload_len = _ETHERTYPE.unpack_from(packet, offset + 4)[0]
+    end = min(len(packet), offset + 40 + payload_len) if payload_len else len(packet)
+    proto = packet[offset + 6]
+    src_ip = socket.inet_ntop(socket.AF_INET6, packet[offset + 8 : offset + 24])
+    dst_ip = socket.inet_ntop(socket.AF_INET6, packet[offset + 24 : offset + 40])
+
+    pos = offset + 40
+    while proto in _IPV6_EXTENSION_HEADERS:
+        if pos + 8 > end:
+            return None
+        next_proto = packet[pos]
+        if proto == IPV6_FRAGMENT:
+            if _ETHERTYPE.unpack_from(packet, pos + 2)[0] & 0xFFF8:
+                return None
+            size = 8
+        elif proto == IPV6_AH:
+            size = (packet[pos + 1] + 2) * 4
+        else:
+            size = (packet[pos + 1] + 1) * 8
+        proto = next_proto
+        pos += size
+    return src_ip, dst_ip, proto, pos - offset, end
+
+
+def _parse_tcp(packet: Buffer, offset: int, end: int) -> Optional[Tuple[int, int, int, int, bytes]]:
     """Return (src_port, dst_port, flags, seq, payload)."""
-    if len(packet) < offset + 20:
+    if end < offset + 20:
         return None
-    src_port, dst_port = struct.unpack_from("!HH", packet, offset)
-    seq = struct.unpack_from("!I", packet, offset + 4)[0]
+    src_port, dst_port, seq = _PORTS_SEQ.unpack_from(packet, offset)
     data_offset = (packet[offset + 12] >> 4) * 4
     flags = packet[offset + 13]
-    if data_offset < 20 or len(packet) < offset + data_offset:
+    if data_offset < 20 or end < offset + data_offset:
         return None
-    payload = packet[offset + data_offset :]
+    # The only copy made per packet, since segments outlive the file buffer
+    payload = bytes(packet[offset + data_offset : end])
     return src_port, dst_port, flags, seq, payload
 
 
-def _iter_pcap_packets(path: Path) -> Iterator[Tuple[float, bytes]]:
-    data = path.read_bytes()
-    if len(data) < 24:
+def _iter_pcap_packets(path: Path) -> Iterator[Tuple[float, memoryview]]:
+    with _CaptureBuffer.open(path) as buf:
+        yield from _iter_pcap_buffer(buf)
+
+
+def _iter_pcap_buffer(buf: _CaptureBuffer) -> Iterator[Tuple[float, memoryview]]:
+    header = buf.view(0, 24)
+    if header is None:
         return
 
-    magic = struct.unpack_from("!I", data, 0)[0]
+    magic = _U32[">"].unpack_from(header, 0)[0]
     if magic in {PCAP_MAGIC_BE, PCAP_MAGIC_BE_NS}:
         endian = ">"
     elif magic in {PCAP_MAGIC_LE, PCAP_MAGIC_LE_NS}:
@@ -113,120 +312,138 @@ def _iter_pcap_packets(path: Path) -> Iterator[Tuple[float, bytes]]:
     else:
         return
 
-    ns = magic in {PCAP_MAGIC_BE_NS, PCAP_MAGIC_LE_NS}
+    divisor = 1_000_000_000 if magic in {PCAP_MAGIC_BE_NS, PCAP_MAGIC_LE_NS} else 1_000_000
+    record = _PCAP_RECORD[endian]
 
     offset = 24
-    while offset + 16 <= len(data):
-        ts_sec = _read_u32(data, offset, endian)
-        ts_sub = _read_u32(data, offset + 4, endian)
-        incl_len = _read_u32(data, offset + 8, endian)
-        # orig_len = _read_u32(data, offset + 12, endian)
-        offset += 16
-        if offset + incl_len > len(data):
+    while True:
+        rec = buf.view(offset, 16)
+        if rec is None:
+            break
+        ts_sec, ts_sub, incl_len, _orig_len = record.unpack_from(rec)
+        frame = buf.view(offset + 16, incl_len)
+        if frame is None:
+            break
+        offset += 16 + incl_len
+        yield ts_sec + ts_sub / divisor, frame
+
+
+def _parse_idb_options(options: memoryview, endian: str) -> Tuple[float, float]:
+    """Return (ticks_per_second, offset_seconds) from IDB options."""
+    ticks, ts_offset = 1_000_000.0, 0.0
+    opt_header = _OPTION_HEADER[endian]
+    pos = 0
+    while pos + 4 <= len(options):
+        code, length = opt_header.unpack_from(options, pos)
+        if code == 0:
             break
-        frame = data[offset : offset + incl_len]
-        offset += incl_len
+        value = options[pos + 4 : pos + 4 + length]
+        if code == PCAPNG_OPT_IF_TSRESOL and length >= 1:
+            # MSB clear: 10^-n seconds per tick, MSB set: 2^-n
+            res = value[0]
+            ticks = float(2 ** (res & 0x7F)) if res & 0x80 else float(10 ** res)
+        elif code == PCAPNG_OPT_IF_TSOFFSET and length >= 8:
+            ts_offset = float(_U64[endian].unpack_from(value, 0)[0])
+        pos += 4 + ((length + 3) & ~3)
+    return ticks, ts_offset
 
-        ts = float(ts_sec) + (ts_sub / (1_000_000_000 if ns else 1_000_000))
-        yield ts, frame
 
+def _iter_pcapng_packets(path: Path) -> Iterator[Tuple[float, memoryview]]:
+    with _CaptureBuffer.open(path) as buf:
+        yield from _iter_pcapng_buffer(buf)
 
-def _iter_pcapng_packets(path: Path) -> Iterator[Tuple[float, bytes]]:
-    data = path.read_bytes()
-    if len(data) < 12:
-        return
 
+def _iter_pcapng_buffer(buf: _CaptureBuffer) -> Iterator[Tuple[float, memoryview]]:
     offset = 0
     endian = "<"  # default until SHB sets it
-    linktype = None
+    # Per section: (linktype, ticks_per_second, offset_seconds) by interface id
+    interfaces: List[Tuple[int, float, float]] = []
 
-    while offset + 12 <= len(data):
-        block_type = struct.unpack_from(endian + "I", data, offset)[0]
-        block_total_len = struct.unpack_from(endian + "I", data, offset + 4)[0]
-        if block_total_len < 12 or offset + block_total_len > len(data):
+    while True:
+        head = buf.view(offset, 12)
+        if head is None:
             break
+        block_type = _U32[endian].unpack_from(head, 0)[0]
 
         if block_type == PCAPNG_BLOCK_TYPE_SHB:
-            # SHB has byte-order magic at offset + 8 in the block
-            bom = struct.unpack_from("<I", data, offset + 8)[0]
-            if bom == 0x1A2B3C4D:
+            # The byte-order magic decides how to read this block's length
+            if _U32["<"].unpack_from(head, 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
                 endian = "<"
+            elif _U32[">"].unpack_from(head, 8)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                endian = ">"
             else:
-                bom_be = struct.unpack_from(">I", data, offset + 8)[0]
-                if bom_be == 0x1A2B3C4D:
-                    endian = ">"
-
-        elif block_type == 0x00000001:
-            # Interface Description Block
-            # linktype at offset + 8 (u16)
-            if block_total_len >= 20:
-                lt = _read_u16(data, offset + 8, endian)
-                linktype = int(lt)
-
-        elif block_type == 0x00000006:
-            # Enhanced Packet Block
-            if linktype != 1 and linktype is not None:
-                # Only Ethernet supported
-                pass
-            else:
-                iface_id = _read_u32(data, offset + 8, endian)
-                ts_high = _read_u32(data, offset + 12, endian)
-                ts_low = _read_u32(data, offset + 16, endian)
-                cap_len = _read_u32(data, offset + 20, endian)
-                # pkt_len = _read_u32(data, offset + 24, endian)
-
-                pkt_offset = offset + 28
-                pkt_end = pkt_offset + cap_len
-                if pkt_end <= offset + block_total_len - 4 and pkt_end <= len(data):
-                    frame = data[pkt_offset:pkt_end]
-                    # Timestamp unit is nominally microseconds without tsresol
-                    ts = float((ts_high << 32) | ts_low) / 1_000_000
-                    _ = iface_id
-                    yield ts, frame
-
-        elif block_type == 0x00000003:
-            # Simple Packet Block
-            if linktype != 1 and linktype is not None:
-                pass
-            else:
-                pkt_len = _read_u32(data, offset + 8, endian)
-                pkt_offset = offset + 12
-                pkt_end = min(pkt_offset + pkt_len, offset + block_total_len - 4)
-                if pkt_offset < pkt_end <= len(data):
-                    frame = data[pkt_offset:pkt_end]
-                    yield 0.0, frame
+                break
+            interfaces = []
 
+        block_total_len = _U32[endian].unpack_from(head, 4)[0]
+        if block_total_len < 12:
+            break
+        block = buf.view(offset, block_total_len)
+        if block is None:
+            break
         offset += block_total_len
 
+        if block_type == PCAPNG_BLOCK_TYPE_IDB:
+            if block_total_len >= 20:
+                linktype = _U16[endian].unpack_from(block, 8)[0]
+                ticks, ts_offset = _parse_idb_options(block[16:-4], endian)
+                interfaces.append((linktype, ticks, ts_offset))
+
+        elif block_type == PCAPNG_BLOCK_TYPE_EPB:
+            if block_total_len < 32:
+                continue
+            iface_id, ts_high, ts_low, cap_len, _pkt_len = _EPB_HEADER[endian].unpack_from(block, 8)
+            linktype, ticks, ts_offset = (
+                interfaces[iface_id] if iface_id < len(interfaces)
+                else (LINKTYPE_ETHERNET, 1_000_000.0, 0.0)
+            )
+            # Only Ethernet supported
+            if linktype != LINKTYPE_ETHERNET or 28 + cap_len > block_total_len - 4:
+                continue
+            ts = ((ts_high << 32) | ts_low) / ticks + ts_offset
+            yield ts, block[28 : 28 + cap_len]
+
+        elif block_type == PCAPNG_BLOCK_TYPE_SPB:
+            linktype = interfaces[0][0] if interfaces else LINKTYPE_ETHERNET
+            if linktype != LINKTYPE_ETHERNET:
+                continue
+            pkt_len = _U32[endian].unpack_from(block, 8)[0]
+            pkt_end = min(12 + pkt_len, block_total_len - 4)
+            if pkt_end > 12:
+                yield 0.0, block[12:pkt_end]
+
 
 def iter_tcp_segments(path: Path) -> Iterator[TcpSegment]:
     """Iterate TCP segments in a capture."""
-    raw = path.read_bytes()[:4]
+    with path.open("rb") as f:
+        raw = f.read(4)
     if len(raw) < 4:
         return
 
-    first_u32_be = struct.unpack("!I", raw)[0]
+    first_u32_be = _U32[">"].unpack(raw)[0]
 
     if first_u32_be in {PCAP_MAGIC_BE, PCAP_MAGIC_BE_NS, PCAP_MAGIC_LE, PCAP_MAGIC_LE_NS}:
-        pkt_iter = _iter_pcap_packets(path)
+        yield from _segments_from(_iter_pcap_packets(path))
     elif first_u32_be == PCAPNG_BLOCK_TYPE_SHB:
-        pkt_iter = _iter_pcapng_packets(path)
-    else:
-        return
+        yield from _segments_from(_iter_pcapng_packets(path))
 
+
+def _segments_from(pkt_iter: Iterable[Tuple[float, memoryview]]) -> Iterator[TcpSegment]:
     for ts, frame in pkt_iter:
         ethertype, l3off = _parse_ethernet(frame)
-        if ethertype != 0x0800:
+        if ethertype == ETHERTYPE_IPV4:
+            ip = _parse_ipv4(frame, l3off)
+        elif ethertype == ETHERTYPE_IPV6:
+            ip = _parse_ipv6(frame, l3off)
+        else:
             continue
-
-        ipv4 = _parse_ipv4(frame, l3off)
-        if not ipv4:
+        if not ip:
             continue
-        src_ip, dst_ip, proto, ihl = ipv4
+        src_ip, dst_ip, proto, ihl, ip_end = ip
         if proto != 6:
             continue
 
-        tcp = _parse_tcp(frame, l3off + ihl)
+        tcp = _parse_tcp(frame, l3off + ihl, ip_end)
         if not tcp:
             continue
         src_port, dst_port, flags, seq, payload = tcp
@@ -243,14 +460,534 @@ def iter_tcp_segments(path: Path) -> Iterator[TcpSegment]:
         )
 
 
-def capture_mentions_port(path: Path, port: int) -> bool:
+class _Direction:
+    """Reassembly state for one direction of a TCP connection."""
+
+    __slots__ = ("next_seq", "pending", "pending_bytes", "delivered", "fin_seq", "ignored")
+
+    def __init__(self) -> None:
+        self.next_seq: Optional[int] = None
+        self.pending: Dict[int, bytes] = {}
+        self.pending_bytes = 0
+        self.delivered = 0
+        self.fin_seq: Optional[int] = None
+        self.ignored = False
+
+
+FlowKey = Tuple[str, int, str, int]
+
+
+class TcpReassembler:
+    """Rebuild each direction of each TCP connection as a byte stream.
+
+    Contiguous data is passed to `on_data(key, data)` as soon as it is in
+    order; key is (src_ip, src_port, dst_ip, dst_port). If on_data returns
+    False the direction is no longer tracked. `on_close(key)` is called once
+    per direction: after FIN once all data before it has arrived, on RST,
+    when limits are hit, or from `flush()`.
+
+    Memory is bounded by:
+      max_flows        directions tracked at once (oldest evicted first)
+      max_buffer       out-of-order bytes held per direction; overflowing
+                       it abandons the direction rather than waiting
+      max_flow_bytes   bytes delivered per direction before it is cut off
+    """
+
+    def __init__(
+        self,
+        on_data: Callable[[FlowKey, bytes], Optional[bool]],
+        on_close: Optional[Callable[[FlowKey], None]] = None,
+        *,
+        max_flows: int = 65536,
+        max_buffer: int = 1 << 20,
+        max_flow_bytes: int = 64 << 20,
+    ) -> None:
+        self.on_data = on_data
+        self.on_close = on_close
+        self.max_flows = max_flows
+        self.max_buffer = max_buffer
+        self.max_flow_bytes = max_flow_bytes
+        self._flows: Dict[FlowKey, _Direction] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._flows)
+
+    def add(self, seg: TcpSegment) -> None:
+        key = (seg.src_ip, seg.src_port, seg.dst_ip, seg.dst_port)
+        flags = seg.flags
+        d = self._flows.get(key)
+        if d is None:
+            if flags & TCP_RST:
+                self._close((seg.dst_ip, seg.dst_port, seg.src_ip, seg.src_port))
+                return
+            if len(self._flows) >= self.max_flows:
+                self.evicted += 1
+                self._close(next(iter(self._flows)))
+            d = self._flows[key] = _Direction()
+
+        payload = seg.payload
+        if flags & TCP_SYN:
+            d.next_seq = (seg.seq + 1) & _SEQ_MASK
+            payload = b""  # data on a SYN (TCP Fast Open) is not followed
+        elif payload and not d.ignored:
+            if d.next_seq is None:
+                # Capture started mid-connection
+                d.next_seq = seg.seq
+            self._accept(key, d, seg.seq, payload)
+
+        if flags & TCP_RST:
+            self._close(key)
+            self._close((seg.dst_ip, seg.dst_port, seg.src_ip, seg.src_port))
+            return
+        if flags & TCP_FIN:
+            d.fin_seq = (seg.seq + len(payload)) & _SEQ_MASK
+        if d.fin_seq is not None and (d.ignored or d.next_seq is None or d.next_seq == d.fin_seq):
+            self._close(key)
+
+    def flush(self) -> None:
+        """Close every direction still open (end of capture)."""
+        for key in list(self._flows):
+            self._close(key)
+
+    def _accept(self, key: FlowKey, d: _Direction, seq: int, data: bytes) -> None:
+        offset = (seq - d.next_seq) & _SEQ_MASK
+        if offset >= _SEQ_HALF:
+            # Starts before next_seq: retransmission, keep only the new tail
+            skip = (d.next_seq - seq) & _SEQ_MASK
+            if skip >= len(data):
+                return
+            data, offset = data[skip:], 0
+        if offset:
+            if seq in d.pending and len(d.pending[seq]) >= len(data):
+                return
+            if d.pending_bytes + len(data) > self.max_buffer:
+                # The gap is not going to be filled within the budget
+                self._abandon(key, d)
+                return
+            d.pending_bytes += len(data) - len(d.pending.get(seq, b""))
+            d.pending[seq] = data
+            return
+
+        self._deliver(key, d, data)
+        while d.pending and not d.ignored:
+            progressed = False
+            for pseq in list(d.pending):
+                poff = (pseq - d.next_seq) & _SEQ_MASK
+                if poff and poff < _SEQ_HALF:
+                    continue
+                chunk = d.pending.pop(pseq)
+                d.pending_bytes -= len(chunk)
+                skip = (d.next_seq - pseq) & _SEQ_MASK
+                if skip < len(chunk):
+                    self._deliver(key, d, chunk[skip:])
+                progressed = True
+                break
+            if not progressed:
+                break
+
+    def _deliver(self, key: FlowKey, d: _Direction, data: bytes) -> None:
+        d.next_seq = (d.next_seq + len(data)) & _SEQ_MASK
+        room = self.max_flow_bytes - d.delivered
+        if len(data) > room:
+            data = data[:room]
+        d.delivered += len(data)
+        if (data and self.on_data(key, data) is False) or d.delivered >= self.max_flow_bytes:
+            self._abandon(key, d)
+
+    def _abandon(self, key: FlowKey, d: _Direction) -> None:
+        """Stop following a direction but remember it until FIN/RST."""
+        if d.ignored:
+            return
+        d.ignored = True
+        d.pending.clear()
+        d.pending_bytes = 0
+        if self.on_close is not None:
+            self.on_close(key)
+
+    def _close(self, key: FlowKey) -> None:
+        d = self._flows.pop(key, None)
+        if d is not None and not d.ignored and self.on_close is not None:
+            self.on_close(key)
+
+
+class _HttpStream:
+    """Incremental HTTP/1.x message framing for one direction of a stream.
+
+    Only header blocks are kept; bodies are skipped by Content-Length or
+    chunked framing. `feed` returns False once the stream is clearly not
+    HTTP or its remaining bytes cannot be framed (body until close).
+    """
+
+    HEAD, BODY, CHUNK_SIZE, CHUNK_DATA, TRAILERS = range(5)
+
+    __slots__ = ("buf", "state", "remaining", "headers", "methods", "peer")
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.state = self.HEAD
+        self.remaining = 0
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.methods: Deque[bytes] = deque()
+        self.peer: Optional["_HttpStream"] = None
+
+    def feed(self, data: bytes) -> bool:
+        if self.state in (self.BODY, self.CHUNK_DATA) and not self.buf:
+            # Skip body bytes without copying them
+            if len(data) <= self.remaining:
+                self.remaining -= len(data)
+                if not self.remaining:
+                    self.state = self.HEAD if self.state == self.BODY else self.CHUNK_SIZE
+                return True
+            data = data[self.remaining:]
+            self.state = self.HEAD if self.state == self.BODY else self.CHUNK_SIZE
+            self.remaining = 0
+        self.buf += data
+        buf = self.buf
+        while buf:
+            if self.state == self.HEAD:
+                while buf[:2] == b"\r\n":
+                    del buf[:2]
+                if len(buf) < 8:
+                    return True
+                if not (buf.startswith(b"HTTP/") or _HTTP_REQUEST_LINE_RE.match(buf)):
+                    return False
+                end = buf.find(b"\r\n\r\n")
+                if end < 0:
+                    return len(buf) <= _HTTP_MAX_HEAD
+                head = bytes(buf[:end])
+                del buf[: end + 4]
+                if not self._start_message(head):
+                    buf.clear()
+                    return False
+            elif self.state in (self.BODY, self.CHUNK_DATA):
+                n = min(self.remaining, len(buf))
+                del buf[:n]
+                self.remaining -= n
+                if self.remaining:
+                    return True
+                self.state = self.HEAD if self.state == self.BODY else self.CHUNK_SIZE
+            elif self.state == self.CHUNK_SIZE:
+                eol = buf.find(b"\r\n")
+                if eol < 0:
+                    return len(buf) <= 1024
+                try:
+                    size = int(bytes(buf[:eol]).split(b";", 1)[0].strip(), 16)
+                except ValueError:
+                    return False
+                del buf[: eol + 2]
+                if size:
+                    self.state, self.remaining = self.CHUNK_DATA, size + 2
+                else:
+                    self.state = self.TRAILERS
+            else:  # TRAILERS
+                if buf.startswith(b"\r\n"):
+                    del buf[:2]
+                    self.state = self.HEAD
+                    continue
+                end = buf.find(b"\r\n\r\n")
+                if end < 0:
+                    return len(buf) <= _HTTP_MAX_HEAD
+                del buf[: end + 4]
+                self.state = self.HEAD
+        return True
+
+    def _start_message(self, head: bytes) -> bool:
+        """Record the headers and set up body framing; False if unframeable."""
+        lines = head.split(b"\r\n")
+        start = lines[0]
+        fields: Dict[bytes, bytes] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(b":")
+            if sep and name and name[:1] not in b" \t":
+                name, value = name.strip().lower(), value.strip()
+                self.headers.append((name, value))
+                fields[name] = value
+
+        if start.startswith(b"HTTP/"):
+            parts = start.split(None, 2)
+            status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+            if 100 <= status < 200 and status != 101:
+                # Interim response: the final one still answers the request
+                return True
+            method = self.peer.methods.popleft() if self.peer and self.peer.methods else b""
+            if method == b"HEAD" or 100 <= status < 200 or status in (204, 304):
+                return True
+            is_response = True
+        else:
+            self.methods.append(start.split(b" ", 1)[0])
+            is_response = False
+
+        if b"chunked" in fields.get(b"transfer-encoding", b"").lower():
+            self.state = self.CHUNK_SIZE
+        elif b"content-length" in fields:
+            try:
+                self.remaining = int(fields[b"content-length"])
+            except ValueError:
+                return False
+            self.state = self.BODY if self.remaining else self.HEAD
+        elif is_response:
+            # Body runs until the connection closes: nothing more to frame
+            return False
+        return True
+
+
+class CaptureIndex:
+    """Everything the query helpers need, collected in one pass over a capture.
+
+    - segment counts per TCP port
+    - TCP handshakes completed per 4-tuple (SYN, SYN-ACK, ACK in order)
+    - HTTP header tallies, overall and per port, from reassembled streams
+      (so headers split across segments or reordered still count)
+    - the ports on which each watched needle appeared in a payload
+
+    Needles must be given up front; `contains_ascii` falls back to a rescan
+    of the capture for a needle that was not watched.
+
+    `summary` and `from_summary` turn the answers into JSON-safe data and
+    back, so an index can be cached without keeping the capture around.
+    """
+
+    def __init__(self, needles: Iterable[str] = (), path: Optional[Path] = None) -> None:
+        self.path = path
+        self.segments = 0
+        self.port_counts: Dict[int, int] = {}
+        self.handshake_ports: Set[int] = set()
+        self._pending: Dict[Tuple[str, int, str, int], int] = {}
+        self._headers: Dict[Tuple[bytes, bytes], int] = {}
+        self._port_headers: Dict[int, Dict[Tuple[bytes, bytes], int]] = {}
+        self._needles: Dict[bytes, Set[int]] = {n.encode("utf-8"): set() for n in needles}
+        self._needle_seen: Set[bytes] = set()
+        self._http: Dict[FlowKey, _HttpStream] = {}
+        self._streams = TcpReassembler(self._on_stream_data, self._on_stream_close)
+        # Header names kept by from_summary; None means every header was tallied
+        self._header_names: Optional[Set[bytes]] = None
+
+    @classmethod
+    def build(cls, path: Path, needles: Iterable[str] = ()) -> "CaptureIndex":
+        index = cls(needles, path=path)
+        for seg in iter_tcp_segments(path):
+            index.add(seg)
+        index.finish()
+        return index
+
+    def finish(self) -> None:
+        """Release reassembly state once every segment has been added."""
+        self._streams.flush()
+
+    def add(self, seg: TcpSegment) -> None:
+        self.segments += 1
+        sport, dport = seg.src_port, seg.dst_port
+        counts = self.port_counts
+        counts[sport] = counts.get(sport, 0) + 1
+        if dport != sport:
+            counts[dport] = counts.get(dport, 0) + 1
+
+        self._track_handshake(seg)
+
+        self._streams.add(seg)
+
+        payload = seg.payload
+        if not payload:
+            return
+        for needle, ports in self._needles.items():
+            if needle in payload:
+                self._needle_seen.add(needle)
+                ports.add(sport)
+                ports.add(dport)
+
+    def _on_stream_data(self, key: FlowKey, data: bytes) -> bool:
+        stream = self._http.get(key)
+        if stream is None:
+            stream = self._http[key] = _HttpStream()
+            peer = self._http.get((key[2], key[3], key[0], key[1]))
+            if peer is not None:
+                stream.peer, peer.peer = peer, stream
+        alive = stream.feed(data)
+        if stream.headers:
+            ports = {key[1], key[3]}
+            for header in stream.headers:
+                self._headers[header] = self._headers.get(header, 0) + 1
+                for port in ports:
+                    per_port = self._port_headers.setdefault(port, {})
+                    per_port[header] = per_port.get(header, 0) + 1
+            stream.headers.clear()
+        return alive
+
+    def _on_stream_close(self, key: FlowKey) -> None:
+        stream = self._http.pop(key, None)
+        if stream is not None and stream.peer is not None:
+            stream.peer.peer = None
+
+    def _track_handshake(self, seg: TcpSegment) -> None:
+        # Keys are always (client_ip, client_port, server_ip, server_port)
+        flags = seg.flags
+        if flags & TCP_SYN and not flags & TCP_ACK:
+            self._pending[(seg.src_ip, seg.src_port, seg.dst_ip, seg.dst_port)] = TCP_SYN
+            return
+        if flags & TCP_SYN:
+            key = (seg.dst_ip, seg.dst_port, seg.src_ip, seg.src_port)
+            if self._pending.get(key) == TCP_SYN:
+                self._pending[key] = TCP_SYN | TCP_ACK
+            return
+        key = (seg.src_ip, seg.src_port, seg.dst_ip, seg.dst_port)
+        state = self._pending.get(key)
+        if state is None:
+            if flags & (TCP_FIN | TCP_RST):
+                self._pending.pop((seg.dst_ip, seg.dst_port, seg.src_ip, seg.src_port), None)
+            return
+        if flags & TCP_RST:
+            del self._pending[key]
+        elif flags & TCP_ACK and state == TCP_SYN | TCP_ACK:
+            del self._pending[key]
+            self.handshake_ports.add(seg.src_port)
+            self.handshake_ports.add(seg.dst_port)
+
+    def mentions_port(self, port: int) -> bool:
+        return port in self.port_counts
+
+    def has_handshake(self, port: int) -> bool:
+        return port in self.handshake_ports
+
+    def contains_ascii(self, needle: str, port: Optional[int] = None) -> bool:
+        n = needle.encode("utf-8")
+        if n not in self._needles:
+            if self.path is None:
+                raise KeyError(f"needle {needle!r} was not indexed")
+            return capture_contains_ascii(self.path, needle, port=port)
+        if port is None:
+            return n in self._needle_seen
+        return port in self._needles[n]
+
+    def header_values(self, header_name: str, port: Optional[int] = None) -> Dict[str, int]:
+        name = header_name.encode("utf-8").lower()
+        if self._header_names is not None and name not in self._header_names:
+            if self.path is None:
+                raise KeyError(f"header {header_name!r} was not kept in the summary")
+            return count_http_header_values(self.path, header_name, port=port)
+        tally = self._headers if port is None else self._port_headers.get(port, {})
+        counts: Dict[str, int] = {}
+        for (hname, raw), n in tally.items():
+            if hname == name:
+                value = raw.decode("iso-8859-1", errors="replace").strip()
+                counts[value] = counts.get(value, 0) + n
+        return counts
+
+    def summary(self, header_names: Iterable[str] = ()) -> Dict[str, Any]:
+        """JSON-safe answers: ports, handshakes, needles and the named headers."""
+        names = {n.encode("utf-8").lower() for n in header_names}
+
+        def tally(source: Dict[Tuple[bytes, bytes], int]) -> Dict[str, Dict[str, int]]:
+            # Latin-1 maps every byte to one code point, so values round-trip
+            out: Dict[str, Dict[str, int]] = {name.decode("latin-1"): {} for name in names}
+            for (hname, raw), n in source.items():
+                if hname in names:
+                    out[hname.decode("latin-1")][raw.decode("latin-1")] = n
+            return out
+
+        return {
+            "segments": self.segments,
+            "port_counts": {str(port): n for port, n in self.port_counts.items()},
+            "handshake_ports": sorted(self.handshake_ports),
+            "needles": {n.decode("utf-8"): sorted(ports) for n, ports in self._needles.items()},
+            "headers": tally(self._headers),
+            "port_headers": {str(port): tally(t) for port, t in self._port_headers.items()
+                             if any(hname in names for hname, _ in t)},
+        }
+
+    @classmethod
+    def from_summary(cls, data: Dict[str, Any], path: Optional[Path] = None) -> "CaptureIndex":
+        """Rebuild an index from `summary` output.
+
+        Queries for needles or headers the summary did not keep fall back to
+        a rescan of `path`, or raise KeyError when no path is given.
+        """
+        index = cls(path=path)
+        index.segments = int(data.get("segments", 0))
+        index.port_counts = {int(port): int(n) for port, n in (data.get("port_counts") or {}).items()}
+        index.handshake_ports = {int(port) for port in data.get("handshake_ports") or ()}
+        for needle, ports in (data.get("needles") or {}).items():
+            n = needle.encode("utf-8")
+            index._needles[n] = {int(port) for port in ports}
+            if ports:
+                index._needle_seen.add(n)
+
+        def untally(by_name: Dict[str, Dict[str, int]]) -> Dict[Tuple[bytes, bytes], int]:
+            return {
+                (name.encode("latin-1"), value.encode("latin-1")): int(n)
+                for name, values in by_name.items() for value, n in values.items()
+            }
+
+        headers = data.get("headers") or {}
+        index._header_names = {name.encode("latin-1") for name in headers}
+        index._headers = untally(headers)
+        index._port_headers = {
+            int(port): untally(by_name) for port, by_name in (data.get("port_headers") or {}).items()
+        }
+        return index
+
+
+Capture = Union[Path, CaptureIndex]
+
+
+class CaptureFile:
+    """A capture opened once, hashed, then indexed from the same bytes.
+
+    Use as a context manager. `sha256` reads the whole file; `index` parses
+    it from the same memory map, so a capture that is both checked against
+    its evidence hash and analysed is only read from disk once.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: Optional[BinaryIO] = None
+        self._buf: Optional[_CaptureBuffer] = None
+        self._sha256: Optional[str] = None
+
+    def __enter__(self) -> "CaptureFile":
+        self._file = self.path.open("rb")
+        self._buf = _CaptureBuffer(self._file)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._buf is not None:
+            self._buf.close()
+        if self._file is not None:
+            self._file.close()
+
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = self._buf.sha256()
+        return self._sha256
+
+    def index(self, needles: Iterable[str] = ()) -> CaptureIndex:
+        index = CaptureIndex(needles, path=self.path)
+        head = self._buf.view(0, 4)
+        magic = _U32[">"].unpack_from(head, 0)[0] if head is not None else None
+        if magic in {PCAP_MAGIC_BE, PCAP_MAGIC_BE_NS, PCAP_MAGIC_LE, PCAP_MAGIC_LE_NS}:
+            segments = _segments_from(_iter_pcap_buffer(self._buf))
+        elif magic == PCAPNG_BLOCK_TYPE_SHB:
+            segments = _segments_from(_iter_pcapng_buffer(self._buf))
+        else:
+            segments = iter(())
+        for seg in segments:
+            index.add(seg)
+        index.finish()
+        return index
+
+
+def capture_mentions_port(path: Capture, port: int) -> bool:
+    if isinstance(path, CaptureIndex):
+        return path.mentions_port(port)
     for seg in iter_tcp_segments(path):
         if seg.src_port == port or seg.dst_port == port:
             return True
     return False
 
 
-def capture_contains_ascii(path: Path, needle: str, port: Optional[int] = None) -> bool:
+def capture_contains_ascii(path: Capture, needle: str, port: Optional[int] = None) -> bool:
+    if isinstance(path, CaptureIndex):
+        return path.contains_ascii(needle, port=port)
     n = needle.encode("utf-8")
     for seg in iter_tcp_segments(path):
         if port is not None and seg.src_port != port and seg.dst_port != port:
@@ -260,30 +997,27 @@ def capture_contains_ascii(path: Path, needle: str, port: Optional[int] = None)
     return False
 
 
-def count_http_header_values(path: Path, header_name: str, port: Optional[int] = None) -> Dict[str, int]:
-    """Count occurrences of HTTP header values in TCP payloads.
+def count_http_header_values(path: Capture, header_name: str, port: Optional[int] = None) -> Dict[str, int]:
+    """Count HTTP header values (name matched case-insensitively).
 
-    This is a best-effort scan of payloads. It does not perform full TCP stream
-    reassembly but works reliably for small HTTP responses typical for the lab.
+    Each TCP stream is reassembled and its HTTP messages framed, so headers
+    split across segments are counted once and bodies are not scanned.
     """
 
-    pattern = re.compile(rb"\r\n" + re.escape(header_name.encode("utf-8")) + rb":\s*([^\r\n]+)")
-    counts: Dict[str, int] = {}
-    for seg in iter_tcp_segments(path):
-        if port is not None and seg.src_port != port and seg.dst_port != port:
-            continue
-        for m in pattern.finditer(seg.payload):
-            value = m.group(1).decode("iso-8859-1", errors="replace").strip()
-            counts[value] = counts.get(value, 0) + 1
-    return counts
+    if not isinstance(path, CaptureIndex):
+        path = CaptureIndex.build(path)
+    return path.header_values(header_name, port=port)
+
 
+def has_basic_tcp_handshake(path: Capture, port: int) -> bool:
+    """Heuristically verify a TCP three-way handshake occurred on a port.
 
-def has_basic_tcp_handshake(path: Path, port: int) -> bool:
-    """Heuristically verify a TCP three-way handshake occurred on a port."""
+    With a CaptureIndex the three segments must belong to the same
+    connection; the path-based scan accepts them from any connection.
+    """
 
-    # Flags
-    SYN = 0x02
-    ACK = 0x10
+    if isinstance(path, CaptureIndex):
+        return path.has_handshake(port)
 
     syn_seen = False
     synack_seen = False
@@ -294,11 +1028,11 @@ def has_basic_tcp_handshake(path: Path, port: int) -> bool:
             continue
 
         flags = seg.flags
-        if flags & SYN and not (flags & ACK):
+        if flags & TCP_SYN and not (flags & TCP_ACK):
             syn_seen = True
-        elif (flags & SYN) and (flags & ACK):
+        elif (flags & TCP_SYN) and (flags & TCP_ACK):
             synack_seen = True
-        elif (flags & ACK) and not (flags & SYN):
+        elif (flags & TCP_ACK) and not (flags & TCP_SYN):
             # This will catch many ACKs, we just need at least one.
             ack_seen = True
 
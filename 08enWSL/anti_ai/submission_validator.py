@@ -9,6 +9,10 @@ The validator checks:
   2) evidence file integrity (hashes)
   3) minimum protocol signals in required PCAPs
 
+Each capture is read once: it is hashed and parsed from the same memory
+map. With an `AnalysisCache`, a capture whose hash has been analysed before
+by this validator version is not parsed at all.
+
 It does not aim to replace a viva, it provides a strong baseline.
 """
 
@@ -20,10 +24,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from .analysis_cache import AnalysisCache
 from .challenge import Challenge, load_challenge
 from .evidence_collector import SCHEMA_VERSION as EVIDENCE_SCHEMA
 from .files import sha256_file
 from .pcap_tools import (
+    CaptureFile,
+    CaptureIndex,
     capture_contains_ascii,
     capture_mentions_port,
     count_http_header_values,
@@ -32,6 +39,12 @@ from .pcap_tools import (
 from .signing import verify_signature
 
 
+# Bump whenever capture analysis changes: cached results are keyed on it
+VALIDATOR_VERSION = "2"
+
+BACKEND_HEADER = "X-Backend-ID"
+
+
 @dataclass
 class ValidationResult:
     ok: bool
@@ -52,6 +65,30 @@ def _evidence_index(evidence: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     return idx
 
 
+def _analyse_capture(
+    cap_path: Path,
+    expected_sha256: Optional[str],
+    needles: List[str],
+    cache: Optional[AnalysisCache],
+) -> Tuple[Optional[CaptureIndex], bool]:
+    """Hash a capture and, if it matches, index it (or load it from the cache).
+
+    Returns (index, cached); index is None when the hash does not match.
+    """
+    with CaptureFile(cap_path) as cap:
+        digest = cap.sha256()
+        if digest != expected_sha256:
+            return None, False
+        if cache is not None:
+            index = cache.load(digest, needles, [BACKEND_HEADER])
+            if index is not None:
+                return index, True
+        index = cap.index(needles)
+    if cache is not None:
+        cache.store(digest, index, [BACKEND_HEADER])
+    return index, False
+
+
 def validate_submission(
     *,
     project_root: Path,
@@ -59,6 +96,7 @@ def validate_submission(
     evidence_path: Path,
     secret: Optional[str] = None,
     strict_signature: bool = False,
+    cache: Optional[AnalysisCache] = None,
 ) -> ValidationResult:
     issues: List[str] = []
     details: Dict[str, Any] = {}
@@ -118,6 +156,7 @@ def validate_submission(
     required = challenge.required_captures or {}
     port = int(challenge.http_port)
     secret_value = challenge.secret_header_value
+    needles = [secret_value] if secret_value else []
 
     capture_results: Dict[str, Any] = {}
     for name, info in required.items():
@@ -130,39 +169,40 @@ def validate_submission(
         entry = idx.get(rel)
         cap_ok = True
         cap_issues: List[str] = []
+        capture: Optional[CaptureIndex] = None
+        cached = False
 
         if not cap_path.exists():
             cap_ok = False
             cap_issues.append(f"Missing capture file: {rel}")
+        elif not entry:
+            cap_ok = False
+            cap_issues.append("Capture not listed in evidence.json")
         else:
-            if entry:
-                actual = sha256_file(cap_path)
-                if actual != entry.get("sha256"):
-                    cap_ok = False
-                    cap_issues.append("Capture hash does not match evidence.json")
-            else:
+            capture, cached = _analyse_capture(cap_path, entry.get("sha256"), needles, cache)
+            if capture is None:
                 cap_ok = False
-                cap_issues.append("Capture not listed in evidence.json")
+                cap_issues.append("Capture hash does not match evidence.json")
 
-        # Protocol-level checks (best effort)
-        if cap_ok:
-            if not capture_mentions_port(cap_path, port):
+        # Protocol-level checks (best effort), answered from one parse
+        if capture is not None:
+            if not capture_mentions_port(capture, port):
                 cap_ok = False
                 cap_issues.append(f"No packets on expected port {port}")
 
             # Additional checks per capture type
             if name == "handshake":
-                if not has_basic_tcp_handshake(cap_path, port):
+                if not has_basic_tcp_handshake(capture, port):
                     cap_ok = False
                     cap_issues.append("TCP handshake not detected")
 
             if name == "http_exchange":
-                if secret_value and not capture_contains_ascii(cap_path, secret_value, port=port):
+                if secret_value and not capture_contains_ascii(capture, secret_value, port=port):
                     cap_ok = False
                     cap_issues.append("Student token not detected in HTTP payload")
 
             if name == "load_balance":
-                backend_counts = count_http_header_values(cap_path, "X-Backend-ID", port=None)
+                backend_counts = count_http_header_values(capture, BACKEND_HEADER, port=None)
                 capture_results.setdefault("load_balance", {})["backend_counts"] = backend_counts
                 if len(backend_counts) < 2:
                     cap_ok = False
@@ -172,6 +212,7 @@ def validate_submission(
             "ok": cap_ok,
             "issues": cap_issues,
             "path": rel,
+            "cached": cached,
         }
 
         if not cap_ok:
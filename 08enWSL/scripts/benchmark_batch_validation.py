@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Batch Validation Benchmark — Week 8 Laboratory
+===============================================
+
+Generates a directory of synthetic submissions (context, challenge,
+evidence and the three required captures each) and times:
+
+  serial      validate_submission per submission, one process, no cache
+  pool_cold   validate_batch over a process pool with an empty cache
+  pool_warm   the same run again: every capture is hashed, none is parsed
+
+Every capture ends with a flow naming its submission, so no two captures
+share a hash and the cold run cannot hit the cache by accident.
+
+Usage:
+    python scripts/benchmark_batch_validation.py
+    python scripts/benchmark_batch_validation.py --submissions 32 --capture-mb 16 --workers 8 --json
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from anti_ai.batch_validator import DEFAULT_CHALLENGE, DEFAULT_EVIDENCE, validate_batch  # noqa: E402
+from anti_ai.challenge import challenge_from_context, save_challenge  # noqa: E402
+from anti_ai.evidence_collector import SCHEMA_VERSION as EVIDENCE_SCHEMA  # noqa: E402
+from anti_ai.files import sha256_file  # noqa: E402
+from anti_ai.submission_validator import validate_submission  # noqa: E402
+from scripts.benchmark_pcap_index import TOKEN, flow_frames, write_synthetic_capture  # noqa: E402
+
+PORT = 8123
+CAPTURES = ("handshake", "http_exchange", "load_balance")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SYNTHETIC_SUBMISSIONS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def append_marker_flow(path: Path, name: str) -> None:
+    """Append a short flow carrying the submission name to a classic PCAP."""
+    req = b"GET /" + name.encode() + b" HTTP/1.1\r\nHost: lab\r\n\r\n"
+    with path.open("ab") as f:
+        for i, frame in enumerate(flow_frames(61000, PORT, req, b"HTTP/1.1 204 No Content\r\n\r\n")):
+            f.write(struct.pack("<IIII", 1_800_000_000, i, len(frame), len(frame)))
+            f.write(frame)
+
+
+def write_submission(directory: Path, name: str, capture_bytes: int) -> Path:
+    """Write one valid submission laid out like a project root."""
+    root = directory / name
+    context_path = root / "artifacts" / "student_context.json"
+    context_path.parent.mkdir(parents=True)
+    context = {
+        "student_id": name,
+        "student_hash": name.encode().hex(),
+        "http_server": {
+            "port": PORT,
+            "secret_header_name": "X-Student-Token",
+            "secret_header_value": TOKEN,
+        },
+        "required_captures": {
+            cap: {"filename": f"pcap/{name}_{cap}.pcap"} for cap in CAPTURES
+        },
+    }
+    context_path.write_text(json.dumps(context, indent=2), encoding="utf-8")
+
+    artefacts = [context_path]
+    for cap in CAPTURES:
+        path = root / "pcap" / f"{name}_{cap}.pcap"
+        path.parent.mkdir(exist_ok=True)
+        write_synthetic_capture(path, capture_bytes, PORT)
+        append_marker_flow(path, f"{name}/{cap}")
+        artefacts.append(path)
+
+    challenge = challenge_from_context(
+        week="08enWSL",
+        student_context=context,
+        context_sha256=sha256_file(context_path),
+    )
+    save_challenge(challenge, root / DEFAULT_CHALLENGE)
+
+    evidence = {
+        "schema": EVIDENCE_SCHEMA,
+        "artefacts": [
+            {
+                "path": p.relative_to(root).as_posix(),
+                "sha256": sha256_file(p),
+                "size_bytes": p.stat().st_size,
+            }
+            for p in artefacts
+        ],
+        "missing": [],
+    }
+    (root / DEFAULT_EVIDENCE).write_text(json.dumps(evidence, indent=2), encoding="utf-8")
+    return root
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run(directory: Path, workers: int) -> Dict[str, object]:
+    submissions = sorted(p for p in directory.iterdir() if p.is_dir())
+
+    start = time.perf_counter()
+    serial = [
+        validate_submission(
+            project_root=s,
+            challenge_path=s / DEFAULT_CHALLENGE,
+            evidence_path=s / DEFAULT_EVIDENCE,
+        )
+        for s in submissions
+    ]
+    serial_s = time.perf_counter() - start
+    assert all(r.ok for r in serial), [r.issues for r in serial if not r.ok]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = validate_batch(directory, workers=workers, cache_dir=Path(cache_dir))
+        warm = validate_batch(directory, workers=workers, cache_dir=Path(cache_dir))
+    assert cold["passed"] == warm["passed"] == len(submissions), (cold, warm)
+    assert warm["cache_misses"] == 0, warm
+
+    return {
+        "serial_s": round(serial_s, 3),
+        "pool_cold_s": cold["elapsed_s"],
+        "pool_warm_s": warm["elapsed_s"],
+        "cold_cache_misses": cold["cache_misses"],
+        "warm_cache_hits": warm["cache_hits"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batch validation with cold and warm cache")
+    parser.add_argument("--submissions", type=int, default=16, help="Number of submissions (default: 16)")
+    parser.add_argument("--capture-mb", type=int, default=8, help="Size of each capture in MB (default: 8)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for i in range(args.submissions):
+            write_submission(directory, f"student{i:03d}", args.capture_mb * 1024 * 1024)
+        total_mb = sum(p.stat().st_size for p in directory.rglob("*.pcap")) / 1e6
+        results = {
+            "submissions": args.submissions,
+            "captures_mb": round(total_mb, 1),
+            "workers": args.workers,
+        }
+        results.update(run(directory, args.workers))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{results['submissions']} submissions, {results['captures_mb']} MB of captures, "
+          f"{results['workers']} workers")
+    print(f"  serial, no cache   {results['serial_s']:>8.3f} s")
+    print(f"  pool, cold cache   {results['pool_cold_s']:>8.3f} s  ({results['cold_cache_misses']} analysed)")
+    print(f"  pool, warm cache   {results['pool_warm_s']:>8.3f} s  ({results['warm_cache_hits']} from cache)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+HTTP Request Parse-Rate Benchmark — Week 8 Laboratory
+======================================================
+
+Compares the whole-buffer helpers in src/utils/net_utils.py
+(read_until + parse_http_request) with the incremental HttpRequestParser
+on three request streams delivered by an in-memory socket:
+
+  per_recv    one small GET per recv (the case the helpers were written for)
+  pipelined   the same GETs back to back, delivered in 64 KB recvs; the
+              helpers need a split-and-slice loop around parse_http_request
+  fragmented  requests with 16 KB of headers arriving 32 bytes per recv;
+              read_until rescans and re-copies the buffer on every recv
+
+Usage:
+    python scripts/benchmark_http_parser.py
+    python scripts/benchmark_http_parser.py --requests 50000 --json
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from utils.net_utils import HttpRequestParser, parse_http_request, read_until  # noqa: E402
+
+SMALL = (b"GET /api/items?page=%d HTTP/1.1\r\nHost: lab.local\r\nUser-Agent: bench/1.0\r\n"
+         b"Accept: */*\r\nConnection: keep-alive\r\n\r\n")
+LARGE_HEADER = b"X-Filler: " + b"f" * 16 * 1024 + b"\r\n"
+
+
+class ChunkSocket:
+    """Socket stand-in whose recv returns prepared chunks in order."""
+
+    def __init__(self, chunks: List[bytes]) -> None:
+        self._chunks = chunks
+        self._i = 0
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def recv(self, n: int) -> bytes:
+        if self._i >= len(self._chunks):
+            return b""
+        chunk = self._chunks[self._i]
+        self._i += 1
+        return chunk
+
+
+def split(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PARSERS_UNDER_TEST
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def helpers_read_until(chunks: List[bytes], expected: int) -> int:
+    """One read_until + parse_http_request per request (no pipelining)."""
+    sock = ChunkSocket(chunks)
+    n = 0
+    while n < expected:
+        parse_http_request(read_until(sock, max_bytes=1 << 20))
+        n += 1
+    return n
+
+
+def helpers_split_loop(chunks: List[bytes], expected: int) -> int:
+    """Accumulate, split at each CRLFCRLF, parse the head with parse_http_request."""
+    buffer = b""
+    n = 0
+    for chunk in chunks:
+        buffer += chunk
+        while b"\r\n\r\n" in buffer:
+            head, buffer = buffer.split(b"\r\n\r\n", 1)
+            parse_http_request(head + b"\r\n\r\n")
+            n += 1
+    return n
+
+
+def incremental(chunks: List[bytes], expected: int) -> int:
+    parser = HttpRequestParser(max_header_bytes=64 * 1024)
+    n = 0
+    for chunk in chunks:
+        n += len(parser.feed(chunk))
+    return n
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def measure(fn: Callable[[List[bytes], int], int], chunks: List[bytes], expected: int,
+            repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = fn(chunks, expected)
+        best = min(best, time.perf_counter() - start)
+        assert parsed == expected, (fn.__name__, parsed, expected)
+    total = sum(len(c) for c in chunks)
+    return {
+        "requests_per_s": round(expected / best),
+        "mb_per_s": round(total / best / 1e6, 1),
+        "seconds": round(best, 4),
+    }
+
+
+def scenarios(requests: int) -> Dict[str, tuple]:
+    small = [SMALL % i for i in range(requests)]
+    large_count = max(1, requests // 100)
+    large = [(SMALL % i)[:-2] + LARGE_HEADER + b"\r\n" for i in range(large_count)]
+    return {
+        "per_recv": (small, requests, [helpers_read_until, helpers_split_loop, incremental]),
+        "pipelined": (split(b"".join(small), 64 * 1024), requests, [helpers_split_loop, incremental]),
+        "fragmented": ([c for r in large for c in split(r, 32)], large_count,
+                       [helpers_read_until, helpers_split_loop, incremental]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark HTTP request parsing")
+    parser.add_argument("--requests", type=int, default=20000, help="Small requests per scenario (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, (chunks, expected, fns) in scenarios(args.requests).items():
+        results[name] = {fn.__name__: measure(fn, chunks, expected, args.repeat) for fn in fns}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'scenario':<11} {'parser':<20} {'req/s':>10} {'MB/s':>8}")
+    for name, by_fn in results.items():
+        for fn_name, r in by_fn.items():
+            print(f"{name:<11} {fn_name:<20} {r['requests_per_s']:>10} {r['mb_per_s']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+HTTP Server Load Benchmark — Week 8 Laboratory
+===============================================
+
+Runs ex_8_01_http_server in this process and drives it with client
+threads, reporting requests per second and latency percentiles for:
+
+  simple            Section 6 loop: one client at a time, a new connection
+                    and a disk read per request
+  event             Section 7 event loop, a new connection per request
+  event_keepalive   Section 7 event loop, one persistent connection per
+                    client thread
+
+The document root holds a 2 KB page (most requests), a 64 KB stylesheet
+and a 4 MB file that is sent with os.sendfile.
+
+Usage:
+    python scripts/benchmark_http_server.py
+    python scripts/benchmark_http_server.py --requests 4000 --concurrency 8 --json
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from exercises.ex_8_01_http_server import CachedHTTPServer, run_server  # noqa: E402
+
+MODES = ["simple", "event", "event_keepalive"]
+# One large-file request in every LARGE_EVERY
+LARGE_EVERY = 50
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLIENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def make_docroot(path: Path) -> None:
+    (path / "index.html").write_bytes(b"<p>" + b"x" * 2048 + b"</p>")
+    (path / "style.css").write_bytes(b"p{}" * (64 * 1024 // 3))
+    (path / "large.bin").write_bytes(os.urandom(4 * 1024 * 1024))
+
+
+def read_response(sock: socket.socket, buf: bytearray) -> Tuple[int, bool]:
+    """Read one response from sock; return (status, server_keeps_connection)."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("connection closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    head = bytes(buf[:end]).decode("iso-8859-1").lower()
+    status = int(head.split(" ", 2)[1])
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        if line.startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    keep = "connection: close" not in head
+    while len(buf) < end + length:
+        chunk = sock.recv(1 << 20)
+        if not chunk:
+            raise ConnectionError("connection closed mid-body")
+        buf += chunk
+    del buf[:end + length]
+    return status, keep
+
+
+def client(address: Tuple[str, int], paths: List[str], keep_alive: bool,
+           latencies: List[float], errors: List[int]) -> None:
+    sock: Optional[socket.socket] = None
+    buf = bytearray()
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            if sock is None:
+                sock = socket.create_connection(address, timeout=10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                buf.clear()
+            conn = "keep-alive" if keep_alive else "close"
+            sock.sendall(f"GET {path} HTTP/1.1\r\nHost: bench\r\nConnection: {conn}\r\n\r\n".encode())
+            status, keep = read_response(sock, buf)
+            if status != 200:
+                errors.append(status)
+            if not (keep_alive and keep):
+                sock.close()
+                sock = None
+        except OSError:
+            errors.append(0)
+            if sock is not None:
+                sock.close()
+            sock = None
+        latencies.append(time.perf_counter() - start)
+    if sock is not None:
+        sock.close()
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def drive(address: Tuple[str, int], requests: int, concurrency: int, keep_alive: bool) -> Dict[str, float]:
+    per_client = requests // concurrency
+    paths = ["/large.bin" if i % LARGE_EVERY == LARGE_EVERY - 1
+             else "/style.css" if i % 10 == 9 else "/index.html"
+             for i in range(per_client)]
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors: List[int] = []
+    threads = [threading.Thread(target=client, args=(address, paths, keep_alive, latencies[i], errors))
+               for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    merged = sorted(x for lat in latencies for x in lat)
+    return {
+        "requests": len(merged),
+        "errors": len(errors),
+        "rps": round(len(merged) / elapsed, 1),
+        "p50_ms": round(percentile(merged, 50) * 1000, 2),
+        "p99_ms": round(percentile(merged, 99) * 1000, 2),
+        "max_ms": round(merged[-1] * 1000, 2) if merged else 0.0,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERVERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench_simple(docroot: str, requests: int, concurrency: int) -> Dict[str, float]:
+    port = free_port()
+    # run_server prints a line per connection and has no stop hook: silence
+    # it and leave it blocked in accept() on a daemon thread
+    sink = io.StringIO()
+    with redirect_stdout(sink):
+        threading.Thread(target=run_server, args=("127.0.0.1", port, docroot), daemon=True).start()
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.02)
+        result = drive(("127.0.0.1", port), requests, concurrency, keep_alive=False)
+    return result
+
+
+def bench_event(docroot: str, requests: int, concurrency: int, keep_alive: bool) -> Dict[str, float]:
+    server = CachedHTTPServer("127.0.0.1", 0, docroot)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        result = drive(server.address, requests, concurrency, keep_alive)
+    finally:
+        server.shutdown()
+    result["cache_hits"] = server.cache.hits
+    result["cache_misses"] = server.cache.misses
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Week 8 HTTP server loops")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Client threads (default: 4)")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        make_docroot(Path(tmp))
+        for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+            if mode == "simple":
+                results[mode] = bench_simple(tmp, args.requests, args.concurrency)
+            elif mode == "event":
+                results[mode] = bench_event(tmp, args.requests, args.concurrency, keep_alive=False)
+            elif mode == "event_keepalive":
+                results[mode] = bench_event(tmp, args.requests, args.concurrency, keep_alive=True)
+            else:
+                parser.error(f"unknown mode: {mode}")
+
+    if args.json:
+        print(json.dumps({"concurrency": args.concurrency, "results": results}, indent=2))
+        return 0
+
+    print(f"{args.requests} requests per mode, {args.concurrency} client threads")
+    print(f"{'mode':<16} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<16} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['max_ms']:>8.2f} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Capture Query Benchmark — Week 8 Laboratory
+============================================
+
+Generates a synthetic classic PCAP of the requested size and times the
+four checks submission_validator runs on an http/load-balance capture:
+
+  per-helper  each helper parses the capture from its path
+  indexed     one CaptureIndex.build() pass, then the same four queries
+
+Background flows on port 443 carry most of the bytes; lab flows on the
+student port are spread through the file and the student token only
+appears in the last one, so the token search cannot stop early.
+
+Usage:
+    python scripts/benchmark_pcap_index.py
+    python scripts/benchmark_pcap_index.py --size-mb 400 --json
+    python scripts/benchmark_pcap_index.py --keep /tmp/big.pcap
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import json
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from anti_ai.pcap_tools import (  # noqa: E402
+    CaptureIndex,
+    capture_contains_ascii,
+    capture_mentions_port,
+    count_http_header_values,
+    has_basic_tcp_handshake,
+)
+
+TOKEN = "tok-7f3a91c2"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SYNTHETIC_CAPTURE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def tcp_frame(src: bytes, dst: bytes, sport: int, dport: int, flags: int,
+              seq: int, payload: bytes = b"") -> bytes:
+    """Ethernet + IPv4 + TCP frame (checksums left at zero)."""
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, seq, 0, 5 << 4, flags, 65535, 0, 0)
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp) + len(payload), 0, 0,
+                     64, 6, 0, src, dst)
+    return b"\x00" * 12 + b"\x08\x00" + ip + tcp + payload
+
+
+def flow_frames(sport: int, dport: int, request: bytes, response: bytes) -> list:
+    c, s = bytes([10, 0, 0, 1]), bytes([10, 0, 0, 2])
+    return [
+        tcp_frame(c, s, sport, dport, 0x02, 1000),
+        tcp_frame(s, c, dport, sport, 0x12, 5000),
+        tcp_frame(c, s, sport, dport, 0x10, 1001),
+        tcp_frame(c, s, sport, dport, 0x18, 1001, request),
+        tcp_frame(s, c, dport, sport, 0x18, 5001, response),
+        tcp_frame(c, s, sport, dport, 0x11, 1001 + len(request)),
+    ]
+
+
+def write_synthetic_capture(path: Path, size_bytes: int, port: int) -> int:
+    """Write a capture of about size_bytes; return the number of frames."""
+    noise_body = b"\x17\x03\x03" + bytes(range(256)) * 5  # TLS-looking records
+    lab_every = 50
+    frames = 0
+
+    def lab_flow(sport: int, backend: int, token: bytes) -> list:
+        req = b"GET / HTTP/1.1\r\nHost: lab\r\nX-Student-Token: " + token + b"\r\n\r\n"
+        resp = (b"HTTP/1.1 200 OK\r\nX-Backend-ID: " + str(backend).encode()
+                + b"\r\nContent-Length: 2\r\n\r\nok")
+        return flow_frames(sport, port, req, resp)
+
+    with path.open("wb") as f:
+        f.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        flow = 0
+        while True:
+            sport = 20000 + flow % 40000
+            if f.tell() >= size_bytes:
+                # The only flow carrying the student token comes last
+                pkts = lab_flow(sport, 1, TOKEN.encode())
+            elif flow % lab_every == 0:
+                pkts = lab_flow(sport, 1 + (flow // lab_every) % 3, b"none")
+            else:
+                pkts = flow_frames(sport, 443, noise_body[:200], noise_body * 4)
+            for i, frame in enumerate(pkts):
+                f.write(struct.pack("<IIII", 1_700_000_000 + flow, i, len(frame), len(frame)))
+                f.write(frame)
+            frames += len(pkts)
+            flow += 1
+            if f.tell() >= size_bytes and pkts[3].endswith(TOKEN.encode() + b"\r\n\r\n"):
+                return frames
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(path: Path, port: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    results["helper_mentions_port_s"] = timed(lambda: capture_mentions_port(path, port))
+    results["helper_handshake_s"] = timed(lambda: has_basic_tcp_handshake(path, port))
+    results["helper_contains_ascii_s"] = timed(lambda: capture_contains_ascii(path, TOKEN, port=port))
+    results["helper_header_values_s"] = timed(lambda: count_http_header_values(path, "X-Backend-ID"))
+    results["per_helper_total_s"] = sum(results.values())
+
+    start = time.perf_counter()
+    index = CaptureIndex.build(path, needles=[TOKEN])
+    results["index_build_s"] = time.perf_counter() - start
+    answers = (
+        capture_mentions_port(index, port),
+        has_basic_tcp_handshake(index, port),
+        capture_contains_ascii(index, TOKEN, port=port),
+        count_http_header_values(index, "X-Backend-ID"),
+    )
+    results["indexed_total_s"] = time.perf_counter() - start
+    assert answers[:3] == (True, True, True) and len(answers[3]) == 3, answers
+    return {k: round(v, 3) for k, v in results.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-helper versus indexed capture queries")
+    parser.add_argument("--size-mb", type=int, default=300, help="Capture size in MB (default: 300)")
+    parser.add_argument("--port", type=int, default=8123, help="Student HTTP port")
+    parser.add_argument("--keep", type=Path, default=None, help="Write the capture here and keep it")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.keep or Path(tmp) / "synthetic.pcap"
+        if not path.exists():
+            write_synthetic_capture(path, args.size_mb * 1024 * 1024, args.port)
+        results = {"capture_mb": round(path.stat().st_size / 1e6, 1)}
+        results.update(run(path, args.port))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Capture: {results['capture_mb']} MB")
+    for key, value in results.items():
+        if key.endswith("_s"):
+            print(f"  {key:<26} {value:>8.3f}")
+    print(f"  speed-up                   {results['per_helper_total_s'] / results['indexed_total_s']:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Capture Reader Peak-Memory Benchmark — Week 8 Laboratory
+=========================================================
+
+Builds CaptureIndex over a synthetic capture in a fresh process per reader
+and reports peak resident memory (VmHWM) and elapsed time:
+
+  read_bytes  the previous reader: whole file in memory, one slice copy
+              per packet (kept here for comparison)
+  mmap        the current reader: memory map plus memoryview slices
+  chunked     the current reader with mmap disabled (chunked reads)
+
+Usage:
+    python scripts/benchmark_pcap_memory.py
+    python scripts/benchmark_pcap_memory.py --size-mb 500 --json
+
+Linux only (reads /proc/self/status).
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import json
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from anti_ai import pcap_tools  # noqa: E402
+from scripts.benchmark_pcap_index import TOKEN, write_synthetic_capture  # noqa: E402
+
+READERS = ["read_bytes", "mmap", "chunked"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BASELINE_READER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def read_bytes_iter_pcap_packets(path: Path) -> Iterator[Tuple[float, bytes]]:
+    """The pre-mmap classic PCAP reader."""
+    data = path.read_bytes()
+    endian = "<" if struct.unpack_from("<I", data, 0)[0] == 0xA1B2C3D4 else ">"
+    offset = 24
+    while offset + 16 <= len(data):
+        ts_sec, ts_sub, incl_len, _ = struct.unpack_from(endian + "IIII", data, offset)
+        offset += 16
+        if offset + incl_len > len(data):
+            break
+        frame = data[offset : offset + incl_len]
+        offset += incl_len
+        yield ts_sec + ts_sub / 1_000_000, frame
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def peak_rss_mb() -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def child(reader: str, path: Path) -> Dict[str, float]:
+    if reader == "read_bytes":
+        pcap_tools._iter_pcap_packets = read_bytes_iter_pcap_packets
+    elif reader == "chunked":
+        def no_mmap(*args, **kwargs):
+            raise OSError("mmap disabled")
+        pcap_tools.mmap.mmap = no_mmap
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    index = pcap_tools.CaptureIndex.build(path, needles=[TOKEN])
+    elapsed = time.perf_counter() - start
+    return {
+        "reader": reader,
+        "segments": index.segments,
+        "seconds": round(elapsed, 3),
+        "peak_rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of the capture readers")
+    parser.add_argument("--size-mb", type=int, default=300, help="Capture size in MB (default: 300)")
+    parser.add_argument("--readers", default=",".join(READERS), help="Comma-separated readers")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", nargs=2, metavar=("READER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child[0], Path(args.child[1]))))
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.pcap"
+        write_synthetic_capture(path, args.size_mb * 1024 * 1024, 8123)
+        for reader in (r.strip() for r in args.readers.split(",") if r.strip()):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", reader, str(path)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            results.append(json.loads(out))
+        size_mb = round(path.stat().st_size / 1e6, 1)
+
+    if args.json:
+        print(json.dumps({"capture_mb": size_mb, "results": results}, indent=2))
+        return 0
+
+    print(f"Capture: {size_mb} MB")
+    print(f"{'reader':<11} {'segments':>9} {'seconds':>8} {'peak RSS growth MB':>19}")
+    for r in results:
+        print(f"{r['reader']:<11} {r['segments']:>9} {r['seconds']:>8.3f} {r['peak_rss_growth_mb']:>19.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Reverse Proxy Soak Test — Week 8 Laboratory
+============================================
+
+Starts three backend_server processes (--mode event) and the reverse proxy
+from ex_8_02 in its own process, once per engine:
+
+  threads     one thread per client connection (Sections 1-6)
+  selectors   fixed pool of event-loop threads (Section 7)
+
+Against each proxy it opens --idle connections that stay open (half send
+one keep-alive request first, half never send anything), then runs
+--concurrency active keep-alive clients for --duration seconds. It samples
+the proxy's resident memory and thread count throughout and reports them
+with request rate, latency percentiles and errors.
+
+Usage:
+    python scripts/benchmark_proxy_soak.py
+    python scripts/benchmark_proxy_soak.py --idle 5000 --duration 20 --json
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import argparse
+import json
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+BACKEND = ROOT_DIR / "src" / "apps" / "backend_server.py"
+PROXY = ROOT_DIR / "src" / "exercises" / "ex_8_02_reverse_proxy.py"
+ENGINES = ["threads", "selectors"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESSES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+def start(args: List[str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+
+
+def proc_status(pid: int) -> Tuple[int, int]:
+    """(resident KB, thread count) of a process, from /proc."""
+    rss = threads = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Threads:"):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+class Sampler(threading.Thread):
+    """Records the peak RSS and thread count of a process."""
+
+    def __init__(self, pid: int) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.peak_rss_kb = 0
+        self.peak_threads = 0
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(0.25):
+            try:
+                rss, threads = proc_status(self.pid)
+            except OSError:
+                return
+            self.peak_rss_kb = max(self.peak_rss_kb, rss)
+            self.peak_threads = max(self.peak_threads, threads)
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLIENTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+REQUEST = b"GET /health HTTP/1.1\r\nHost: soak\r\nConnection: keep-alive\r\n\r\n"
+
+
+def read_response(sock: socket.socket, buf: bytearray) -> Tuple[int, bool]:
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    head = bytes(buf[:end]).decode("iso-8859-1").lower()
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        if line.startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    while len(buf) < end + length:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("closed mid-body")
+        buf += chunk
+    del buf[:end + length]
+    return int(head.split(" ", 2)[1]), "connection: close" not in head
+
+
+def open_idle(port: int, count: int) -> Tuple[List[socket.socket], int]:
+    """Open idle connections; every other one sends a request first."""
+    socks: List[socket.socket] = []
+    failures = 0
+    for i in range(count):
+        try:
+            sock = socket.create_connection(("127.0.0.1", port), timeout=10)
+            if i % 2 == 0:
+                sock.sendall(REQUEST)
+                read_response(sock, bytearray())
+            socks.append(sock)
+        except OSError:
+            failures += 1
+    return socks, failures
+
+
+def still_open(socks: List[socket.socket]) -> int:
+    alive = 0
+    for sock in socks:
+        sock.setblocking(False)
+        try:
+            alive += sock.recv(1) != b""
+        except BlockingIOError:
+            alive += 1
+        except OSError:
+            pass
+    return alive
+
+
+def active_client(port: int, deadline: float, latencies: List[float], errors: List[int]) -> None:
+    sock: Optional[socket.socket] = None
+    buf = bytearray()
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            if sock is None:
+                sock = socket.create_connection(("127.0.0.1", port), timeout=10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                buf.clear()
+            sock.sendall(REQUEST)
+            status, keep = read_response(sock, buf)
+            if status != 200:
+                errors.append(status)
+            if not keep:
+                sock.close()
+                sock = None
+        except OSError:
+            errors.append(0)
+            if sock is not None:
+                sock.close()
+            sock = None
+        latencies.append(time.perf_counter() - start)
+    if sock is not None:
+        sock.close()
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SOAK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def soak(engine: str, backends: str, idle: int, concurrency: int, duration: float,
+         threads: int) -> Dict[str, float]:
+    port = free_port()
+    proxy = start([str(PROXY), "--host", "127.0.0.1", "--port", str(port), "--backends", backends,
+                   "--engine", engine, "--threads", str(threads), "--quiet"])
+    try:
+        wait_for_port(port)
+        base_rss, _ = proc_status(proxy.pid)
+        sampler = Sampler(proxy.pid)
+        sampler.start()
+
+        started = time.monotonic()
+        idle_socks, idle_failures = open_idle(port, idle)
+        open_s = time.monotonic() - started
+
+        latencies: List[List[float]] = [[] for _ in range(concurrency)]
+        errors: List[int] = []
+        deadline = time.monotonic() + duration
+        clients = [threading.Thread(target=active_client, args=(port, deadline, latencies[i], errors))
+                   for i in range(concurrency)]
+        for t in clients:
+            t.start()
+        for t in clients:
+            t.join()
+
+        idle_alive = still_open(idle_socks)
+        sampler.stop()
+        for sock in idle_socks:
+            sock.close()
+    finally:
+        proxy.terminate()
+        proxy.wait()
+
+    merged = sorted(x for lat in latencies for x in lat)
+    return {
+        "idle_opened": len(idle_socks),
+        "idle_failed": idle_failures,
+        "idle_open_s": round(open_s, 2),
+        "idle_alive_at_end": idle_alive,
+        "requests": len(merged),
+        "errors": len(errors),
+        "rps": round(len(merged) / duration, 1),
+        "p50_ms": round(percentile(merged, 50) * 1000, 2),
+        "p99_ms": round(percentile(merged, 99) * 1000, 2),
+        "max_ms": round(merged[-1] * 1000, 2) if merged else 0.0,
+        "base_rss_mb": round(base_rss / 1024, 1),
+        "peak_rss_mb": round(sampler.peak_rss_kb / 1024, 1),
+        "rss_kb_per_conn": round((sampler.peak_rss_kb - base_rss) / max(1, len(idle_socks)), 1),
+        "peak_threads": sampler.peak_threads,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Soak the Week 8 reverse proxy engines")
+    parser.add_argument("--idle", type=int, default=2000, help="Idle connections (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Active clients (default: 16)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Active phase seconds (default: 10)")
+    parser.add_argument("--threads", type=int, default=2, help="Selectors engine threads (default: 2)")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Comma-separated engines")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Both ends of every idle connection live on this machine
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    want = min(hard, max(soft, 2 * args.idle + 1024))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (want, hard))
+
+    backend_ports = [free_port() for _ in range(3)]
+    backends = [start([str(BACKEND), "--host", "127.0.0.1", "--port", str(p), "--id", chr(65 + i),
+                       "--mode", "event", "--quiet"])
+                for i, p in enumerate(backend_ports)]
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for p in backend_ports:
+            wait_for_port(p)
+        spec = ",".join(f"127.0.0.1:{p}" for p in backend_ports)
+        for engine in (e.strip() for e in args.engines.split(",") if e.strip()):
+            if engine not in ENGINES:
+                parser.error(f"unknown engine: {engine}")
+            results[engine] = soak(engine, spec, args.idle, args.concurrency, args.duration, args.threads)
+    finally:
+        for proc in backends:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        print(json.dumps({"idle": args.idle, "concurrency": args.concurrency,
+                          "duration_s": args.duration, "results": results}, indent=2))
+        return 0
+
+    print(f"{args.idle} idle connections, {args.concurrency} active clients for {args.duration:g} s")
+    print(f"{'engine':<10} {'rps':>8} {'p50 ms':>7} {'p99 ms':>7} {'errors':>6} "
+          f"{'idle ok':>8} {'RSS MB':>7} {'KB/conn':>8} {'threads':>8}")
+    for engine, r in results.items():
+        print(f"{engine:<10} {r['rps']:>8.1f} {r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f} {r['errors']:>6} "
+              f"{r['idle_alive_at_end']:>8} {r['peak_rss_mb']:>7.1f} {r['rss_kb_per_conn']:>8.1f} "
+              f"{r['peak_threads']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
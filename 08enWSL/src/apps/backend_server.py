@@ -5,15 +5,44 @@ Backend HTTP Server for Load Balancing Demonstration
 This server identifies itself in responses, allowing observation
 of load balancing behaviour when accessed through a reverse proxy.
 
+Concurrency modes (--mode):
+    simple     One connection at a time, one request per connection
+    pool       Selector thread handing connections with bytes waiting to a
+               pool of worker threads; idle keep-alive connections hold none
+    event      Single-threaded selectors loop with keep-alive and pipelining
+    reuseport  Several processes, each running the event loop on its own
+               SO_REUSEPORT listener; the kernel spreads new connections
+
+--load starts the server on a loopback port and reports requests per
+second and latency percentiles; --load-target drives a running server
+(or the reverse proxy in front of it) instead.
+
 Author: ing. dr. Antonio Clim
 Course: Computer Networks - ASE, CSIE
 """
 
 import socket
 import argparse
+import json
+import multiprocessing
 import os
+import queue
+import select
+import selectors
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Make src/utils importable when run as a script (in the container the
+# script sits next to utils/ already)
+SRC_DIR = Path(__file__).resolve().parents[1]
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from utils.net_utils import HttpParseError, HttpRequest, HttpRequestParser  # noqa: E402
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -25,6 +54,24 @@ BUFFER_SIZE = 4096
 # Server identification (can be set via environment or command line)
 BACKEND_ID = os.environ.get("BACKEND_ID", "Unknown")
 
+MODES = ("simple", "pool", "event", "reuseport")
+DEFAULT_MODE = os.environ.get("BACKEND_MODE", "simple")
+DEFAULT_POOL_WORKERS = 16
+DEFAULT_BACKLOG = 128
+RECV_SIZE = 64 * 1024
+
+# /api/status is rebuilt at most this often
+STATUS_REFRESH_S = 1.0
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_TIMEOUT = 5.0
+# How often blocking loops check for shutdown
+POLL_INTERVAL = 0.2
+# Pool mode: while no other connection is waiting, a worker keeps its
+# connection this long for the next request (at most POOL_BURST in a row)
+# instead of handing it back to the selector
+POOL_LINGER = 0.005
+POOL_BURST = 64
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 1: REQUEST PARSING
@@ -90,8 +137,13 @@ def build_response(status_code: int, headers: dict, body: bytes = b"") -> bytes:
     """
     status_messages = {
         200: "OK",
+        400: "Bad Request",
         404: "Not Found",
         405: "Method Not Allowed",
+        413: "Content Too Large",
+        431: "Request Header Fields Too Large",
+        501: "Not Implemented",
+        505: "HTTP Version Not Supported",
     }
     
     status_line = f"HTTP/1.1 {status_code} {status_messages.get(status_code, 'Unknown')}\r\n"
@@ -165,79 +217,151 @@ def generate_status_json(backend_id: str) -> bytes:
     return json.dumps(status, indent=2).encode('utf-8')
 
 
+class StatusCache:
+    """
+    Status JSON shared by all requests and rebuilt on a timer.
+
+    The body is rebuilt by the first request after it is `interval` seconds
+    old, so between refreshes /api/status costs one clock read.
+    """
+
+    def __init__(self, backend_id: str, interval: float = STATUS_REFRESH_S) -> None:
+        self.backend_id = backend_id
+        self.interval = interval
+        self.builds = 0
+        self._body = b""
+        self._expires = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self) -> bytes:
+        now = time.monotonic()
+        if now >= self._expires:
+            with self._lock:
+                if now >= self._expires:
+                    self._body = generate_status_json(self.backend_id)
+                    self._expires = now + self.interval
+                    self.builds += 1
+        return self._body
+
+
+_date_cache: Tuple[int, str] = (0, "")
+
+
+def http_date() -> str:
+    """Current time as an HTTP Date value, formatted once per second."""
+    global _date_cache
+    now = int(time.time())
+    if _date_cache[0] != now:
+        _date_cache = (now, time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(now)))
+    return _date_cache[1]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 3: REQUEST HANDLING
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def handle_request(raw_data: bytes, backend_id: str) -> bytes:
+def handle_request(raw_data: bytes, backend_id: str,
+                   status_cache: Optional[StatusCache] = None,
+                   keep_alive: bool = False) -> bytes:
     """
     Process HTTP request and generate response.
-    
+
     Routes:
         /          - Index page with backend identification
         /health    - Health check endpoint
         /api/status - JSON status endpoint
-        
+
     Args:
         raw_data: Raw HTTP request bytes
         backend_id: This server's identifier
-        
+        status_cache: Shared status body (built per request if None)
+        keep_alive: Whether the connection stays open after this response
+
     Returns:
         Complete HTTP response
     """
-    request = parse_request(raw_data)
-    
+    return route_request(parse_request(raw_data), backend_id, status_cache, keep_alive)
+
+
+def route_request(request: Optional[dict], backend_id: str,
+                  status_cache: Optional[StatusCache] = None,
+                  keep_alive: bool = False) -> bytes:
+    """Build the response for an already parsed request (None means unparseable)."""
+    connection = "keep-alive" if keep_alive else "close"
+
     if request is None:
-        return build_response(400, {"Content-Type": "text/plain"}, b"Bad Request")
-    
+        return build_response(400, {"Content-Type": "text/plain", "Content-Length": "11",
+                                    "Connection": "close"}, b"Bad Request")
+
     method = request['method']
     path = request['path']
-    
+
     # Only allow GET and HEAD
     if method not in ('GET', 'HEAD'):
         return build_response(
             405,
-            {"Content-Type": "text/plain", "Allow": "GET, HEAD"},
+            {"Content-Type": "text/plain", "Allow": "GET, HEAD",
+             "Content-Length": "18", "Connection": connection},
             b"Method Not Allowed"
         )
-    
+
     # Route to appropriate handler
     if path == '/' or path == '/index.html':
         body = generate_index_page(backend_id, request)
         content_type = "text/html; charset=utf-8"
-        
+
     elif path == '/health':
         body = generate_health_response()
         content_type = "text/plain"
-        
+
     elif path == '/api/status' or path == '/api/status.json':
-        body = generate_status_json(backend_id)
+        body = status_cache.get() if status_cache else generate_status_json(backend_id)
         content_type = "application/json"
-        
+
     else:
         body = b"Not Found"
         headers = {
             "Content-Type": "text/plain",
             "Content-Length": str(len(body)),
             "X-Backend-ID": backend_id,
+            "Connection": connection,
         }
         return build_response(404, headers, body if method == 'GET' else b"")
-    
+
     # Build success response
     headers = {
         "Content-Type": content_type,
         "Content-Length": str(len(body)),
         "X-Backend-ID": backend_id,
         "Server": f"PythonBackend/{backend_id}",
-        "Date": datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        "Date": http_date(),
+        "Connection": connection,
     }
-    
+
     # HEAD requests get headers but no body
     response_body = body if method == 'GET' else b""
-    
+
     return build_response(200, headers, response_body)
 
 
+def error_response(exc: HttpParseError) -> bytes:
+    """Response for a request the parser rejected; the connection then closes."""
+    body = str(exc).encode('utf-8', errors='replace')
+    return build_response(exc.status, {"Content-Type": "text/plain",
+                                       "Content-Length": str(len(body)),
+                                       "Connection": "close"}, body)
+
+
+def as_request_dict(request: HttpRequest) -> dict:
+    """Adapt a net_utils HttpRequest to the dictionary used by the handlers."""
+    return {
+        'method': request.method,
+        'path': request.target,
+        'version': request.version,
+        'headers': request.headers,
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 4: SERVER MAIN LOOP
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -245,7 +369,7 @@ def handle_request(raw_data: bytes, backend_id: str) -> bytes:
 def run_server(host: str, port: int, backend_id: str) -> None:
     """
     Run the backend HTTP server.
-    
+
     Args:
         host: Address to bind to
         port: Port to listen on
@@ -255,49 +379,661 @@ def run_server(host: str, port: int, backend_id: str) -> None:
     server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     server.bind((host, port))
     server.listen(5)
-    
+
     print(f"Backend {backend_id} running on http://{host}:{port}")
     print("Press Ctrl+C to stop")
-    
+
     try:
         while True:
             client, addr = server.accept()
-            
+
             try:
                 data = client.recv(BUFFER_SIZE)
                 if data:
                     # Log request
                     request_line = data.split(b'\r\n')[0].decode('utf-8', errors='ignore')
                     print(f"[{datetime.now().isoformat()}] {addr[0]} -> {request_line}")
-                    
+
                     response = handle_request(data, backend_id)
                     client.sendall(response)
-                    
+
             except Exception as e:
                 print(f"Error: {e}")
             finally:
                 client.close()
-                
+
     except KeyboardInterrupt:
         print(f"\nBackend {backend_id} shutting down...")
     finally:
         server.close()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 5: CONCURRENT SERVING MODES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def create_listener(host: str, port: int, backlog: int = DEFAULT_BACKLOG,
+                    reuse_port: bool = False, listen: bool = True) -> socket.socket:
+    """Bind a TCP socket, optionally with SO_REUSEPORT so several can share a port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        if not hasattr(socket, "SO_REUSEPORT"):
+            sock.close()
+            raise OSError("SO_REUSEPORT is not available on this platform")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    if listen:
+        sock.listen(backlog)
+    return sock
+
+
+def _wait_readable(sock: socket.socket, wait: float) -> bool:
+    """Wait up to `wait` seconds for sock to become readable.
+
+    poll() where it exists: select() cannot take descriptors at or above
+    FD_SETSIZE (1024), and a pool with many idle clients gets there.
+    """
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return bool(poller.poll(wait * 1000))
+    readable, _, _ = select.select([sock], [], [], wait)
+    return bool(readable)
+
+
+class _EventConnection:
+    """Per-connection state for the event loop."""
+
+    __slots__ = ("sock", "addr", "parser", "out", "closing", "last_active")
+
+    def __init__(self, sock: socket.socket, addr: Tuple[str, int]) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.parser = HttpRequestParser()
+        self.out = bytearray()
+        self.closing = False
+        self.last_active = time.monotonic()
+
+
+class BackendServer:
+    """
+    Backend HTTP server with a selectable concurrency mode.
+
+    Every mode except `simple` keeps connections open (HTTP/1.1 keep-alive),
+    reads requests with HttpRequestParser so pipelined requests are answered
+    in order, and serves /api/status from a shared StatusCache.
+
+    Args:
+        host: Address to bind to
+        port: Port to listen on (0 picks a free port; see .address)
+        backend_id: Identifier for this backend
+        mode: One of MODES
+        workers: Pool threads (pool) or processes (reuseport)
+        status_interval: Seconds between /api/status rebuilds
+        keepalive_timeout: Idle seconds before a kept-alive connection closes
+        log: Print one line per request
+        reuse_port: Bind the listener with SO_REUSEPORT (set for the
+            processes started by reuseport mode)
+
+    Example:
+        >>> server = BackendServer("127.0.0.1", 0, "A", mode="event", log=False)
+        >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+        >>> server.ready.wait(5)
+        True
+        >>> server.shutdown()
+    """
+
+    def __init__(self, host: str, port: int, backend_id: str, mode: str = "event",
+                 workers: Optional[int] = None,
+                 status_interval: float = STATUS_REFRESH_S,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+                 log: bool = True,
+                 reuse_port: bool = False) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.backend_id = backend_id
+        if workers is None:
+            workers = (os.cpu_count() or 1) if mode == "reuseport" else DEFAULT_POOL_WORKERS
+        self.workers = workers
+        self.status_interval = status_interval
+        self.keepalive_timeout = keepalive_timeout
+        self.log = log
+        self.status_cache = StatusCache(backend_id, status_interval)
+        self.ready = threading.Event()
+
+        # reuseport: the parent only reserves the port; the worker processes
+        # each bind and listen on it themselves
+        reserve_only = mode == "reuseport"
+        self._listener = create_listener(host, port, reuse_port=reuse_port or reserve_only,
+                                         listen=not reserve_only)
+        self.address: Tuple[str, int] = self._listener.getsockname()[:2]
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._conns: set = set()
+        self._conns_lock = threading.Lock()
+
+    # ── lifecycle ──────────────────────────────────────────────────────────────
+
+    def serve_forever(self) -> None:
+        """Serve until shutdown() is called."""
+        try:
+            if self.mode == "simple":
+                self._serve_simple()
+            elif self.mode == "pool":
+                self._serve_pool()
+            elif self.mode == "event":
+                self._serve_event()
+            else:
+                self._serve_reuseport()
+        finally:
+            self._listener.close()
+            self._done.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop serving, close open connections and wait for serve_forever to return."""
+        self._stop.set()
+        with self._conns_lock:
+            for conn in list(self._conns):
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self._done.wait(timeout)
+
+    # ── shared helpers ─────────────────────────────────────────────────────────
+
+    def _respond(self, request: HttpRequest, addr: Tuple[str, int]) -> Tuple[bytes, bool]:
+        """Return (response, keep_alive) for one parsed request."""
+        keep_alive = request.keep_alive and not self._stop.is_set()
+        if self.log:
+            print(f"[{datetime.now().isoformat()}] {addr[0]} -> "
+                  f"{request.method} {request.target} {request.version}")
+        response = route_request(as_request_dict(request), self.backend_id,
+                                 self.status_cache, keep_alive)
+        return response, keep_alive
+
+    def _accept(self) -> Optional[Tuple[socket.socket, Tuple[str, int]]]:
+        """Blocking accept that gives up every POLL_INTERVAL to check for shutdown."""
+        try:
+            return self._listener.accept()
+        except socket.timeout:
+            return None
+        except OSError:
+            if self._stop.is_set():
+                return None
+            raise
+
+    # ── simple ─────────────────────────────────────────────────────────────────
+
+    def _serve_simple(self) -> None:
+        self._listener.settimeout(POLL_INTERVAL)
+        self.ready.set()
+        while not self._stop.is_set():
+            accepted = self._accept()
+            if accepted is None:
+                continue
+            client, addr = accepted
+            with self._conns_lock:
+                self._conns.add(client)
+            with client:
+                try:
+                    client.settimeout(self.keepalive_timeout)
+                    data = client.recv(BUFFER_SIZE)
+                    if data:
+                        if self.log:
+                            request_line = data.split(b'\r\n')[0].decode('utf-8', errors='ignore')
+                            print(f"[{datetime.now().isoformat()}] {addr[0]} -> {request_line}")
+                        client.sendall(handle_request(data, self.backend_id, self.status_cache))
+                except OSError as e:
+                    if self.log and not self._stop.is_set():
+                        print(f"Error: {e}")
+                finally:
+                    with self._conns_lock:
+                        self._conns.discard(client)
+
+    # ── pool ───────────────────────────────────────────────────────────────────
+
+    def _serve_pool(self) -> None:
+        # The acceptor thread runs a selector over the listener and every idle
+        # keep-alive connection; only a connection with bytes waiting is
+        # handed to a worker, which serves what arrived and hands it back.
+        # Idle or slow clients therefore hold no worker between requests.
+        jobs: "queue.Queue[Optional[_EventConnection]]" = queue.Queue()
+        threads = [threading.Thread(target=self._pool_worker, args=(jobs,), daemon=True)
+                   for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        listener = self._listener
+        listener.setblocking(False)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._rearm: List[_EventConnection] = []
+        self._rearm_lock = threading.Lock()
+        sel = selectors.DefaultSelector()
+        sel.register(listener, selectors.EVENT_READ, None)
+        sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        conns: Dict[int, _EventConnection] = {}
+        next_sweep = time.monotonic() + 1.0
+        self.ready.set()
+        try:
+            while not self._stop.is_set():
+                for key, _ in sel.select(POLL_INTERVAL):
+                    if key.data is None:
+                        self._event_accept(sel, conns, blocking=True)
+                    elif key.data == "wake":
+                        self._pool_rearm(sel, conns)
+                    else:
+                        sel.unregister(key.fileobj)
+                        jobs.put(key.data)
+                now = time.monotonic()
+                if now >= next_sweep:
+                    next_sweep = now + 1.0
+                    for key in list(sel.get_map().values()):
+                        conn = key.data
+                        if (isinstance(conn, _EventConnection)
+                                and now - conn.last_active > self.keepalive_timeout):
+                            self._event_close(sel, conns, conn)
+        finally:
+            for _ in threads:
+                jobs.put(None)
+            for thread in threads:
+                thread.join()
+            self._pool_rearm(sel, conns)
+            for conn in list(conns.values()):
+                self._event_close(sel, conns, conn)
+            sel.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _pool_rearm(self, sel: selectors.BaseSelector, conns: Dict[int, _EventConnection]) -> None:
+        """Take back connections from the workers: watch them again or close them."""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        with self._rearm_lock:
+            ready, self._rearm = self._rearm, []
+        for conn in ready:
+            if conn.closing or self._stop.is_set():
+                self._event_close(sel, conns, conn)
+            else:
+                sel.register(conn.sock, selectors.EVENT_READ, conn)
+
+    def _pool_worker(self, jobs: "queue.Queue") -> None:
+        while True:
+            conn = jobs.get()
+            if conn is None:
+                return
+            try:
+                for _ in range(POOL_BURST):
+                    # Readable, so recv returns at once; the socket timeout only
+                    # bounds sendall to a client that stops reading its responses
+                    data = conn.sock.recv(RECV_SIZE)
+                    if not data:
+                        conn.closing = True
+                        break
+                    self._handle_data(conn, data)
+                    if conn.out:
+                        conn.sock.sendall(conn.out)
+                        conn.out.clear()
+                    if (conn.closing or not jobs.empty()
+                            or not _wait_readable(conn.sock, POOL_LINGER)):
+                        break
+            except OSError:
+                conn.closing = True
+            with self._rearm_lock:
+                self._rearm.append(conn)
+            try:
+                self._wake_w.send(b"\0")
+            except OSError:
+                pass
+
+    # ── event ──────────────────────────────────────────────────────────────────
+
+    def _serve_event(self) -> None:
+        listener = self._listener
+        listener.setblocking(False)
+        sel = selectors.DefaultSelector()
+        sel.register(listener, selectors.EVENT_READ, None)
+        conns: Dict[int, _EventConnection] = {}
+        next_sweep = time.monotonic() + 1.0
+        self.ready.set()
+        try:
+            while not self._stop.is_set():
+                for key, mask in sel.select(POLL_INTERVAL):
+                    if key.data is None:
+                        self._event_accept(sel, conns)
+                        continue
+                    conn = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._event_read(sel, conns, conn)
+                    if mask & selectors.EVENT_WRITE and conn.sock.fileno() >= 0:
+                        self._event_write(sel, conns, conn)
+                now = time.monotonic()
+                if now >= next_sweep:
+                    next_sweep = now + 1.0
+                    for conn in list(conns.values()):
+                        if not conn.out and now - conn.last_active > self.keepalive_timeout:
+                            self._event_close(sel, conns, conn)
+        finally:
+            for conn in list(conns.values()):
+                self._event_close(sel, conns, conn)
+            sel.close()
+
+    def _event_accept(self, sel: selectors.BaseSelector, conns: Dict[int, _EventConnection],
+                      blocking: bool = False) -> None:
+        # Drain the accept queue so a burst of connects costs one wakeup
+        while True:
+            try:
+                client, addr = self._listener.accept()
+            except OSError:
+                return
+            if blocking:
+                client.settimeout(self.keepalive_timeout)
+                # Lets shutdown() unblock a worker stuck in sendall
+                with self._conns_lock:
+                    self._conns.add(client)
+            else:
+                client.setblocking(False)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _EventConnection(client, addr)
+            conns[client.fileno()] = conn
+            sel.register(client, selectors.EVENT_READ, conn)
+
+    def _event_read(self, sel: selectors.BaseSelector, conns: Dict[int, _EventConnection],
+                    conn: _EventConnection) -> None:
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._event_close(sel, conns, conn)
+            return
+        self._handle_data(conn, data)
+        if conn.out or conn.closing:
+            self._event_write(sel, conns, conn)
+
+    def _handle_data(self, conn: _EventConnection, data: bytes) -> None:
+        """Parse received bytes and append the responses to conn.out."""
+        conn.last_active = time.monotonic()
+        try:
+            requests = conn.parser.feed(data)
+        except HttpParseError as exc:
+            conn.out += error_response(exc)
+            conn.closing = True
+            requests = []
+        for request in requests:
+            response, keep_alive = self._respond(request, conn.addr)
+            conn.out += response
+            if not keep_alive:
+                conn.closing = True
+                break
+        if conn.parser.error is not None and not conn.closing:
+            conn.out += error_response(conn.parser.error)
+            conn.closing = True
+
+    def _event_write(self, sel: selectors.BaseSelector, conns: Dict[int, _EventConnection],
+                     conn: _EventConnection) -> None:
+        if conn.out:
+            try:
+                sent = conn.sock.send(conn.out)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                self._event_close(sel, conns, conn)
+                return
+            del conn.out[:sent]
+        if conn.out:
+            # Stop reading until the client drains its responses
+            sel.modify(conn.sock, selectors.EVENT_WRITE, conn)
+        elif conn.closing:
+            self._event_close(sel, conns, conn)
+        else:
+            sel.modify(conn.sock, selectors.EVENT_READ, conn)
+
+    def _event_close(self, sel: selectors.BaseSelector, conns: Dict[int, _EventConnection],
+                     conn: _EventConnection) -> None:
+        fd = conn.sock.fileno()
+        if fd < 0:
+            return
+        conns.pop(fd, None)
+        if conn.sock in sel.get_map():
+            sel.unregister(conn.sock)
+        if self.mode == "pool":
+            with self._conns_lock:
+                self._conns.discard(conn.sock)
+        conn.sock.close()
+
+    # ── reuseport ──────────────────────────────────────────────────────────────
+
+    def _serve_reuseport(self) -> None:
+        host, port = self.address
+        ctx = multiprocessing.get_context()
+        started = [ctx.Event() for _ in range(self.workers)]
+        procs = [ctx.Process(target=_reuseport_worker,
+                             args=(host, port, self.backend_id, self.status_interval,
+                                   self.keepalive_timeout, self.log, ev),
+                             daemon=True)
+                 for ev in started]
+        for proc in procs:
+            proc.start()
+        try:
+            for ev in started:
+                ev.wait(10)
+            self.ready.set()
+            self._stop.wait()
+        finally:
+            for proc in procs:
+                proc.terminate()
+            for proc in procs:
+                proc.join()
+
+
+def _reuseport_worker(host: str, port: int, backend_id: str, status_interval: float,
+                      keepalive_timeout: float, log: bool, started) -> None:
+    """Entry point of one reuseport process: an event loop on its own listener."""
+    server = BackendServer(host, port, backend_id, mode="event",
+                           status_interval=status_interval,
+                           keepalive_timeout=keepalive_timeout,
+                           log=log, reuse_port=True)
+    started.set()
+    server.serve_forever()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 6: LOAD GENERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _read_response(sock: socket.socket, buf: bytearray) -> Tuple[int, bool]:
+    """Read one response; return (status, server_keeps_connection)."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError("connection closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    head = bytes(buf[:end]).decode("iso-8859-1").lower()
+    status = int(head.split(" ", 2)[1])
+    length = 0
+    for line in head.split("\r\n")[1:]:
+        if line.startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    while len(buf) < end + length:
+        chunk = sock.recv(RECV_SIZE)
+        if not chunk:
+            raise ConnectionError("connection closed mid-body")
+        buf += chunk
+    del buf[:end + length]
+    return status, "connection: close" not in head
+
+
+def _load_client(address: Tuple[str, int], count: int, request: bytes,
+                 latencies: List[float], errors: List[int]) -> None:
+    sock: Optional[socket.socket] = None
+    buf = bytearray()
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            if sock is None:
+                sock = socket.create_connection(address, timeout=10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                buf.clear()
+            sock.sendall(request)
+            status, keep = _read_response(sock, buf)
+            if status != 200:
+                errors.append(status)
+            if not keep:
+                sock.close()
+                sock = None
+        except OSError:
+            errors.append(0)
+            if sock is not None:
+                sock.close()
+            sock = None
+        latencies.append(time.perf_counter() - start)
+    if sock is not None:
+        sock.close()
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_load(host: str, port: int, requests: int = 2000, concurrency: int = 8,
+             path: str = "/api/status", keep_alive: bool = True) -> Dict[str, float]:
+    """
+    Drive a server with `concurrency` client threads and measure it.
+
+    Each thread sends its share of GET requests one after another, reusing
+    its connection while the server allows it (or opening one per request
+    when keep_alive is False).
+
+    Returns:
+        Dictionary with requests, errors, rps and p50/p90/p99/max latency in ms
+    """
+    conn_header = "keep-alive" if keep_alive else "close"
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: {conn_header}\r\n\r\n".encode()
+    per_client = max(1, requests // concurrency)
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors: List[int] = []
+    threads = [threading.Thread(target=_load_client,
+                                args=((host, port), per_client, request, latencies[i], errors))
+               for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    merged = sorted(x for lat in latencies for x in lat)
+    return {
+        "requests": len(merged),
+        "errors": len(errors),
+        "rps": round(len(merged) / elapsed, 1),
+        "p50_ms": round(_percentile(merged, 50) * 1000, 2),
+        "p90_ms": round(_percentile(merged, 90) * 1000, 2),
+        "p99_ms": round(_percentile(merged, 99) * 1000, 2),
+        "max_ms": round(merged[-1] * 1000, 2) if merged else 0.0,
+    }
+
+
+def load_mode(mode: str, workers: Optional[int], **load_args) -> Dict[str, float]:
+    """Start a quiet server in `mode` on a loopback port, load it, stop it."""
+    server = BackendServer("127.0.0.1", 0, "load", mode=mode, workers=workers, log=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        server.ready.wait(10)
+        return run_load(*server.address, **load_args)
+    finally:
+        server.shutdown()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN ENTRY POINT
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def main():
-    """Parse arguments and start server."""
+    """Parse arguments and start server (or a load run)."""
     parser = argparse.ArgumentParser(description="Backend HTTP Server")
     parser.add_argument("--host", default="0.0.0.0", help="Bind address")
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port")
     parser.add_argument("--id", default=BACKEND_ID, help="Backend identifier")
-    
+    parser.add_argument("--mode", default=DEFAULT_MODE, choices=MODES + ("all",),
+                        help="Concurrency mode (default: $BACKEND_MODE or simple); "
+                             "'all' is only valid with --load. In pool mode at most "
+                             "--workers requests are served at once; idle keep-alive "
+                             "connections wait in the selector and hold no worker, but "
+                             "a client that stops reading holds one for up to the "
+                             f"{KEEPALIVE_TIMEOUT:g}s send timeout")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Pool threads (default {DEFAULT_POOL_WORKERS}) or "
+                             "reuseport processes (default: CPU count)")
+    parser.add_argument("--status-interval", type=float, default=STATUS_REFRESH_S,
+                        help="Seconds between /api/status rebuilds")
+    parser.add_argument("--quiet", action="store_true", help="Do not log each request")
+
+    load = parser.add_argument_group("load generator")
+    load.add_argument("--load", action="store_true",
+                      help="Serve on a loopback port in --mode and measure it")
+    load.add_argument("--load-target", metavar="HOST:PORT",
+                      help="Measure an already running server or proxy instead")
+    load.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    load.add_argument("--concurrency", type=int, default=8, help="Client threads")
+    load.add_argument("--path", default="/api/status", help="Path to request")
+    load.add_argument("--no-keepalive", action="store_true", help="One connection per request")
+    load.add_argument("--json", action="store_true", help="Print load results as JSON")
+
     args = parser.parse_args()
-    
-    run_server(args.host, args.port, args.id)
+    load_args = dict(requests=args.requests, concurrency=args.concurrency,
+                     path=args.path, keep_alive=not args.no_keepalive)
+
+    if args.load or args.load_target:
+        results: Dict[str, Dict[str, float]] = {}
+        if args.load_target:
+            host, _, port = args.load_target.rpartition(":")
+            results[args.load_target] = run_load(host or "127.0.0.1", int(port), **load_args)
+        else:
+            modes = MODES if args.mode == "all" else (args.mode,)
+            for mode in modes:
+                results[mode] = load_mode(mode, args.workers, **load_args)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"{args.requests} requests, {args.concurrency} clients, GET {args.path}, "
+              f"keep-alive {'off' if args.no_keepalive else 'on'}")
+        print(f"{'target':<22} {'rps':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name, r in results.items():
+            print(f"{name:<22} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} "
+                  f"{r['p99_ms']:>8.2f} {r['errors']:>7}")
+        return
+
+    if args.mode == "all":
+        parser.error("--mode all requires --load")
+
+    server = BackendServer(args.host, args.port, args.id, mode=args.mode, workers=args.workers,
+                           status_interval=args.status_interval, log=not args.quiet)
+    workers = f", workers: {server.workers}" if args.mode in ("pool", "reuseport") else ""
+    print(f"Backend {args.id} running on http://{args.host}:{server.address[1]} "
+          f"(mode: {args.mode}{workers})")
+    print("Press Ctrl+C to stop")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        print(f"\nBackend {args.id} shutting down...")
+    finally:
+        server.shutdown()
 
 
 if __name__ == "__main__":
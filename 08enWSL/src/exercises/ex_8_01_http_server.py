@@ -10,6 +10,8 @@ Learning Objectives:
 - Implement secure path resolution (prevent directory traversal)
 - Build valid HTTP responses with proper headers
 - Handle different HTTP methods (GET, HEAD)
+- (Section 7, extension) Serve many keep-alive clients from one event
+  loop with a file cache, conditional and range requests, and sendfile
 
 Estimated Time: 45-60 minutes
 Difficulty: Intermediate
@@ -28,9 +30,16 @@ Course: Computer Networks - ASE, CSIE
 import socket
 import os
 import argparse
+import selectors
+import stat
+import threading
+import time
 import urllib.parse
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from email.utils import formatdate
+from typing import Optional, Union
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -40,6 +49,14 @@ DEFAULT_PORT = 8081
 DEFAULT_DOCROOT = "www"
 BUFFER_SIZE = 4096
 
+# Event-loop serving mode (see Section 7)
+CACHE_MAX_BYTES = 32 * 1024 * 1024       # total bytes held by the file cache
+CACHE_MAX_FILE_BYTES = 1024 * 1024       # larger files are sent with os.sendfile
+KEEPALIVE_TIMEOUT = 5.0                  # idle seconds before a connection is closed
+MAX_REQUEST_HEAD = 16 * 1024             # request line + headers
+MAX_QUEUED_RESPONSES = 32                # pipelined responses queued per connection
+RECV_SIZE = 64 * 1024
+
 # MIME type mapping for common file extensions
 MIME_TYPES: dict[str, str] = {
     ".html": "text/html; charset=utf-8",
@@ -60,10 +77,13 @@ MIME_TYPES: dict[str, str] = {
 # HTTP status messages
 STATUS_MESSAGES: dict[int, str] = {
     200: "OK",
+    206: "Partial Content",
+    304: "Not Modified",
     400: "Bad Request",
     403: "Forbidden",
     404: "Not Found",
     405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
     500: "Internal Server Error",
 }
 
@@ -222,6 +242,36 @@ def get_mime_type(filepath: str) -> str:
     return MIME_TYPES.get(ext.lower(), "application/octet-stream")
 
 
+def resolve_path(filepath: str, docroot: str) -> Optional[str]:
+    """
+    Map a request path to a file system path inside the document root.
+    
+    Directories map to their index.html. Whether the file exists is left
+    to the caller.
+    
+    Args:
+        filepath: Requested file path (from HTTP request)
+        docroot: Document root directory
+        
+    Returns:
+        Absolute file path, or None if the path escapes the document root
+    """
+    if not is_safe_path(filepath, docroot):
+        return None
+
+    parsed = urllib.parse.urlparse(filepath)
+    path = urllib.parse.unquote(parsed.path)
+    rel = path.lstrip("/")
+    rel = os.path.normpath(rel) if rel else ""
+
+    full_path = os.path.join(os.path.abspath(docroot), rel)
+
+    # Default document
+    if os.path.isdir(full_path):
+        full_path = os.path.join(full_path, "index.html")
+    return full_path
+
+
 def serve_file(filepath: str, docroot: str) -> tuple[int, bytes, str]:
     """
     Read and serve a file from the document root.
@@ -241,22 +291,11 @@ def serve_file(filepath: str, docroot: str) -> tuple[int, bytes, str]:
         'text/html; charset=utf-8'
     """
     try:
-        if not is_safe_path(filepath, docroot):
+        full_path = resolve_path(filepath, docroot)
+        if full_path is None:
             body = b"Forbidden"
             return 403, body, "text/plain; charset=utf-8"
 
-        parsed = urllib.parse.urlparse(filepath)
-        path = urllib.parse.unquote(parsed.path)
-        rel = path.lstrip("/")
-        rel = os.path.normpath(rel) if rel else ""
-
-        docroot_abs = os.path.abspath(docroot)
-        full_path = os.path.join(docroot_abs, rel)
-
-        # Default document
-        if os.path.isdir(full_path):
-            full_path = os.path.join(full_path, "index.html")
-
         if not os.path.exists(full_path) or not os.path.isfile(full_path):
             body = b"Not Found"
             return 404, body, "text/plain; charset=utf-8"
@@ -454,6 +493,573 @@ def run_server(host: str, port: int, docroot: str) -> None:
         server_socket.close()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 7: CACHED KEEP-ALIVE SERVER (EVENT LOOP)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# 💭 PREDICTION: The Section 6 loop re-reads the file and opens a new TCP
+#    connection for every request. Which of those costs dominates for a
+#    2 KB page? For a 50 MB video?
+#    Think about this before reading on...
+
+@dataclass
+class FileEntry:
+    """Metadata (and, for small files, content) of one served file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    mime: str
+    etag: str
+    last_modified: str
+    content: Optional[bytes]  # None when the file is too large to cache
+
+
+class FileCache:
+    """
+    LRU cache of file contents, bounded by total bytes.
+
+    Every lookup stats the file; an entry is only reused while its size and
+    modification time are unchanged, so edits under the document root show
+    up on the next request. Files above max_file_bytes are never cached:
+    their entry carries metadata only and the body is sent with os.sendfile.
+
+    Example:
+        >>> cache = FileCache(max_bytes=1024 * 1024)
+        >>> entry = cache.lookup('www/index.html')
+        >>> entry.content is not None
+        True
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES,
+                 max_file_bytes: int = CACHE_MAX_FILE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, FileEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, full_path: str) -> Optional[FileEntry]:
+        """
+        Return the entry for a regular file, or None if there is none.
+
+        Raises:
+            PermissionError: The file exists but cannot be read
+        """
+        try:
+            st = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._discard(full_path)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        entry = self._entries.get(full_path)
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            self._entries.move_to_end(full_path)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        self._discard(full_path)
+        size = st.st_size
+        content = None
+        if size <= self.max_file_bytes:
+            with open(full_path, "rb") as f:
+                content = f.read()
+            # A concurrent write may have changed the length since the stat
+            size = len(content)
+
+        entry = FileEntry(
+            path=full_path,
+            size=size,
+            mtime_ns=st.st_mtime_ns,
+            mime=get_mime_type(full_path),
+            etag=f'"{size:x}-{st.st_mtime_ns:x}"',
+            last_modified=formatdate(st.st_mtime, usegmt=True),
+            content=content,
+        )
+        if content is not None:
+            self._entries[full_path] = entry
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.size
+        return entry
+
+    def _discard(self, full_path: str) -> None:
+        entry = self._entries.pop(full_path, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+
+RANGE_NOT_SATISFIABLE = (-1, -1)
+
+
+def parse_range(value: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range Range header into a half-open byte span.
+
+    Malformed and multi-range headers are ignored (the full file is sent),
+    as RFC 9110 allows.
+
+    Args:
+        value: Range header value (e.g., "bytes=0-99")
+        size: File size in bytes
+
+    Returns:
+        (start, end) with end exclusive, None to ignore the header, or
+        RANGE_NOT_SATISFIABLE
+
+    Example:
+        >>> parse_range('bytes=0-99', 1000)
+        (0, 100)
+        >>> parse_range('bytes=-100', 1000)
+        (900, 1000)
+        >>> parse_range('bytes=2000-', 1000)
+        (-1, -1)
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first.isdigit() or first == "") or not (last.isdigit() or last == ""):
+        return None
+
+    if first == "":
+        # Suffix range: the last N bytes
+        if last == "":
+            return None
+        length = int(last)
+        if length == 0:
+            return RANGE_NOT_SATISFIABLE
+        return max(0, size - length), size
+
+    start = int(first)
+    if start >= size:
+        return RANGE_NOT_SATISFIABLE
+    end = size if last == "" else min(int(last) + 1, size)
+    if end <= start:
+        return None
+    return start, end
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class FileSpan:
+    """Part of a file still to be written to a socket."""
+
+    def __init__(self, path: str, offset: int, count: int) -> None:
+        self.file = open(path, "rb")
+        self.offset = offset
+        self.remaining = count
+
+    def send(self, sock: socket.socket) -> int:
+        """Send as much as the socket takes; 0 means the file ended early."""
+        if hasattr(os, "sendfile"):
+            return os.sendfile(sock.fileno(), self.file.fileno(), self.offset, self.remaining)
+        self.file.seek(self.offset)
+        return sock.send(self.file.read(min(self.remaining, RECV_SIZE)))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+@dataclass
+class PreparedResponse:
+    """Response head plus a body held in memory or still on disk."""
+
+    head: bytes
+    body: Union[bytes, memoryview] = b""
+    file_span: Optional[tuple[str, int, int]] = None  # (path, offset, count)
+
+
+_date_cache: list = [0, ""]
+
+
+def http_date() -> str:
+    """Current time as an HTTP date, formatted at most once per second."""
+    now = int(time.time())
+    if _date_cache[0] != now:
+        _date_cache[0], _date_cache[1] = now, formatdate(now, usegmt=True)
+    return _date_cache[1]
+
+
+def wants_keep_alive(request: dict) -> bool:
+    """HTTP/1.1 keeps the connection unless told otherwise; HTTP/1.0 only on request."""
+    connection = request["headers"].get("connection", "").lower()
+    if request["version"] == "HTTP/1.1":
+        return "close" not in connection
+    return "keep-alive" in connection
+
+
+def prepare_response(request: dict, docroot: str, cache: FileCache,
+                     keep_alive: bool) -> PreparedResponse:
+    """
+    Build the response to a parsed GET/HEAD request using the file cache.
+
+    Handles conditional requests (If-None-Match → 304) and single byte
+    ranges (Range → 206 or 416). Small files come from memory; files the
+    cache will not hold are returned as a span for os.sendfile.
+    """
+    method = request["method"]
+    headers = {"Date": http_date(), "Server": "Week8HTTP/1.1"}
+
+    def simple(status: int, body: bytes, extra: Optional[dict] = None) -> PreparedResponse:
+        headers.update(extra or {})
+        headers["Content-Type"] = "text/plain; charset=utf-8"
+        headers["Content-Length"] = str(len(body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        return PreparedResponse(build_response(status, headers), b"" if method == "HEAD" else body)
+
+    if method not in {"GET", "HEAD"}:
+        return simple(405, b"Method Not Allowed", {"Allow": "GET, HEAD"})
+
+    full_path = resolve_path(request["path"], docroot)
+    if full_path is None:
+        return simple(403, b"Forbidden")
+    try:
+        entry = cache.lookup(full_path)
+    except PermissionError:
+        return simple(403, b"Forbidden")
+    except OSError:
+        return simple(500, b"Internal Server Error")
+    if entry is None:
+        return simple(404, b"Not Found")
+
+    req_headers = request["headers"]
+    headers["ETag"] = entry.etag
+    headers["Last-Modified"] = entry.last_modified
+    headers["Accept-Ranges"] = "bytes"
+    connection = "keep-alive" if keep_alive else "close"
+
+    inm = req_headers.get("if-none-match")
+    if inm is not None and etag_matches(inm, entry.etag):
+        headers["Connection"] = connection
+        return PreparedResponse(build_response(304, headers))
+
+    status, start, end = 200, 0, entry.size
+    range_header = req_headers.get("range")
+    if_range = req_headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == entry.etag):
+        span = parse_range(range_header, entry.size)
+        if span == RANGE_NOT_SATISFIABLE:
+            return simple(416, b"", {"Content-Range": f"bytes */{entry.size}"})
+        if span is not None:
+            status, (start, end) = 206, span
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{entry.size}"
+
+    headers["Content-Type"] = entry.mime
+    headers["Content-Length"] = str(end - start)
+    headers["Connection"] = connection
+    head = build_response(status, headers)
+
+    if method == "HEAD" or start == end:
+        return PreparedResponse(head)
+    if entry.content is not None:
+        return PreparedResponse(head, memoryview(entry.content)[start:end])
+    return PreparedResponse(head, file_span=(entry.path, start, end - start))
+
+
+class _Connection:
+    """Per-client state for the event loop."""
+
+    __slots__ = ("sock", "inbuf", "discard", "out", "last_active", "closing", "events")
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.discard = 0           # request body bytes still to drop
+        self.out: deque = deque()  # bytes/memoryview or FileSpan, in order
+        self.last_active = time.monotonic()
+        self.closing = False       # close once the queued output is written
+        self.events = selectors.EVENT_READ
+
+
+class CachedHTTPServer:
+    """
+    Single-threaded HTTP/1.1 server: one selectors loop multiplexes every
+    client, connections stay open between requests (keep-alive, including
+    pipelined requests), files come from a FileCache and large files are
+    sent with os.sendfile.
+
+    Example:
+        >>> server = CachedHTTPServer('127.0.0.1', 0, 'www')
+        >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+        >>> # ... requests to server.address ...
+        >>> server.shutdown()
+    """
+
+    def __init__(self, host: str, port: int, docroot: str,
+                 cache_bytes: int = CACHE_MAX_BYTES,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+                 backlog: int = 128) -> None:
+        self.docroot = docroot
+        self.cache = FileCache(cache_bytes)
+        self.keepalive_timeout = keepalive_timeout
+        self.requests = 0
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((host, port))
+        self._listener.listen(backlog)
+        self._listener.setblocking(False)
+        self.address = self._listener.getsockname()
+
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._conns: dict[int, _Connection] = {}
+
+    # ── lifecycle ──────────────────────────────────────────────────────────────
+
+    def serve_forever(self) -> None:
+        """Run the event loop until shutdown() is called."""
+        sel = self._selector
+        sel.register(self._listener, selectors.EVENT_READ, None)
+        sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        next_sweep = time.monotonic() + 1.0
+        try:
+            while not self._stop.is_set():
+                for key, mask in sel.select(timeout=1.0):
+                    if key.data is None:
+                        self._accept()
+                    elif key.data == "wake":
+                        continue
+                    else:
+                        self._service(key.data, mask)
+                now = time.monotonic()
+                if now >= next_sweep:
+                    self._close_idle(now)
+                    next_sweep = now + 1.0
+        finally:
+            for conn in list(self._conns.values()):
+                self._close(conn)
+            sel.close()
+            self._listener.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            self._done.set()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop serve_forever (from another thread) and wait for it to exit."""
+        self._stop.set()
+        try:
+            self._wake_w.send(b"x")
+        except OSError:
+            pass
+        self._done.wait(timeout)
+
+    # ── connections ────────────────────────────────────────────────────────────
+
+    def _accept(self) -> None:
+        # Drain the accept queue: many clients may connect per wake-up
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Connection(sock)
+            self._conns[sock.fileno()] = conn
+            self._selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _close(self, conn: _Connection) -> None:
+        fd = conn.sock.fileno()
+        if fd >= 0:
+            self._conns.pop(fd, None)
+            try:
+                self._selector.unregister(conn.sock)
+            except (KeyError, ValueError):
+                pass
+        for item in conn.out:
+            if isinstance(item, FileSpan):
+                item.close()
+        conn.out.clear()
+        conn.sock.close()
+
+    def _close_idle(self, now: float) -> None:
+        for conn in list(self._conns.values()):
+            if not conn.out and now - conn.last_active > self.keepalive_timeout:
+                self._close(conn)
+
+    def _service(self, conn: _Connection, mask: int) -> None:
+        try:
+            if mask & selectors.EVENT_READ:
+                data = conn.sock.recv(RECV_SIZE)
+                if not data:
+                    self._close(conn)
+                    return
+                conn.inbuf += data
+                conn.last_active = time.monotonic()
+                self._process(conn)
+            if conn.out and not self._flush(conn):
+                self._set_events(conn, selectors.EVENT_WRITE)
+                return
+            if conn.closing:
+                self._close(conn)
+                return
+            if conn.inbuf:
+                # Responses were held back by MAX_QUEUED_RESPONSES
+                self._process(conn)
+                if conn.out and not self._flush(conn):
+                    self._set_events(conn, selectors.EVENT_WRITE)
+                    return
+            self._set_events(conn, selectors.EVENT_READ)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._close(conn)
+
+    def _set_events(self, conn: _Connection, events: int) -> None:
+        # While output is pending, stop reading: that is the backpressure
+        if conn.events != events:
+            conn.events = events
+            self._selector.modify(conn.sock, events, conn)
+
+    # ── requests and responses ─────────────────────────────────────────────────
+
+    def _process(self, conn: _Connection) -> None:
+        """Turn every complete request in the input buffer into a queued response."""
+        buf = conn.inbuf
+        while not conn.closing and len(conn.out) < MAX_QUEUED_RESPONSES:
+            if conn.discard:
+                # Request bodies are ignored: drop them as they arrive
+                # instead of holding a whole (possibly huge) body in memory
+                n = min(conn.discard, len(buf))
+                del buf[:n]
+                conn.discard -= n
+                if conn.discard:
+                    return
+            end = buf.find(b"\r\n\r\n")
+            if end < 0:
+                if len(buf) > MAX_REQUEST_HEAD:
+                    self._queue_error(conn, 400, b"Bad Request")
+                return
+            request = parse_request(bytes(buf[:end + 4]))
+            if request is None or "transfer-encoding" in request["headers"]:
+                self._queue_error(conn, 400, b"Bad Request")
+                return
+            try:
+                body_len = int(request["headers"].get("content-length", "0"))
+            except ValueError:
+                body_len = -1
+            if body_len < 0:
+                self._queue_error(conn, 400, b"Bad Request")
+                return
+            del buf[:end + 4]
+            conn.discard = body_len
+
+            keep_alive = wants_keep_alive(request)
+            response = prepare_response(request, self.docroot, self.cache, keep_alive)
+            self.requests += 1
+            conn.out.append(response.head)
+            if response.body:
+                conn.out.append(response.body)
+            if response.file_span is not None:
+                conn.out.append(FileSpan(*response.file_span))
+            if not keep_alive:
+                conn.closing = True
+
+    def _queue_error(self, conn: _Connection, status: int, body: bytes) -> None:
+        headers = {
+            "Content-Type": "text/plain; charset=utf-8",
+            "Content-Length": str(len(body)),
+            "Connection": "close",
+        }
+        conn.out.append(build_response(status, headers, body))
+        conn.inbuf.clear()
+        conn.closing = True
+
+    def _flush(self, conn: _Connection) -> bool:
+        """Write queued output; return True once everything has been sent."""
+        try:
+            return self._write_queued(conn)
+        except (BlockingIOError, InterruptedError):
+            return False
+
+    def _write_queued(self, conn: _Connection) -> bool:
+        out, sock = conn.out, conn.sock
+        while out:
+            item = out[0]
+            if isinstance(item, FileSpan):
+                sent = item.send(sock)
+                if sent == 0:
+                    # The file shrank: the promised length cannot be met
+                    raise ConnectionError("file truncated while sending")
+                item.offset += sent
+                item.remaining -= sent
+                if item.remaining:
+                    return False
+                item.close()
+                out.popleft()
+                continue
+
+            # Gather consecutive in-memory buffers into one system call
+            batch = []
+            for queued in out:
+                if isinstance(queued, FileSpan) or len(batch) == 64:
+                    break
+                batch.append(queued)
+            sent = sock.sendmsg(batch) if hasattr(sock, "sendmsg") else sock.send(batch[0])
+            while sent:
+                first = out[0]
+                if sent >= len(first):
+                    sent -= len(first)
+                    out.popleft()
+                else:
+                    out[0] = memoryview(first)[sent:]
+                    return False
+        conn.last_active = time.monotonic()
+        return True
+
+
+def run_event_server(host: str, port: int, docroot: str,
+                     cache_bytes: int = CACHE_MAX_BYTES) -> None:
+    """
+    Run the cached keep-alive server until Ctrl+C.
+
+    Args:
+        host: Host address to bind to
+        port: Port number to listen on
+        docroot: Document root directory
+        cache_bytes: File cache bound in bytes
+    """
+    server = CachedHTTPServer(host, port, docroot, cache_bytes=cache_bytes)
+    print(f"HTTP Server (event loop, keep-alive) running on http://{host}:{port}")
+    print(f"Document root: {os.path.abspath(docroot)}")
+    print(f"File cache: {cache_bytes // (1024 * 1024)} MB")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down server...")
+    finally:
+        cache = server.cache
+        print(f"Served {server.requests} requests "
+              f"(cache: {cache.hits} hits, {cache.misses} misses)")
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN ENTRY POINT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -479,6 +1085,19 @@ def main() -> int:
         default=DEFAULT_DOCROOT,
         help=f"Document root directory (default: {DEFAULT_DOCROOT})"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["simple", "event"],
+        default="simple",
+        help="simple: one client at a time (Section 6); "
+             "event: cached keep-alive event loop (Section 7)"
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=CACHE_MAX_BYTES // (1024 * 1024),
+        help="File cache size in MB for --mode event"
+    )
     
     args = parser.parse_args()
     
@@ -487,7 +1106,10 @@ def main() -> int:
         print(f"Error: Document root '{args.docroot}' does not exist")
         return 1
     
-    run_server(args.host, args.port, args.docroot)
+    if args.mode == "event":
+        run_event_server(args.host, args.port, args.docroot, args.cache_mb * 1024 * 1024)
+    else:
+        run_server(args.host, args.port, args.docroot)
     return 0
 
 
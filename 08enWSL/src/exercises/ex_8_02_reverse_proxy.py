@@ -12,6 +12,10 @@ Learning Objectives:
 - Forward HTTP requests while preserving headers
 - Add proxy-specific headers (X-Forwarded-For)
 
+Section 7 adds an optional engine (--engine selectors) that multiplexes
+all client and backend sockets over a fixed number of threads, keeps
+clients alive and reuses pooled backend connections.
+
 Estimated Time: 40-50 minutes
 Difficulty: Advanced
 
@@ -29,8 +33,23 @@ Course: Computer Networks - ASE, CSIE
 import socket
 import threading
 import argparse
+import errno
+import random
+import selectors
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Optional
+
+# Make src/utils importable when run as a script
+SRC_DIR = Path(__file__).resolve().parents[1]
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from utils.net_utils import HttpParseError, HttpRequestParser  # noqa: E402
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -62,6 +81,10 @@ class RoundRobinBalancer:
     
     Thread safety is essential because multiple client connections
     may be processed concurrently.
+
+    Backends may also carry a weight (see set_weight); while any weight is
+    below 1.0 the rotation becomes smooth weighted round-robin, which the
+    health checker uses to ramp a recovered backend back in gradually.
     
     Example:
         >>> balancer = RoundRobinBalancer([('127.0.0.1', 9001), ('127.0.0.1', 9002)])
@@ -87,6 +110,8 @@ class RoundRobinBalancer:
         self.backends: list[tuple[str, int]] = list(backends)
         self.index = 0
         self.lock = threading.Lock()
+        self.weights: dict[tuple[str, int], float] = {}
+        self._current: dict[tuple[str, int], float] = {}
     
     def next_backend(self) -> Optional[tuple[str, int]]:
         """
@@ -104,11 +129,42 @@ class RoundRobinBalancer:
             if not self.backends:
                 return None
 
+            if self.weights:
+                return self._next_weighted()
+
             backend = self.backends[self.index]
             self.index = (self.index + 1) % len(self.backends)
             return backend
+
+    def _next_weighted(self) -> tuple[str, int]:
+        # Smooth weighted round-robin: every backend earns its weight, the
+        # richest is chosen and pays back the total (caller holds the lock)
+        total = 0.0
+        best = None
+        for backend in self.backends:
+            weight = self.weights.get(backend, 1.0)
+            current = self._current.get(backend, 0.0) + weight
+            self._current[backend] = current
+            total += weight
+            if best is None or current > self._current[best]:
+                best = backend
+        self._current[best] -= total
+        return best
+
+    def set_weight(self, host: str, port: int, weight: float) -> bool:
+        """Set a backend's share relative to 1.0. Returns True if found."""
+        with self.lock:
+            if (host, port) not in self.backends:
+                return False
+            if weight >= 1.0:
+                self.weights.pop((host, port), None)
+            else:
+                self.weights[(host, port)] = max(weight, 0.0)
+            if not self.weights:
+                self._current.clear()
+            return True
     
-    def add_backend(self, host: str, port: int) -> None:
+    def add_backend(self, host: str, port: int, weight: float = 1.0) -> None:
         """Add a new backend server to the pool."""
         with self.lock:
             if (host, port) not in self.backends:
@@ -116,6 +172,8 @@ class RoundRobinBalancer:
                 # Keep index valid if this is the first backend
                 if len(self.backends) == 1:
                     self.index = 0
+                if weight < 1.0:
+                    self.weights[(host, port)] = max(weight, 0.0)
     
     def remove_backend(self, host: str, port: int) -> bool:
         """Remove a backend server from the pool. Returns True if found."""
@@ -124,6 +182,10 @@ class RoundRobinBalancer:
                 self.backends.remove((host, port))
             except ValueError:
                 return False
+            self.weights.pop((host, port), None)
+            self._current.pop((host, port), None)
+            if not self.weights:
+                self._current.clear()
 
             if self.backends:
                 self.index %= len(self.backends)
@@ -248,6 +310,33 @@ def modify_host_header(request_str: str, backend_host: str, backend_port: int) -
     return "\r\n".join(lines)
 
 
+def set_connection_close(request_str: str) -> str:
+    """
+    Ask the backend to close the connection after its response.
+
+    forward_request reads the response until the backend closes, so a
+    keep-alive backend would otherwise hold each request open until its
+    idle timeout.
+
+    Args:
+        request_str: HTTP request as string
+
+    Returns:
+        Request whose Connection header is "close"
+    """
+    lines = request_str.split("\r\n")
+    try:
+        header_end = lines.index("")
+    except ValueError:
+        header_end = len(lines)
+
+    headers = [line for line in lines[1:header_end]
+               if not line.lower().startswith("connection:")]
+    lines = lines[:1] + headers + ["Connection: close"] + lines[header_end:]
+
+    return "\r\n".join(lines)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 3: REQUEST FORWARDING
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -293,6 +382,7 @@ def forward_request(
         request_str = request.decode("iso-8859-1", errors="replace")
         request_str = add_proxy_headers(request_str, client_ip)
         request_str = modify_host_header(request_str, backend_host, backend_port)
+        request_str = set_connection_close(request_str)
         backend_socket.sendall(request_str.encode("iso-8859-1"))
 
         chunks: list[bytes] = []
@@ -329,18 +419,19 @@ def forward_request(
 #    What timeout is appropriate for a health check?
 #    Think about this before implementing...
 
-def check_backend_health(host: str, port: int, timeout: float = 2.0) -> bool:
+def check_backend_health(host: str, port: int, timeout: float = 2.0,
+                         path: Optional[str] = None) -> bool:
     """
     Check if a backend server is alive and accepting connections.
     
-    This performs a simple TCP connection test. For more thorough
-    health checks, you could send an HTTP HEAD request to a /health
-    endpoint.
+    This performs a simple TCP connection test. With `path`, it also
+    sends an HTTP GET for that path and requires a 2xx or 3xx status.
     
     Args:
         host: Backend hostname
         port: Backend port
         timeout: Connection timeout in seconds
+        path: Optional HTTP path to request (e.g. "/health")
         
     Returns:
         True if backend is reachable, False otherwise
@@ -355,11 +446,211 @@ def check_backend_health(host: str, port: int, timeout: float = 2.0) -> bool:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.settimeout(timeout)
             s.connect((host, port))
-            return True
+            if path is None:
+                return True
+            s.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                      f"Connection: close\r\n\r\n".encode("ascii"))
+            status_line = s.recv(64).split(b" ", 2)
+            return len(status_line) >= 2 and status_line[1][:1] in (b"2", b"3")
     except Exception:
         return False
 
 
+HEALTH_INTERVAL = 2.0       # seconds between probes of one backend
+HEALTH_JITTER = 0.2         # each interval is scaled by 1 ± this
+HEALTH_RISE = 2             # consecutive successes before a backend returns
+HEALTH_FALL = 3             # consecutive failures before it is removed
+SLOW_START = 10.0           # seconds for a returning backend to reach full weight
+SLOW_START_MIN_WEIGHT = 0.1
+
+
+class _BackendHealth:
+    __slots__ = ("healthy", "successes", "failures", "next_due", "in_flight",
+                 "recovered_at", "probes")
+
+    def __init__(self, now: float) -> None:
+        self.healthy = True
+        self.successes = 0
+        self.failures = 0
+        self.next_due = now
+        self.in_flight = False
+        self.recovered_at: Optional[float] = None
+        self.probes = 0
+
+
+class HealthChecker:
+    """
+    Background active health checks feeding a RoundRobinBalancer.
+
+    A scheduler thread probes every backend on its own jittered interval
+    (so probes do not line up), running the probes concurrently in a small
+    thread pool so one slow backend never delays the others. Hysteresis
+    keeps a flapping backend from bouncing in and out: it is removed with
+    remove_backend() after `fall` consecutive failures and re-added with
+    add_backend() after `rise` consecutive successes. A re-added backend
+    starts at a small weight that ramps linearly to 1.0 over `slow_start`
+    seconds, so it is not handed a full share while it warms up.
+
+    Args:
+        balancer: Balancer whose membership is managed
+        backends: Every backend to watch (healthy or not)
+        interval: Mean seconds between probes of one backend
+        timeout: Probe timeout in seconds
+        rise: Successes needed to return
+        fall: Failures needed to be removed
+        jitter: Fraction by which each interval is randomised
+        slow_start: Ramp duration in seconds (0 returns at full weight)
+        path: HTTP path to probe; None probes with a TCP connect only
+        probe: Probe function (host, port) -> bool; defaults to
+            check_backend_health with `timeout` and `path`
+        clock: Time source (monotonic seconds)
+        seed: Seed for the jitter (for reproducible tests)
+
+    Example:
+        >>> checker = HealthChecker(balancer, backends, interval=1.0, path="/health")
+        >>> checker.start()
+        >>> checker.status()[('127.0.0.1', 9001)]['healthy']
+        True
+        >>> checker.stop()
+    """
+
+    def __init__(self, balancer: RoundRobinBalancer, backends: list[tuple[str, int]],
+                 interval: float = HEALTH_INTERVAL, timeout: float = 1.0,
+                 rise: int = HEALTH_RISE, fall: int = HEALTH_FALL,
+                 jitter: float = HEALTH_JITTER, slow_start: float = SLOW_START,
+                 path: Optional[str] = None,
+                 probe: Optional[Callable[[str, int], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 seed: Optional[int] = None) -> None:
+        self.balancer = balancer
+        self.interval = interval
+        self.rise = max(1, rise)
+        self.fall = max(1, fall)
+        self.jitter = jitter
+        self.slow_start = slow_start
+        self.probe = probe or (lambda host, port: check_backend_health(host, port, timeout, path))
+        self.clock = clock
+        self.transitions: list[tuple[float, tuple[str, int], bool]] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        now = clock()
+        # First probes are spread over one interval as well
+        self._health: dict[tuple[str, int], _BackendHealth] = {}
+        for backend in backends:
+            state = _BackendHealth(now)
+            state.next_due = now + self._rng.uniform(0, interval * jitter)
+            state.healthy = backend in balancer.backends
+            self._health[backend] = state
+
+    # ── lifecycle ──────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        workers = max(1, min(32, len(self._health)))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="health")
+        self._thread = threading.Thread(target=self._run, name="health-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop probing; the balancer keeps its current membership."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        tick = min(0.05, self.interval / 4)
+        while not self._stop.wait(tick):
+            now = self.clock()
+            with self._lock:
+                due = [b for b, s in self._health.items() if not s.in_flight and s.next_due <= now]
+                for backend in due:
+                    self._health[backend].in_flight = True
+            for backend in due:
+                self._executor.submit(self._probe_and_record, backend)
+            self.update_weights(now)
+
+    def _probe_and_record(self, backend: tuple[str, int]) -> None:
+        try:
+            ok = bool(self.probe(*backend))
+        except Exception:
+            ok = False
+        self.record(backend, ok)
+
+    # ── state machine ──────────────────────────────────────────────────────────
+
+    def probe_all(self) -> dict[tuple[str, int], bool]:
+        """Probe every backend now, concurrently, and apply the results."""
+        backends = list(self._health)
+        with ThreadPoolExecutor(max_workers=max(1, len(backends))) as pool:
+            results = dict(zip(backends, pool.map(lambda b: bool(self.probe(*b)), backends)))
+        for backend, ok in results.items():
+            self.record(backend, ok)
+        return results
+
+    def record(self, backend: tuple[str, int], ok: bool) -> None:
+        """Apply one probe result, adding or removing the backend on a transition."""
+        now = self.clock()
+        with self._lock:
+            state = self._health[backend]
+            state.in_flight = False
+            state.probes += 1
+            spread = self.interval * self.jitter
+            state.next_due = now + self.interval + self._rng.uniform(-spread, spread)
+            if ok:
+                state.successes += 1
+                state.failures = 0
+                if not state.healthy and state.successes >= self.rise:
+                    state.healthy = True
+                    state.recovered_at = now if self.slow_start > 0 else None
+                    weight = SLOW_START_MIN_WEIGHT if self.slow_start > 0 else 1.0
+                    # The balancer's own lock makes each change atomic for
+                    # request threads; ours orders them per backend
+                    self.balancer.add_backend(*backend, weight=weight)
+                    self.transitions.append((now, backend, True))
+            else:
+                state.failures += 1
+                state.successes = 0
+                if state.healthy and state.failures >= self.fall:
+                    state.healthy = False
+                    state.recovered_at = None
+                    self.balancer.remove_backend(*backend)
+                    self.transitions.append((now, backend, False))
+
+    def update_weights(self, now: Optional[float] = None) -> None:
+        """Advance the slow-start ramp of recently recovered backends."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            for backend, state in self._health.items():
+                if state.recovered_at is None:
+                    continue
+                progress = (now - state.recovered_at) / self.slow_start
+                if progress >= 1.0:
+                    state.recovered_at = None
+                    self.balancer.set_weight(*backend, 1.0)
+                else:
+                    weight = SLOW_START_MIN_WEIGHT + (1.0 - SLOW_START_MIN_WEIGHT) * progress
+                    self.balancer.set_weight(*backend, weight)
+
+    def status(self) -> dict[tuple[str, int], dict]:
+        """Snapshot of every watched backend."""
+        with self._lock:
+            return {
+                backend: {
+                    "healthy": state.healthy,
+                    "successes": state.successes,
+                    "failures": state.failures,
+                    "probes": state.probes,
+                    "weight": self.balancer.weights.get(backend, 1.0) if state.healthy else 0.0,
+                }
+                for backend, state in self._health.items()
+            }
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 5: CLIENT CONNECTION HANDLER
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -437,7 +728,19 @@ def handle_client(
 # SECTION 6: PROXY SERVER MAIN LOOP
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def run_proxy(host: str, port: int, backends: list[tuple[str, int]]) -> None:
+def start_health_checker(balancer: RoundRobinBalancer, backends: list[tuple[str, int]],
+                         interval: float, path: Optional[str]) -> Optional[HealthChecker]:
+    """Start background health checks, or return None when interval is 0."""
+    if interval <= 0:
+        return None
+    checker = HealthChecker(balancer, backends, interval=interval, path=path)
+    checker.start()
+    print(f"Health checks every ~{interval:g}s ({'GET ' + path if path else 'TCP connect'})")
+    return checker
+
+
+def run_proxy(host: str, port: int, backends: list[tuple[str, int]],
+              health_interval: float = 0.0, health_path: Optional[str] = None) -> None:
     """
     Run the reverse proxy server.
     
@@ -445,9 +748,12 @@ def run_proxy(host: str, port: int, backends: list[tuple[str, int]]) -> None:
         host: Address to bind the proxy to
         port: Port to listen on
         backends: List of (host, port) tuples for backend servers
+        health_interval: Seconds between background health checks (0 = off)
+        health_path: HTTP path the health checks request (None = TCP only)
     """
     # Create load balancer
     balancer = RoundRobinBalancer(backends)
+    checker = start_health_checker(balancer, backends, health_interval, health_path)
     
     # Create server socket
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -475,9 +781,756 @@ def run_proxy(host: str, port: int, backends: list[tuple[str, int]]) -> None:
     except KeyboardInterrupt:
         print("\nShutting down proxy...")
     finally:
+        if checker is not None:
+            checker.stop()
         server_socket.close()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 7: MULTIPLEXING PROXY ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# The thread-per-client loop above is the exercise. The engine below serves
+# the same role with a fixed number of event-loop threads: every client and
+# backend socket is non-blocking and multiplexed with selectors, clients stay
+# connected between requests (keep-alive), and backend connections are kept
+# in a pool per balancer member instead of being opened per request.
+
+ENGINE_THREADS = 2
+KEEPALIVE_TIMEOUT = 15.0        # idle client connections are closed after this
+POOL_IDLE_TIMEOUT = 30.0        # idle pooled backend connections likewise
+MAX_IDLE_PER_BACKEND = 64       # pooled connections kept per backend per thread
+MAX_PIPELINE = 32               # queued requests per client before reads pause
+CLIENT_HIGH_WATER = 256 * 1024  # buffered response bytes before backend reads pause
+RECV_SIZE = 64 * 1024
+MAX_RESPONSE_HEAD = 64 * 1024
+
+# Request headers the engine sets itself, plus hop-by-hop headers
+_REQUEST_DROP = frozenset((
+    b"host", b"x-forwarded-for", b"x-real-ip", b"content-length",
+    b"transfer-encoding", b"connection", b"keep-alive", b"proxy-connection",
+    b"te", b"upgrade",
+))
+_RESPONSE_DROP = frozenset((b"connection", b"keep-alive", b"proxy-connection"))
+# Requests safe to replay when a pooled connection turns out to be stale
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"))
+
+
+def rewrite_request_head(head: bytes, client_ip: str, backend_host: str,
+                         backend_port: int, body_length: Optional[int]) -> bytes:
+    """
+    Byte-level add_proxy_headers() + modify_host_header() for the engine.
+
+    Works on the raw header block of a request already validated by
+    HttpRequestParser: lines are split on CRLF and only header names are
+    lower-cased, so values are copied through without decoding. The body
+    is forwarded with a Content-Length (chunked bodies arrive de-chunked)
+    and the backend connection is asked to stay open.
+
+    Args:
+        head: Request line and headers, ending in CRLF CRLF
+        client_ip: Address of the connecting client
+        backend_host: Backend the request goes to
+        backend_port: Backend port
+        body_length: Body size, or None for a request without a body
+
+    Returns:
+        Header block to send to the backend
+
+    Example:
+        >>> rewrite_request_head(b"GET / HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n", "10.0.0.9", "b", 80, None)
+        b'GET / HTTP/1.1\\r\\nHost: b:80\\r\\nX-Forwarded-For: 10.0.0.9\\r\\nX-Real-IP: 10.0.0.9\\r\\nConnection: keep-alive\\r\\n\\r\\n'
+    """
+    lines = head.split(b"\r\n")
+    out = [lines[0]]
+    forwarded_for = b""
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(b":")
+        key = name.lower()
+        if key == b"x-forwarded-for":
+            value = value.strip()
+            forwarded_for = forwarded_for + b", " + value if forwarded_for else value
+        elif key not in _REQUEST_DROP:
+            out.append(line)
+    ip = client_ip.encode("ascii")
+    out.append(b"Host: %s:%d" % (backend_host.encode("ascii"), backend_port))
+    out.append(b"X-Forwarded-For: " + (forwarded_for + b", " + ip if forwarded_for else ip))
+    out.append(b"X-Real-IP: " + ip)
+    if body_length is not None:
+        out.append(b"Content-Length: %d" % body_length)
+    out.append(b"Connection: keep-alive")
+    return b"\r\n".join(out) + b"\r\n\r\n"
+
+
+_R_HEAD, _R_LENGTH, _R_CHUNK_SIZE, _R_CHUNK_DATA, _R_CHUNK_END, _R_TRAILERS, \
+    _R_UNTIL_CLOSE, _R_DONE = range(8)
+
+
+class ResponseFramer:
+    """
+    Finds where one backend response ends while streaming it to the client.
+
+    feed() appends the bytes to forward to `out` and returns how many input
+    bytes belonged to this response. Only the header block is buffered (to
+    rewrite its Connection header); body bytes are passed through as they
+    arrive, with Content-Length and chunked framing tracked by counting.
+
+    Args:
+        head_request: The request was HEAD, so the response has no body
+        client_keep_alive: The client wants its connection kept open
+    """
+
+    def __init__(self, head_request: bool = False, client_keep_alive: bool = True) -> None:
+        self.head_request = head_request
+        self.client_keep_alive = client_keep_alive
+        self.status = 0
+        self.backend_keep_alive = False
+        self.started = False        # some bytes were forwarded to the client
+        self._state = _R_HEAD
+        self._buf = bytearray()
+        self._remaining = 0
+
+    @property
+    def done(self) -> bool:
+        return self._state == _R_DONE
+
+    @property
+    def until_close(self) -> bool:
+        """The response is delimited by the backend closing the connection."""
+        return self._state == _R_UNTIL_CLOSE
+
+    @property
+    def keep_client(self) -> bool:
+        return self.client_keep_alive and self.status != 0 and not self.until_close
+
+    def feed(self, data: bytes, out: bytearray) -> int:
+        """
+        Consume backend bytes for this response.
+
+        Raises:
+            ValueError: The backend sent something that is not an HTTP/1.x response
+        """
+        pos, end = 0, len(data)
+        while pos < end and self._state != _R_DONE:
+            state = self._state
+            if state == _R_HEAD:
+                pos = self._feed_head(data, pos, out)
+            elif state == _R_LENGTH or state == _R_CHUNK_DATA:
+                n = min(self._remaining, end - pos)
+                out += data[pos:pos + n]
+                pos += n
+                self._remaining -= n
+                if not self._remaining:
+                    self._state = _R_DONE if state == _R_LENGTH else _R_CHUNK_END
+            elif state == _R_UNTIL_CLOSE:
+                out += data[pos:]
+                pos = end
+            else:
+                pos = self._feed_line(data, pos, out)
+        return pos
+
+    def _feed_head(self, data: bytes, pos: int, out: bytearray) -> int:
+        start = max(0, len(self._buf) - 3)
+        self._buf += data[pos:]
+        idx = self._buf.find(b"\r\n\r\n", start)
+        if idx < 0:
+            if len(self._buf) > MAX_RESPONSE_HEAD:
+                raise ValueError("Response header section too large")
+            return len(data)
+        head_len = idx + 4
+        consumed = pos + head_len - (len(self._buf) - (len(data) - pos))
+        head = bytes(self._buf[:head_len])
+        self._buf.clear()
+        self._start_body(head, out)
+        return consumed
+
+    def _start_body(self, head: bytes, out: bytearray) -> None:
+        lines = head[:-4].split(b"\r\n")
+        parts = lines[0].split(b" ", 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/1.") or not parts[1].isdigit():
+            raise ValueError(f"Invalid status line: {lines[0][:80]!r}")
+        status = int(parts[1])
+        if 100 <= status < 200 and status != 101:
+            # Interim response: forward it and wait for the real one
+            out += head
+            return
+        self.status = status
+
+        length: Optional[int] = None
+        chunked = False
+        connection = b""
+        kept = [lines[0]]
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            key = name.strip().lower()
+            if key == b"content-length":
+                length = int(value.strip())
+            elif key == b"transfer-encoding":
+                chunked = value.strip().lower().endswith(b"chunked")
+            if key in _RESPONSE_DROP:
+                if key == b"connection":
+                    connection = value.strip().lower()
+                continue
+            kept.append(line)
+
+        if parts[0] == b"HTTP/1.0":
+            self.backend_keep_alive = b"keep-alive" in connection
+        else:
+            self.backend_keep_alive = b"close" not in connection
+
+        if self.head_request or status in (204, 304):
+            self._state = _R_DONE
+        elif chunked:
+            self._state = _R_CHUNK_SIZE
+        elif length is not None:
+            self._remaining = length
+            self._state = _R_LENGTH if length else _R_DONE
+        else:
+            self._state = _R_UNTIL_CLOSE
+            self.backend_keep_alive = False
+
+        kept.append(b"Connection: keep-alive" if self.keep_client else b"Connection: close")
+        out += b"\r\n".join(kept) + b"\r\n\r\n"
+        self.started = True
+
+    def _feed_line(self, data: bytes, pos: int, out: bytearray) -> int:
+        """Chunk-size lines, chunk terminators and trailers (forwarded unchanged)."""
+        idx = data.find(b"\n", pos)
+        if idx < 0:
+            self._buf += data[pos:]
+            out += data[pos:]
+            if len(self._buf) > MAX_RESPONSE_HEAD:
+                raise ValueError("Chunk line too long")
+            return len(data)
+        out += data[pos:idx + 1]
+        self._buf += data[pos:idx + 1]
+        line = bytes(self._buf).rstrip(b"\r\n")
+        self._buf.clear()
+        state = self._state
+        if state == _R_CHUNK_SIZE:
+            size = int(line.split(b";", 1)[0].strip() or b"x", 16)
+            if size:
+                self._remaining = size
+                self._state = _R_CHUNK_DATA
+            else:
+                self._state = _R_TRAILERS
+        elif state == _R_CHUNK_END:
+            if line:
+                raise ValueError("Chunk data not followed by CRLF")
+            self._state = _R_CHUNK_SIZE
+        elif not line:
+            self._state = _R_DONE
+        return idx + 1
+
+
+_STATIC_RESPONSES = {
+    400: b"Bad Request",
+    413: b"Content Too Large",
+    431: b"Request Header Fields Too Large",
+    501: b"Not Implemented",
+    502: b"Backend error",
+    503: b"No backends available",
+    505: b"HTTP Version Not Supported",
+}
+
+
+def _error_response(status: int) -> bytes:
+    body = _STATIC_RESPONSES.get(status, b"Error")
+    reason = body if status not in (502, 503) else (b"Bad Gateway" if status == 502 else b"Service Unavailable")
+    return (b"HTTP/1.1 %d %s\r\nContent-Type: text/plain\r\nContent-Length: %d\r\n"
+            b"Connection: close\r\n\r\n%s" % (status, reason, len(body), body))
+
+
+class _Client:
+    __slots__ = ("sock", "ip", "parser", "queue", "out", "upstream", "keep_alive",
+                 "closing", "eof", "last_active", "events")
+
+    def __init__(self, sock: socket.socket, ip: str) -> None:
+        self.sock = sock
+        self.ip = ip
+        self.parser = HttpRequestParser()
+        self.queue: deque = deque()
+        self.out = bytearray()
+        self.upstream: Optional["_Upstream"] = None
+        self.keep_alive = True
+        self.closing = False        # send what is buffered, then close
+        self.eof = False            # client stopped sending; finish queued requests
+        self.last_active = time.monotonic()
+        self.events = 0
+
+
+class _Upstream:
+    __slots__ = ("sock", "backend", "out", "payload", "method", "framer", "client",
+                 "connecting", "reused", "retried", "received", "paused", "last_active",
+                 "events")
+
+    def __init__(self, sock: socket.socket, backend: tuple[str, int]) -> None:
+        self.sock = sock
+        self.backend = backend
+        self.out = bytearray()
+        self.payload = b""
+        self.method = ""
+        self.framer: Optional[ResponseFramer] = None
+        self.client: Optional[_Client] = None
+        self.connecting = True
+        self.reused = False
+        self.retried = False
+        self.received = False
+        self.paused = False
+        self.last_active = time.monotonic()
+        self.events = 0
+
+
+class _ProxyLoop:
+    """One event-loop thread: its own selector, clients and backend pool."""
+
+    def __init__(self, proxy: "MultiplexProxy") -> None:
+        self.proxy = proxy
+        self.sel = selectors.DefaultSelector()
+        self.clients: set = set()
+        self.upstreams: set = set()
+        # Idle backend connections keyed on (host, port) balancer members
+        self.pool: dict[tuple[str, int], list[_Upstream]] = {}
+        self.requests = 0
+        self.backend_connects = 0
+        self.backend_reuses = 0
+        self.backend_errors = 0
+
+    # ── interest bookkeeping ───────────────────────────────────────────────────
+
+    def _set_events(self, conn, events: int) -> None:
+        if events == conn.events:
+            return
+        if conn.events == 0:
+            self.sel.register(conn.sock, events, conn)
+        elif events == 0:
+            self.sel.unregister(conn.sock)
+        else:
+            self.sel.modify(conn.sock, events, conn)
+        conn.events = events
+
+    def _update_client(self, c: _Client) -> None:
+        if c.sock.fileno() < 0:
+            return
+        finished = c.closing or (c.eof and not c.queue)
+        if finished and not c.out and c.upstream is None:
+            self._close_client(c)
+            return
+        events = 0
+        if (not c.closing and not c.eof and c.parser.error is None
+                and len(c.queue) < MAX_PIPELINE):
+            events |= selectors.EVENT_READ
+        if c.out:
+            events |= selectors.EVENT_WRITE
+        self._set_events(c, events)
+
+    # ── main loop ──────────────────────────────────────────────────────────────
+
+    def run(self) -> None:
+        proxy = self.proxy
+        self.sel.register(proxy.listener, selectors.EVENT_READ, None)
+        next_sweep = time.monotonic() + 1.0
+        try:
+            while not proxy.stopping.is_set():
+                for key, mask in self.sel.select(0.2):
+                    conn = key.data
+                    if conn is None:
+                        self._accept()
+                    elif isinstance(conn, _Client):
+                        if mask & selectors.EVENT_READ:
+                            self._client_read(conn)
+                        if mask & selectors.EVENT_WRITE and conn.sock.fileno() >= 0:
+                            self._client_write(conn)
+                    else:
+                        if mask & selectors.EVENT_WRITE:
+                            self._upstream_write(conn)
+                        if mask & selectors.EVENT_READ and conn.sock.fileno() >= 0:
+                            self._upstream_read(conn)
+                now = time.monotonic()
+                if now >= next_sweep:
+                    next_sweep = now + 1.0
+                    self._sweep(now)
+        finally:
+            for c in list(self.clients):
+                self._close_client(c)
+            for up in list(self.upstreams):
+                self._close_upstream(up)
+            self.sel.close()
+
+    def _sweep(self, now: float) -> None:
+        proxy = self.proxy
+        for c in list(self.clients):
+            if (c.upstream is None and not c.out and not c.queue
+                    and now - c.last_active > proxy.keepalive_timeout):
+                self._close_client(c)
+        for up in list(self.upstreams):
+            idle = now - up.last_active
+            if up.client is None and idle > proxy.pool_idle_timeout:
+                self._close_upstream(up)
+            elif up.client is not None and not up.paused and idle > proxy.backend_timeout:
+                self._upstream_failed(up, retry=False)
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, addr = self.proxy.listener.accept()
+            except OSError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            c = _Client(sock, addr[0])
+            self.clients.add(c)
+            self._set_events(c, selectors.EVENT_READ)
+
+    # ── client side ────────────────────────────────────────────────────────────
+
+    def _client_read(self, c: _Client) -> None:
+        try:
+            data = c.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            if c.upstream is None and not c.queue:
+                self._close_client(c)
+            else:
+                c.eof = True
+                self._update_client(c)
+            return
+        c.last_active = time.monotonic()
+        try:
+            c.queue.extend(c.parser.feed(data))
+        except HttpParseError:
+            pass
+        if c.parser.error is not None:
+            # Reading stops here; the error is answered in its turn
+            c.queue.append(c.parser.error)
+        self._dispatch(c)
+        self._update_client(c)
+
+    def _client_write(self, c: _Client) -> None:
+        try:
+            sent = c.sock.send(c.out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close_client(c)
+            return
+        del c.out[:sent]
+        c.last_active = time.monotonic()
+        up = c.upstream
+        if up is not None and up.paused and len(c.out) < CLIENT_HIGH_WATER // 2:
+            up.paused = False
+            self._set_events(up, selectors.EVENT_READ)
+        self._update_client(c)
+
+    def _dispatch(self, c: _Client) -> None:
+        """Send the client's next queued request to a backend (one in flight)."""
+        while c.upstream is None and c.queue and not c.closing:
+            request = c.queue.popleft()
+            if isinstance(request, HttpParseError):
+                c.out += _error_response(request.status)
+                c.closing = True
+                c.queue.clear()
+                return
+            self.requests += 1
+            c.keep_alive = request.keep_alive
+            if self.proxy.log:
+                print(f"[{datetime.now().isoformat()}] {c.ip} -> "
+                      f"{request.method} {request.target} {request.version}")
+            backend = self.proxy.balancer.next_backend()
+            if backend is None:
+                c.out += _error_response(503)
+                c.closing = True
+                c.queue.clear()
+                return
+            has_body = request.body or "content-length" in request.headers \
+                or "transfer-encoding" in request.headers
+            head = rewrite_request_head(request.raw, c.ip, backend[0], backend[1],
+                                        len(request.body) if has_body else None)
+            up = self._acquire(backend)
+            if up is None:
+                c.out += _error_response(502)
+                c.closing = True
+                c.queue.clear()
+                return
+            up.payload = head + request.body
+            up.method = request.method
+            up.out += up.payload
+            up.framer = ResponseFramer(request.method == "HEAD", c.keep_alive)
+            up.client = c
+            up.last_active = time.monotonic()
+            c.upstream = up
+            if up.connecting:
+                self._set_events(up, selectors.EVENT_WRITE)
+            else:
+                self._upstream_write(up)
+
+    def _close_client(self, c: _Client) -> None:
+        if c in self.clients:
+            self.clients.discard(c)
+            self._set_events(c, 0)
+            c.sock.close()
+        up = c.upstream
+        if up is not None:
+            # Response not finished: the backend connection cannot be reused
+            c.upstream = None
+            up.client = None
+            self._close_upstream(up)
+
+    # ── backend side ───────────────────────────────────────────────────────────
+
+    def _acquire(self, backend: tuple[str, int]) -> Optional[_Upstream]:
+        idle = self.pool.get(backend)
+        if idle:
+            up = idle.pop()
+            up.reused = True
+            up.retried = False
+            self.backend_reuses += 1
+            return up
+        return self._connect(backend)
+
+    def _connect(self, backend: tuple[str, int]) -> Optional[_Upstream]:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            err = sock.connect_ex(backend)
+        except OSError:
+            sock.close()
+            self.backend_errors += 1
+            return None
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
+            self.backend_errors += 1
+            return None
+        self.backend_connects += 1
+        up = _Upstream(sock, backend)
+        self.upstreams.add(up)
+        return up
+
+    def _release(self, up: _Upstream) -> None:
+        """Return a finished backend connection to the pool (or close it)."""
+        up.client = None
+        up.framer = None
+        up.payload = b""
+        up.method = ""
+        up.received = False
+        idle = self.pool.setdefault(up.backend, [])
+        if len(idle) >= MAX_IDLE_PER_BACKEND or self.proxy.stopping.is_set():
+            self._close_upstream(up)
+            return
+        up.last_active = time.monotonic()
+        idle.append(up)
+        # Readable while idle means the backend closed it
+        self._set_events(up, selectors.EVENT_READ)
+
+    def _close_upstream(self, up: _Upstream) -> None:
+        if up not in self.upstreams:
+            return
+        self.upstreams.discard(up)
+        idle = self.pool.get(up.backend)
+        if idle and up in idle:
+            idle.remove(up)
+        self._set_events(up, 0)
+        up.sock.close()
+
+    def _upstream_write(self, up: _Upstream) -> None:
+        if up.connecting:
+            err = up.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err:
+                self._upstream_failed(up)
+                return
+            up.connecting = False
+        if up.out:
+            try:
+                sent = up.sock.send(up.out)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                self._upstream_failed(up)
+                return
+            del up.out[:sent]
+        self._set_events(up, selectors.EVENT_WRITE if up.out else selectors.EVENT_READ)
+
+    def _upstream_read(self, up: _Upstream) -> None:
+        c = up.client
+        try:
+            data = up.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if c is None:
+            # Idle pooled connection: closed by the backend (or unexpected data)
+            self._close_upstream(up)
+            return
+        framer = up.framer
+        up.received = up.received or bool(data)
+        if not data:
+            if framer.until_close:
+                self._finish(up, reusable=False)
+            else:
+                self._upstream_failed(up)
+            return
+        up.last_active = time.monotonic()
+        try:
+            consumed = framer.feed(data, c.out)
+        except ValueError:
+            self._upstream_failed(up)
+            return
+        if framer.done:
+            # Bytes past the end of the response mean the backend is confused
+            self._finish(up, reusable=framer.backend_keep_alive and consumed == len(data))
+        elif len(c.out) >= CLIENT_HIGH_WATER:
+            up.paused = True
+            self._set_events(up, 0)
+        self._update_client(c)
+
+    def _finish(self, up: _Upstream, reusable: bool) -> None:
+        c = up.client
+        keep_client = up.framer.keep_client
+        c.upstream = None
+        if reusable:
+            self._release(up)
+        else:
+            up.client = None
+            self._close_upstream(up)
+        if not keep_client:
+            c.closing = True
+            c.queue.clear()
+        self._dispatch(c)
+        self._update_client(c)
+
+    def _upstream_failed(self, up: _Upstream, retry: bool = True) -> None:
+        c = up.client
+        framer = up.framer
+        started = framer is not None and framer.started
+        payload = up.payload
+        up.client = None
+        self._close_upstream(up)
+        if c is None:
+            return
+        c.upstream = None
+        self.backend_errors += 1
+        if retry and up.reused and not up.retried and not up.received \
+                and up.method in _IDEMPOTENT_METHODS:
+            # A pooled connection the backend had already closed: retry once
+            # on a fresh connection to the same backend. The backend may have
+            # acted on the request before closing, so only idempotent ones.
+            fresh = self._connect(up.backend)
+            if fresh is not None:
+                fresh.retried = True
+                fresh.payload = payload
+                fresh.method = up.method
+                fresh.out += payload
+                fresh.framer = ResponseFramer(framer.head_request, framer.client_keep_alive)
+                fresh.client = c
+                c.upstream = fresh
+                self._set_events(fresh, selectors.EVENT_WRITE)
+                return
+        if not started:
+            c.out += _error_response(502)
+        c.closing = True
+        c.queue.clear()
+        self._update_client(c)
+
+
+class MultiplexProxy:
+    """
+    Reverse proxy engine: a fixed pool of selector threads.
+
+    Each thread accepts from the shared listening socket and owns the
+    connections it accepted, plus a pool of idle backend connections keyed
+    on the balancer's (host, port) members. Requests are read with
+    HttpRequestParser, so keep-alive and pipelined clients work; responses
+    are streamed back in request order.
+
+    Args:
+        host: Address to bind to
+        port: Port to listen on (0 picks a free port; see .address)
+        balancer: Backend selection (shared by all threads)
+        threads: Number of event-loop threads
+        log: Print one line per request
+    """
+
+    def __init__(self, host: str, port: int, balancer: RoundRobinBalancer,
+                 threads: int = ENGINE_THREADS, log: bool = True,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+                 pool_idle_timeout: float = POOL_IDLE_TIMEOUT,
+                 backend_timeout: float = CONNECTION_TIMEOUT,
+                 backlog: int = 1024) -> None:
+        self.balancer = balancer
+        self.log = log
+        self.keepalive_timeout = keepalive_timeout
+        self.pool_idle_timeout = pool_idle_timeout
+        self.backend_timeout = backend_timeout
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((host, port))
+        self.listener.listen(backlog)
+        self.listener.setblocking(False)
+        self.address: tuple[str, int] = self.listener.getsockname()[:2]
+        self.stopping = threading.Event()
+        self._done = threading.Event()
+        self.loops = [_ProxyLoop(self) for _ in range(max(1, threads))]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters summed over the event-loop threads."""
+        return {
+            "clients": sum(len(loop.clients) for loop in self.loops),
+            "requests": sum(loop.requests for loop in self.loops),
+            "backend_connects": sum(loop.backend_connects for loop in self.loops),
+            "backend_reuses": sum(loop.backend_reuses for loop in self.loops),
+            "backend_errors": sum(loop.backend_errors for loop in self.loops),
+        }
+
+    def serve_forever(self) -> None:
+        """Run the event loops until shutdown() is called."""
+        threads = [threading.Thread(target=loop.run, daemon=True) for loop in self.loops]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.listener.close()
+            self._done.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop the loops, closing every connection."""
+        self.stopping.set()
+        self._done.wait(timeout)
+
+
+def run_multiplex_proxy(host: str, port: int, backends: list[tuple[str, int]],
+                        threads: int = ENGINE_THREADS, log: bool = True,
+                        health_interval: float = 0.0, health_path: Optional[str] = None) -> None:
+    """Run MultiplexProxy in the foreground until Ctrl+C."""
+    balancer = RoundRobinBalancer(backends)
+    proxy = MultiplexProxy(host, port, balancer, threads=threads, log=log)
+    checker = start_health_checker(balancer, backends, health_interval, health_path)
+    print(f"Reverse Proxy (selectors engine, {len(proxy.loops)} threads) running on "
+          f"http://{host}:{proxy.address[1]}")
+    print(f"Backends: {backends}")
+    print("Press Ctrl+C to stop")
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        print("\nShutting down proxy...")
+    finally:
+        if checker is not None:
+            checker.stop()
+        proxy.shutdown()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MAIN ENTRY POINT
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -526,6 +1579,35 @@ def main() -> int:
         required=True,
         help="Comma-separated backend servers (e.g., localhost:9001,localhost:9002)"
     )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "selectors"],
+        default="threads",
+        help="threads: one thread per client (Sections 1-6); "
+             "selectors: multiplexing engine (Section 7)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=ENGINE_THREADS,
+        help=f"Event-loop threads for --engine selectors (default: {ENGINE_THREADS})"
+    )
+    parser.add_argument(
+        "--health-interval",
+        type=float,
+        default=0.0,
+        help="Seconds between background health checks per backend (default: 0, off)"
+    )
+    parser.add_argument(
+        "--health-path",
+        default="/health",
+        help="HTTP path probed by health checks; empty for TCP connect only (default: /health)"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not log each request (selectors engine)"
+    )
     
     args = parser.parse_args()
     
@@ -535,7 +1617,13 @@ def main() -> int:
         print("Error: No valid backends specified")
         return 1
     
-    run_proxy(args.host, args.port, backends)
+    health_path = args.health_path or None
+    if args.engine == "selectors":
+        run_multiplex_proxy(args.host, args.port, backends, threads=args.threads, log=not args.quiet,
+                            health_interval=args.health_interval, health_path=health_path)
+    else:
+        run_proxy(args.host, args.port, backends,
+                  health_interval=args.health_interval, health_path=health_path)
     return 0
 
 
@@ -3,7 +3,8 @@
 net_utils.py - Utilities for network programming (Week 8).
 
 Helper functions for:
-- HTTP request/response parsing
+- HTTP request/response parsing (whole buffers, or incrementally with
+  HttpRequestParser for keep-alive and pipelined connections)
 - Building HTTP responses
 - Path validation and sanitisation (security)
 - MIME types and formatting
@@ -17,7 +18,7 @@ import re
 import socket
 import urllib.parse
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -37,10 +38,14 @@ HTTP_STATUS_CODES = {
     404: "Not Found",
     405: "Method Not Allowed",
     408: "Request Timeout",
+    413: "Content Too Large",
     414: "URI Too Long",
+    431: "Request Header Fields Too Large",
     500: "Internal Server Error",
+    501: "Not Implemented",
     502: "Bad Gateway",
     503: "Service Unavailable",
+    505: "HTTP Version Not Supported",
 }
 
 MIME_TYPES = {
@@ -80,6 +85,14 @@ class HttpRequest:
     body: bytes = b""
     raw: bytes = b""
 
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client expects the connection to stay open."""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
 
 @dataclass
 class HttpResponse:
@@ -248,6 +261,327 @@ def parse_http_response(raw: bytes) -> HttpResponse:
     return HttpResponse(status=status, reason=reason, headers=headers, body=body)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Incremental HTTP Request Parsing
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class HttpParseError(ValueError):
+    """Malformed or oversized request; `status` is the response to send."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+_TOKEN_RE = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+_VERSION_RE = re.compile(r"HTTP/1\.[01]")
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+
+_HEAD, _BODY, _CHUNK_SIZE, _CHUNK_DATA, _CHUNK_CRLF, _TRAILERS = range(6)
+
+
+class HttpRequestParser:
+    """
+    Incremental HTTP/1.x request parser.
+
+    Feed it byte chunks exactly as they come off the socket (any size, split
+    anywhere); it returns each request as soon as its last byte arrives, so
+    one recv may yield several pipelined requests or none. Bodies are framed
+    by Content-Length or chunked Transfer-Encoding.
+
+    Every byte is examined once: the search for the end of the headers
+    resumes where the previous feed stopped, and body bytes are sliced off
+    the buffer without being scanned.
+
+    Errors raise HttpParseError with the status code to answer with (400,
+    413, 431, 501 or 505); the connection should then be closed. Requests
+    completed before the error in the same feed are returned first and the
+    error is raised by the next call (check `error`, or call feed(b"")).
+
+    Example:
+        >>> parser = HttpRequestParser()
+        >>> [r.target for r in parser.feed(b"GET / HTTP/1.1\\r\\nHost: a\\r\\n\\r\\nGET /x HT")]
+        ['/']
+        >>> [r.target for r in parser.feed(b"TP/1.1\\r\\n\\r\\n")]
+        ['/x']
+    """
+
+    def __init__(self,
+                 max_header_bytes: int = 64 * 1024,
+                 max_headers: int = 100,
+                 max_body_bytes: int = 16 * 1024 * 1024,
+                 max_line_bytes: int = 8 * 1024) -> None:
+        self.max_header_bytes = max_header_bytes
+        self.max_headers = max_headers
+        self.max_body_bytes = max_body_bytes
+        self.max_line_bytes = max_line_bytes
+
+        self._buf = bytearray()
+        self._pos = 0            # start of unconsumed data in _buf
+        self._scan = 0           # where the next terminator search resumes
+        self._state = _HEAD
+        self._error: Optional[HttpParseError] = None
+
+        self._request: Optional[HttpRequest] = None
+        self._body_parts: List[bytes] = []
+        self._body_len = 0
+        self._remaining = 0      # body or chunk bytes still expected
+        self._trailer_bytes = 0
+
+    @property
+    def error(self) -> Optional[HttpParseError]:
+        """The error that stopped parsing, if any."""
+        return self._error
+
+    @property
+    def pending(self) -> bool:
+        """True if part of a request has been received but not completed."""
+        return self._state != _HEAD or len(self._buf) > self._pos
+
+    def feed(self, data: bytes) -> List[HttpRequest]:
+        """
+        Add received bytes; return the requests they complete, in order.
+
+        Raises:
+            HttpParseError: The stream is not a valid HTTP/1.x request
+                stream or exceeds a limit
+        """
+        if self._error is not None:
+            raise self._error
+        self._buf += data
+        done: List[HttpRequest] = []
+        try:
+            while self._step(done):
+                pass
+        except HttpParseError as exc:
+            self._error = exc
+            if not done:
+                raise
+        finally:
+            # Drop consumed bytes once per feed; at most a partial head or
+            # chunk-size line is left to move
+            if self._pos:
+                del self._buf[:self._pos]
+                self._scan -= self._pos
+                self._pos = 0
+        return done
+
+    # ── state machine ──────────────────────────────────────────────────────────
+
+    def _step(self, done: List[HttpRequest]) -> bool:
+        """Advance by one unit of work; return False when more data is needed."""
+        state = self._state
+        if state == _HEAD:
+            return self._parse_head(done)
+        if state == _BODY:
+            if not self._take_body():
+                return False
+            self._finish(done)
+            return True
+        if state == _CHUNK_SIZE:
+            return self._parse_chunk_size()
+        if state == _CHUNK_DATA:
+            if not self._take_body():
+                return False
+            self._state = _CHUNK_CRLF
+            return True
+        if state == _CHUNK_CRLF:
+            if len(self._buf) - self._pos < 2:
+                return False
+            if self._buf[self._pos:self._pos + 2] != b"\r\n":
+                raise HttpParseError("Chunk data not followed by CRLF")
+            self._pos += 2
+            self._scan = self._pos
+            self._state = _CHUNK_SIZE
+            return True
+        return self._parse_trailers(done)
+
+    def _find_line_end(self, limit: int, what: str, status: int = 400) -> int:
+        """Index of the next CRLF from the scan position, or -1 (resumable)."""
+        buf = self._buf
+        end = buf.find(b"\r\n", self._scan)
+        if end < 0:
+            # Keep the last byte: it may be the CR of a split CRLF
+            self._scan = max(self._pos, len(buf) - 1)
+            if len(buf) - self._pos > limit:
+                raise HttpParseError(f"{what} too long", status)
+        elif end - self._pos > limit:
+            raise HttpParseError(f"{what} too long", status)
+        return end
+
+    def _parse_head(self, done: List[HttpRequest]) -> bool:
+        buf = self._buf
+        # RFC 9112 §2.2: ignore empty lines before a request line
+        while buf[self._pos:self._pos + 2] == b"\r\n":
+            self._pos += 2
+            self._scan = max(self._scan, self._pos)
+        if self._pos >= len(buf):
+            return False
+
+        end = buf.find(b"\r\n\r\n", max(self._scan, self._pos))
+        if end < 0:
+            self._scan = max(self._pos, len(buf) - 3)
+            if len(buf) - self._pos > self.max_header_bytes:
+                raise HttpParseError("Request header section too large", 431)
+            return False
+        if end + 4 - self._pos > self.max_header_bytes:
+            raise HttpParseError("Request header section too large", 431)
+
+        head = bytes(buf[self._pos:end + 4])
+        self._pos = end + 4
+        self._scan = self._pos
+        request = self._parse_head_bytes(head)
+
+        te = request.headers.get("transfer-encoding")
+        cl = request.headers.get("content-length")
+        if te is not None:
+            if cl is not None:
+                # Both framings at once is the classic smuggling vector
+                raise HttpParseError("Both Transfer-Encoding and Content-Length")
+            if te.lower() != "chunked":
+                raise HttpParseError(f"Unsupported Transfer-Encoding: {te}", 501)
+            self._request = request
+            self._state = _CHUNK_SIZE
+            return True
+        if cl is not None:
+            length = self._content_length(cl)
+            if length:
+                self._request = request
+                self._remaining = length
+                self._state = _BODY
+                return True
+        done.append(request)
+        return True
+
+    def _parse_head_bytes(self, head: bytes) -> HttpRequest:
+        lines = head[:-4].decode("iso-8859-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3:
+            raise HttpParseError(f"Invalid request line: {lines[0][:100]!r}")
+        method, target, version = parts
+        if not _TOKEN_RE.fullmatch(method) or not target:
+            raise HttpParseError(f"Invalid request line: {lines[0][:100]!r}")
+        if not _VERSION_RE.fullmatch(version):
+            raise HttpParseError(f"Unsupported HTTP version: {version[:20]!r}", 505)
+        if len(lines) - 1 > self.max_headers:
+            raise HttpParseError("Too many header fields", 431)
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if not sep or not _TOKEN_RE.fullmatch(name):
+                # Also rejects obsolete line folding and "Name : value"
+                raise HttpParseError(f"Invalid header line: {line[:100]!r}")
+            key = name.lower()
+            value = value.strip(" \t")
+            if key in headers:
+                if key == "content-length" and headers[key] != value:
+                    raise HttpParseError("Conflicting Content-Length headers")
+                if key != "content-length":
+                    headers[key] = headers[key] + ", " + value
+                continue
+            headers[key] = value
+
+        return HttpRequest(method=method.upper(), target=target, version=version,
+                           headers=headers, raw=head)
+
+    def _content_length(self, value: str) -> int:
+        if not value.isdigit() or not value.isascii():
+            raise HttpParseError(f"Invalid Content-Length: {value[:20]!r}")
+        length = int(value)
+        if length > self.max_body_bytes:
+            raise HttpParseError("Request body too large", 413)
+        return length
+
+    def _take_body(self) -> bool:
+        """Move up to _remaining buffered bytes into the body; True when complete."""
+        available = len(self._buf) - self._pos
+        if available <= 0 and self._remaining:
+            return False
+        n = min(available, self._remaining)
+        if n:
+            self._body_parts.append(bytes(self._buf[self._pos:self._pos + n]))
+            self._pos += n
+            self._scan = self._pos
+            self._remaining -= n
+        return self._remaining == 0
+
+    def _parse_chunk_size(self) -> bool:
+        end = self._find_line_end(self.max_line_bytes, "Chunk size line")
+        if end < 0:
+            return False
+        line = bytes(self._buf[self._pos:end])
+        self._pos = end + 2
+        self._scan = self._pos
+        size_field = line.split(b";", 1)[0].strip(b" \t")
+        if not size_field or len(size_field) > 16 or not set(size_field) <= _HEX_DIGITS:
+            raise HttpParseError(f"Invalid chunk size: {line[:20]!r}")
+        size = int(size_field, 16)
+        if size == 0:
+            self._trailer_bytes = 0
+            self._state = _TRAILERS
+            return True
+        self._body_len += size
+        if self._body_len > self.max_body_bytes:
+            raise HttpParseError("Request body too large", 413)
+        self._remaining = size
+        self._state = _CHUNK_DATA
+        return True
+
+    def _parse_trailers(self, done: List[HttpRequest]) -> bool:
+        # Trailer fields are read and discarded, within the header budget
+        while True:
+            end = self._find_line_end(self.max_header_bytes, "Trailer section", 431)
+            if end < 0:
+                return False
+            length = end - self._pos
+            self._trailer_bytes += length + 2
+            if self._trailer_bytes > self.max_header_bytes:
+                raise HttpParseError("Trailer section too large", 431)
+            self._pos = end + 2
+            self._scan = self._pos
+            if length == 0:
+                self._finish(done)
+                return True
+
+    def _finish(self, done: List[HttpRequest]) -> None:
+        request = self._request
+        request.body = b"".join(self._body_parts)
+        done.append(request)
+        self._request = None
+        self._body_parts = []
+        self._body_len = 0
+        self._remaining = 0
+        self._state = _HEAD
+
+
+def iter_http_requests(sock: socket.socket,
+                       parser: Optional[HttpRequestParser] = None,
+                       timeout: float = 10.0,
+                       bufsize: int = 64 * 1024) -> Iterator[HttpRequest]:
+    """
+    Yield requests from a blocking socket until the peer closes it.
+
+    Pipelined requests that arrive in one recv are yielded one by one.
+
+    Raises:
+        HttpParseError: Malformed request, or the peer closed mid-request
+        TimeoutError: No data within timeout seconds
+    """
+    parser = parser or HttpRequestParser()
+    sock.settimeout(timeout)
+    while True:
+        try:
+            chunk = sock.recv(bufsize)
+        except socket.timeout as exc:
+            raise TimeoutError("Socket timeout on read") from exc
+        if not chunk:
+            if parser.pending:
+                raise HttpParseError("Connection closed mid-request")
+            return
+        yield from parser.feed(chunk)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Building HTTP Responses
 # ═══════════════════════════════════════════════════════════════════════════════
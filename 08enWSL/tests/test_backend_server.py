@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for the Backend Server Concurrency Modes
+===============================================
+
+Runs BackendServer in each mode on a loopback port and checks routing,
+keep-alive, pipelining and error handling over real connections, plus
+the timer-refreshed status body and the built-in load generator.
+
+Run with: pytest tests/test_backend_server.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from apps.backend_server import (  # noqa: E402
+    MODES,
+    BackendServer,
+    StatusCache,
+    handle_request,
+    run_load,
+)
+
+KEEPALIVE_MODES = [m for m in MODES if m != "simple"]
+
+
+def start(mode, **kwargs):
+    server = BackendServer("127.0.0.1", 0, "T", mode=mode, workers=2, log=False, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    assert server.ready.wait(10)
+    return server, thread
+
+
+@pytest.fixture(params=MODES)
+def any_server(request):
+    if request.param == "reuseport" and not hasattr(socket, "SO_REUSEPORT"):
+        pytest.skip("SO_REUSEPORT not available")
+    server, thread = start(request.param)
+    yield server
+    server.shutdown()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+@pytest.fixture(params=KEEPALIVE_MODES)
+def server(request):
+    if request.param == "reuseport" and not hasattr(socket, "SO_REUSEPORT"):
+        pytest.skip("SO_REUSEPORT not available")
+    srv, thread = start(request.param)
+    yield srv
+    srv.shutdown()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def get(path, **headers):
+    lines = [f"GET {path} HTTP/1.1", "Host: test"]
+    lines += [f"{k.replace('_', '-')}: {v}" for k, v in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def read_response(sock, buf, head_only=False):
+    """Return (status, headers, body) for the next response on sock."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    lines = bytes(buf[:end]).decode("iso-8859-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    length = 0 if head_only else int(headers.get("content-length", 0))
+    while len(buf) < end + length:
+        buf += sock.recv(65536)
+    body = bytes(buf[end:end + length])
+    del buf[:end + length]
+    return status, headers, body
+
+
+def is_closed(sock):
+    sock.settimeout(2)
+    try:
+        return sock.recv(1) == b""
+    except ConnectionResetError:
+        return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STATUS_CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestStatusCache:
+    """The status body is shared until its interval expires."""
+
+    def test_reused_within_interval(self):
+        cache = StatusCache("A", interval=60)
+        first = cache.get()
+        assert cache.get() is first
+        assert cache.builds == 1
+        assert json.loads(first)["backend_id"] == "A"
+
+    def test_rebuilt_after_interval(self):
+        cache = StatusCache("A", interval=0.01)
+        cache.get()
+        time.sleep(0.02)
+        cache.get()
+        assert cache.builds == 2
+
+    def test_handle_request_uses_cache(self):
+        cache = StatusCache("A", interval=60)
+        for _ in range(5):
+            handle_request(get("/api/status"), "A", cache)
+        assert cache.builds == 1
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ALL_MODES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAllModes:
+    """Behaviour every mode shares, including the one-request simple loop."""
+
+    def test_routes(self, any_server):
+        for path, status, marker in [("/", 200, b"Backend T"), ("/health", 200, b"OK"),
+                                     ("/api/status", 200, b'"backend_id": "T"'),
+                                     ("/missing", 404, b"Not Found")]:
+            with socket.create_connection(any_server.address, timeout=5) as sock:
+                sock.sendall(get(path, Connection="close"))
+                got_status, headers, body = read_response(sock, bytearray())
+            assert got_status == status and marker in body
+            assert headers["x-backend-id"] == "T"
+
+    def test_concurrent_clients(self, any_server):
+        results = []
+
+        def client():
+            with socket.create_connection(any_server.address, timeout=5) as sock:
+                sock.sendall(get("/health", Connection="close"))
+                results.append(read_response(sock, bytearray())[0])
+
+        threads = [threading.Thread(target=client) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [200] * 20
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KEEP_ALIVE_MODES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestKeepAliveModes:
+    """pool, event and reuseport read requests with HttpRequestParser."""
+
+    def test_keep_alive(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            buf = bytearray()
+            for _ in range(5):
+                sock.sendall(get("/health"))
+                status, headers, body = read_response(sock, buf)
+                assert status == 200 and headers["connection"] == "keep-alive"
+
+    def test_pipelined_in_order(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            buf = bytearray()
+            sock.sendall(get("/health") + get("/missing") + get("/api/status"))
+            assert read_response(sock, buf)[2] == b"OK"
+            assert read_response(sock, buf)[0] == 404
+            assert b"healthy" in read_response(sock, buf)[2]
+
+    def test_request_split_across_packets(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            for b in get("/health"):
+                sock.sendall(bytes([b]))
+            assert read_response(sock, bytearray())[0] == 200
+
+    def test_connection_close_honoured(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/health", Connection="close") + get("/health"))
+            assert read_response(sock, bytearray())[1]["connection"] == "close"
+            assert is_closed(sock)
+
+    def test_malformed_request_gets_400_and_close(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            sock.sendall(get("/health") + b"NOT HTTP\r\n\r\n")
+            buf = bytearray()
+            assert read_response(sock, buf)[0] == 200
+            assert read_response(sock, buf)[0] == 400
+            assert is_closed(sock)
+
+    def test_head_and_method_not_allowed(self, server):
+        with socket.create_connection(server.address, timeout=5) as sock:
+            buf = bytearray()
+            sock.sendall(b"POST / HTTP/1.1\r\nContent-Length: 2\r\n\r\nhi"
+                         b"HEAD /health HTTP/1.1\r\n\r\n")
+            assert read_response(sock, buf)[0] == 405
+            status, headers, _ = read_response(sock, buf, head_only=True)
+            assert status == 200 and headers["content-length"] == "2"
+            sock.sendall(get("/health"))
+            assert read_response(sock, buf)[2] == b"OK"
+
+    def test_idle_clients_do_not_block_others(self, server):
+        # More idle keep-alive and half-sent clients than the two workers
+        held = []
+        for i in range(6):
+            sock = socket.create_connection(server.address, timeout=5)
+            held.append(sock)
+            if i % 2:
+                sock.sendall(get("/health")[:10])
+            else:
+                sock.sendall(get("/health"))
+                assert read_response(sock, bytearray())[0] == 200
+        try:
+            with socket.create_connection(server.address, timeout=2) as sock:
+                sock.sendall(get("/health"))
+                assert read_response(sock, bytearray())[2] == b"OK"
+        finally:
+            for sock in held:
+                sock.close()
+
+    def test_shutdown_with_idle_connection(self, server):
+        sock = socket.create_connection(server.address, timeout=5)
+        sock.sendall(get("/health"))
+        read_response(sock, bytearray())
+        # Fixture teardown must not wait for the keep-alive timeout
+        started = time.monotonic()
+        server.shutdown()
+        assert time.monotonic() - started < 3
+        sock.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD_GENERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestLoad:
+    """run_load reports throughput and latency percentiles."""
+
+    @pytest.mark.parametrize("keep_alive", [True, False])
+    def test_run_load(self, keep_alive):
+        server, thread = start("event")
+        try:
+            result = run_load(*server.address, requests=200, concurrency=4, keep_alive=keep_alive)
+        finally:
+            server.shutdown()
+        assert result["requests"] == 200 and result["errors"] == 0
+        assert result["rps"] > 0
+        assert result["p50_ms"] <= result["p90_ms"] <= result["p99_ms"] <= result["max_ms"]
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            BackendServer("127.0.0.1", 0, "T", mode="threads")
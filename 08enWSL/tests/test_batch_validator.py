@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for Batch Submission Validation
+======================================
+
+Builds small synthetic submissions and checks the process-pool batch
+validator, the (sha256, validator version) analysis cache and the
+hash-then-index capture handle.
+
+Run with: pytest tests/test_batch_validator.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from anti_ai import pcap_tools  # noqa: E402
+from anti_ai.analysis_cache import AnalysisCache  # noqa: E402
+from anti_ai.batch_validator import DEFAULT_EVIDENCE, find_submissions, validate_batch  # noqa: E402
+from anti_ai.files import sha256_file  # noqa: E402
+from anti_ai.pcap_tools import CaptureFile, CaptureIndex  # noqa: E402
+from anti_ai.submission_validator import VALIDATOR_VERSION  # noqa: E402
+from scripts.benchmark_batch_validation import PORT, write_submission  # noqa: E402
+from scripts.benchmark_pcap_index import TOKEN, write_synthetic_capture  # noqa: E402
+
+CAPTURE_BYTES = 1 << 20  # large enough for lab flows from several backends
+
+
+@pytest.fixture
+def submissions(tmp_path):
+    root = tmp_path / "submissions"
+    root.mkdir()
+    for name in ("alice", "bob", "carol"):
+        write_submission(root, name, CAPTURE_BYTES)
+    return root
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+def rewrite_evidence_hash(submission: Path, capture: Path) -> None:
+    path = submission / DEFAULT_EVIDENCE
+    evidence = json.loads(path.read_text())
+    for entry in evidence["artefacts"]:
+        if submission / entry["path"] == capture:
+            entry["sha256"] = sha256_file(capture)
+    path.write_text(json.dumps(evidence))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BATCH_VALIDATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestValidateBatch:
+    """Pool and cache behaviour over a directory of submissions."""
+
+    def test_all_pass_cold_then_warm(self, submissions, cache_dir):
+        cold = validate_batch(submissions, workers=2, cache_dir=cache_dir)
+        assert (cold["passed"], cold["failed"]) == (3, 0)
+        assert (cold["cache_hits"], cold["cache_misses"]) == (0, 9)
+
+        warm = validate_batch(submissions, workers=2, cache_dir=cache_dir)
+        assert (warm["passed"], warm["failed"]) == (3, 0)
+        assert (warm["cache_hits"], warm["cache_misses"]) == (9, 0)
+
+    def test_warm_results_match_cold(self, submissions, cache_dir):
+        cold = validate_batch(submissions, workers=1, cache_dir=cache_dir)
+        warm = validate_batch(submissions, workers=1, cache_dir=cache_dir)
+        for name, result in cold["results"].items():
+            assert warm["results"][name].issues == result.issues
+            assert all(c["cached"] for c in warm["results"][name].details["captures"].values())
+
+    def test_pool_matches_serial(self, submissions):
+        serial = validate_batch(submissions, workers=1, cache_dir=None)
+        pooled = validate_batch(submissions, workers=3, cache_dir=None)
+        assert {n: r.ok for n, r in serial["results"].items()} == {n: r.ok for n, r in pooled["results"].items()}
+        assert pooled["cache_misses"] == 0
+
+    def test_only_changed_capture_is_reanalysed(self, submissions, cache_dir):
+        validate_batch(submissions, workers=1, cache_dir=cache_dir)
+        bob = submissions / "bob"
+        capture = next((bob / "pcap").glob("*_http_exchange.pcap"))
+        write_synthetic_capture(capture, CAPTURE_BYTES * 2, PORT)
+        rewrite_evidence_hash(bob, capture)
+
+        rerun = validate_batch(submissions, workers=1, cache_dir=cache_dir)
+        assert rerun["passed"] == 3
+        assert (rerun["cache_hits"], rerun["cache_misses"]) == (8, 1)
+
+    def test_tampered_capture_fails_without_analysis(self, submissions, cache_dir):
+        capture = next((submissions / "carol" / "pcap").glob("*_handshake.pcap"))
+        with capture.open("ab") as f:
+            f.write(b"\x00")
+        summary = validate_batch(submissions, workers=1, cache_dir=cache_dir)
+        carol = summary["results"]["carol"]
+        assert not carol.ok
+        assert "handshake: Capture hash does not match evidence.json" in carol.issues
+        assert summary["cache_misses"] == 8
+
+    def test_broken_submission_reported_not_raised(self, submissions, cache_dir):
+        challenge = next((submissions / "alice").rglob("challenge_week08.json"))
+        challenge.write_text("{not json")
+        summary = validate_batch(submissions, workers=2, cache_dir=cache_dir)
+        assert summary["failed"] == 1
+        assert summary["results"]["alice"].issues[0].startswith("Validator error")
+
+    def test_directories_without_challenge_skipped(self, submissions):
+        (submissions / "notes").mkdir()
+        assert [p.name for p in find_submissions(submissions)] == ["alice", "bob", "carol"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ANALYSIS_CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestAnalysisCache:
+    """Entries keyed by (sha256, validator version)."""
+
+    @pytest.fixture
+    def capture(self, tmp_path):
+        path = tmp_path / "lab.pcap"
+        write_synthetic_capture(path, CAPTURE_BYTES, PORT)
+        return path
+
+    def test_round_trip(self, capture, cache_dir):
+        index = CaptureIndex.build(capture, needles=[TOKEN])
+        digest = sha256_file(capture)
+        cache = AnalysisCache(cache_dir, VALIDATOR_VERSION)
+        cache.store(digest, index, ["X-Backend-ID"])
+
+        restored = cache.load(digest, [TOKEN], ["X-Backend-ID"])
+        assert restored is not None
+        assert restored.mentions_port(PORT) and restored.has_handshake(PORT)
+        assert restored.contains_ascii(TOKEN, port=PORT)
+        assert restored.header_values("x-backend-id") == index.header_values("X-Backend-ID")
+        assert restored.header_values("X-Backend-ID", port=PORT) == index.header_values("X-Backend-ID", port=PORT)
+        assert cache.path_for(digest).name == f"{digest}-{VALIDATOR_VERSION}.json"
+
+    def test_other_version_misses(self, capture, cache_dir):
+        digest = sha256_file(capture)
+        AnalysisCache(cache_dir, "old").store(digest, CaptureIndex.build(capture), [])
+        cache = AnalysisCache(cache_dir, VALIDATOR_VERSION)
+        assert cache.load(digest) is None
+        assert cache.misses == 1
+
+    def test_uncovered_needle_or_header_misses(self, capture, cache_dir):
+        digest = sha256_file(capture)
+        cache = AnalysisCache(cache_dir, VALIDATOR_VERSION)
+        cache.store(digest, CaptureIndex.build(capture, needles=[TOKEN]), ["X-Backend-ID"])
+        assert cache.load(digest, ["other-token"]) is None
+        assert cache.load(digest, [TOKEN], ["Server"]) is None
+        assert cache.load(digest, [TOKEN], ["x-backend-id"]) is not None
+
+    def test_corrupt_entry_misses(self, capture, cache_dir):
+        digest = sha256_file(capture)
+        cache = AnalysisCache(cache_dir, VALIDATOR_VERSION)
+        cache.store(digest, CaptureIndex.build(capture), [])
+        cache.path_for(digest).write_text("{truncated")
+        assert cache.load(digest) is None
+
+    def test_unkept_header_needs_path(self, capture):
+        summary = CaptureIndex.build(capture).summary(["X-Backend-ID"])
+        with pytest.raises(KeyError):
+            CaptureIndex.from_summary(summary).header_values("Host")
+        rescanned = CaptureIndex.from_summary(summary, path=capture).header_values("Host")
+        assert rescanned == CaptureIndex.build(capture).header_values("Host")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAPTURE_FILE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestCaptureFile:
+    """One open file: hash first, then index from the same bytes."""
+
+    @pytest.fixture
+    def capture(self, tmp_path):
+        path = tmp_path / "big.pcap"
+        # Larger than the release interval so hashing drops pages behind it
+        write_synthetic_capture(path, pcap_tools._RELEASE_EVERY + CAPTURE_BYTES, PORT)
+        return path
+
+    def check(self, capture):
+        expected = CaptureIndex.build(capture, needles=[TOKEN])
+        with CaptureFile(capture) as cap:
+            assert cap.sha256() == sha256_file(capture)
+            index = cap.index([TOKEN])
+        assert index.segments == expected.segments
+        assert index.port_counts == expected.port_counts
+        assert index.contains_ascii(TOKEN, port=PORT)
+        assert index.header_values("X-Backend-ID") == expected.header_values("X-Backend-ID")
+
+    def test_mapped(self, capture):
+        self.check(capture)
+
+    def test_chunked(self, capture, monkeypatch):
+        def no_mmap(*args, **kwargs):
+            raise OSError("mmap disabled")
+        monkeypatch.setattr(pcap_tools.mmap, "mmap", no_mmap)
+        self.check(capture)
+
+    def test_not_a_capture(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"hello")
+        with CaptureFile(path) as cap:
+            assert cap.sha256() == sha256_file(path)
+            assert cap.index().segments == 0
@@ -289,6 +289,27 @@ class TestExercise2ReverseProxy(unittest.TestCase):
             "When X-Forwarded-For exists, APPEND to it, don't replace. "
             "This creates a chain showing all proxies."
         )
+    
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_VERIFICATION
+# ═══════════════════════════════════════════════════════════════════════════════
+    def test_set_connection_close(self) -> None:
+        """Test that forwarded requests ask the backend to close."""
+        try:
+            from exercises.ex_8_02_reverse_proxy import set_connection_close
+        except ImportError:
+            self.skipTest("Exercise 2 not implemented yet")
+        
+        original: str = "GET / HTTP/1.1\r\nHost: backend\r\nConnection: keep-alive\r\n\r\n"
+        modified: str = set_connection_close(original)
+        
+        self.assertEqual(
+            modified,
+            "GET / HTTP/1.1\r\nHost: backend\r\nConnection: close\r\n\r\n",
+            "The proxy reads the backend response until EOF, so it must "
+            "replace any Connection header with 'close'."
+        )
 
 
 
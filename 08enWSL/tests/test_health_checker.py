@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Tests for Active Health Checking (Exercise 8.02, Section 4)
+============================================================
+
+Drives HealthChecker with scripted probes and a fake clock (rise/fall
+hysteresis, jitter, slow-start ramp), then kills and revives a real
+backend behind MultiplexProxy while a client sends requests, measuring
+the failed-request window and p99 latency with and without the checker.
+
+Run with: pytest tests/test_health_checker.py -v -s   (-s prints the measurements)
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from apps.backend_server import BackendServer  # noqa: E402
+from exercises.ex_8_02_reverse_proxy import (  # noqa: E402
+    SLOW_START_MIN_WEIGHT,
+    HealthChecker,
+    MultiplexProxy,
+    RoundRobinBalancer,
+    check_backend_health,
+)
+
+A, B, C = ("a", 1), ("b", 2), ("c", 3)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_checker(**kwargs):
+    balancer = RoundRobinBalancer([A, B, C])
+    clock = FakeClock()
+    checker = HealthChecker(balancer, [A, B, C], interval=1.0, rise=2, fall=3,
+                            slow_start=10.0, probe=lambda h, p: True, clock=clock,
+                            seed=1, **kwargs)
+    return balancer, checker, clock
+
+
+def start_backend(backend_id, port=0):
+    server = BackendServer("127.0.0.1", port, backend_id, mode="event", log=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    assert server.ready.wait(10)
+    return server
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WEIGHTED_BALANCER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestWeightedBalancer:
+    """Weights below 1.0 switch to smooth weighted round-robin."""
+
+    def test_unweighted_order_unchanged(self):
+        balancer = RoundRobinBalancer([A, B, C])
+        assert [balancer.next_backend() for _ in range(6)] == [A, B, C, A, B, C]
+
+    def test_weighted_share_is_smooth(self):
+        balancer = RoundRobinBalancer([A, B, C])
+        balancer.set_weight(*C, 0.25)
+        picks = [balancer.next_backend() for _ in range(900)]
+        assert Counter(picks) == {A: 400, B: 400, C: 100}
+        # Never two picks of C in a row
+        assert all(not (x == C and y == C) for x, y in zip(picks, picks[1:]))
+
+    def test_full_weight_restores_plain_rotation(self):
+        balancer = RoundRobinBalancer([A, B])
+        balancer.set_weight(*B, 0.5)
+        balancer.set_weight(*B, 1.0)
+        assert not balancer.weights
+        assert Counter(balancer.next_backend() for _ in range(10)) == {A: 5, B: 5}
+
+    def test_remove_clears_weight(self):
+        balancer = RoundRobinBalancer([A, B])
+        balancer.add_backend(*C, weight=0.2)
+        assert balancer.remove_backend(*C)
+        assert not balancer.weights and not balancer.set_weight(*C, 0.5)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HYSTERESIS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestHysteresis:
+    """rise/fall thresholds decide membership, not single probes."""
+
+    def test_removed_after_fall_failures(self):
+        balancer, checker, _ = make_checker()
+        checker.record(B, False)
+        checker.record(B, False)
+        assert B in balancer.backends
+        checker.record(B, False)
+        assert B not in balancer.backends
+        assert checker.status()[B]["healthy"] is False
+
+    def test_flapping_backend_stays(self):
+        balancer, checker, _ = make_checker()
+        for ok in [False, False, True, False, False, True, False, False]:
+            checker.record(B, ok)
+        assert B in balancer.backends
+
+    def test_returns_after_rise_successes_at_low_weight(self):
+        balancer, checker, _ = make_checker()
+        for _ in range(3):
+            checker.record(B, False)
+        checker.record(B, True)
+        assert B not in balancer.backends
+        checker.record(B, True)
+        assert B in balancer.backends
+        assert balancer.weights[B] == pytest.approx(SLOW_START_MIN_WEIGHT)
+        assert [up for _, backend, up in checker.transitions if backend == B] == [False, True]
+
+    def test_slow_start_ramp(self):
+        balancer, checker, clock = make_checker()
+        for ok in [False] * 3 + [True] * 2:
+            checker.record(B, ok)
+        clock.now += 5.0
+        checker.update_weights()
+        assert balancer.weights[B] == pytest.approx(SLOW_START_MIN_WEIGHT + (1 - SLOW_START_MIN_WEIGHT) / 2)
+        clock.now += 5.0
+        checker.update_weights()
+        assert B not in balancer.weights
+        assert checker.status()[B]["weight"] == 1.0
+
+    def test_no_slow_start(self):
+        balancer, checker, _ = make_checker()
+        checker.slow_start = 0
+        for ok in [False] * 3 + [True] * 2:
+            checker.record(B, ok)
+        assert B in balancer.backends and not balancer.weights
+
+    def test_jittered_schedule(self):
+        _, checker, clock = make_checker(jitter=0.2)
+        due = []
+        for _ in range(50):
+            checker.record(A, True)
+            due.append(checker._health[A].next_due - clock.now)
+        assert all(0.8 <= d <= 1.2 for d in due)
+        assert len(set(due)) > 10
+
+    def test_probe_all_runs_concurrently(self):
+        balancer = RoundRobinBalancer([A, B, C])
+
+        def slow_probe(host, port):
+            time.sleep(0.3)
+            return port != 2
+
+        checker = HealthChecker(balancer, [A, B, C], fall=1, probe=slow_probe)
+        started = time.monotonic()
+        assert checker.probe_all() == {A: True, B: False, C: True}
+        assert time.monotonic() - started < 0.8
+        assert balancer.backends == [A, C]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROBES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestProbes:
+    """check_backend_health against a real backend."""
+
+    def test_tcp_and_http_probes(self):
+        server = start_backend("P")
+        try:
+            host, port = server.address
+            assert check_backend_health(host, port)
+            assert check_backend_health(host, port, path="/health")
+            assert not check_backend_health(host, port, path="/missing")
+        finally:
+            server.shutdown()
+        assert not check_backend_health(host, port, timeout=0.5)
+
+    def test_scheduler_thread_detects_down_and_up(self):
+        server = start_backend("S")
+        backend = server.address
+        balancer = RoundRobinBalancer([backend])
+        checker = HealthChecker(balancer, [backend], interval=0.05, rise=2, fall=2,
+                                slow_start=0, path="/health")
+        checker.start()
+        try:
+            server.shutdown()
+            deadline = time.monotonic() + 5
+            while backend in balancer.backends and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert backend not in balancer.backends
+            server = start_backend("S", port=backend[1])
+            while backend not in balancer.backends and time.monotonic() < deadline + 5:
+                time.sleep(0.02)
+            assert backend in balancer.backends
+        finally:
+            checker.stop()
+            server.shutdown()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FAILOVER_UNDER_LOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))]
+
+
+def run_kill_revive(with_checker: bool, phase: float = 0.8):
+    """Kill backend B for `phase` seconds while a client keeps requesting."""
+    servers = [start_backend(name) for name in "ABC"]
+    addresses = [s.address for s in servers]
+    balancer = RoundRobinBalancer(addresses)
+    proxy = MultiplexProxy("127.0.0.1", 0, balancer, log=False)
+    threading.Thread(target=proxy.serve_forever, daemon=True).start()
+    checker = None
+    if with_checker:
+        checker = HealthChecker(balancer, addresses, interval=0.05, timeout=0.5, rise=2, fall=2,
+                                slow_start=0.3, path="/health")
+        checker.start()
+
+    samples = []   # (time, ok, latency, backend_id)
+    stop = threading.Event()
+
+    def client():
+        sock, buf = None, bytearray()
+        while not stop.is_set():
+            start = time.monotonic()
+            ok, backend_id = False, ""
+            try:
+                if sock is None:
+                    sock = socket.create_connection(proxy.address, timeout=5)
+                    buf.clear()
+                sock.sendall(b"GET /health HTTP/1.1\r\nHost: t\r\n\r\n")
+                while b"\r\n\r\n" not in buf:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        raise ConnectionError
+                    buf += chunk
+                end = buf.index(b"\r\n\r\n") + 4
+                head = bytes(buf[:end]).decode("iso-8859-1")
+                length = int(head.lower().split("content-length:")[1].split("\r\n")[0])
+                while len(buf) < end + length:
+                    buf += sock.recv(65536)
+                del buf[:end + length]
+                ok = head.startswith("HTTP/1.1 200")
+                if "X-Backend-ID:" in head:
+                    backend_id = head.split("X-Backend-ID:")[1].split("\r\n")[0].strip()
+                if not ok or "Connection: close" in head:
+                    sock.close()
+                    sock = None
+            except OSError:
+                if sock is not None:
+                    sock.close()
+                sock = None
+            samples.append((start, ok, time.monotonic() - start, backend_id))
+        if sock is not None:
+            sock.close()
+
+    thread = threading.Thread(target=client)
+    thread.start()
+    try:
+        time.sleep(phase)
+        killed_at = time.monotonic()
+        servers[1].shutdown()
+        time.sleep(phase)
+        revived_at = time.monotonic()
+        servers[1] = start_backend("B", port=addresses[1][1])
+        time.sleep(phase * 1.5)
+    finally:
+        stop.set()
+        thread.join()
+        if checker is not None:
+            checker.stop()
+        proxy.shutdown()
+        for server in servers:
+            server.shutdown()
+
+    failures = [t for t, ok, _, _ in samples if not ok]
+    before = [lat for t, ok, lat, _ in samples if t < killed_at]
+    after = [lat for t, ok, lat, _ in samples if t > revived_at + phase / 2]
+    return {
+        "requests": len(samples),
+        "failed": len(failures),
+        "failed_window_s": (max(failures) - min(failures)) if failures else 0.0,
+        "p99_before_ms": percentile(before, 99) * 1000,
+        "p99_after_ms": percentile(after, 99) * 1000,
+        "b_after_revival": sum(1 for t, ok, _, bid in samples if bid == "B" and t > revived_at),
+        "dead_s": revived_at - killed_at,
+    }
+
+
+class TestFailoverUnderLoad:
+    """A killed and revived backend behind the selectors proxy."""
+
+    def test_health_checker_shrinks_failure_window(self):
+        without = run_kill_revive(with_checker=False)
+        with_hc = run_kill_revive(with_checker=True)
+        print(f"\nwithout health checks: {without}\nwith health checks:    {with_hc}")
+
+        # Without checks roughly every third request fails for the whole outage
+        assert without["failed"] > 0
+        assert without["failed_window_s"] > 0.5 * without["dead_s"]
+        # With checks failures stop once fall probes have failed
+        assert with_hc["failed"] < without["failed"] / 2
+        assert with_hc["failed_window_s"] < 0.5 * with_hc["dead_s"]
+        # The revived backend is taken back into rotation
+        assert with_hc["b_after_revival"] > 0
+        assert with_hc["p99_after_ms"] < 250
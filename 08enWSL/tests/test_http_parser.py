@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Tests for the Incremental HTTP Request Parser
+==============================================
+
+Feeds HttpRequestParser the same request stream split at random points
+(fuzz-style fragmentation) and checks that the parsed requests never
+depend on how the bytes were chunked; also covers pipelining, bodies
+framed by Content-Length and chunked encoding, and every limit.
+
+Run with: pytest tests/test_http_parser.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import random
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from utils.net_utils import (  # noqa: E402
+    HttpParseError,
+    HttpRequestParser,
+    iter_http_requests,
+)
+
+
+def chunked(body: bytes, sizes) -> bytes:
+    out, pos = b"", 0
+    for size in sizes:
+        out += f"{size:x};ext=1\r\n".encode() + body[pos:pos + size] + b"\r\n"
+        pos += size
+    return out + b"0\r\nX-Trailer: yes\r\n\r\n"
+
+
+REQUESTS = [
+    b"GET / HTTP/1.1\r\nHost: lab\r\n\r\n",
+    b"POST /submit HTTP/1.1\r\nHost: lab\r\nContent-Length: 11\r\n\r\nhello world",
+    b"\r\nHEAD /x HTTP/1.0\r\nConnection: keep-alive\r\n\r\n",
+    b"PUT /up HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n" + chunked(b"0123456789" * 30, [1, 99, 200]),
+    b"GET /q?a=1 HTTP/1.1\r\nAccept: a\r\nAccept: b\r\nContent-Length: 0\r\n\r\n",
+    b"DELETE /item/7 HTTP/1.1\r\nHost: lab\r\nX-Big: " + b"v" * 5000 + b"\r\n\r\n",
+]
+EXPECTED = [
+    ("GET", "/", b""),
+    ("POST", "/submit", b"hello world"),
+    ("HEAD", "/x", b""),
+    ("PUT", "/up", b"0123456789" * 30),
+    ("GET", "/q?a=1", b""),
+    ("DELETE", "/item/7", b""),
+]
+STREAM = b"".join(REQUESTS)
+
+
+def feed_all(parser, pieces):
+    out = []
+    for piece in pieces:
+        out.extend(parser.feed(piece))
+    return out
+
+
+def summary(requests):
+    return [(r.method, r.target, r.body) for r in requests]
+
+
+def random_split(data: bytes, rng: random.Random, max_piece: int):
+    pieces, pos = [], 0
+    while pos < len(data):
+        n = rng.randint(1, max_piece)
+        pieces.append(data[pos:pos + n])
+        pos += n
+    return pieces
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FRAGMENTATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestFragmentation:
+    """Results must not depend on where the stream is cut."""
+
+    def test_whole_stream(self):
+        parser = HttpRequestParser()
+        assert summary(parser.feed(STREAM)) == EXPECTED
+        assert not parser.pending
+
+    def test_one_byte_at_a_time(self):
+        parser = HttpRequestParser()
+        assert summary(feed_all(parser, [STREAM[i:i + 1] for i in range(len(STREAM))])) == EXPECTED
+
+    @pytest.mark.parametrize("seed", range(200))
+    def test_random_splits(self, seed):
+        rng = random.Random(seed)
+        pieces = random_split(STREAM, rng, rng.choice([2, 7, 64, 1500]))
+        parser = HttpRequestParser()
+        assert summary(feed_all(parser, pieces)) == EXPECTED
+        assert not parser.pending
+
+    def test_every_two_way_cut(self):
+        for cut in range(1, len(STREAM)):
+            parser = HttpRequestParser()
+            assert summary(feed_all(parser, [STREAM[:cut], STREAM[cut:]])) == EXPECTED, cut
+
+    def test_requests_returned_as_soon_as_complete(self):
+        parser = HttpRequestParser()
+        assert parser.feed(REQUESTS[0][:-1]) == []
+        assert parser.pending
+        assert [r.target for r in parser.feed(REQUESTS[0][-1:] + REQUESTS[1][:5])] == ["/"]
+        assert [r.body for r in parser.feed(REQUESTS[1][5:])] == [b"hello world"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MESSAGE_SEMANTICS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestMessages:
+    """Headers, framing and keep-alive."""
+
+    def test_headers_lowercased_and_repeats_joined(self):
+        (req,) = HttpRequestParser().feed(REQUESTS[4])
+        assert req.headers["accept"] == "a, b"
+        assert req.raw == REQUESTS[4]
+
+    def test_keep_alive_rules(self):
+        reqs = HttpRequestParser().feed(
+            b"GET / HTTP/1.1\r\n\r\n"
+            b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n"
+            b"GET / HTTP/1.0\r\n\r\n"
+            b"GET / HTTP/1.0\r\nConnection: Keep-Alive\r\n\r\n")
+        assert [r.keep_alive for r in reqs] == [True, False, False, True]
+
+    def test_binary_body_untouched(self):
+        body = bytes(range(256)) + b"\r\n\r\n" + bytes(range(256))
+        raw = b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body + REQUESTS[0]
+        reqs = HttpRequestParser().feed(raw)
+        assert reqs[0].body == body and reqs[1].target == "/"
+
+    def test_identical_duplicate_content_length_accepted(self):
+        (req,) = HttpRequestParser().feed(b"POST / HTTP/1.1\r\nContent-Length: 2\r\nContent-Length: 2\r\n\r\nok")
+        assert req.body == b"ok"
+
+    def test_iter_http_requests_over_socket(self):
+        a, b = socket.socketpair()
+        with a, b:
+            def send():
+                for piece in random_split(STREAM, random.Random(1), 50):
+                    a.sendall(piece)
+                a.shutdown(socket.SHUT_WR)
+            threading.Thread(target=send).start()
+            assert summary(iter_http_requests(b, timeout=5)) == EXPECTED
+
+    def test_iter_http_requests_eof_mid_request(self):
+        a, b = socket.socketpair()
+        with a, b:
+            a.sendall(REQUESTS[1][:-3])
+            a.shutdown(socket.SHUT_WR)
+            with pytest.raises(HttpParseError):
+                list(iter_http_requests(b, timeout=5))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ERRORS_AND_LIMITS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestErrorsAndLimits:
+    """Each malformed or oversized input maps to one status code."""
+
+    @pytest.mark.parametrize("raw,status", [
+        (b"GET /\r\n\r\n", 400),
+        (b"GET  / HTTP/1.1\r\n\r\n", 400),
+        (b"G(T / HTTP/1.1\r\n\r\n", 400),
+        (b"GET / HTTP/2.0\r\n\r\n", 505),
+        (b"GET / HTTP/1.1\r\nNoColon\r\n\r\n", 400),
+        (b"GET / HTTP/1.1\r\nHost : a\r\n\r\n", 400),
+        (b"GET / HTTP/1.1\r\nHost\n: a\r\n\r\n", 400),
+        (b"GET\n / HTTP/1.1\r\n\r\n", 400),
+        (b"GET / HTTP/1.1\n\r\n\r\n", 505),
+        (b"GET / HTTP/1.1\r\nA: 1\r\n folded\r\n\r\n", 400),
+        (b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+        (b"POST / HTTP/1.1\r\nContent-Length: 1\r\nContent-Length: 2\r\n\r\n", 400),
+        (b"POST / HTTP/1.1\r\nContent-Length: 3\r\nTransfer-Encoding: chunked\r\n\r\n", 400),
+        (b"POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n", 501),
+        (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n", 400),
+        (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n2\r\nabXX", 400),
+    ])
+    def test_malformed(self, raw, status):
+        with pytest.raises(HttpParseError) as exc:
+            HttpRequestParser().feed(raw)
+        assert exc.value.status == status
+
+    def test_header_bytes_limit_without_terminator(self):
+        parser = HttpRequestParser(max_header_bytes=1024)
+        parser.feed(b"GET / HTTP/1.1\r\nX: " + b"a" * 900)
+        with pytest.raises(HttpParseError) as exc:
+            parser.feed(b"a" * 200)
+        assert exc.value.status == 431
+
+    def test_header_count_limit(self):
+        raw = b"GET / HTTP/1.1\r\n" + b"".join(b"H%d: v\r\n" % i for i in range(11)) + b"\r\n"
+        with pytest.raises(HttpParseError) as exc:
+            HttpRequestParser(max_headers=10).feed(raw)
+        assert exc.value.status == 431
+        assert len(HttpRequestParser(max_headers=11).feed(raw)) == 1
+
+    def test_body_limits(self):
+        with pytest.raises(HttpParseError) as exc:
+            HttpRequestParser(max_body_bytes=10).feed(b"POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n")
+        assert exc.value.status == 413
+        parser = HttpRequestParser(max_body_bytes=10)
+        parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n8\r\n12345678\r\n")
+        with pytest.raises(HttpParseError) as exc:
+            parser.feed(b"8\r\n")
+        assert exc.value.status == 413
+
+    def test_chunk_size_line_limit(self):
+        parser = HttpRequestParser(max_line_bytes=64)
+        with pytest.raises(HttpParseError):
+            parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n1;" + b"e" * 100)
+
+    def test_error_is_sticky(self):
+        parser = HttpRequestParser()
+        with pytest.raises(HttpParseError):
+            parser.feed(b"BAD\r\n\r\n")
+        with pytest.raises(HttpParseError):
+            parser.feed(REQUESTS[0])
+
+    def test_requests_before_error_returned_first(self):
+        parser = HttpRequestParser()
+        assert [r.target for r in parser.feed(REQUESTS[0] + b"BAD\r\n\r\n")] == ["/"]
+        assert parser.error is not None and parser.error.status == 400
+        with pytest.raises(HttpParseError):
+            parser.feed(b"")
+
+    def test_buffer_does_not_keep_consumed_bytes(self):
+        parser = HttpRequestParser()
+        for _ in range(1000):
+            parser.feed(REQUESTS[1])
+        assert len(parser._buf) == 0
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Tests for the Cached Keep-Alive HTTP Server (Exercise 8.01, Section 7)
+======================================================================
+
+Covers the byte-bounded FileCache, Range and ETag handling, and the
+selectors event loop over real loopback connections: keep-alive,
+pipelining, sendfile for large files and connection close rules.
+
+Run with: pytest tests/test_http_server_cache.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import os
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from exercises.ex_8_01_http_server import (  # noqa: E402
+    CACHE_MAX_FILE_BYTES,
+    RANGE_NOT_SATISFIABLE,
+    CachedHTTPServer,
+    FileCache,
+    etag_matches,
+    parse_range,
+)
+
+LARGE = os.urandom(CACHE_MAX_FILE_BYTES + 12345)
+
+
+@pytest.fixture
+def docroot(tmp_path):
+    (tmp_path / "index.html").write_bytes(b"<h1>Week 8</h1>")
+    (tmp_path / "hello.txt").write_bytes(b"0123456789abcdef")
+    (tmp_path / "large.bin").write_bytes(LARGE)
+    return tmp_path
+
+
+@pytest.fixture
+def server(docroot):
+    srv = CachedHTTPServer("127.0.0.1", 0, str(docroot), keepalive_timeout=2.0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    assert not thread.is_alive()
+
+
+def connect(srv):
+    sock = socket.create_connection(srv.address, timeout=5)
+    return sock, bytearray()
+
+
+def get(path, **headers):
+    lines = [f"GET {path} HTTP/1.1", "Host: test"]
+    lines += [f"{k.replace('_', '-')}: {v}" for k, v in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def read_response(sock, buf, head_only=False):
+    """Return (status, headers, body) for the next response on sock."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    lines = bytes(buf[:end]).decode("iso-8859-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    length = 0 if head_only or status == 304 else int(headers.get("content-length", 0))
+    while len(buf) < end + length:
+        chunk = sock.recv(1 << 20)
+        if not chunk:
+            raise ConnectionError("closed mid-body")
+        buf += chunk
+    body = bytes(buf[end:end + length])
+    del buf[:end + length]
+    return status, headers, body
+
+
+def is_closed(sock):
+    sock.settimeout(2)
+    try:
+        return sock.recv(1) == b""
+    except ConnectionResetError:
+        return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FILE_CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestFileCache:
+    """LRU bounded by bytes, validated by size and mtime."""
+
+    def test_second_lookup_hits(self, docroot):
+        cache = FileCache()
+        first = cache.lookup(str(docroot / "hello.txt"))
+        second = cache.lookup(str(docroot / "hello.txt"))
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_modified_file_is_reloaded(self, docroot):
+        cache = FileCache()
+        path = docroot / "hello.txt"
+        old = cache.lookup(str(path))
+        path.write_bytes(b"changed")
+        os.utime(path, ns=(old.mtime_ns + 10**9, old.mtime_ns + 10**9))
+        new = cache.lookup(str(path))
+        assert new.content == b"changed"
+        assert new.etag != old.etag
+        assert cache.current_bytes == len(b"changed")
+
+    def test_byte_bound_evicts_least_recently_used(self, tmp_path):
+        for name in "abc":
+            (tmp_path / name).write_bytes(name.encode() * 400)
+        cache = FileCache(max_bytes=1000)
+        cache.lookup(str(tmp_path / "a"))
+        cache.lookup(str(tmp_path / "b"))
+        cache.lookup(str(tmp_path / "a"))   # b is now least recently used
+        cache.lookup(str(tmp_path / "c"))
+        assert cache.current_bytes == 800
+        cache.lookup(str(tmp_path / "a"))
+        assert cache.hits == 2
+        cache.lookup(str(tmp_path / "b"))
+        assert cache.misses == 4
+
+    def test_large_file_not_cached(self, docroot):
+        cache = FileCache()
+        entry = cache.lookup(str(docroot / "large.bin"))
+        assert entry.content is None and entry.size == len(LARGE)
+        assert len(cache) == 0 and cache.current_bytes == 0
+
+    def test_missing_and_deleted(self, docroot):
+        cache = FileCache()
+        assert cache.lookup(str(docroot / "nope.txt")) is None
+        cache.lookup(str(docroot / "hello.txt"))
+        (docroot / "hello.txt").unlink()
+        assert cache.lookup(str(docroot / "hello.txt")) is None
+        assert cache.current_bytes == 0
+
+
+class TestRangeAndETag:
+    """Header parsing helpers."""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=-100", (900, 1000)),
+        ("bytes=-5000", (0, 1000)),
+        ("bytes=990-5000", (990, 1000)),
+        ("bytes=1000-", RANGE_NOT_SATISFIABLE),
+        ("bytes=-0", RANGE_NOT_SATISFIABLE),
+        ("bytes=5-1", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=a-b", None),
+    ])
+    def test_parse_range(self, value, expected):
+        assert parse_range(value, 1000) == expected
+
+    def test_etag_matches(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"c"', '"b"')
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# EVENT_LOOP_SERVER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestEventLoopServer:
+    """Requests over real loopback connections."""
+
+    def test_keep_alive_serves_many_requests(self, server):
+        sock, buf = connect(server)
+        with sock:
+            for _ in range(5):
+                sock.sendall(get("/hello.txt"))
+                status, headers, body = read_response(sock, buf)
+                assert status == 200 and body == b"0123456789abcdef"
+                assert headers["connection"] == "keep-alive"
+        assert server.cache.misses == 1 and server.cache.hits == 4
+
+    def test_pipelined_requests_answered_in_order(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/hello.txt") + get("/") + get("/missing") + get("/hello.txt", Range="bytes=0-3"))
+            assert read_response(sock, buf)[2] == b"0123456789abcdef"
+            assert read_response(sock, buf)[2] == b"<h1>Week 8</h1>"
+            assert read_response(sock, buf)[0] == 404
+            assert read_response(sock, buf)[2] == b"0123"
+
+    def test_request_split_across_packets(self, server):
+        sock, buf = connect(server)
+        with sock:
+            raw = get("/hello.txt")
+            for i in range(len(raw)):
+                sock.sendall(raw[i:i + 1])
+            assert read_response(sock, buf)[0] == 200
+
+    def test_large_file_via_sendfile(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/large.bin") + get("/hello.txt"))
+            status, headers, body = read_response(sock, buf)
+            assert status == 200 and body == LARGE
+            assert read_response(sock, buf)[2] == b"0123456789abcdef"
+
+    def test_range_on_large_file(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/large.bin", Range="bytes=-1000"))
+            status, headers, body = read_response(sock, buf)
+        assert status == 206
+        assert body == LARGE[-1000:]
+        assert headers["content-range"] == f"bytes {len(LARGE) - 1000}-{len(LARGE) - 1}/{len(LARGE)}"
+
+    def test_unsatisfiable_range(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/hello.txt", Range="bytes=100-"))
+            status, headers, body = read_response(sock, buf)
+        assert status == 416
+        assert headers["content-range"] == "bytes */16"
+
+    def test_if_none_match_returns_304(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/hello.txt"))
+            etag = read_response(sock, buf)[1]["etag"]
+            sock.sendall(get("/hello.txt", If_None_Match=etag) + get("/hello.txt"))
+            status, headers, body = read_response(sock, buf)
+            assert status == 304 and body == b"" and headers["etag"] == etag
+            assert read_response(sock, buf)[2] == b"0123456789abcdef"
+
+    def test_stale_if_range_sends_whole_file(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/hello.txt", Range="bytes=0-3", If_Range='"stale"'))
+            status, _, body = read_response(sock, buf)
+        assert status == 200 and body == b"0123456789abcdef"
+
+    def test_head_has_length_but_no_body(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(b"HEAD /hello.txt HTTP/1.1\r\nHost: t\r\n\r\n" + get("/hello.txt"))
+            status, headers, _ = read_response(sock, buf, head_only=True)
+            assert status == 200 and headers["content-length"] == "16"
+            assert read_response(sock, buf)[2] == b"0123456789abcdef"
+
+    def test_traversal_forbidden(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/../../etc/passwd"))
+            assert read_response(sock, buf)[0] == 403
+
+    def test_connection_close_honoured(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(get("/hello.txt", Connection="close"))
+            assert read_response(sock, buf)[1]["connection"] == "close"
+            assert is_closed(sock)
+
+    def test_http10_closes_by_default(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(b"GET /hello.txt HTTP/1.0\r\n\r\n")
+            assert read_response(sock, buf)[0] == 200
+            assert is_closed(sock)
+
+    def test_malformed_request_closes(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(b"\r\n\r\n")
+            assert read_response(sock, buf)[0] == 400
+            assert is_closed(sock)
+
+    def test_unsupported_method(self, server):
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(b"POST /hello.txt HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc" + get("/hello.txt"))
+            status, headers, _ = read_response(sock, buf)
+            assert status == 405 and headers["allow"] == "GET, HEAD"
+            assert read_response(sock, buf)[0] == 200
+
+    def test_ignored_body_not_buffered(self, server):
+        # The 405 goes out before the body arrives; the body is dropped
+        # as it streams in and the connection stays usable after it
+        size = 32 * 1024 * 1024
+        sock, buf = connect(server)
+        with sock:
+            sock.sendall(b"POST /hello.txt HTTP/1.1\r\nHost: t\r\nContent-Length: %d\r\n\r\n" % size)
+            assert read_response(sock, buf)[0] == 405
+            piece = b"b" * (1024 * 1024)
+            for _ in range(size // len(piece)):
+                sock.sendall(piece)
+            sock.sendall(get("/hello.txt"))
+            assert read_response(sock, buf)[2] == b"0123456789abcdef"
+
+    def test_many_concurrent_clients(self, server):
+        socks = [connect(server) for _ in range(50)]
+        for sock, _ in socks:
+            sock.sendall(get("/"))
+        for sock, buf in socks:
+            assert read_response(sock, buf)[0] == 200
+            sock.close()
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Tests for the Dependency-Free PCAP Helpers
+===========================================
+
+Builds small synthetic captures and checks that CaptureIndex answers
+every query helper the same way as the path-based scan.
+
+Run with: pytest tests/test_pcap_tools.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from anti_ai import pcap_tools  # noqa: E402
+from anti_ai.pcap_tools import (  # noqa: E402
+    CaptureIndex,
+    capture_contains_ascii,
+    capture_mentions_port,
+    count_http_header_values,
+    has_basic_tcp_handshake,
+    iter_tcp_segments,
+)
+
+CLIENT = bytes([10, 0, 0, 1])
+SERVER = bytes([10, 0, 0, 2])
+SYN, SYNACK, ACK, PSHACK, FINACK, RST = 0x02, 0x12, 0x10, 0x18, 0x11, 0x04
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAPTURE_BUILDERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def tcp_frame(src, dst, sport, dport, flags, payload=b"", seq=0):
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, seq, 0, 5 << 4, flags, 65535, 0, 0)
+    ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 40 + len(payload), 0, 0, 64, 6, 0, src, dst)
+    return b"\x00" * 12 + b"\x08\x00" + ip + tcp + payload
+
+
+def c2s(sport, dport, flags, payload=b"", seq=0):
+    return tcp_frame(CLIENT, SERVER, sport, dport, flags, payload, seq)
+
+
+def s2c(sport, dport, flags, payload=b"", seq=0):
+    return tcp_frame(SERVER, CLIENT, dport, sport, flags, payload, seq)
+
+
+def write_pcap(path, frames, endian="<", magic=0xA1B2C3D4, times=None):
+    with path.open("wb") as f:
+        f.write(struct.pack(endian + "IHHiIII", magic, 2, 4, 0, 0, 65535, 1))
+        for i, frame in enumerate(frames):
+            sec, sub = times[i] if times else (1_700_000_000, i)
+            f.write(struct.pack(endian + "IIII", sec, sub, len(frame), len(frame)))
+            f.write(frame)
+    return path
+
+
+def pcapng_block(endian, block_type, body):
+    pad = body + b"\x00" * (-len(body) % 4)
+    total = 12 + len(pad)
+    return struct.pack(endian + "II", block_type, total) + pad + struct.pack(endian + "I", total)
+
+
+def pcapng_shb(endian):
+    return pcapng_block(endian, 0x0A0D0D0A, struct.pack(endian + "IHHq", 0x1A2B3C4D, 1, 0, -1))
+
+
+def pcapng_idb(endian, linktype=1, tsresol=None):
+    body = struct.pack(endian + "HHI", linktype, 0, 65535)
+    if tsresol is not None:
+        body += struct.pack(endian + "HH", 9, 1) + bytes([tsresol]) + b"\x00" * 3
+        body += struct.pack(endian + "HH", 0, 0)
+    return pcapng_block(endian, 0x00000001, body)
+
+
+def pcapng_epb(endian, iface, ticks, frame):
+    body = struct.pack(endian + "IIIII", iface, ticks >> 32, ticks & 0xFFFFFFFF, len(frame), len(frame))
+    return pcapng_block(endian, 0x00000006, body + frame)
+
+
+def http_response(backend):
+    return b"HTTP/1.1 200 OK\r\nX-Backend-ID: " + backend + b"\r\nContent-Length: 2\r\n\r\nok"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def lab_capture(tmp_path):
+    """A handshake on 8123, HTTP with a token, responses from two backends, noise on 443."""
+    request = b"GET / HTTP/1.1\r\nHost: lab\r\nX-Student-Token: abc123\r\n\r\n"
+    frames = [
+        c2s(40000, 443, PSHACK, b"\x17\x03\x03 tls noise"),
+        c2s(40001, 8123, SYN, seq=100),
+        s2c(40001, 8123, SYNACK, seq=500),
+        c2s(40001, 8123, ACK, seq=101),
+        c2s(40001, 8123, PSHACK, request, seq=101),
+        s2c(40001, 8123, PSHACK, http_response(b"1"), seq=501),
+        s2c(40002, 8080, PSHACK, http_response(b"2")),
+        s2c(40003, 8080, PSHACK, http_response(b"2")),
+        c2s(40001, 8123, FINACK, seq=101 + len(request)),
+    ]
+    return write_pcap(tmp_path / "lab.pcap", frames)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INDEX_MATCHES_HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestCaptureIndexMatchesScan:
+    """The index answers exactly as the per-helper scan on the same file."""
+
+    @pytest.mark.parametrize("port", [8123, 8080, 443, 9999])
+    def test_mentions_port(self, lab_capture, port):
+        index = CaptureIndex.build(lab_capture)
+        assert capture_mentions_port(index, port) == capture_mentions_port(lab_capture, port)
+
+    @pytest.mark.parametrize("port", [8123, 8080])
+    def test_handshake(self, lab_capture, port):
+        index = CaptureIndex.build(lab_capture)
+        assert has_basic_tcp_handshake(index, port) == has_basic_tcp_handshake(lab_capture, port)
+
+    @pytest.mark.parametrize("needle,port", [
+        ("abc123", 8123), ("abc123", None), ("abc123", 8080), ("nope", None),
+    ])
+    def test_contains_ascii(self, lab_capture, needle, port):
+        index = CaptureIndex.build(lab_capture, needles=["abc123", "nope"])
+        assert (capture_contains_ascii(index, needle, port=port)
+                == capture_contains_ascii(lab_capture, needle, port=port))
+
+    @pytest.mark.parametrize("name,port", [
+        ("X-Backend-ID", None), ("X-Backend-ID", 8080), ("X-Backend-ID", 8123),
+        ("Host", None), ("Content-Length", 443),
+    ])
+    def test_header_values(self, lab_capture, name, port):
+        index = CaptureIndex.build(lab_capture)
+        assert (count_http_header_values(index, name, port=port)
+                == count_http_header_values(lab_capture, name, port=port))
+
+    def test_header_counts(self, lab_capture):
+        index = CaptureIndex.build(lab_capture)
+        assert count_http_header_values(index, "X-Backend-ID") == {"1": 1, "2": 2}
+
+    def test_unwatched_needle_rescans(self, lab_capture):
+        index = CaptureIndex.build(lab_capture)
+        assert capture_contains_ascii(index, "abc123", port=8123)
+
+    def test_port_counts(self, lab_capture):
+        index = CaptureIndex.build(lab_capture)
+        assert index.segments == 9
+        assert index.port_counts[8123] == 6
+        assert index.port_counts[8080] == 2
+
+
+class TestHandshakePerConnection:
+    """The index needs SYN, SYN-ACK and ACK on the same 4-tuple, in order."""
+
+    def test_pieces_from_different_connections(self, tmp_path):
+        path = write_pcap(tmp_path / "split.pcap", [
+            c2s(40001, 8123, SYN),
+            s2c(40002, 8123, SYNACK),
+            c2s(40003, 8123, ACK),
+        ])
+        assert has_basic_tcp_handshake(path, 8123)
+        assert not has_basic_tcp_handshake(CaptureIndex.build(path), 8123)
+
+    def test_reset_before_ack(self, tmp_path):
+        path = write_pcap(tmp_path / "rst.pcap", [
+            c2s(40001, 8123, SYN),
+            s2c(40001, 8123, SYNACK),
+            c2s(40001, 8123, RST),
+            c2s(40001, 8123, ACK),
+        ])
+        assert not has_basic_tcp_handshake(CaptureIndex.build(path), 8123)
+
+    def test_retransmitted_syn(self, tmp_path):
+        path = write_pcap(tmp_path / "retx.pcap", [
+            c2s(40001, 8123, SYN),
+            c2s(40001, 8123, SYN),
+            s2c(40001, 8123, SYNACK),
+            c2s(40001, 8123, ACK),
+        ])
+        assert has_basic_tcp_handshake(CaptureIndex.build(path), 8123)
+
+    def test_completed_flows_are_released(self, tmp_path):
+        frames = []
+        for sport in range(40000, 40100):
+            frames += [c2s(sport, 8123, SYN), s2c(sport, 8123, SYNACK), c2s(sport, 8123, ACK)]
+        index = CaptureIndex.build(write_pcap(tmp_path / "many.pcap", frames))
+        assert index.has_handshake(8123)
+        assert not index._pending
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CAPTURE_READERS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def segment_summary(path):
+    return [(round(seg.ts, 9), seg.src_port, seg.dst_port, seg.payload) for seg in iter_tcp_segments(path)]
+
+
+FRAMES = [c2s(40001, 8123, SYN), s2c(40001, 8123, SYNACK), c2s(40001, 8123, PSHACK, b"GET / HTTP/1.1\r\n\r\n")]
+
+
+class TestPcapReader:
+    @pytest.mark.parametrize("endian,magic", [("<", 0xA1B2C3D4), (">", 0xA1B2C3D4)])
+    def test_microsecond_byte_orders(self, tmp_path, endian, magic):
+        times = [(1_700_000_000, 250_000), (1_700_000_001, 0), (1_700_000_001, 999_999)]
+        path = write_pcap(tmp_path / "us.pcap", FRAMES, endian=endian, magic=magic, times=times)
+        segs = segment_summary(path)
+        assert [s[0] for s in segs] == [1_700_000_000.25, 1_700_000_001.0, 1_700_000_001.999999]
+        assert segs[2][3] == b"GET / HTTP/1.1\r\n\r\n"
+
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    def test_nanosecond(self, tmp_path, endian):
+        times = [(10, 123_456_789), (10, 5), (11, 0)]
+        path = write_pcap(tmp_path / "ns.pcap", FRAMES, endian=endian, magic=0xA1B23C4D, times=times)
+        assert [s[0] for s in segment_summary(path)] == [10.123456789, 10.000000005, 11.0]
+
+    def test_truncated_record_stops_cleanly(self, tmp_path):
+        path = write_pcap(tmp_path / "cut.pcap", FRAMES)
+        path.write_bytes(path.read_bytes()[:-5])
+        assert len(segment_summary(path)) == 2
+
+    def test_empty_and_header_only(self, tmp_path):
+        empty = tmp_path / "empty.pcap"
+        empty.write_bytes(b"")
+        assert segment_summary(empty) == []
+        assert segment_summary(write_pcap(tmp_path / "hdr.pcap", [])) == []
+
+    def test_chunked_fallback_matches_mmap(self, tmp_path, monkeypatch):
+        frames = [c2s(40000 + i, 8123, PSHACK, bytes([i]) * (i * 37 % 1500)) for i in range(200)]
+        path = write_pcap(tmp_path / "many.pcap", frames)
+        mapped = segment_summary(path)
+
+        def no_mmap(*args, **kwargs):
+            raise OSError("mmap disabled for test")
+
+        monkeypatch.setattr(pcap_tools.mmap, "mmap", no_mmap)
+        monkeypatch.setattr(pcap_tools, "_CHUNK_SIZE", 1000)
+        assert segment_summary(path) == mapped
+        assert len(mapped) == 200
+
+    def test_frames_are_views(self, tmp_path):
+        path = write_pcap(tmp_path / "v.pcap", FRAMES)
+        ts, frame = next(pcap_tools._iter_pcap_packets(path))
+        assert isinstance(frame, memoryview)
+
+
+class TestPcapngReader:
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    def test_multi_interface_resolutions(self, tmp_path, endian):
+        data = (
+            pcapng_shb(endian)
+            + pcapng_idb(endian)                        # 0: Ethernet, microseconds
+            + pcapng_idb(endian, tsresol=9)             # 1: Ethernet, nanoseconds
+            + pcapng_idb(endian, linktype=101)          # 2: raw IP, skipped
+            + pcapng_idb(endian, tsresol=0x80 | 10)     # 3: Ethernet, 2^-10 s ticks
+            + pcapng_epb(endian, 0, 1_700_000_000_500_000, FRAMES[0])
+            + pcapng_epb(endian, 1, 1_700_000_000_000_000_042, FRAMES[1])
+            + pcapng_epb(endian, 2, 0, FRAMES[2][14:])
+            + pcapng_epb(endian, 3, 3 * 1024 + 512, FRAMES[2])
+        )
+        path = tmp_path / "multi.pcapng"
+        path.write_bytes(data)
+        segs = segment_summary(path)
+        assert [s[0] for s in segs] == [1_700_000_000.5, round(1_700_000_000 + 42e-9, 9), 3.5]
+        assert [s[1] for s in segs] == [40001, 8123, 40001]
+
+    def test_new_section_resets_interfaces(self, tmp_path):
+        data = (
+            pcapng_shb("<") + pcapng_idb("<", tsresol=3)
+            + pcapng_epb("<", 0, 1500, FRAMES[0])
+            + pcapng_shb(">") + pcapng_idb(">")
+            + pcapng_epb(">", 0, 2_000_000, FRAMES[1])
+        )
+        path = tmp_path / "sections.pcapng"
+        path.write_bytes(data)
+        assert [s[0] for s in segment_summary(path)] == [1.5, 2.0]
+
+    def test_index_over_pcapng(self, tmp_path):
+        data = pcapng_shb("<") + pcapng_idb("<") + b"".join(
+            pcapng_epb("<", 0, i, f) for i, f in enumerate(FRAMES + [c2s(40001, 8123, ACK)])
+        )
+        path = tmp_path / "hs.pcapng"
+        path.write_bytes(data)
+        assert has_basic_tcp_handshake(CaptureIndex.build(path), 8123)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IPV6
+# ═══════════════════════════════════════════════════════════════════════════════
+
+V6_CLIENT = bytes.fromhex("20010db8000000000000000000000001")
+V6_SERVER = bytes.fromhex("20010db8000000000000000000000002")
+
+
+def tcp6_frame(sport, dport, flags, payload=b"", seq=0, ext=b"", first_next=6, src=V6_CLIENT, dst=V6_SERVER):
+    tcp = struct.pack("!HHIIBBHHH", sport, dport, seq, 0, 5 << 4, flags, 65535, 0, 0) + payload
+    ip = struct.pack("!IHBB16s16s", 6 << 28, len(ext) + len(tcp), first_next, 64, src, dst)
+    return b"\x00" * 12 + b"\x86\xdd" + ip + ext + tcp
+
+
+class TestIPv6:
+    def test_plain(self, tmp_path):
+        path = write_pcap(tmp_path / "v6.pcap", [tcp6_frame(40001, 8123, PSHACK, b"hello")])
+        seg = next(iter_tcp_segments(path))
+        assert (seg.src_ip, seg.dst_ip) == ("2001:db8::1", "2001:db8::2")
+        assert seg.payload == b"hello"
+
+    def test_extension_headers(self, tmp_path):
+        # Hop-by-hop (8 bytes) -> destination options (16 bytes) -> TCP
+        hop = bytes([60, 0]) + b"\x01\x04\x00\x00\x00\x00"
+        dest = bytes([6, 1]) + b"\x01\x0c" + b"\x00" * 12
+        path = write_pcap(tmp_path / "ext.pcap", [tcp6_frame(40001, 8123, PSHACK, b"data", ext=hop + dest, first_next=0)])
+        seg = next(iter_tcp_segments(path))
+        assert (seg.dst_port, seg.payload) == (8123, b"data")
+
+    def test_fragments(self, tmp_path):
+        first = bytes([6, 0]) + struct.pack("!H", 0x0001) + b"\x00\x00\x00\x07"
+        later = bytes([6, 0]) + struct.pack("!H", 0x0010) + b"\x00\x00\x00\x07"
+        path = write_pcap(tmp_path / "frag.pcap", [
+            tcp6_frame(40001, 8123, PSHACK, b"first", ext=first, first_next=44),
+            tcp6_frame(40001, 8123, PSHACK, b"later", ext=later, first_next=44),
+        ])
+        assert [s.payload for s in iter_tcp_segments(path)] == [b"first"]
+
+    def test_handshake_and_headers(self, tmp_path):
+        resp = http_response(b"6")
+        path = write_pcap(tmp_path / "hs6.pcap", [
+            tcp6_frame(40001, 8123, SYN, seq=10),
+            tcp6_frame(8123, 40001, SYNACK, seq=90, src=V6_SERVER, dst=V6_CLIENT),
+            tcp6_frame(40001, 8123, ACK, seq=11),
+            tcp6_frame(8123, 40001, PSHACK, resp, seq=91, src=V6_SERVER, dst=V6_CLIENT),
+        ])
+        index = CaptureIndex.build(path)
+        assert index.has_handshake(8123)
+        assert index.header_values("X-Backend-ID", port=8123) == {"6": 1}
+
+    def test_ethernet_padding_trimmed(self, tmp_path):
+        path = write_pcap(tmp_path / "pad.pcap", [c2s(40001, 8123, ACK) + b"\x00" * 6])
+        assert next(iter_tcp_segments(path)).payload == b""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREAM_REASSEMBLY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def response_segments(data, sizes, seq=1000, sport=40001, dport=8080):
+    """Split data into server-to-client segments of the given sizes."""
+    out, pos = [], 0
+    for size in sizes:
+        out.append(s2c(sport, dport, PSHACK, data[pos:pos + size], seq=(seq + pos) & 0xFFFFFFFF))
+        pos += size
+    if pos < len(data):
+        out.append(s2c(sport, dport, PSHACK, data[pos:], seq=(seq + pos) & 0xFFFFFFFF))
+    return out
+
+
+def backends(path, **kwargs):
+    return count_http_header_values(path, "X-Backend-ID", **kwargs)
+
+
+class TestReassembledHeaders:
+    def test_header_split_across_segments(self, tmp_path):
+        data = http_response(b"7")
+        cut = data.index(b"Backend") + 3
+        path = write_pcap(tmp_path / "split.pcap", response_segments(data, [cut]))
+        assert backends(path) == {"7": 1}
+
+    def test_reordered_segments(self, tmp_path):
+        data = http_response(b"1") + http_response(b"2") + http_response(b"3")
+        segs = response_segments(data, [10] * (len(data) // 10))
+        # The SYN-ACK fixes the stream start; data then arrives odd-first
+        synack = s2c(40001, 8080, SYNACK, seq=999)
+        segs = [synack] + segs[1::2] + segs[0::2]
+        path = write_pcap(tmp_path / "reorder.pcap", segs)
+        assert backends(path) == {"1": 1, "2": 1, "3": 1}
+
+    def test_retransmission_counted_once(self, tmp_path):
+        data = http_response(b"9")
+        segs = response_segments(data, [20, 30])
+        path = write_pcap(tmp_path / "retx.pcap", segs[:2] + [segs[1], segs[0]] + segs[2:])
+        assert backends(path) == {"9": 1}
+
+    def test_overlapping_retransmission(self, tmp_path):
+        data = http_response(b"4")
+        path = write_pcap(tmp_path / "overlap.pcap", [
+            s2c(40001, 8080, PSHACK, data[:30], seq=1000),
+            s2c(40001, 8080, PSHACK, data[20:], seq=1020),
+        ])
+        assert backends(path) == {"4": 1}
+
+    def test_sequence_wraparound(self, tmp_path):
+        data = http_response(b"5")
+        path = write_pcap(tmp_path / "wrap.pcap", response_segments(data, [10, 10], seq=0xFFFFFFF8))
+        assert backends(path) == {"5": 1}
+
+    def test_body_is_not_scanned(self, tmp_path):
+        body = b"\r\nX-Backend-ID: fake\r\n"
+        data = (b"HTTP/1.1 200 OK\r\nX-Backend-ID: 1\r\nContent-Length: "
+                + str(len(body)).encode() + b"\r\n\r\n" + body + http_response(b"2"))
+        path = write_pcap(tmp_path / "body.pcap", response_segments(data, [7, 50]))
+        assert backends(path) == {"1": 1, "2": 1}
+
+    def test_chunked_keep_alive(self, tmp_path):
+        data = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nX-Backend-ID: 1\r\n\r\n"
+                b"4\r\nX-Ba\r\n3;ext\r\nck:\r\n0\r\nTrailer: 1\r\n\r\n" + http_response(b"2"))
+        path = write_pcap(tmp_path / "chunked.pcap", response_segments(data, [60, 5, 5]))
+        assert backends(path) == {"1": 1, "2": 1}
+
+    def test_head_response_has_no_body(self, tmp_path):
+        head_req = b"HEAD / HTTP/1.1\r\nHost: lab\r\n\r\n"
+        get_req = b"GET / HTTP/1.1\r\nHost: lab\r\n\r\n"
+        head_resp = b"HTTP/1.1 200 OK\r\nX-Backend-ID: 1\r\nContent-Length: 500\r\n\r\n"
+        path = write_pcap(tmp_path / "head.pcap", [
+            c2s(40001, 8080, PSHACK, head_req + get_req, seq=1),
+            s2c(40001, 8080, PSHACK, head_resp + http_response(b"2"), seq=1),
+        ])
+        assert backends(path) == {"1": 1, "2": 1}
+
+    def test_interim_response_keeps_request_pairing(self, tmp_path):
+        post_req = b"POST /up HTTP/1.1\r\nExpect: 100-continue\r\nContent-Length: 5\r\n\r\nhello"
+        head_req = b"HEAD / HTTP/1.1\r\nHost: lab\r\n\r\n"
+        responses = (b"HTTP/1.1 100 Continue\r\n\r\n"
+                     b"HTTP/1.1 201 Created\r\nX-Backend-ID: 1\r\nContent-Length: 0\r\n\r\n"
+                     b"HTTP/1.1 200 OK\r\nX-Backend-ID: 3\r\nContent-Length: 500\r\n\r\n"
+                     + http_response(b"2"))
+        path = write_pcap(tmp_path / "continue.pcap", [
+            c2s(40001, 8080, PSHACK, post_req + head_req, seq=1),
+            s2c(40001, 8080, PSHACK, responses, seq=1),
+        ])
+        assert backends(path) == {"1": 1, "3": 1, "2": 1}
+
+    def test_header_name_case_insensitive(self, tmp_path):
+        data = b"HTTP/1.1 200 OK\r\nx-backend-id: 3\r\nContent-Length: 0\r\n\r\n"
+        path = write_pcap(tmp_path / "case.pcap", response_segments(data, []))
+        assert backends(path) == {"3": 1}
+
+    def test_port_filter(self, tmp_path):
+        segs = response_segments(http_response(b"1"), [], dport=8080)
+        segs += response_segments(http_response(b"2"), [], sport=40002, dport=9090)
+        path = write_pcap(tmp_path / "ports.pcap", segs)
+        assert backends(path, port=9090) == {"2": 1}
+
+    def test_non_http_stream_dropped(self, tmp_path):
+        path = write_pcap(tmp_path / "tls.pcap", response_segments(b"\x16\x03\x01" + b"\x00" * 5000, [100]))
+        index = CaptureIndex(path=path)
+        for seg in iter_tcp_segments(path):
+            index.add(seg)
+        assert not index._http
+        assert index.header_values("X-Backend-ID") == {}
+
+
+class TestReassemblerLimits:
+    def collect(self, **limits):
+        from anti_ai.pcap_tools import TcpReassembler
+
+        data, closed = {}, []
+        r = TcpReassembler(lambda k, d: data.setdefault(k, bytearray()).extend(d),
+                           closed.append, **limits)
+        return r, data, closed
+
+    def seg(self, seq, payload=b"", flags=PSHACK, sport=40001):
+        return pcap_tools.TcpSegment(0.0, "10.0.0.2", "10.0.0.1", 8080, sport, flags, seq, payload)
+
+    def test_in_order_and_out_of_order(self):
+        r, data, closed = self.collect()
+        for seq, chunk in [(1, b"ab"), (5, b"ef"), (3, b"cd"), (7, b"gh")]:
+            r.add(self.seg(seq, chunk))
+        assert bytes(next(iter(data.values()))) == b"abcdefgh"
+
+    def test_fin_closes_after_gap_fills(self):
+        r, data, closed = self.collect()
+        r.add(self.seg(1, b"ab"))
+        r.add(self.seg(5, b"ef", flags=FINACK))
+        assert not closed
+        r.add(self.seg(3, b"cd"))
+        assert len(closed) == 1 and len(r) == 0
+        assert bytes(next(iter(data.values()))) == b"abcdef"
+
+    def test_rst_evicts_both_directions(self):
+        r, data, closed = self.collect()
+        r.add(self.seg(1, b"ab"))
+        r.add(pcap_tools.TcpSegment(0.0, "10.0.0.1", "10.0.0.2", 40001, 8080, PSHACK, 1, b"x"))
+        r.add(self.seg(3, flags=RST))
+        assert len(r) == 0 and len(closed) == 2
+
+    def test_out_of_order_budget(self):
+        r, data, closed = self.collect(max_buffer=100)
+        r.add(self.seg(1, b"a"))
+        for i in range(5):
+            r.add(self.seg(1000 + i * 40, b"x" * 40))
+        assert closed  # abandoned instead of buffering past 100 bytes
+        r.add(self.seg(2, b"late"))
+        assert bytes(next(iter(data.values()))) == b"a"
+
+    def test_flow_byte_cap(self):
+        r, data, closed = self.collect(max_flow_bytes=10)
+        r.add(self.seg(1, b"0123456"))
+        r.add(self.seg(8, b"789abc"))
+        r.add(self.seg(14, b"more"))
+        assert bytes(next(iter(data.values()))) == b"0123456789"
+
+    def test_max_flows_evicts_oldest(self):
+        r, data, closed = self.collect(max_flows=10)
+        for sport in range(20):
+            r.add(self.seg(1, b"x", sport=sport))
+        assert len(r) == 10 and r.evicted == 10
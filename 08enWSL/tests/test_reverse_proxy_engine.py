@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Tests for the Multiplexing Reverse Proxy Engine (Exercise 8.02, Section 7)
+==========================================================================
+
+Covers byte-level request rewriting, response framing fed in every
+possible split, and MultiplexProxy in front of real backend_server
+instances: round-robin, keep-alive with pooled backend connections,
+pipelining, stale pooled connections and backend failures.
+
+Run with: pytest tests/test_reverse_proxy_engine.py -v
+
+Course: Computer Networks — ASE, CSIE
+"""
+
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from apps.backend_server import BackendServer  # noqa: E402
+from exercises.ex_8_02_reverse_proxy import (  # noqa: E402
+    MultiplexProxy,
+    ResponseFramer,
+    RoundRobinBalancer,
+    add_proxy_headers,
+    modify_host_header,
+    rewrite_request_head,
+)
+
+
+def start_backend(backend_id, mode="event", **kwargs):
+    server = BackendServer("127.0.0.1", 0, backend_id, mode=mode, log=False, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    assert server.ready.wait(10)
+    return server
+
+
+def start_proxy(backends, **kwargs):
+    proxy = MultiplexProxy("127.0.0.1", 0, RoundRobinBalancer(backends), log=False, **kwargs)
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    return proxy, thread
+
+
+@pytest.fixture
+def backends():
+    servers = [start_backend(name) for name in "AB"]
+    yield servers
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.fixture
+def proxy(backends):
+    px, thread = start_proxy([b.address for b in backends])
+    yield px
+    px.shutdown()
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def get(path, **headers):
+    lines = [f"GET {path} HTTP/1.1", "Host: test"]
+    lines += [f"{k.replace('_', '-')}: {v}" for k, v in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def read_response(sock, buf, head_only=False):
+    """Return (status, headers, body) for the next response on sock."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("closed before headers")
+        buf += chunk
+    end = buf.index(b"\r\n\r\n") + 4
+    lines = bytes(buf[:end]).decode("iso-8859-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    length = 0 if head_only else int(headers.get("content-length", 0))
+    while len(buf) < end + length:
+        buf += sock.recv(65536)
+    body = bytes(buf[end:end + length])
+    del buf[:end + length]
+    return status, headers, body
+
+
+def canned_backend(response: bytes):
+    """One-shot backend: read a request, send `response`, close."""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        with listener:
+            conn, _ = listener.accept()
+            with conn:
+                conn.recv(65536)
+                conn.sendall(response)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[:2]
+
+
+def dropping_backend():
+    """
+    Keep-alive backend that answers the first request on each connection,
+    then reads the next one and closes without a response. Returns its
+    address, the list of request methods it read, and the listener.
+    """
+    listener = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve(conn):
+        with conn:
+            for n in range(2):
+                data = conn.recv(65536)
+                if not data:
+                    return
+                received.append(data.split(b" ", 1)[0])
+                if n == 0:
+                    conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+
+    def accept_loop():
+        with listener:
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except OSError:
+                    return
+                threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return listener.getsockname()[:2], received, listener
+
+
+def headers_of(block: bytes):
+    lines = block.decode("iso-8859-1").split("\r\n")
+    return lines[0], [line for line in lines[1:] if line]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REQUEST_REWRITING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestRewriteRequestHead:
+    """Byte-level rewriting agrees with the string helpers from Section 2."""
+
+    @pytest.mark.parametrize("raw", [
+        "GET / HTTP/1.1\r\nHost: client\r\n\r\n",
+        "GET /a?b=c HTTP/1.1\r\nX-Forwarded-For: 10.0.0.1\r\nAccept: */*\r\n\r\n",
+        "GET / HTTP/1.1\r\nHost: c\r\nX-Real-IP: 6.6.6.6\r\nX-Forwarded-For: 1.1.1.1, 2.2.2.2\r\n\r\n",
+    ])
+    def test_same_headers_as_string_helpers(self, raw):
+        expected = modify_host_header(add_proxy_headers(raw, "192.168.1.100"), "b", 9001)
+        got = rewrite_request_head(raw.encode(), "192.168.1.100", "b", 9001, None)
+        exp_line, exp_headers = headers_of(expected.encode())
+        got_line, got_headers = headers_of(got)
+        assert got_line == exp_line
+        assert sorted(got_headers) == sorted(exp_headers + ["Connection: keep-alive"])
+
+    def test_hop_by_hop_and_framing_replaced(self):
+        raw = (b"POST /u HTTP/1.1\r\nConnection: close\r\nKeep-Alive: 5\r\n"
+               b"Transfer-Encoding: chunked\r\nX-Custom: \xe9t\xe9\r\n\r\n")
+        _, headers = headers_of(rewrite_request_head(raw, "1.2.3.4", "b", 80, 11))
+        assert "Content-Length: 11" in headers
+        assert "Connection: keep-alive" in headers
+        assert not any(h.lower().startswith(("transfer-encoding", "keep-alive", "connection: close"))
+                       for h in headers)
+        # Non-ASCII values are copied byte for byte
+        assert "X-Custom: \xe9t\xe9" in headers
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RESPONSE_FRAMING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CHUNKED = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n"
+           b"5;x=y\r\nhello\r\n6\r\n world\r\n0\r\nTrailer: 1\r\n\r\n")
+LENGTH = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello"
+
+
+def frame(data: bytes, pieces, **kwargs):
+    framer = ResponseFramer(**kwargs)
+    out = bytearray()
+    consumed = 0
+    pos = 0
+    for size in pieces:
+        chunk = data[pos:pos + size]
+        pos += size
+        if framer.done:
+            break
+        consumed += framer.feed(chunk, out)
+    return framer, bytes(out), consumed
+
+
+class TestResponseFramer:
+    """Where a response ends, however the bytes are split."""
+
+    @pytest.mark.parametrize("response", [LENGTH, CHUNKED])
+    def test_every_two_way_split(self, response):
+        trailing = b"HTTP/1.1 200 OK\r\n"
+        data = response + trailing
+        for cut in range(1, len(data)):
+            framer, out, consumed = frame(data, [cut, len(data)])
+            assert framer.done, cut
+            assert consumed == len(response), cut
+            assert framer.backend_keep_alive
+
+    def test_chunked_body_forwarded_unchanged(self):
+        framer, out, _ = frame(CHUNKED, [1] * len(CHUNKED))
+        assert out.endswith(b"5;x=y\r\nhello\r\n6\r\n world\r\n0\r\nTrailer: 1\r\n\r\n")
+
+    def test_connection_header_follows_client(self):
+        _, out, _ = frame(LENGTH, [len(LENGTH)], client_keep_alive=False)
+        assert b"Connection: close" in out
+        framer, out, _ = frame(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 0\r\n\r\n", [99])
+        assert b"Connection: keep-alive" in out and not framer.backend_keep_alive
+
+    def test_until_close(self):
+        framer, out, consumed = frame(b"HTTP/1.0 200 OK\r\n\r\nbody bytes", [100])
+        assert framer.until_close and not framer.done
+        assert out.endswith(b"Connection: close\r\n\r\nbody bytes")
+        assert consumed == len(b"HTTP/1.0 200 OK\r\n\r\nbody bytes")
+
+    @pytest.mark.parametrize("response,kwargs", [
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 500\r\n\r\n", {"head_request": True}),
+        (b"HTTP/1.1 204 No Content\r\n\r\n", {}),
+        (b"HTTP/1.1 304 Not Modified\r\nContent-Length: 9\r\n\r\n", {}),
+    ])
+    def test_no_body_responses(self, response, kwargs):
+        framer, _, consumed = frame(response + b"extra", [len(response) + 5], **kwargs)
+        assert framer.done and consumed == len(response)
+
+    def test_interim_response_passed_through(self):
+        data = b"HTTP/1.1 100 Continue\r\n\r\n" + LENGTH
+        framer, out, consumed = frame(data, [len(data)])
+        assert framer.done and framer.status == 200 and consumed == len(data)
+        assert out.startswith(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK")
+
+    def test_garbage_rejected(self):
+        with pytest.raises(ValueError):
+            ResponseFramer().feed(b"SSH-2.0-OpenSSH\r\n\r\n", bytearray())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestMultiplexProxy:
+    """MultiplexProxy in front of real backends."""
+
+    def test_round_robin_over_one_keep_alive_connection(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            buf = bytearray()
+            seen = []
+            for _ in range(6):
+                sock.sendall(get("/health"))
+                status, headers, body = read_response(sock, buf)
+                assert status == 200 and headers["connection"] == "keep-alive"
+                seen.append(headers["x-backend-id"])
+        assert seen == ["A", "B"] * 3
+
+    def test_backend_connections_are_pooled(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            buf = bytearray()
+            for _ in range(20):
+                sock.sendall(get("/health"))
+                read_response(sock, buf)
+        stats = proxy.stats
+        assert stats["requests"] == 20
+        assert stats["backend_connects"] <= 2 * len(proxy.loops)
+        assert stats["backend_reuses"] >= 20 - 2 * len(proxy.loops)
+
+    def test_pipelined_responses_in_order(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            buf = bytearray()
+            sock.sendall(get("/health") + get("/missing") + b"HEAD / HTTP/1.1\r\n\r\n" + get("/api/status"))
+            assert read_response(sock, buf)[2] == b"OK"
+            assert read_response(sock, buf)[0] == 404
+            assert read_response(sock, buf, head_only=True)[0] == 200
+            assert b"healthy" in read_response(sock, buf)[2]
+
+    def test_forwarded_headers_reach_backend(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            sock.sendall(get("/", X_Forwarded_For="10.9.8.7"))
+            _, _, body = read_response(sock, bytearray())
+        assert b"10.9.8.7, 127.0.0.1" in body
+
+    def test_client_close_honoured(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            sock.sendall(get("/health", Connection="close") + get("/health"))
+            assert read_response(sock, bytearray())[1]["connection"] == "close"
+            sock.settimeout(2)
+            assert sock.recv(1) == b""
+
+    def test_half_closed_client_still_answered(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            sock.sendall(get("/health") + get("/health"))
+            sock.shutdown(socket.SHUT_WR)
+            buf = bytearray()
+            assert read_response(sock, buf)[0] == 200
+            assert read_response(sock, buf)[0] == 200
+
+    def test_malformed_request_400(self, proxy):
+        with socket.create_connection(proxy.address, timeout=5) as sock:
+            sock.sendall(get("/health") + b"BROKEN\r\n\r\n")
+            buf = bytearray()
+            assert read_response(sock, buf)[0] == 200
+            assert read_response(sock, buf)[0] == 400
+
+    def test_close_delimited_and_chunked_backends(self):
+        chunked = canned_backend(CHUNKED)
+        until_close = canned_backend(b"HTTP/1.0 200 OK\r\n\r\nstreamed until close")
+        px, thread = start_proxy([chunked, until_close])
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                sock.sendall(get("/"))
+                buf = bytearray()
+                while not buf.endswith(b"0\r\nTrailer: 1\r\n\r\n"):
+                    buf += sock.recv(65536)
+                assert b"hello\r\n6\r\n world" in buf
+                sock.sendall(get("/"))
+                data = b""
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+            assert data.endswith(b"Connection: close\r\n\r\nstreamed until close")
+        finally:
+            px.shutdown()
+
+    def test_stale_pooled_connection_retried(self):
+        backend = start_backend("S", keepalive_timeout=0.3)
+        px, thread = start_proxy([backend.address])
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                buf = bytearray()
+                sock.sendall(get("/health"))
+                assert read_response(sock, buf)[0] == 200
+                # Backend idle sweep closes the pooled connection
+                time.sleep(1.5)
+                sock.sendall(get("/health"))
+                assert read_response(sock, buf)[0] == 200
+        finally:
+            px.shutdown()
+            backend.shutdown()
+
+    def test_stale_pooled_get_replayed(self):
+        address, received, listener = dropping_backend()
+        px, thread = start_proxy([address], threads=1)
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                buf = bytearray()
+                for _ in range(2):
+                    sock.sendall(get("/"))
+                    assert read_response(sock, buf)[0] == 200
+            assert received == [b"GET", b"GET", b"GET"]
+        finally:
+            px.shutdown()
+            listener.close()
+
+    def test_stale_pooled_post_not_replayed(self):
+        # The backend may have acted on the POST before dropping the connection
+        address, received, listener = dropping_backend()
+        px, thread = start_proxy([address], threads=1)
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                buf = bytearray()
+                sock.sendall(get("/"))
+                assert read_response(sock, buf)[0] == 200
+                sock.sendall(b"POST /order HTTP/1.1\r\nHost: test\r\n"
+                             b"Content-Length: 3\r\n\r\nabc")
+                assert read_response(sock, buf)[0] == 502
+            assert received == [b"GET", b"POST"]
+        finally:
+            px.shutdown()
+            listener.close()
+
+    def test_backend_down_502_and_no_backends_503(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            dead = s.getsockname()[:2]
+        px, thread = start_proxy([dead])
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                sock.sendall(get("/"))
+                assert read_response(sock, bytearray())[0] == 502
+            px.balancer.remove_backend(*dead)
+            with socket.create_connection(px.address, timeout=5) as sock:
+                sock.sendall(get("/"))
+                assert read_response(sock, bytearray())[0] == 503
+        finally:
+            px.shutdown()
+
+    def test_close_per_request_backend(self):
+        backend = start_backend("C", mode="simple")
+        px, thread = start_proxy([backend.address])
+        try:
+            with socket.create_connection(px.address, timeout=5) as sock:
+                buf = bytearray()
+                for _ in range(3):
+                    sock.sendall(get("/health"))
+                    status, headers, _ = read_response(sock, buf)
+                    assert status == 200 and headers["connection"] == "keep-alive"
+            assert px.stats["backend_reuses"] == 0
+        finally:
+            px.shutdown()
+            backend.shutdown()
+
+    def test_many_idle_clients_do_not_block_active_one(self, proxy):
+        idle = [socket.create_connection(proxy.address, timeout=5) for _ in range(300)]
+        try:
+            with socket.create_connection(proxy.address, timeout=5) as sock:
+                sock.sendall(get("/health"))
+                assert read_response(sock, bytearray())[0] == 200
+            deadline = time.monotonic() + 5
+            while proxy.stats["clients"] < 300 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert proxy.stats["clients"] >= 300
+        finally:
+            for sock in idle:
+                sock.close()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Load Balancer Pick-Rate Benchmark — Week 11
+NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
+
+Measures LoadBalancer.pick() calls per second for every algorithm in
+ex_11_02_loadbalancer.py at 10, 100 and 1000 backends. No sockets are
+opened: only the selection logic is timed.
+
+For least_conn, the inc_active/dec_active bookkeeping around each pick is
+included (it is what keeps the heap ordered), and the previous
+sort-per-pick implementation is measured alongside as `least_conn_sort`.
+
+Usage:
+    python scripts/benchmark_lb_algorithms.py
+    python scripts/benchmark_lb_algorithms.py --sizes 10,100 --picks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.exercises.ex_11_02_loadbalancer import Backend, LoadBalancer  # noqa: E402
+from src.utils.net_utils import now_s  # noqa: E402
+
+
+class SortingLeastConnLB(LoadBalancer):
+    """The previous least_conn: filter and sort the whole list per pick."""
+
+    def _pick_least_conn(self, client_ip: str) -> Optional[Backend]:
+        with self._lock:
+            alive = [b for b in self.backends if not b.is_down(now_s())]
+            if not alive:
+                return None
+            alive.sort(key=lambda b: (b.active, b.fails, b.host, b.port))
+            return alive[0]
+
+
+ALGORITHMS = ["rr", "least_conn", "least_conn_sort", "ip_hash",
+              "consistent_hash", "consistent_hash_bounded"]
+
+
+def build_lb(algo: str, size: int) -> LoadBalancer:
+    backends = [Backend(host=f"10.0.{i // 256}.{i % 256}", port=8080) for i in range(size)]
+    cls = SortingLeastConnLB if algo == "least_conn_sort" else LoadBalancer
+    return cls(backends=backends, algo=algo.replace("_sort", ""), passive_failures=1,
+               fail_timeout_s=10.0, sock_timeout=2.0)
+
+
+def measure(algo: str, size: int, picks: int) -> Dict[str, object]:
+    lb = build_lb(algo, size)
+    clients = [f"192.168.{i // 256}.{i % 256}" for i in range(1024)]
+    track_active = algo.startswith("least_conn") or algo == "consistent_hash_bounded"
+    window: List[Backend] = []
+
+    start = time.perf_counter()
+    for i in range(picks):
+        b = lb.pick(clients[i & 1023])
+        if track_active:
+            # Keep ~size/2 connections open so the active counts vary
+            lb.inc_active(b)
+            window.append(b)
+            if len(window) > size // 2:
+                lb.dec_active(window.pop(0))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "algo": algo,
+        "backends": size,
+        "picks": picks,
+        "seconds": round(elapsed, 4),
+        "picks_per_second": round(picks / elapsed, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark load balancer pick rate")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated backend counts")
+    parser.add_argument("--picks", type=int, default=20000, help="Picks per measurement")
+    parser.add_argument("--algos", default=",".join(ALGORITHMS), help="Comma-separated algorithms")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    algos = [a.strip() for a in args.algos.split(",") if a.strip()]
+    results = [measure(a, n, args.picks) for n in sizes for a in algos]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'algo':<25} " + " ".join(f"{n:>12}" for n in sizes))
+    for a in algos:
+        row = [r for r in results if r["algo"] == a]
+        print(f"{a:<25} " + " ".join(f"{r['picks_per_second']:>12,.0f}" for r in row))
+    print("(picks per second at N backends)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Backend Connection Pool Benchmark — Week 11
+NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
+
+Starts three ex_11_01_backend.py processes and one ex_11_02_loadbalancer.py
+proxy on 127.0.0.1, then drives the proxy with the exercise's own
+`loadgen` subcommand. The proxy is run twice: with --pool-size 0 (a new
+backend connection per request, the previous behaviour) and with pooling.
+
+Reported per run: loadgen RPS and latency percentiles, plus the proxy's
+CPU time per request read from /proc/<pid>/stat (Linux only).
+
+Usage:
+    python scripts/benchmark_lb_pool.py
+    python scripts/benchmark_lb_pool.py --n 5000 --c 32 --pools 0,8,32
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+BACKEND = PROJECT_ROOT / "src" / "exercises" / "ex_11_01_backend.py"
+LB = PROJECT_ROOT / "src" / "exercises" / "ex_11_02_loadbalancer.py"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_listening(port: int, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"nothing listening on port {port}")
+
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    """utime + stime of a process, or None where /proc is unavailable."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def measure(pool_size: int, backend_ports: List[int], n: int, c: int) -> Dict[str, float]:
+    lb_port = free_port()
+    lb = subprocess.Popen(
+        [sys.executable, str(LB), "--listen", f"127.0.0.1:{lb_port}",
+         "--backends", ",".join(f"127.0.0.1:{p}" for p in backend_ports),
+         "--pool-size", str(pool_size)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_listening(lb_port)
+        url = f"http://127.0.0.1:{lb_port}/"
+        loadgen = [sys.executable, str(LB), "loadgen", "--url", url, "--c", str(c), "--json"]
+        subprocess.run(loadgen + ["--n", "200"], capture_output=True, check=True)  # warm-up
+        cpu_before = cpu_seconds(lb.pid)
+        out = json.loads(subprocess.run(loadgen + ["--n", str(n)], capture_output=True,
+                                        text=True, check=True).stdout)
+        cpu_after = cpu_seconds(lb.pid)
+    finally:
+        lb.terminate()
+        lb.wait(timeout=5)
+
+    result: Dict[str, float] = {"pool_size": pool_size, "requests": n, "concurrency": c}
+    result["ok"] = out["status_counts"].get("200", 0)
+    result["rps"] = out["rps"]
+    result["p50_ms"] = out["latency_ms"]["p50"]
+    result["p99_ms"] = out["latency_ms"]["p99"]
+    if cpu_before is not None and cpu_after is not None:
+        result["lb_cpu_us_per_request"] = round((cpu_after - cpu_before) / n * 1e6, 1)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark backend connection pooling")
+    parser.add_argument("--n", type=int, default=3000, help="Requests per run")
+    parser.add_argument("--c", type=int, default=16, help="loadgen concurrency")
+    parser.add_argument("--pools", default="0,8", help="Comma-separated --pool-size values")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    ports = [free_port() for _ in range(3)]
+    backends = [
+        subprocess.Popen([sys.executable, str(BACKEND), "--id", str(i + 1),
+                          "--host", "127.0.0.1", "--port", str(p)],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for i, p in enumerate(ports)
+    ]
+    try:
+        for p in ports:
+            wait_listening(p)
+        results = [measure(int(s), ports, args.n, args.c)
+                   for s in args.pools.split(",") if s.strip()]
+    finally:
+        for b in backends:
+            b.terminate()
+            b.wait(timeout=5)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'pool':>5} {'ok':>6} {'rps':>9} {'p50 ms':>8} {'p99 ms':>8} {'LB CPU us/req':>14}")
+    for r in results:
+        print(f"{r['pool_size']:>5} {r['ok']:>6} {r['rps']:>9.1f} {r.get('p50_ms', 0):>8.2f} "
+              f"{r.get('p99_ms', 0):>8.2f} {r.get('lb_cpu_us_per_request', float('nan')):>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
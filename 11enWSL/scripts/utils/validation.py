@@ -98,7 +98,8 @@ def sanitize_user_input(text: str, max_length: int = MAX_INPUT_LENGTH,
 def validate_algorithm(algo: str, valid_algorithms: Optional[List[str]] = None) -> bool:
     """Validate load balancing algorithm name."""
     if valid_algorithms is None:
-        valid_algorithms = ["rr", "least_conn", "ip_hash"]
+        valid_algorithms = ["rr", "least_conn", "ip_hash",
+                            "consistent_hash", "consistent_hash_bounded"]
     return algo in valid_algorithms
 
 
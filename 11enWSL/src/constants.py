@@ -42,8 +42,13 @@ DOCKER_STARTUP_TIMEOUT: Final[float] = 30.0
 ALGORITHM_ROUND_ROBIN: Final[str] = "rr"
 ALGORITHM_LEAST_CONN: Final[str] = "least_conn"
 ALGORITHM_IP_HASH: Final[str] = "ip_hash"
+ALGORITHM_CONSISTENT_HASH: Final[str] = "consistent_hash"
+ALGORITHM_CONSISTENT_HASH_BOUNDED: Final[str] = "consistent_hash_bounded"
 DEFAULT_ALGORITHM: Final[str] = ALGORITHM_ROUND_ROBIN
-VALID_ALGORITHMS: Final[Tuple[str, ...]] = (ALGORITHM_ROUND_ROBIN, ALGORITHM_LEAST_CONN, ALGORITHM_IP_HASH)
+VALID_ALGORITHMS: Final[Tuple[str, ...]] = (
+    ALGORITHM_ROUND_ROBIN, ALGORITHM_LEAST_CONN, ALGORITHM_IP_HASH,
+    ALGORITHM_CONSISTENT_HASH, ALGORITHM_CONSISTENT_HASH_BOUNDED,
+)
 MAX_FAILS_DEFAULT: Final[int] = 1
 
 # DOCKER CONFIGURATION
@@ -84,7 +84,8 @@ def prompt_prediction(question: str) -> None:
 # BUILD_HTTP_RESPONSE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def build_response(backend_id: int, request_count: int) -> bytes:
+def build_response(backend_id: int, request_count: int,
+                   keep_alive: bool = False) -> bytes:
     """
     Build the HTTP response.
     
@@ -97,6 +98,7 @@ def build_response(backend_id: int, request_count: int) -> bytes:
     Args:
         backend_id: Unique identifier for this backend
         request_count: Number of requests processed so far
+        keep_alive: Announce a persistent connection instead of close
         
     Returns:
         Complete HTTP response as bytes
@@ -110,7 +112,7 @@ def build_response(backend_id: int, request_count: int) -> bytes:
     response = (
         b"HTTP/1.1 200 OK\r\n"
         b"Content-Type: text/plain; charset=utf-8\r\n"
-        b"Connection: close\r\n"
+        b"Connection: " + (b"keep-alive" if keep_alive else b"close") + b"\r\n"
         b"X-Backend-ID: " + str(backend_id).encode() + b"\r\n"
         b"X-netENwsl-Week: 11\r\n"
         b"Content-Length: " + str(len(body_bytes)).encode() + b"\r\n"
@@ -145,36 +147,47 @@ def handle_client(client_sock: socket.socket,
         verbose: Enable detailed logging
     """
     try:
-        # ─── READ_REQUEST ───────────────────────────────────────────────
-        request = b""
         client_sock.settimeout(5.0)
-        
-        while True:
-            chunk = client_sock.recv(4096)
-            if not chunk:
-                break
-            request += chunk
-            if b"\r\n\r\n" in request:
+        buffered = b""
+        keep_alive = True
+        while keep_alive:
+            # ─── READ_REQUEST ───────────────────────────────────────────
+            request = buffered
+            while b"\r\n\r\n" not in request:
+                chunk = client_sock.recv(4096)
+                if not chunk:
+                    break
+                request += chunk
+            if b"\r\n\r\n" not in request:
                 break
-        
-        # ─── UPDATE_COUNTER ─────────────────────────────────────────────
-        with threading.Lock():
-            request_counter[0] += 1
-            count = request_counter[0]
-        
-        # ─── SIMULATE_PROCESSING_DELAY ──────────────────────────────────
-        if delay > 0:
-            time.sleep(delay)
-        
-        # ─── SEND_RESPONSE ──────────────────────────────────────────────
-        response = build_response(backend_id, count)
-        client_sock.sendall(response)
-        
-        # ─── LOG_REQUEST ────────────────────────────────────────────────
-        if verbose:
-            method = request.split(b" ", 1)[0].decode("ascii", errors="replace")
-            print(f"[Backend {backend_id}] {client_addr[0]}:{client_addr[1]} - {method} - #{count}")
+            head_end = request.index(b"\r\n\r\n") + 4
+            request, buffered = request[:head_end], request[head_end:]
+
+            # The connection stays open only if the client asks for it
+            # explicitly (the Week 11 load balancer does when pooling)
+            keep_alive = b"connection: keep-alive" in request.lower()
+
+            # ─── UPDATE_COUNTER ─────────────────────────────────────────
+            with threading.Lock():
+                request_counter[0] += 1
+                count = request_counter[0]
+
+            # ─── SIMULATE_PROCESSING_DELAY ──────────────────────────────
+            if delay > 0:
+                time.sleep(delay)
+
+            # ─── SEND_RESPONSE ──────────────────────────────────────────
+            response = build_response(backend_id, count, keep_alive)
+            client_sock.sendall(response)
+
+            # ─── LOG_REQUEST ────────────────────────────────────────────
+            if verbose:
+                method = request.split(b" ", 1)[0].decode("ascii", errors="replace")
+                print(f"[Backend {backend_id}] {client_addr[0]}:{client_addr[1]} - {method} - #{count}")
     
+    except socket.timeout:
+        pass  # idle keep-alive connection
+
     except Exception as e:
         if verbose:
             print(f"[Backend {backend_id}] Error: {e}")
@@ -19,7 +19,9 @@ PAIR PROGRAMMING NOTES:
 
 NOTE:
   - The proxy operates at simplified TCP/HTTP level (for common GET/HEAD)
-  - Does not fully implement HTTP keep-alive/pipelining
+  - Client connections are closed after one response; backend connections
+    are kept alive and pooled (--pool-size 0 opens one per request)
+  - Does not implement pipelining
 
 USAGE (proxy):
   python3 ex_11_02_loadbalancer.py --listen 0.0.0.0:8080 \\
@@ -28,6 +30,8 @@ USAGE (proxy):
 
 USAGE (load generator):
   python3 ex_11_02_loadbalancer.py loadgen --url http://localhost:8080/ --n 200 --c 10
+  python3 ex_11_02_loadbalancer.py loadgen --url http://localhost:8081/ --n 2000 \\
+      --c 10 --keep-alive --rate 500 --json
 
 PREDICTION PROMPTS:
   💭 Before testing rr: If you send 9 requests to 3 backends, how many will each receive?
@@ -38,6 +42,10 @@ ALGORITHMS:
   - rr (round-robin): Rotate through backends sequentially
   - least_conn: Route to backend with fewest active connections
   - ip_hash: Hash client IP for sticky sessions
+  - consistent_hash: Hash ring with virtual nodes; a failed backend only
+    moves its own clients
+  - consistent_hash_bounded: As consistent_hash, but skips backends whose
+    active count exceeds hash_balance × the average load
 
 ═══════════════════════════════════════════════════════════════════════════════
 NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
@@ -56,12 +64,18 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 import argparse
+import bisect
+import hashlib
+import heapq
+import json
+import math
 import socket
 import threading
 import time
 import urllib.parse
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 
 try:
     from src.utils.net_utils import (
@@ -80,6 +94,12 @@ except ImportError:
 # ═══════════════════════════════════════════════════════════════════════════════
 BUFFER_SIZE = 4096
 MAX_RESPONSE_SIZE = 5_000_000
+IDEMPOTENT_METHODS = frozenset({b"GET", b"HEAD", b"OPTIONS", b"PUT", b"DELETE"})
+DEFAULT_VNODES = 100
+DEFAULT_HASH_BALANCE = 1.25
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_IDLE_S = 4.0
+MAX_HEADER_SIZE = 65536
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -97,12 +117,14 @@ class Backend:
         active: Current number of active connections (for least_conn)
         fails: Consecutive failure count
         down_until: Timestamp until which backend is considered down
+        pool: Idle keep-alive connections (None when pooling is off)
     """
     host: str
     port: int
     active: int = 0
     fails: int = 0
     down_until: float = 0.0
+    pool: Optional["BackendPool"] = field(default=None, repr=False, compare=False)
 
     def addr(self) -> Tuple[str, int]:
         """Return (host, port) tuple."""
@@ -113,6 +135,189 @@ class Backend:
         return t < self.down_until
 
 
+class StaleConnectionError(ConnectionError):
+    """A pooled connection was closed by the backend while it sat idle."""
+
+
+class BackendPool:
+    """
+    Idle keep-alive sockets to one backend.
+
+    Sockets are handed out most-recently-used first. Any socket idle for
+    longer than idle_timeout is closed rather than reused, since the
+    backend has probably dropped it already (ex_11_01_backend gives up
+    after 5 s).
+    """
+
+    def __init__(self, backend: Backend, max_idle: int = DEFAULT_POOL_SIZE,
+                 idle_timeout: float = DEFAULT_POOL_IDLE_S):
+        self.backend = backend
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle: Deque[Tuple[socket.socket, float]] = deque()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, timeout: float, fresh: bool = False) -> Tuple[socket.socket, bool]:
+        """Return (socket, reused); fresh=True skips the idle list."""
+        expired: List[socket.socket] = []
+        sock: Optional[socket.socket] = None
+        if not fresh:
+            t = now_s()
+            with self._lock:
+                while self._idle:
+                    candidate, since = self._idle.pop()
+                    if t - since <= self.idle_timeout:
+                        sock = candidate
+                        self.reused += 1
+                        break
+                    expired.append(candidate)
+        for old in expired:
+            _close_socket_safely(old)
+        if sock is not None:
+            sock.settimeout(timeout)
+            return sock, True
+
+        sock = socket.create_connection(self.backend.addr(), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.created += 1
+        return sock, False
+
+    def release(self, sock: socket.socket, reusable: bool) -> None:
+        """Park a socket for reuse, or close it."""
+        if reusable:
+            t = now_s()
+            with self._lock:
+                # Oldest entries sit on the left: evict the expired ones
+                while self._idle and t - self._idle[0][1] > self.idle_timeout:
+                    _close_socket_safely(self._idle.popleft()[0])
+                if len(self._idle) < self.max_idle:
+                    self._idle.append((sock, t))
+                    return
+        _close_socket_safely(sock)
+
+    def close_all(self) -> None:
+        with self._lock:
+            while self._idle:
+                _close_socket_safely(self._idle.pop()[0])
+
+
+def _hash64(key: str) -> int:
+    """Stable 64-bit hash (Python's hash() is randomised per process)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+
+    Each backend owns `vnodes` points on a 64-bit ring; a key belongs to
+    the first point clockwise from its hash. Removing a backend only
+    moves the keys that backend owned, unlike `hash % len(alive)`, which
+    remaps almost every key when the alive count changes.
+    """
+
+    def __init__(self, backends: List[Backend], vnodes: int = DEFAULT_VNODES):
+        points = sorted(
+            (_hash64(f"{b.host}:{b.port}#{v}"), idx)
+            for idx, b in enumerate(backends)
+            for v in range(vnodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [idx for _, idx in points]
+        self._count = len(backends)
+
+    def walk(self, key: str) -> Iterator[int]:
+        """Yield distinct backend indices in ring order starting at key."""
+        n = len(self._hashes)
+        if n == 0:
+            return
+        start = bisect.bisect(self._hashes, _hash64(key))
+        seen = set()
+        for k in range(n):
+            idx = self._owners[(start + k) % n]
+            if idx in seen:
+                continue
+            seen.add(idx)
+            yield idx
+            if len(seen) == self._count:
+                return
+
+
+class BackendHeap:
+    """
+    Indexed binary min-heap of backend indices for least_conn.
+
+    Ordered by (active, fails, host, port), the same key the sort-based
+    version used. `pos` maps a backend index to its heap slot, so a
+    changed backend is re-sifted in O(log n) instead of re-sorting.
+    """
+
+    def __init__(self, backends: List[Backend]):
+        self._backends = backends
+        self._heap = list(range(len(backends)))
+        self._pos = list(range(len(backends)))
+        for i in reversed(range(len(self._heap) // 2)):
+            self._sift_down(i)
+
+    def _key(self, idx: int) -> Tuple[int, int, str, int]:
+        b = self._backends[idx]
+        return (b.active, b.fails, b.host, b.port)
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i]] = i
+        self._pos[heap[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._key(self._heap[i]) >= self._key(self._heap[parent]):
+                return
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        n = len(self._heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._key(self._heap[child]) < self._key(self._heap[smallest]):
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+    def update(self, idx: int) -> None:
+        """Restore heap order after backend idx changed its key."""
+        i = self._pos[idx]
+        self._sift_up(i)
+        self._sift_down(self._pos[idx])
+
+    def pick(self, alive) -> Optional[int]:
+        """Return the smallest index for which alive(index) is true."""
+        if not self._heap:
+            return None
+        top = self._heap[0]
+        if alive(top):
+            return top
+        # Explore the heap in key order, skipping down backends
+        frontier = [(self._key(top), 0)]
+        while frontier:
+            _, i = heapq.heappop(frontier)
+            idx = self._heap[i]
+            if alive(idx):
+                return idx
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._key(self._heap[child]), child))
+        return None
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # LOAD_BALANCER_CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -124,7 +329,9 @@ class LoadBalancer:
     Supports:
     - Round-robin (rr): Cycle through backends sequentially
     - Least connections (least_conn): Route to least busy backend
-    - IP hash (ip_hash): Consistent hashing for session affinity
+    - IP hash (ip_hash): Hash modulo alive count for session affinity
+    - Consistent hash (consistent_hash): Hash ring with virtual nodes
+    - Bounded-load consistent hash (consistent_hash_bounded)
     """
 
     def __init__(self,
@@ -132,24 +339,43 @@ class LoadBalancer:
                  algo: str,
                  passive_failures: int,
                  fail_timeout_s: float,
-                 sock_timeout: float):
+                 sock_timeout: float,
+                 vnodes: int = DEFAULT_VNODES,
+                 hash_balance: float = DEFAULT_HASH_BALANCE,
+                 pool_size: int = 0,
+                 pool_idle_s: float = DEFAULT_POOL_IDLE_S):
         """
         Initialise the load balancer.
 
         Args:
             backends: List of Backend objects
-            algo: Algorithm name ('rr', 'least_conn', 'ip_hash')
+            algo: Algorithm name ('rr', 'least_conn', 'ip_hash',
+                'consistent_hash', 'consistent_hash_bounded')
             passive_failures: Failures before marking backend down
             fail_timeout_s: Seconds to keep backend marked down
             sock_timeout: Socket timeout for backend connections
+            vnodes: Virtual nodes per backend on the hash ring
+            hash_balance: Load factor c for consistent_hash_bounded; a
+                backend is skipped once active >= ceil(c * average load)
+            pool_size: Idle keep-alive connections kept per backend
+                (0 = open a new connection for every request)
+            pool_idle_s: Seconds before an idle pooled connection is dropped
         """
         self.backends = backends
         self.algo = algo
         self.passive_failures = passive_failures
         self.fail_timeout_s = fail_timeout_s
         self.sock_timeout = sock_timeout
+        self.hash_balance = hash_balance
         self._rr_idx = 0
         self._lock = threading.Lock()
+        self._index = {id(b): i for i, b in enumerate(backends)}
+        self._total_active = sum(b.active for b in backends)
+        self._heap = BackendHeap(backends) if algo == "least_conn" else None
+        self._ring = (HashRing(backends, vnodes)
+                      if algo in ("consistent_hash", "consistent_hash_bounded") else None)
+        for b in backends:
+            b.pool = BackendPool(b, pool_size, pool_idle_s) if pool_size > 0 else None
 
     # ─── ALGORITHM: ROUND-ROBIN ─────────────────────────────────────────────
     def _pick_rr(self, client_ip: str) -> Optional[Backend]:
@@ -165,13 +391,11 @@ class LoadBalancer:
 
     # ─── ALGORITHM: LEAST CONNECTIONS ───────────────────────────────────────
     def _pick_least_conn(self, client_ip: str) -> Optional[Backend]:
-        """Select backend with fewest active connections."""
+        """Select backend with fewest active connections (heap top)."""
         with self._lock:
-            alive = [b for b in self.backends if not b.is_down(now_s())]
-            if not alive:
-                return None
-            alive.sort(key=lambda b: (b.active, b.fails, b.host, b.port))
-            return alive[0]
+            t = now_s()
+            idx = self._heap.pick(lambda i: not self.backends[i].is_down(t))
+            return None if idx is None else self.backends[idx]
 
     # ─── ALGORITHM: IP HASH ─────────────────────────────────────────────────
     def _pick_ip_hash(self, client_ip: str) -> Optional[Backend]:
@@ -185,6 +409,44 @@ class LoadBalancer:
                 h = (h * 131 + ord(ch)) & 0xFFFFFFFF
             return alive[h % len(alive)]
 
+    # ─── ALGORITHM: CONSISTENT HASH ─────────────────────────────────────────
+    def _pick_consistent_hash(self, client_ip: str) -> Optional[Backend]:
+        """Select the first alive backend clockwise from the client's hash."""
+        with self._lock:
+            t = now_s()
+            for idx in self._ring.walk(client_ip):
+                b = self.backends[idx]
+                if not b.is_down(t):
+                    return b
+        return None
+
+    def _pick_consistent_hash_bounded(self, client_ip: str) -> Optional[Backend]:
+        """
+        Consistent hashing with bounded loads.
+
+        Walks the ring past backends already holding ceil(c * average)
+        active connections. The average is taken over the alive backends
+        only, so a down backend does not lower the cap for the others. If
+        every alive backend is at the cap, the least-loaded one is used.
+        """
+        with self._lock:
+            t = now_s()
+            alive = [b for b in self.backends if not b.is_down(t)]
+            if not alive:
+                return None
+            active = sum(b.active for b in alive)
+            cap = math.ceil(self.hash_balance * (active + 1) / len(alive))
+            fallback = None
+            for idx in self._ring.walk(client_ip):
+                b = self.backends[idx]
+                if b.is_down(t):
+                    continue
+                if b.active < cap:
+                    return b
+                if fallback is None or b.active < fallback.active:
+                    fallback = b
+            return fallback
+
     # ─── BACKEND SELECTION ──────────────────────────────────────────────────
     def pick(self, client_ip: str) -> Optional[Backend]:
         """Select a backend using the configured algorithm."""
@@ -194,13 +456,23 @@ class LoadBalancer:
             return self._pick_least_conn(client_ip)
         if self.algo == "ip_hash":
             return self._pick_ip_hash(client_ip)
+        if self.algo == "consistent_hash":
+            return self._pick_consistent_hash(client_ip)
+        if self.algo == "consistent_hash_bounded":
+            return self._pick_consistent_hash_bounded(client_ip)
         raise ValueError(f"Unknown algorithm: {self.algo}")
 
+    def _changed(self, b: Backend) -> None:
+        """Re-sift b in the least_conn heap (caller holds the lock)."""
+        if self._heap is not None:
+            self._heap.update(self._index[id(b)])
+
     # ─── HEALTH TRACKING ────────────────────────────────────────────────────
     def mark_success(self, b: Backend) -> None:
         """Mark backend as healthy after successful request."""
         with self._lock:
             b.fails = 0
+            self._changed(b)
 
     def mark_failure(self, b: Backend) -> None:
         """Record backend failure and mark down if threshold reached."""
@@ -208,16 +480,22 @@ class LoadBalancer:
             b.fails += 1
             if self.passive_failures > 0 and b.fails >= self.passive_failures:
                 b.down_until = now_s() + self.fail_timeout_s
+            self._changed(b)
 
     def inc_active(self, b: Backend) -> None:
         """Increment active connection count."""
         with self._lock:
             b.active += 1
+            self._total_active += 1
+            self._changed(b)
 
     def dec_active(self, b: Backend) -> None:
         """Decrement active connection count."""
         with self._lock:
-            b.active = max(0, b.active - 1)
+            if b.active > 0:
+                b.active -= 1
+                self._total_active -= 1
+            self._changed(b)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -267,13 +545,197 @@ def _send_error_response(client_sock: socket.socket,
     client_sock.sendall(response)
 
 
+def _request_method(request_data: bytes) -> bytes:
+    """Return the method token of a raw HTTP request (upper case)."""
+    return request_data.split(b" ", 1)[0].upper()
+
+
+def _keep_alive_request(request_data: bytes, backend: Backend) -> bytes:
+    """Rewrite the client request as HTTP/1.1 with Connection: keep-alive."""
+    head_end = request_data.find(b"\r\n\r\n")
+    if head_end < 0:
+        return request_data
+    lines = request_data[:head_end].split(b"\r\n")
+    method, target = lines[0].split(b" ")[:2]
+    out = [method + b" " + target + b" HTTP/1.1"]
+    has_host = False
+    for line in lines[1:]:
+        name = line.split(b":", 1)[0].strip().lower()
+        if name in (b"connection", b"keep-alive", b"proxy-connection"):
+            continue
+        has_host = has_host or name == b"host"
+        out.append(line)
+    if not has_host:
+        out.append(f"Host: {backend.host}:{backend.port}".encode("ascii"))
+    out.append(b"Connection: keep-alive")
+    return b"\r\n".join(out) + b"\r\n\r\n" + request_data[head_end + 4:]
+
+
+def _recv_more(sock: socket.socket, buf: bytearray) -> None:
+    """Append one recv() to buf; raise ConnectionError on EOF."""
+    chunk = sock.recv(BUFFER_SIZE * 16)
+    if not chunk:
+        raise ConnectionError("backend closed the connection mid-response")
+    buf += chunk
+
+
+def _chunked_body_end(sock: socket.socket, buf: bytearray, pos: int) -> int:
+    """Read a chunked body into buf, walking the chunk framing once; return its end."""
+    total = 0
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        if line_end < 0:
+            _recv_more(sock, buf)
+            continue
+        size = int(bytes(buf[pos:line_end]).split(b";", 1)[0].strip(), 16)
+        # Reject on the declared size, before the chunk is buffered
+        total += size
+        if size < 0 or total > MAX_RESPONSE_SIZE:
+            raise ValueError("response exceeds MAX_RESPONSE_SIZE")
+        if size == 0:
+            # Trailer section ends with an empty line
+            trailer_end = buf.find(b"\r\n\r\n", line_end)
+            while trailer_end < 0:
+                _recv_more(sock, buf)
+                trailer_end = buf.find(b"\r\n\r\n", line_end)
+            return trailer_end + 4
+        pos = line_end + 2 + size + 2
+        while len(buf) < pos:
+            _recv_more(sock, buf)
+
+
+def _read_framed_response(sock: socket.socket, head_only: bool,
+                          reused: bool) -> Tuple[bytes, bool]:
+    """
+    Read exactly one HTTP response; return (response, reusable).
+
+    The body is located by Content-Length (received straight into a
+    preallocated buffer) or by chunked framing, so the socket can carry
+    the next request. Without either, the body runs to EOF and the
+    socket is not reusable. The Connection header is rewritten to close,
+    since the client side is not kept alive. Interim 1xx heads (other
+    than 101) are dropped: the request body has already been sent.
+    """
+    buf = bytearray()
+    scanned = 0
+    interim = False
+    while True:
+        head_end = buf.find(b"\r\n\r\n", scanned)
+        if head_end >= 0:
+            head_lines = bytes(buf[:head_end]).split(b"\r\n")
+            status = int(head_lines[0].split()[1])
+            if not 100 <= status < 200 or status == 101:
+                break
+            del buf[:head_end + 4]
+            scanned = 0
+            interim = True
+            continue
+        scanned = max(0, len(buf) - 3)
+        if len(buf) > MAX_HEADER_SIZE:
+            raise ValueError("response head too large")
+        fresh = reused and not buf and not interim
+        try:
+            chunk = sock.recv(BUFFER_SIZE * 16)
+        except (ConnectionResetError, BrokenPipeError) as e:
+            if fresh:
+                raise StaleConnectionError(str(e)) from e
+            raise
+        if not chunk:
+            if fresh:
+                raise StaleConnectionError("idle connection closed by backend")
+            raise ConnectionError("backend closed the connection mid-response")
+        buf += chunk
+
+    headers = {}
+    out_lines = [head_lines[0]]
+    for line in head_lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        headers[name] = value.strip().lower()
+        if name not in (b"connection", b"keep-alive"):
+            out_lines.append(line)
+    out_lines.append(b"Connection: close")
+    new_head = b"\r\n".join(out_lines) + b"\r\n\r\n"
+    body_start = head_end + 4
+    reusable = headers.get(b"connection") != b"close"
+
+    if head_only or status in (204, 304) or 100 <= status < 200:
+        return new_head, reusable and len(buf) == body_start
+
+    if b"chunked" in headers.get(b"transfer-encoding", b""):
+        end = _chunked_body_end(sock, buf, body_start)
+        return new_head + bytes(buf[body_start:end]), reusable and len(buf) == end
+
+    if b"content-length" in headers:
+        length = int(headers[b"content-length"])
+        if length > MAX_RESPONSE_SIZE:
+            raise ValueError("response exceeds MAX_RESPONSE_SIZE")
+        response = bytearray(len(new_head) + length)
+        response[:len(new_head)] = new_head
+        view = memoryview(response)
+        have = min(length, len(buf) - body_start)
+        pos = len(new_head)
+        view[pos:pos + have] = buf[body_start:body_start + have]
+        pos += have
+        while pos < len(response):
+            n = sock.recv_into(view[pos:])
+            if n == 0:
+                raise ConnectionError("backend closed the connection mid-body")
+            pos += n
+        return bytes(response), reusable and len(buf) - body_start <= length
+
+    # No framing: the body ends when the backend closes
+    while len(buf) - body_start <= MAX_RESPONSE_SIZE:
+        chunk = sock.recv(BUFFER_SIZE * 16)
+        if not chunk:
+            break
+        buf += chunk
+    return new_head + bytes(buf[body_start:]), False
+
+
 def _forward_to_backend(request_data: bytes, backend: Backend,
-                        timeout: float) -> Optional[bytes]:
-    """Forward request to backend and return response."""
+                        timeout: float, fresh: bool = False) -> Optional[bytes]:
+    """
+    Forward request to backend and return response.
+
+    With a pool, the request goes over a kept-alive connection and
+    StaleConnectionError is raised if a reused socket turns out to be
+    dead before any response byte arrives; fresh=True forces a new one.
+    """
+    if backend.pool is None:
+        return _forward_unpooled(request_data, backend, timeout)
+
+    try:
+        sock, reused = backend.pool.acquire(timeout, fresh=fresh)
+    except OSError:
+        return None
+    try:
+        try:
+            sock.sendall(_keep_alive_request(request_data, backend))
+        except (ConnectionResetError, BrokenPipeError) as e:
+            if reused:
+                raise StaleConnectionError(str(e)) from e
+            raise
+        response, reusable = _read_framed_response(
+            sock, head_only=request_data.startswith(b"HEAD "), reused=reused
+        )
+    except StaleConnectionError:
+        _close_socket_safely(sock)
+        raise
+    except (OSError, ValueError, IndexError):
+        _close_socket_safely(sock)
+        return None
+    backend.pool.release(sock, reusable)
+    return response
+
+
+def _forward_unpooled(request_data: bytes, backend: Backend,
+                      timeout: float) -> Optional[bytes]:
+    """One connection per request; the response ends when the backend closes."""
     try:
         with connect_tcp(backend.host, backend.port, timeout=timeout) as be:
             be.sendall(request_data)
-            response = b""
+            response = bytearray()
             while True:
                 chunk = be.recv(BUFFER_SIZE)
                 if not chunk:
@@ -281,7 +743,7 @@ def _forward_to_backend(request_data: bytes, backend: Backend,
                 response += chunk
                 if len(response) > MAX_RESPONSE_SIZE:
                     break
-            return response
+            return bytes(response)
     except Exception:
         return None
 
@@ -321,7 +783,16 @@ def _try_forward_with_retry(client_sock: socket.socket, request_data: bytes,
                             client_ip: str) -> None:
     """Attempt to forward request with one retry on failure."""
     for attempt in (1, 2):
-        response = _forward_to_backend(request_data, backend, lb.sock_timeout)
+        try:
+            response = _forward_to_backend(request_data, backend, lb.sock_timeout)
+        except StaleConnectionError:
+            # Backend closed an idle pooled socket: not a backend failure.
+            # Only idempotent requests are replayed automatically.
+            if _request_method(request_data) not in IDEMPOTENT_METHODS:
+                _send_error_response(client_sock, 502, "Bad Gateway")
+                return
+            response = _forward_to_backend(request_data, backend, lb.sock_timeout,
+                                           fresh=True)
         if response is not None:
             client_sock.sendall(response)
             lb.mark_success(backend)
@@ -351,6 +822,9 @@ def run_proxy(args: argparse.Namespace) -> None:
         passive_failures=args.passive_failures,
         fail_timeout_s=args.fail_timeout,
         sock_timeout=args.sock_timeout,
+        vnodes=args.vnodes,
+        hash_balance=args.hash_balance,
+        pool_size=args.pool_size,
     )
     host, port_s = args.listen.split(":")
     port = int(port_s)
@@ -359,7 +833,8 @@ def run_proxy(args: argparse.Namespace) -> None:
     print(f"[LB] listen {host}:{port} | algo={args.algo} | "
           f"backends={[(b.host, b.port) for b in backends]}")
     print(f"[LB] passive_failures={args.passive_failures} "
-          f"fail_timeout={args.fail_timeout}s sock_timeout={args.sock_timeout}s")
+          f"fail_timeout={args.fail_timeout}s sock_timeout={args.sock_timeout}s "
+          f"pool_size={args.pool_size}")
 
     # ─── ACCEPT_LOOP ────────────────────────────────────────────────────────
     _run_accept_loop(host, port, lb)
@@ -466,53 +941,238 @@ def _consume_response_body(sock: socket.socket) -> None:
             break
 
 
-def run_loadgen(args: argparse.Namespace) -> None:
-    """Run the load generator for benchmarking."""
-    url, n, c, timeout = args.url, args.n, args.c, args.timeout
-    latencies: List[float] = []
-    statuses: Dict[int, int] = {}
-    lock = threading.Lock()
-    counter = {"sent": 0}
-    start = time.time()
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (HDR style) with constant memory.
 
-    def worker():
-        while True:
-            with lock:
-                if counter["sent"] >= n:
-                    return
-                counter["sent"] += 1
-            st, lat = http_get_once(url, timeout=timeout)
-            with lock:
-                latencies.append(lat)
-                statuses[st] = statuses.get(st, 0) + 1
+    Values are recorded in microseconds. Below 2 * SUB_BUCKETS every
+    microsecond has its own bucket; above that each power of two is split
+    into SUB_BUCKETS linear buckets, so any reported value is within
+    1/SUB_BUCKETS (~1.6%) of the true one. Histograms of the same shape
+    can be merged, which lets every loadgen worker keep its own.
+    """
+
+    SUB_BUCKETS = 64
+    MAX_US = 1 << 36  # ~19 hours; larger values are clamped
+
+    def __init__(self) -> None:
+        self.counts = [0] * (self._index(self.MAX_US) + 1)
+        self.total = 0
+        self.min_us = 0
+        self.max_us = 0
+        self.sum_us = 0
+
+    @classmethod
+    def _index(cls, v: int) -> int:
+        sub = cls.SUB_BUCKETS
+        if v < 2 * sub:
+            return v
+        shift = v.bit_length() - sub.bit_length()
+        return sub * (shift + 1) + (v >> shift) - sub
+
+    @classmethod
+    def _value(cls, idx: int) -> int:
+        """Midpoint of bucket idx in microseconds."""
+        sub = cls.SUB_BUCKETS
+        if idx < 2 * sub:
+            return idx
+        shift = idx // sub - 1
+        low = (idx % sub + sub) << shift
+        return low + (1 << shift) // 2
+
+    def record(self, seconds: float) -> None:
+        v = min(max(int(seconds * 1e6), 0), self.MAX_US)
+        self.counts[self._index(v)] += 1
+        if self.total == 0 or v < self.min_us:
+            self.min_us = v
+        if v > self.max_us:
+            self.max_us = v
+        self.total += 1
+        self.sum_us += v
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.total == 0:
+            return
+        for i, n in enumerate(other.counts):
+            if n:
+                self.counts[i] += n
+        self.min_us = other.min_us if self.total == 0 else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.total += other.total
+        self.sum_us += other.sum_us
+
+    def percentile(self, p: float) -> float:
+        """Latency in seconds at percentile p (0-100)."""
+        if self.total == 0:
+            return 0.0
+        rank = max(1, math.ceil(p / 100.0 * self.total))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(max(self._value(i), self.min_us), self.max_us) / 1e6
+        return self.max_us / 1e6
+
+    def summary_ms(self) -> Dict[str, float]:
+        out = {f"p{str(p).replace('.0', '')}": round(self.percentile(p) * 1000, 3)
+               for p in (50.0, 90.0, 95.0, 99.0, 99.9)}
+        out["min"] = round(self.min_us / 1000, 3)
+        out["max"] = round(self.max_us / 1000, 3)
+        out["mean"] = round(self.sum_us / self.total / 1000, 3) if self.total else 0.0
+        return out
+
+
+class KeepAliveClient:
+    """One persistent HTTP/1.1 connection, reopened when the server closes it."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.sock: Optional[socket.socket] = None
+        self.connections = 0
+
+    def get(self, path: str) -> int:
+        """Send GET path and return the status code (0 on failure)."""
+        req = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            f"User-Agent: s11-loadgen/0.1\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        ).encode("ascii", errors="replace")
+        for _ in range(2):
+            reused = self.sock is not None
+            try:
+                if self.sock is None:
+                    self.sock = socket.create_connection((self.host, self.port),
+                                                         timeout=self.timeout)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self.connections += 1
+                self.sock.sendall(req)
+                response, reusable = _read_framed_response(self.sock, False, reused)
+            except socket.timeout:
+                self.close()
+                return 0
+            except OSError:
+                # A reused socket the server already closed: reconnect once
+                self.close()
+                if reused:
+                    continue
+                return 0
+            except (ValueError, IndexError):
+                self.close()
+                return 0
+            if not reusable:
+                self.close()
+            return _parse_status_code(response)
+        return 0
+
+    def close(self) -> None:
+        if self.sock is not None:
+            _close_socket_safely(self.sock)
+            self.sock = None
+
+
+def run_loadgen(args: argparse.Namespace) -> Dict[str, object]:
+    """
+    Run the load generator for benchmarking.
 
-    threads = [threading.Thread(target=worker) for _ in range(c)]
+    Closed loop (default): c workers send back-to-back requests.
+    Open loop (--rate R): request i is due at start + i/R and its latency
+    is measured from that due time, so a stalled server is charged for
+    the requests that queued behind it (no coordinated omission).
+    """
+    url, n, c, timeout = args.url, args.n, args.c, args.timeout
+    keep_alive = getattr(args, "keep_alive", False)
+    rate = getattr(args, "rate", 0.0) or 0.0
+    u = urllib.parse.urlparse(url)
+    host = u.hostname or "127.0.0.1"
+    port = u.port or 80
+    path = (u.path or "/") + ("?" + u.query if u.query else "")
+
+    hists = [LatencyHistogram() for _ in range(c)]
+    statuses: List[Dict[int, int]] = [{} for _ in range(c)]
+    connections = [0] * c
+    claim = iter(range(n))
+    claim_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def worker(w: int) -> None:
+        client = KeepAliveClient(host, port, timeout) if keep_alive else None
+        hist, counts = hists[w], statuses[w]
+        while True:
+            with claim_lock:
+                i = next(claim, None)
+            if i is None:
+                break
+            if rate > 0:
+                t0 = start + i / rate
+                delay = t0 - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                t0 = time.perf_counter()
+            if client is not None:
+                st = client.get(path)
+            else:
+                try:
+                    st, _ = _execute_http_get(host, port, path, timeout)
+                except OSError:
+                    st = 0
+                connections[w] += 1
+            hist.record(time.perf_counter() - t0)
+            counts[st] = counts.get(st, 0) + 1
+        if client is not None:
+            client.close()
+            connections[w] = client.connections
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(c)]
     for t in threads:
         t.start()
     for t in threads:
         t.join()
-
-    _display_loadgen_results(url, n, c, time.time() - start, latencies, statuses)
-
-
-def _display_loadgen_results(url: str, n: int, c: int, dur: float,
-                             latencies: List[float],
-                             statuses: Dict[int, int]) -> None:
+    dur = time.perf_counter() - start
+
+    hist = LatencyHistogram()
+    for h in hists:
+        hist.merge(h)
+    merged: Dict[int, int] = {}
+    for counts in statuses:
+        for st, k in counts.items():
+            merged[st] = merged.get(st, 0) + k
+
+    result: Dict[str, object] = {
+        "url": url,
+        "mode": "open" if rate > 0 else "closed",
+        "keep_alive": keep_alive,
+        "requests": n,
+        "concurrency": c,
+        "target_rps": rate or None,
+        "duration_s": round(dur, 3),
+        "rps": round(n / dur, 2) if dur > 0 else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(merged.items())},
+        "errors": sum(v for k, v in merged.items() if not 200 <= k < 400),
+        "connections": sum(connections),
+        "latency_ms": hist.summary_ms(),
+    }
+    if getattr(args, "json", False):
+        print(json.dumps(result, indent=2))
+    else:
+        _display_loadgen_results(result)
+    return result
+
+
+def _display_loadgen_results(result: Dict[str, object]) -> None:
     """Display load generator results."""
-    latencies_sorted = sorted(latencies)
-
-    def pct(p: float) -> float:
-        if not latencies_sorted:
-            return 0.0
-        idx = int((p / 100.0) * (len(latencies_sorted) - 1))
-        return latencies_sorted[idx]
-
-    rps = (n / dur) if dur > 0 else 0.0
-    print(f"[loadgen] url={url}")
-    print(f"[loadgen] n={n} c={c} duration={dur:.3f}s rps={rps:.2f}")
-    print(f"[loadgen] status_counts={dict(sorted(statuses.items()))}")
-    print(f"[loadgen] latency_s: p50={pct(50):.4f} p90={pct(90):.4f} "
-          f"p95={pct(95):.4f} p99={pct(99):.4f}")
+    lat = result["latency_ms"]
+    mode = result["mode"] + (" keep-alive" if result["keep_alive"] else "")
+    print(f"[loadgen] url={result['url']} mode={mode}")
+    print(f"[loadgen] n={result['requests']} c={result['concurrency']} "
+          f"duration={result['duration_s']:.3f}s rps={result['rps']:.2f} "
+          f"connections={result['connections']}")
+    statuses = {int(k): v for k, v in result["status_counts"].items()}
+    print(f"[loadgen] status_counts={statuses} errors={result['errors']}")
+    print(f"[loadgen] latency_ms: p50={lat['p50']:.3f} p90={lat['p90']:.3f} "
+          f"p95={lat['p95']:.3f} p99={lat['p99']:.3f} p99.9={lat['p99.9']:.3f} "
+          f"max={lat['max']:.3f}")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -532,8 +1192,14 @@ Examples:
   # Start with IP hash for sticky sessions
   %(prog)s --backends localhost:8081,localhost:8082,localhost:8083 --algo ip_hash
 
+  # Sticky sessions that survive a backend failure
+  %(prog)s --backends localhost:8081,localhost:8082,localhost:8083 --algo consistent_hash
+
   # Run load generator
   %(prog)s loadgen --url http://localhost:8080/ --n 500 --c 20
+
+  # Keep-alive, 500 requests/s open loop, JSON summary
+  %(prog)s loadgen --url http://localhost:8081/ --n 5000 --c 20 --keep-alive --rate 500 --json
         """
     )
     sub = p.add_subparsers(dest="cmd")
@@ -542,20 +1208,33 @@ Examples:
     p.add_argument("--backends", type=str,
                    default="localhost:8081,localhost:8082,localhost:8083",
                    help="Comma-separated backend list (host:port)")
-    p.add_argument("--algo", type=str, choices=["rr", "least_conn", "ip_hash"],
+    p.add_argument("--algo", type=str,
+                   choices=["rr", "least_conn", "ip_hash",
+                            "consistent_hash", "consistent_hash_bounded"],
                    default="rr", help="Load balancing algorithm")
+    p.add_argument("--vnodes", type=int, default=DEFAULT_VNODES,
+                   help="Virtual nodes per backend for consistent_hash*")
+    p.add_argument("--hash-balance", type=float, default=DEFAULT_HASH_BALANCE,
+                   help="Load factor for consistent_hash_bounded (default: 1.25)")
     p.add_argument("--passive-failures", type=int, default=1,
                    help="Failures before marking backend down")
     p.add_argument("--fail-timeout", type=float, default=10.0,
                    help="Seconds to keep backend marked down")
     p.add_argument("--sock-timeout", type=float, default=2.5,
                    help="Socket timeout for backend connections")
+    p.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                   help="Idle keep-alive connections per backend (0 = no pooling)")
 
     p_lg = sub.add_parser("loadgen", help="Run load generator")
     p_lg.add_argument("--url", type=str, required=True, help="Target URL")
     p_lg.add_argument("--n", type=int, default=200, help="Number of requests")
     p_lg.add_argument("--c", type=int, default=10, help="Concurrency level")
     p_lg.add_argument("--timeout", type=float, default=2.5, help="Request timeout")
+    p_lg.add_argument("--keep-alive", action="store_true",
+                      help="Reuse one connection per worker")
+    p_lg.add_argument("--rate", type=float, default=0.0,
+                      help="Open loop: total requests per second (0 = closed loop)")
+    p_lg.add_argument("--json", action="store_true", help="Print results as JSON")
 
     return p
 
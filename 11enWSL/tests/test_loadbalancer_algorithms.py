@@ -6,11 +6,14 @@ NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
 Tests cover:
 - Round-robin distribution
 - IP hash consistency
-- Least connections selection
+- Least connections selection (indexed heap)
+- Consistent hashing: key remapping when a backend is removed
+- Bounded-load consistent hashing
 - Passive health check behaviour
 """
 from __future__ import annotations
 
+import random
 import sys
 import unittest
 from pathlib import Path
@@ -73,6 +76,134 @@ class TestIPHash(unittest.TestCase):
             self.assertEqual(b.port, first.port)
 
 
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestLeastConnHeap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backends = create_test_backends(5)
+        self.lb = create_test_lb(self.backends, algo="least_conn")
+
+    def _reference(self):
+        alive = [b for b in self.backends if b.down_until == 0.0]
+        return min(alive, key=lambda b: (b.active, b.fails, b.host, b.port)) if alive else None
+
+    def test_picks_least_active(self) -> None:
+        for b, n in zip(self.backends, (3, 1, 4, 0, 2)):
+            for _ in range(n):
+                self.lb.inc_active(b)
+        self.assertEqual(self.lb.pick("10.0.0.1").port, 8084)
+        self.lb.inc_active(self.backends[3])
+        self.lb.inc_active(self.backends[3])
+        self.assertEqual(self.lb.pick("10.0.0.1").port, 8082)
+
+    def test_skips_down_backends(self) -> None:
+        self.backends[0].down_until = float("inf")
+        self.assertEqual(self.lb.pick("10.0.0.1").port, 8082)
+
+    def test_matches_sort_based_reference(self) -> None:
+        rng = random.Random(11)
+        for _ in range(2000):
+            b = rng.choice(self.backends)
+            op = rng.random()
+            if op < 0.45:
+                self.lb.inc_active(b)
+            elif op < 0.9:
+                self.lb.dec_active(b)
+            elif op < 0.95:
+                self.lb.mark_failure(b)
+                b.down_until = 0.0
+            else:
+                self.lb.mark_success(b)
+            self.assertIs(self.lb.pick("10.0.0.1"), self._reference())
+
+
+def _key_map(lb, keys: List[str]) -> dict:
+    return {k: lb.pick(k).port for k in keys}
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestConsistentHash(unittest.TestCase):
+    KEYS = [f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}" for i in range(10000)]
+
+    def _remapped_after_removal(self, algo: str, count: int = 10) -> float:
+        backends = create_test_backends(count)
+        lb = create_test_lb(backends, algo=algo)
+        before = _key_map(lb, self.KEYS)
+        backends[3].down_until = float("inf")
+        after = _key_map(lb, self.KEYS)
+        moved = [k for k in self.KEYS if before[k] != after[k]]
+        # Keys that were not on the removed backend must never move
+        if algo == "consistent_hash":
+            self.assertTrue(all(before[k] == backends[3].port for k in moved))
+        return len(moved) / len(self.KEYS)
+
+    def test_same_ip_same_backend(self) -> None:
+        lb = create_test_lb(create_test_backends(3), algo="consistent_hash")
+        first = lb.pick("192.168.1.50")
+        for _ in range(10):
+            self.assertIs(lb.pick("192.168.1.50"), first)
+
+    def test_removal_remaps_about_one_nth(self) -> None:
+        moved = self._remapped_after_removal("consistent_hash")
+        self.assertGreater(moved, 0.03)
+        self.assertLess(moved, 0.2)
+
+    def test_modulo_hash_remaps_most_keys(self) -> None:
+        self.assertGreater(self._remapped_after_removal("ip_hash"), 0.5)
+
+    def test_spread_is_reasonably_even(self) -> None:
+        lb = create_test_lb(create_test_backends(10), algo="consistent_hash")
+        counts: dict = {}
+        for port in _key_map(lb, self.KEYS).values():
+            counts[port] = counts.get(port, 0) + 1
+        self.assertEqual(len(counts), 10)
+        self.assertLess(max(counts.values()), 2 * len(self.KEYS) / 10)
+
+    def test_all_down_returns_none(self) -> None:
+        backends = create_test_backends(3)
+        lb = create_test_lb(backends, algo="consistent_hash")
+        for b in backends:
+            b.down_until = float("inf")
+        self.assertIsNone(lb.pick("10.0.0.1"))
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestBoundedConsistentHash(unittest.TestCase):
+    def test_no_backend_exceeds_capacity(self) -> None:
+        backends = create_test_backends(4)
+        lb = create_test_lb(backends, algo="consistent_hash_bounded")
+        # Every client hashes to the same key: plain consistent hashing
+        # would pile all 40 connections on one backend.
+        for _ in range(40):
+            lb.inc_active(lb.pick("203.0.113.7"))
+        self.assertLessEqual(max(b.active for b in backends), 13)
+        self.assertEqual(sum(b.active for b in backends), 40)
+
+    def test_down_backend_does_not_lower_capacity(self) -> None:
+        backends = create_test_backends(3)
+        lb = create_test_lb(backends, algo="consistent_hash_bounded")
+        backends[1].down_until = float("inf")
+        for _ in range(30):
+            b = lb.pick("203.0.113.7")
+            self.assertIsNotNone(b)
+            self.assertIsNot(b, backends[1])
+            lb.inc_active(b)
+        self.assertEqual(backends[0].active + backends[2].active, 30)
+        self.assertLessEqual(max(backends[0].active, backends[2].active), 19)
+
+    def test_falls_back_to_least_loaded_when_all_full(self) -> None:
+        backends = create_test_backends(3)
+        lb = create_test_lb(backends, algo="consistent_hash_bounded")
+        lb.hash_balance = 0.5
+        backends[0].active, backends[1].active, backends[2].active = 5, 3, 4
+        self.assertIs(lb.pick("203.0.113.7"), backends[1])
+
+    def test_sticky_when_unloaded(self) -> None:
+        lb = create_test_lb(create_test_backends(4), algo="consistent_hash_bounded")
+        plain = create_test_lb(create_test_backends(4), algo="consistent_hash")
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            self.assertEqual(lb.pick(ip).port, plain.pick(ip).port)
+
+
 @unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
 class TestPassiveHealthChecks(unittest.TestCase):
     def setUp(self) -> None:
@@ -107,6 +238,9 @@ def main() -> None:
     suite = unittest.TestSuite()
     suite.addTests(loader.loadTestsFromTestCase(TestRoundRobin))
     suite.addTests(loader.loadTestsFromTestCase(TestIPHash))
+    suite.addTests(loader.loadTestsFromTestCase(TestLeastConnHeap))
+    suite.addTests(loader.loadTestsFromTestCase(TestConsistentHash))
+    suite.addTests(loader.loadTestsFromTestCase(TestBoundedConsistentHash))
     suite.addTests(loader.loadTestsFromTestCase(TestPassiveHealthChecks))
     suite.addTests(loader.loadTestsFromTestCase(TestParseBackends))
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Backend Connection Pooling — Week 11
+NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
+
+Tests cover:
+- Keep-alive reuse of backend connections
+- Response framing: Content-Length, chunked, HEAD, close-delimited
+- Idle eviction
+- Response size limit for chunked bodies
+- Retry on a fresh connection after the backend drops a pooled one
+  (idempotent methods only)
+"""
+from __future__ import annotations
+
+import socket
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Callable, List, Tuple
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import src.exercises.ex_11_02_loadbalancer as lb_module
+    from src.exercises.ex_11_02_loadbalancer import (
+        Backend, LoadBalancer, _forward_to_backend, _try_forward_with_retry
+    )
+    LB_AVAILABLE = True
+except ImportError:
+    LB_AVAILABLE = False
+
+
+REQUEST = b"GET / HTTP/1.0\r\nHost: lb\r\n\r\n"
+
+
+def body_response(body: bytes, keep_alive: bool = True) -> bytes:
+    conn = b"keep-alive" if keep_alive else b"close"
+    return (b"HTTP/1.1 200 OK\r\nContent-Length: " + str(len(body)).encode()
+            + b"\r\nConnection: " + conn + b"\r\n\r\n" + body)
+
+
+class StubBackend:
+    """
+    Socket-level backend: answers each request on a connection with
+    respond(request, n), where n counts requests on that connection.
+    Returning None closes the connection without answering; a list of
+    byte strings is sent as separate writes, 50 ms apart.
+    """
+
+    def __init__(self, respond: Callable[[bytes, int], bytes],
+                 max_per_conn: int = 1000):
+        self.respond = respond
+        self.max_per_conn = max_per_conn
+        self.accepted = 0
+        self.requests: List[bytes] = []
+        self.srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.srv.bind(("127.0.0.1", 0))
+        self.srv.listen(16)
+        self.port = self.srv.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self.srv.accept()
+            except OSError:
+                return
+            self.accepted += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        buf = b""
+        with conn:
+            for n in range(self.max_per_conn):
+                while b"\r\n\r\n" not in buf:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        return
+                    buf += chunk
+                end = buf.index(b"\r\n\r\n") + 4
+                request, buf = buf[:end], buf[end:]
+                self.requests.append(request)
+                reply = self.respond(request, n)
+                if reply is None:
+                    return
+                if isinstance(reply, list):
+                    for part in reply[:-1]:
+                        conn.sendall(part)
+                        time.sleep(0.05)
+                    reply = reply[-1]
+                conn.sendall(reply)
+
+    def backend(self) -> "Backend":
+        return Backend(host="127.0.0.1", port=self.port)
+
+    def close(self) -> None:
+        self.srv.close()
+
+
+def pooled(backends: List, pool_size: int = 4, idle_s: float = 4.0) -> "LoadBalancer":
+    return LoadBalancer(backends=backends, algo="rr", passive_failures=1,
+                        fail_timeout_s=10.0, sock_timeout=2.0,
+                        pool_size=pool_size, pool_idle_s=idle_s)
+
+
+def client_pair() -> Tuple[socket.socket, socket.socket]:
+    a, b = socket.socketpair()
+    b.settimeout(2.0)
+    return a, b
+
+
+def read_all(sock: socket.socket) -> bytes:
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestPoolReuse(unittest.TestCase):
+    def test_reuses_one_connection(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"r%d" % n))
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for i in range(5):
+            resp = _forward_to_backend(REQUEST, b, 2.0)
+            self.assertTrue(resp.endswith(b"r%d" % i))
+        self.assertEqual(stub.accepted, 1)
+        self.assertEqual(b.pool.reused, 4)
+
+    def test_request_upgraded_to_keep_alive(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok"))
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        _forward_to_backend(b"GET /x HTTP/1.0\r\nConnection: close\r\n\r\n", b, 2.0)
+        sent = stub.requests[0]
+        self.assertTrue(sent.startswith(b"GET /x HTTP/1.1\r\n"))
+        self.assertIn(b"Connection: keep-alive", sent)
+        self.assertNotIn(b"Connection: close", sent)
+        self.assertIn(b"Host: 127.0.0.1:", sent)
+
+    def test_client_sees_connection_close(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok"))
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        resp = _forward_to_backend(REQUEST, b, 2.0)
+        self.assertIn(b"Connection: close\r\n", resp)
+        self.assertNotIn(b"keep-alive", resp)
+
+    def test_backend_close_header_not_pooled(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok", keep_alive=False), max_per_conn=1)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for _ in range(3):
+            self.assertTrue(_forward_to_backend(REQUEST, b, 2.0).endswith(b"ok"))
+        self.assertEqual(stub.accepted, 3)
+
+    def test_idle_connections_expire(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok"))
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b], idle_s=0.05)
+        _forward_to_backend(REQUEST, b, 2.0)
+        time.sleep(0.1)
+        _forward_to_backend(REQUEST, b, 2.0)
+        self.assertEqual(stub.accepted, 2)
+
+    def test_pool_size_zero_disables_pooling(self) -> None:
+        b = Backend(host="127.0.0.1", port=1)
+        pooled([b], pool_size=0)
+        self.assertIsNone(b.pool)
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestResponseFraming(unittest.TestCase):
+    def test_large_content_length(self) -> None:
+        body = bytes(range(256)) * 4096
+        stub = StubBackend(lambda req, n: body_response(body))
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for _ in range(2):
+            resp = _forward_to_backend(REQUEST, b, 2.0)
+            self.assertEqual(resp[resp.index(b"\r\n\r\n") + 4:], body)
+        self.assertEqual(stub.accepted, 1)
+
+    def test_chunked_passed_through(self) -> None:
+        chunked = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                   b"5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\nX-Trailer: 1\r\n\r\n")
+        stub = StubBackend(lambda req, n: chunked)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for _ in range(2):
+            resp = _forward_to_backend(REQUEST, b, 2.0)
+            self.assertTrue(resp.endswith(b"5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\nX-Trailer: 1\r\n\r\n"))
+        self.assertEqual(stub.accepted, 1)
+
+    def test_chunked_total_size_limited(self) -> None:
+        chunked = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                   + b"a\r\n0123456789\r\n" * 20 + b"0\r\n\r\n")
+        stub = StubBackend(lambda req, n: chunked)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        with mock.patch.object(lb_module, "MAX_RESPONSE_SIZE", 100):
+            self.assertIsNone(_forward_to_backend(REQUEST, b, 2.0))
+        self.assertIsNotNone(_forward_to_backend(REQUEST, b, 2.0))
+
+    def test_oversized_chunk_rejected_before_reading(self) -> None:
+        # Declares 1 MiB, sends nothing more: must fail without waiting for it
+        stub = StubBackend(lambda req, n: b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                          b"100000\r\n")
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        started = time.monotonic()
+        with mock.patch.object(lb_module, "MAX_RESPONSE_SIZE", 1000):
+            self.assertIsNone(_forward_to_backend(REQUEST, b, 2.0))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_head_has_no_body(self) -> None:
+        stub = StubBackend(lambda req, n: b"HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n")
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for _ in range(2):
+            resp = _forward_to_backend(b"HEAD / HTTP/1.0\r\n\r\n", b, 2.0)
+            self.assertTrue(resp.endswith(b"Content-Length: 100\r\nConnection: close\r\n\r\n"))
+        self.assertEqual(stub.accepted, 1)
+
+    def test_interim_response_skipped(self) -> None:
+        # 100 Continue arrives alone; the final response follows later
+        stub = StubBackend(lambda req, n: [b"HTTP/1.1 100 Continue\r\n\r\n",
+                                           body_response(b"r%d" % n)])
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for i in range(2):
+            resp = _forward_to_backend(REQUEST, b, 2.0)
+            self.assertTrue(resp.startswith(b"HTTP/1.1 200 OK\r\n"))
+            self.assertTrue(resp.endswith(b"r%d" % i))
+        self.assertEqual(stub.accepted, 1)
+
+    def test_close_delimited_body(self) -> None:
+        stub = StubBackend(lambda req, n: b"HTTP/1.0 200 OK\r\n\r\nuntil-eof", max_per_conn=1)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b])
+        for _ in range(2):
+            self.assertTrue(_forward_to_backend(REQUEST, b, 2.0).endswith(b"until-eof"))
+        self.assertEqual(stub.accepted, 2)
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestStaleRetry(unittest.TestCase):
+    def test_stale_socket_retried_without_marking_failure(self) -> None:
+        # Claims keep-alive but closes after each response
+        stub = StubBackend(lambda req, n: body_response(b"ok"), max_per_conn=1)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        lb = pooled([b])
+        for _ in range(3):
+            a, c = client_pair()
+            _try_forward_with_retry(a, REQUEST, b, lb, "127.0.0.1")
+            a.close()
+            self.assertTrue(read_all(c).endswith(b"ok"))
+            c.close()
+            time.sleep(0.02)
+        self.assertEqual(b.fails, 0)
+        self.assertEqual(stub.accepted, 3)
+
+    def test_stale_socket_post_not_replayed(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok"), max_per_conn=1)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        lb = pooled([b])
+        post = b"POST /order HTTP/1.0\r\nContent-Length: 0\r\n\r\n"
+        replies = []
+        for _ in range(2):
+            a, c = client_pair()
+            _try_forward_with_retry(a, post, b, lb, "127.0.0.1")
+            a.close()
+            replies.append(read_all(c))
+            c.close()
+            time.sleep(0.02)
+        self.assertTrue(replies[0].endswith(b"ok"))
+        self.assertTrue(replies[1].startswith(b"HTTP/1.1 502 "))
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(b.fails, 0)
+
+    def test_unpooled_path_unchanged(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok", keep_alive=False), max_per_conn=1)
+        self.addCleanup(stub.close)
+        b = stub.backend()
+        pooled([b], pool_size=0)
+        resp = _forward_to_backend(REQUEST, b, 2.0)
+        self.assertEqual(stub.requests[0], REQUEST)
+        self.assertTrue(resp.endswith(b"ok"))
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for cls in (TestPoolReuse, TestResponseFraming, TestStaleRetry):
+        suite.addTests(loader.loadTestsFromTestCase(cls))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
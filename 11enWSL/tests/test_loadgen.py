@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Load Generator — Week 11
+NETWORKING class - ASE, CSIE | by ing. dr. Antonio Clim
+
+Tests cover:
+- LatencyHistogram percentile accuracy and merging
+- Keep-alive mode (one connection per worker)
+- Open-loop mode (arrival rate, latency measured from the due time)
+- JSON summary fields
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    from src.exercises.ex_11_02_loadbalancer import LatencyHistogram, run_loadgen
+    from tests.test_loadbalancer_pool import StubBackend, body_response
+    LB_AVAILABLE = True
+except ImportError:
+    LB_AVAILABLE = False
+
+
+def loadgen(port: int, **kwargs) -> dict:
+    args = argparse.Namespace(url=f"http://127.0.0.1:{port}/", n=200, c=4,
+                              timeout=2.0, keep_alive=False, rate=0.0, json=True)
+    for k, v in kwargs.items():
+        setattr(args, k, v)
+    out = io.StringIO()
+    with redirect_stdout(out):
+        result = run_loadgen(args)
+    assert json.loads(out.getvalue())["requests"] == args.n
+    return result
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_error(self) -> None:
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(-6, 1.2) for _ in range(20000)]
+        hist = LatencyHistogram()
+        for s in samples:
+            hist.record(s)
+        samples.sort()
+        for p in (50, 90, 99, 99.9):
+            exact = samples[max(0, int(p / 100 * len(samples)) - 1)]
+            self.assertAlmostEqual(hist.percentile(p), exact, delta=exact * 0.03 + 2e-6)
+
+    def test_small_values_exact(self) -> None:
+        hist = LatencyHistogram()
+        for us in (1, 2, 3, 100):
+            hist.record(us / 1e6)
+        self.assertEqual(hist.percentile(50), 2e-6)
+        self.assertEqual(hist.percentile(100), 100e-6)
+
+    def test_merge_matches_single_histogram(self) -> None:
+        rng = random.Random(1)
+        samples = [rng.expovariate(200) for _ in range(5000)]
+        whole = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(4)]
+        for i, s in enumerate(samples):
+            whole.record(s)
+            parts[i % 4].record(s)
+        merged = LatencyHistogram()
+        for h in parts:
+            merged.merge(h)
+        self.assertEqual(merged.counts, whole.counts)
+        self.assertEqual(merged.summary_ms(), whole.summary_ms())
+
+    def test_memory_does_not_grow(self) -> None:
+        hist = LatencyHistogram()
+        size = len(hist.counts)
+        for i in range(10000):
+            hist.record(i / 1000.0)
+        self.assertEqual(len(hist.counts), size)
+
+
+@unittest.skipUnless(LB_AVAILABLE, "Load balancer module not available")
+class TestLoadgenModes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = StubBackend(lambda req, n: body_response(b"ok"))
+        self.addCleanup(self.stub.close)
+
+    def test_keep_alive_reuses_connections(self) -> None:
+        result = loadgen(self.stub.port, keep_alive=True)
+        self.assertEqual(result["status_counts"], {"200": 200})
+        self.assertEqual(result["connections"], 4)
+        self.assertEqual(self.stub.accepted, 4)
+
+    def test_keep_alive_reconnects_after_close(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok", keep_alive=n < 2))
+        self.addCleanup(stub.close)
+        result = loadgen(stub.port, keep_alive=True, n=30, c=1)
+        self.assertEqual(result["errors"], 0)
+        self.assertEqual(result["connections"], 10)
+
+    def test_closed_loop_one_connection_per_request(self) -> None:
+        stub = StubBackend(lambda req, n: body_response(b"ok", keep_alive=False), max_per_conn=1)
+        self.addCleanup(stub.close)
+        result = loadgen(stub.port, n=50)
+        self.assertEqual(result["connections"], 50)
+        self.assertEqual(result["errors"], 0)
+
+    def test_open_loop_holds_rate(self) -> None:
+        result = loadgen(self.stub.port, keep_alive=True, n=100, rate=500.0)
+        self.assertEqual(result["mode"], "open")
+        self.assertGreater(result["duration_s"], 0.19)
+        self.assertLess(result["rps"], 550)
+
+    def test_open_loop_charges_queueing_delay(self) -> None:
+        slow = StubBackend(lambda req, n: time.sleep(0.02) or body_response(b"ok"))
+        self.addCleanup(slow.close)
+        # One worker, 20 ms service time, 200 req/s offered: the backlog grows
+        result = loadgen(slow.port, keep_alive=True, n=20, c=1, rate=200.0)
+        self.assertGreater(result["latency_ms"]["max"], 150)
+
+    def test_errors_counted(self) -> None:
+        result = loadgen(1, n=5, c=1, timeout=0.5)
+        self.assertEqual(result["errors"], 5)
+        self.assertEqual(result["status_counts"], {"0": 5})
+
+    def test_summary_fields(self) -> None:
+        result = loadgen(self.stub.port, n=20, keep_alive=True)
+        for key in ("p50", "p90", "p99", "p99.9", "max"):
+            self.assertIn(key, result["latency_ms"])
+        for key in ("rps", "errors", "status_counts", "duration_s"):
+            self.assertIn(key, result)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for cls in (TestLatencyHistogram, TestLoadgenModes):
+        suite.addTests(loader.loadTestsFromTestCase(cls))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
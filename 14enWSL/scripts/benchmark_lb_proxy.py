@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+benchmark_lb_proxy.py — Classic versus async lb_proxy engine
+NETWORKING class — ASE, CSIE | Computer Networks Laboratory
+by ing. dr. Antonio Clim
+
+Starts in-process stub backends (HTTP/1.1 keep-alive), puts each proxy
+engine in front of them and drives it with concurrent keep-alive clients.
+No Docker is needed; everything runs on 127.0.0.1 with ephemeral ports.
+
+Reported per engine: requests per second, p50/p99 latency, errors and the
+number of TCP connections the backends accepted (the pool effect).
+
+Usage:
+    python scripts/benchmark_lb_proxy.py
+    python scripts/benchmark_lb_proxy.py --clients 32 --duration 5 --backends 3
+    python scripts/benchmark_lb_proxy.py --json
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORTS
+# ═══════════════════════════════════════════════════════════════════════════════
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.lb_proxy import AsyncProxyServer, LoadBalancer, ProxyHandler  # noqa: E402
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STUB_BACKENDS
+# ═══════════════════════════════════════════════════════════════════════════════
+class StubBackendHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive backend: fixed body, no logging."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body: bytes = b"hello\n"
+    connections: List[int] = [0]
+    counter_lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with self.counter_lock:
+            self.connections[0] += 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+
+def start_stub_backends(count: int, body_size: int) -> Tuple[List[ThreadingHTTPServer], List[int]]:
+    """Starts count stub backends; returns servers and a shared connection counter."""
+    counter = [0]
+    handler = type(
+        "BenchBackendHandler",
+        (StubBackendHandler,),
+        {"body": b"x" * body_size, "connections": counter, "counter_lock": threading.Lock()},
+    )
+    servers = []
+    for _ in range(count):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+    return servers, counter
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROXY_ENGINES
+# ═══════════════════════════════════════════════════════════════════════════════
+def start_classic(lb: LoadBalancer, timeout: float) -> Tuple[int, Callable[[], None]]:
+    handler = type("BenchProxyHandler", (ProxyHandler,), {"lb": lb, "timeout": timeout, "quiet": True})
+    httpd = HTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def stop() -> None:
+        httpd.shutdown()
+        httpd.server_close()
+
+    return httpd.server_address[1], stop
+
+
+def start_async(lb: LoadBalancer, timeout: float) -> Tuple[int, Callable[[], None]]:
+    proxy = AsyncProxyServer(lb, timeout=timeout, quiet=True)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(proxy.start("127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def shutdown() -> None:
+        proxy.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=2)
+
+    def stop() -> None:
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+    return port, stop
+
+
+ENGINES: Dict[str, Callable[[LoadBalancer, float], Tuple[int, Callable[[], None]]]] = {
+    "classic": start_classic,
+    "async": start_async,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# LOAD_GENERATOR
+# ═══════════════════════════════════════════════════════════════════════════════
+@dataclass
+class BenchResult:
+    engine: str
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    backend_connections: int
+
+
+def drive(port: int, clients: int, duration: float) -> Tuple[List[float], int, float]:
+    """Runs keep-alive clients for duration seconds; returns latencies, errors, elapsed."""
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def worker(idx: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        samples = latencies[idx]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", "/")
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    errors[idx] += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                errors[idx] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            samples.append(time.perf_counter() - start)
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return [x for per in latencies for x in per], sum(errors), elapsed
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def run_engine(name: str, args: argparse.Namespace) -> BenchResult:
+    servers, counter = start_stub_backends(args.backends, args.body_size)
+    lb = LoadBalancer(",".join(f"127.0.0.1:{s.server_address[1]}" for s in servers))
+    port, stop = ENGINES[name](lb, args.timeout)
+    try:
+        drive(port, 2, 0.2)  # warm-up
+        counter[0] = 0
+        latencies, errors, elapsed = drive(port, args.clients, args.duration)
+    finally:
+        stop()
+        for s in servers:
+            s.shutdown()
+            s.server_close()
+
+    latencies.sort()
+    return BenchResult(
+        engine=name,
+        requests=len(latencies),
+        errors=errors,
+        seconds=round(elapsed, 3),
+        rps=round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        backend_connections=counter[0],
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark lb_proxy engines against stub backends")
+    parser.add_argument("--engines", default="classic,async", help="Comma-separated engines to run")
+    parser.add_argument("--backends", type=int, default=2, help="Number of stub backends (default: 2)")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive clients (default: 16)")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per engine (default: 3)")
+    parser.add_argument("--body-size", type=int, default=256, help="Backend response size in bytes")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Proxy upstream timeout")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [run_engine(name.strip(), args) for name in args.engines.split(",") if name.strip()]
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return 0
+
+    print(f"lb_proxy benchmark — {args.clients} clients, {args.backends} backends, {args.duration}s per engine")
+    print(f"{'engine':<8} {'requests':>9} {'errors':>7} {'rps':>10} {'p50 ms':>9} {'p99 ms':>9} {'upstream conns':>15}")
+    for r in results:
+        print(
+            f"{r.engine:<8} {r.requests:>9} {r.errors:>7} {r.rps:>10.1f} "
+            f"{r.p50_ms:>9.3f} {r.p99_ms:>9.3f} {r.backend_connections:>15}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
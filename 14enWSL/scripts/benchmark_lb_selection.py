@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+benchmark_lb_selection.py — LoadBalancer.get_next_backend micro-benchmark
+NETWORKING class — ASE, CSIE | Computer Networks Laboratory
+by ing. dr. Antonio Clim
+
+Calls get_next_backend() from N threads for a fixed time and reports
+selections per second for two implementations:
+
+  locked    — the previous design: take a lock and rebuild the healthy
+              list on every call
+  snapshot  — the current design: read an immutable healthy-set snapshot
+              and advance an atomic counter
+
+A background thread can flip one backend's health periodically
+(--flap-ms) so the snapshot is republished during the run.
+
+Usage:
+    python scripts/benchmark_lb_selection.py
+    python scripts/benchmark_lb_selection.py --threads 1,4,16 --backends 8 --duration 2
+    python scripts/benchmark_lb_selection.py --json
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORTS
+# ═══════════════════════════════════════════════════════════════════════════════
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.lb_proxy import Backend, LoadBalancer  # noqa: E402
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BASELINE_IMPLEMENTATION
+# ═══════════════════════════════════════════════════════════════════════════════
+class LockedLoadBalancer(LoadBalancer):
+    """The pre-snapshot selection path, kept here for comparison."""
+
+    def __init__(self, backends_str: str):
+        super().__init__(backends_str)
+        self._current_index = 0
+
+    def get_next_backend(self) -> Optional[Backend]:
+        with self._lock:
+            healthy_backends = [b for b in self.backends if b.healthy]
+            if not healthy_backends:
+                healthy_backends = self.backends
+            if not healthy_backends:
+                return None
+            backend = healthy_backends[self._current_index % len(healthy_backends)]
+            self._current_index = (self._current_index + 1) % len(healthy_backends)
+            return backend
+
+
+IMPLEMENTATIONS = {
+    "locked": LockedLoadBalancer,
+    "snapshot": LoadBalancer,
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════════════════
+def measure(impl: str, threads: int, backends: int, duration: float, flap_ms: float) -> Dict[str, float]:
+    lb = IMPLEMENTATIONS[impl](",".join(f"10.0.0.{i + 1}:80" for i in range(backends)))
+    counts = [0] * threads
+    stop = threading.Event()
+    start_barrier = threading.Barrier(threads + 1)
+
+    def worker(idx: int) -> None:
+        pick = lb.get_next_backend
+        n = 0
+        start_barrier.wait()
+        while not stop.is_set():
+            for _ in range(1000):
+                pick()
+            n += 1000
+        counts[idx] = n
+
+    def flapper() -> None:
+        victim = lb.backends[0]
+        while not stop.wait(flap_ms / 1000.0):
+            if victim.healthy:
+                for _ in range(3):
+                    victim.mark_failure()
+            else:
+                victim.mark_success()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    flap_thread = threading.Thread(target=flapper) if flap_ms > 0 else None
+    start_barrier.wait()
+    started = time.perf_counter()
+    if flap_thread:
+        flap_thread.start()
+    time.sleep(duration)
+    stop.set()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    if flap_thread:
+        flap_thread.join()
+
+    total = sum(counts)
+    return {
+        "impl": impl,
+        "threads": threads,
+        "selections": total,
+        "seconds": round(elapsed, 3),
+        "selections_per_second": round(total / elapsed, 1),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark LoadBalancer.get_next_backend")
+    parser.add_argument("--threads", default="1,2,4,8,16", help="Comma-separated thread counts")
+    parser.add_argument("--backends", type=int, default=4, help="Number of backends (default: 4)")
+    parser.add_argument("--duration", type=float, default=1.0, help="Seconds per run (default: 1)")
+    parser.add_argument("--flap-ms", type=float, default=50.0,
+                        help="Flip one backend's health every N ms, 0 to disable (default: 50)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results: List[Dict[str, float]] = []
+    for threads in (int(t) for t in args.threads.split(",") if t.strip()):
+        for impl in IMPLEMENTATIONS:
+            results.append(measure(impl, threads, args.backends, args.duration, args.flap_ms))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"get_next_backend — {args.backends} backends, {args.duration}s per run, flap every {args.flap_ms} ms")
+    print(f"{'threads':>7} {'impl':<9} {'selections/s':>14}")
+    for r in results:
+        print(f"{r['threads']:>7} {r['impl']:<9} {r['selections_per_second']:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,10 +6,15 @@ Features:
   - Passive health check (marks backend unavailable on error)
   - Adds forwarding headers (X-Forwarded-For, X-Real-IP)
   - Detailed logging for debugging
+  - Two serving engines:
+      classic — single-threaded HTTPServer, one urlopen() per request
+                (--stream relays bodies in fixed-size chunks instead of buffering)
+      async   — asyncio event loop with a keep-alive upstream pool per backend
 
 Usage:
   python3 lb_proxy.py --listen-host 0.0.0.0 --listen-port 8080 \
                       --backends 10.0.14.100:8080,10.0.14.101:8080
+  python3 lb_proxy.py --engine async --backends 10.0.14.100:8080,10.0.14.101:8080
 """
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -18,11 +23,18 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import http.client
+import itertools
+import json
 import socket
 import threading
+import time
+from collections import deque
 from datetime import datetime
+from http import HTTPStatus
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import List, Tuple, Optional
+from typing import Callable, Deque, Dict, Iterator, List, Set, Tuple, Optional
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 
@@ -41,6 +53,8 @@ class Backend:
         self.total_requests = 0
         self.total_errors = 0
         self.lock = threading.Lock()
+        # Called (outside the lock) whenever `healthy` flips
+        self.on_health_change: Optional[Callable[[], None]] = None
     
     @property
     def address(self) -> str:
@@ -48,29 +62,42 @@ class Backend:
     
     def mark_success(self) -> None:
         with self.lock:
+            changed = not self.healthy
             self.healthy = True
             self.consecutive_failures = 0
             self.total_requests += 1
+        if changed and self.on_health_change is not None:
+            self.on_health_change()
     
     def mark_failure(self) -> None:
         with self.lock:
             self.consecutive_failures += 1
             self.total_requests += 1
             self.total_errors += 1
-            if self.consecutive_failures >= 3:
+            changed = self.healthy and self.consecutive_failures >= 3
+            if changed:
                 self.healthy = False
+        if changed and self.on_health_change is not None:
+            self.on_health_change()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # LOAD_BALANCER_CORE
 # ═══════════════════════════════════════════════════════════════════════════════
 class LoadBalancer:
-    """Round-robin load balancer with health tracking."""
+    """Round-robin load balancer with health tracking.
+
+    Selection reads an immutable (version, backends) snapshot of the healthy
+    set and advances a shared itertools.count(), whose next() is atomic, so
+    the per-request path takes no lock and builds no list. The snapshot is
+    republished, under the lock, only when a Backend changes health.
+    """
     
     def __init__(self, backends_str: str):
         self.backends: List[Backend] = []
-        self._current_index = 0
+        self._counter = itertools.count()
         self._lock = threading.Lock()
+        self._snapshot: Tuple[int, Tuple[Backend, ...]] = (0, ())
         
         for addr in backends_str.split(","):
             addr = addr.strip()
@@ -83,21 +110,30 @@ class LoadBalancer:
         
         if not self.backends:
             raise ValueError("No backends configured")
+
+        for backend in self.backends:
+            backend.on_health_change = self.refresh_healthy
+        self.refresh_healthy()
     
-    def get_next_backend(self) -> Optional[Backend]:
-        """Returns next healthy backend (round-robin)."""
+    @property
+    def snapshot_version(self) -> int:
+        return self._snapshot[0]
+
+    def refresh_healthy(self) -> None:
+        """Republishes the healthy-set snapshot."""
         with self._lock:
-            healthy_backends = [b for b in self.backends if b.healthy]
-            if not healthy_backends:
+            healthy = tuple(b for b in self.backends if b.healthy)
+            if not healthy:
                 # Fallback: try any backend
-                healthy_backends = self.backends
-            
-            if not healthy_backends:
-                return None
-            
-            backend = healthy_backends[self._current_index % len(healthy_backends)]
-            self._current_index = (self._current_index + 1) % len(healthy_backends)
-            return backend
+                healthy = tuple(self.backends)
+            self._snapshot = (self._snapshot[0] + 1, healthy)
+
+    def get_next_backend(self) -> Optional[Backend]:
+        """Returns next healthy backend (round-robin)."""
+        healthy = self._snapshot[1]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
     
     def get_stats(self) -> dict:
         """Returns statistics for all backends."""
@@ -117,27 +153,27 @@ class LoadBalancer:
 # ═══════════════════════════════════════════════════════════════════════════════
 # PROXY_HANDLER
 # ═══════════════════════════════════════════════════════════════════════════════
+class ChunkedBodyError(ValueError):
+    """A chunked request body with broken framing."""
+
+
 class ProxyHandler(BaseHTTPRequestHandler):
     """Handler for proxy/load balancer."""
     
     lb: LoadBalancer
     timeout: float = 5.0
+    quiet: bool = False
+    stream: bool = False
+    relay_chunk: int = 64 * 1024
 
     def log_message(self, format: str, *args) -> None:
+        if self.quiet:
+            return
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         print(f"[{ts}] [proxy] {format % args}")
 
-    def _proxy_request(self) -> None:
-        """Proxies the request to a backend."""
-        backend = self.lb.get_next_backend()
-        if backend is None:
-            self._send_error(503, "No healthy backends available")
-            return
-        
-        # Build URL to backend
-        backend_url = f"http://{backend.host}:{backend.port}{self.path}"
-        
-        # Copy relevant headers
+    def _forward_headers(self) -> dict:
+        """Copies client headers and adds the forwarding headers."""
         headers = {}
         for key, value in self.headers.items():
             if key.lower() not in ("host", "connection"):
@@ -148,6 +184,22 @@ class ProxyHandler(BaseHTTPRequestHandler):
         headers["X-Forwarded-For"] = client_ip
         headers["X-Real-IP"] = client_ip
         headers["X-Forwarded-Host"] = self.headers.get("Host", "")
+        return headers
+
+    def _proxy_request(self) -> None:
+        """Proxies the request to a backend."""
+        backend = self.lb.get_next_backend()
+        if backend is None:
+            self._send_error(503, "No healthy backends available")
+            return
+        
+        if self.stream:
+            self._stream_request(backend)
+            return
+
+        # Build URL to backend
+        backend_url = f"http://{backend.host}:{backend.port}{self.path}"
+        headers = self._forward_headers()
         
         try:
             req = Request(backend_url, headers=headers, method=self.command)
@@ -192,6 +244,139 @@ class ProxyHandler(BaseHTTPRequestHandler):
             self.log_message("ERROR backend %s: %s", backend.address, error_msg)
             self._send_error(502, f"Backend unavailable: {backend.address}")
 
+    # ── streaming relay ─────────────────────────────────────────────────────
+    def _iter_request_body(self, length: int) -> Iterator[bytes]:
+        """Yields a Content-Length request body in relay_chunk pieces."""
+        remaining = length
+        while remaining > 0:
+            data = self.rfile.read(min(self.relay_chunk, remaining))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+
+    def _iter_chunked_request_body(self) -> Iterator[bytes]:
+        """De-chunks a chunked request body without buffering it.
+
+        Raises:
+            ChunkedBodyError: On a bad chunk-size line, a missing CRLF after
+                chunk data or a body cut short
+        """
+        while True:
+            size_line = self.rfile.readline(65537)
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise ChunkedBodyError(f"bad chunk size line {size_line[:40]!r}") from None
+            if size < 0:
+                raise ChunkedBodyError(f"negative chunk size {size_line[:40]!r}")
+            if size == 0:
+                while self.rfile.readline(65537) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            received = 0
+            for data in self._iter_request_body(size):
+                received += len(data)
+                yield data
+            if received < size:
+                raise ChunkedBodyError("request body ended inside a chunk")
+            if self.rfile.readline(65537) not in (b"\r\n", b"\n"):
+                raise ChunkedBodyError("chunk data not followed by CRLF")
+
+    def _stream_request(self, backend: Backend) -> None:
+        """Proxies the request with bounded buffers in both directions.
+
+        Bodies travel in relay_chunk pieces: memory per request stays
+        constant and the client sees the first byte as soon as the backend
+        sends it. A response without Content-Length is re-chunked for
+        HTTP/1.1 clients and delimited by connection close otherwise.
+        """
+        headers = self._forward_headers()
+        for key in [k for k in headers if k.lower() in ("content-length", "transfer-encoding")]:
+            del headers[key]
+
+        body: Optional[Iterator[bytes]] = None
+        request_chunked = "chunked" in self.headers.get("Transfer-Encoding", "").lower()
+        content_length = self.headers.get("Content-Length")
+        if request_chunked:
+            body = self._iter_chunked_request_body()
+        elif content_length:
+            try:
+                length = int(content_length)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self._send_error(400, "Invalid Content-Length")
+                return
+            headers["Content-Length"] = str(length)
+            body = self._iter_request_body(length)
+
+        conn = http.client.HTTPConnection(backend.host, backend.port, timeout=self.timeout)
+        try:
+            try:
+                conn.request(
+                    self.command, self.path, body=body, headers=headers,
+                    encode_chunked=request_chunked,
+                )
+                response = conn.getresponse()
+            except ChunkedBodyError as e:
+                # The client's fault, not the backend's; its body is unread
+                self.log_message("ERROR client %s: %s", self.client_address[0], str(e))
+                self.close_connection = True
+                self._send_error(400, "Malformed chunked body")
+                return
+            except (OSError, http.client.HTTPException) as e:
+                backend.mark_failure()
+                self.log_message("ERROR backend %s: %s", backend.address, str(e))
+                self._send_error(502, f"Backend unavailable: {backend.address}")
+                return
+
+            length = response.getheader("Content-Length")
+            has_body = self.command != "HEAD" and response.status not in (204, 304)
+            chunked_out = has_body and length is None and self.request_version == "HTTP/1.1"
+            if chunked_out:
+                self.protocol_version = "HTTP/1.1"
+
+            self.send_response(response.status)
+            for key, value in response.getheaders():
+                if key.lower() not in ("transfer-encoding", "connection", "content-length"):
+                    self.send_header(key, value)
+            if length is not None:
+                self.send_header("Content-Length", length)
+            if chunked_out:
+                self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("X-Backend", backend.address)
+            if response.status >= 400:
+                self.send_header("X-Proxy-Error", "backend-http-error")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            sent = 0
+            while has_body:
+                try:
+                    data = response.read1(self.relay_chunk)
+                except (OSError, http.client.HTTPException) as e:
+                    backend.mark_failure()
+                    self.log_message("ERROR backend %s mid-response: %s", backend.address, str(e))
+                    return
+                if not data:
+                    break
+                if chunked_out:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                else:
+                    self.wfile.write(data)
+                sent += len(data)
+            if chunked_out:
+                self.wfile.write(b"0\r\n\r\n")
+
+            backend.mark_success()
+            self.log_message(
+                "PROXY %s -> %s [%d] %d bytes (streamed)",
+                self.path, backend.address, response.status, sent
+            )
+        finally:
+            conn.close()
+
     def _send_error(self, code: int, message: str) -> None:
         """Sends error response."""
         body = f"{code} {message}\n".encode("utf-8")
@@ -204,7 +389,6 @@ class ProxyHandler(BaseHTTPRequestHandler):
     def do_GET(self) -> None:
         if self.path == "/lb-status":
             # Special endpoint: LB statistics
-            import json
             stats = self.lb.get_stats()
             body = json.dumps(stats, indent=2).encode("utf-8")
             self.send_response(200)
@@ -225,6 +409,481 @@ class ProxyHandler(BaseHTTPRequestHandler):
         self._proxy_request()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# UPSTREAM_CONNECTION_POOL
+# ═══════════════════════════════════════════════════════════════════════════════
+class UpstreamConnection:
+    """A persistent HTTP/1.1 connection to one backend."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class UpstreamPool:
+    """Idle keep-alive connections to a single Backend.
+
+    Connections are handed out most-recently-used first, so a small working
+    set stays warm and rarely used sockets age out through idle_timeout.
+    """
+
+    def __init__(self, backend: Backend, max_idle: int = 32, idle_timeout: float = 30.0):
+        self.backend = backend
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle: Deque[UpstreamConnection] = deque()
+        self.created = 0
+        self.reused = 0
+
+    async def acquire(self, timeout: float) -> Tuple[UpstreamConnection, bool]:
+        """Returns (connection, reused); opens a new one when none is idle."""
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if now - conn.last_used > self.idle_timeout or conn.reader.at_eof():
+                conn.close()
+                continue
+            self.reused += 1
+            return conn, True
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.backend.host, self.backend.port), timeout
+        )
+        self.created += 1
+        return UpstreamConnection(reader, writer), False
+
+    def release(self, conn: UpstreamConnection, reusable: bool) -> None:
+        """Returns a connection to the pool, or closes it."""
+        if reusable and len(self._idle) < self.max_idle:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    def close_all(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HTTP_FRAMING_HELPERS
+# ═══════════════════════════════════════════════════════════════════════════════
+_HOP_BY_HOP = frozenset({
+    "connection", "keep-alive", "proxy-connection", "te", "trailer",
+    "transfer-encoding", "upgrade",
+})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def _parse_head(head: bytes) -> Tuple[str, List[Tuple[str, str]]]:
+    """Splits a request/status head into its first line and header pairs."""
+    lines = head.decode("latin-1").split("\r\n")
+    headers: List[Tuple[str, str]] = []
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError(f"Malformed header line: {line!r}")
+        headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+def _get_header(headers: List[Tuple[str, str]], name: str) -> Optional[str]:
+    """Case-insensitive lookup of the first header called name."""
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _is_chunked(headers: List[Tuple[str, str]]) -> bool:
+    value = _get_header(headers, "Transfer-Encoding")
+    return value is not None and "chunked" in value.lower()
+
+
+def _wants_keep_alive(version: str, headers: List[Tuple[str, str]]) -> bool:
+    """HTTP/1.1 defaults to persistent connections, HTTP/1.0 to close."""
+    connection = (_get_header(headers, "Connection") or "").lower()
+    if version == "HTTP/1.1":
+        return "close" not in connection
+    return "keep-alive" in connection
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    """Reads and de-chunks a chunked body (trailers are discarded)."""
+    parts: List[bytes] = []
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(parts)
+        parts.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASYNC_PROXY_ENGINE
+# ═══════════════════════════════════════════════════════════════════════════════
+class AsyncProxyServer:
+    """Event-driven proxy engine.
+
+    A single asyncio loop serves every client connection (with HTTP/1.1
+    keep-alive) and forwards requests over pooled upstream connections, so
+    concurrent clients no longer wait for each other and a request does
+    not pay a TCP handshake to its backend. Round-robin selection, passive
+    health marking, /lb-status and the forwarding headers are shared with
+    ProxyHandler.
+    """
+
+    relay_chunk: int = 64 * 1024
+
+    def __init__(
+        self,
+        lb: LoadBalancer,
+        timeout: float = 5.0,
+        pool_size: int = 32,
+        quiet: bool = False,
+    ):
+        self.lb = lb
+        self.timeout = timeout
+        self.quiet = quiet
+        self.pools: Dict[str, UpstreamPool] = {
+            b.address: UpstreamPool(b, max_idle=pool_size) for b in lb.backends
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+
+    def log_message(self, format: str, *args) -> None:
+        if self.quiet:
+            return
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        print(f"[{ts}] [proxy] {format % args}")
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Binds the listening socket and starts accepting clients."""
+        self._server = await asyncio.start_server(
+            self._handle_client, host, port, backlog=1024
+        )
+        return self._server
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops accepting, drops open client connections and empties the pools."""
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        for pool in self.pools.values():
+            pool.close_all()
+
+    # ── client side ──────────────────────────────────────────────────────────
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        peer = writer.get_extra_info("peername") or ("", 0)
+        client_ip = peer[0]
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, 431, "Request header fields too large", False)
+                    break
+
+                try:
+                    request_line, headers = _parse_head(head[:-4])
+                    method, target, version = request_line.split(" ", 2)
+                    if _is_chunked(headers):
+                        body = await _read_chunked(reader)
+                    else:
+                        body = await reader.readexactly(
+                            int(_get_header(headers, "Content-Length") or 0)
+                        )
+                except ValueError:
+                    await self._send_error(writer, 400, "Malformed request", False)
+                    break
+
+                keep_alive = _wants_keep_alive(version, headers)
+                if method == "GET" and target == "/lb-status":
+                    await self._send_status(writer, keep_alive)
+                else:
+                    keep_alive = await self._proxy_request(
+                        method, target, version, headers, body, client_ip, writer, keep_alive
+                    )
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def _send_error(
+        self, writer: asyncio.StreamWriter, code: int, message: str, keep_alive: bool
+    ) -> None:
+        body = f"{code} {message}\n".encode("utf-8")
+        await self._send_simple(writer, code, "text/plain; charset=utf-8", body, keep_alive)
+
+    async def _send_status(self, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        body = json.dumps(self.lb.get_stats(), indent=2).encode("utf-8")
+        await self._send_simple(writer, 200, "application/json", body, keep_alive)
+
+    async def _send_simple(
+        self,
+        writer: asyncio.StreamWriter,
+        code: int,
+        content_type: str,
+        body: bytes,
+        keep_alive: bool,
+    ) -> None:
+        head = (
+            f"HTTP/1.1 {code} {HTTPStatus(code).phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    # ── upstream side ────────────────────────────────────────────────────────
+    def _build_upstream_head(
+        self,
+        method: str,
+        target: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        client_ip: str,
+        backend: Backend,
+    ) -> bytes:
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {backend.address}"]
+        for key, value in headers:
+            lower = key.lower()
+            if lower in _HOP_BY_HOP or lower in (
+                "host", "content-length", "x-forwarded-for", "x-real-ip", "x-forwarded-host"
+            ):
+                continue
+            lines.append(f"{key}: {value}")
+        lines.append(f"X-Forwarded-For: {client_ip}")
+        lines.append(f"X-Real-IP: {client_ip}")
+        lines.append(f"X-Forwarded-Host: {_get_header(headers, 'Host') or ''}")
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _proxy_request(
+        self,
+        method: str,
+        target: str,
+        version: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        client_ip: str,
+        writer: asyncio.StreamWriter,
+        keep_alive: bool,
+    ) -> bool:
+        """Forwards one request; returns whether the client connection may stay open."""
+        backend = self.lb.get_next_backend()
+        if backend is None:
+            await self._send_error(writer, 503, "No healthy backends available", keep_alive)
+            return keep_alive
+
+        pool = self.pools[backend.address]
+        request = self._build_upstream_head(method, target, headers, body, client_ip, backend) + body
+
+        # A pooled socket may have been closed by the backend while idle. If
+        # it fails before any response bytes arrive, retry once on a fresh one.
+        for attempt in range(2):
+            try:
+                conn, reused = await pool.acquire(self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                return await self._backend_failed(backend, writer, str(e) or repr(e), keep_alive)
+            try:
+                conn.writer.write(request)
+                await conn.writer.drain()
+                status_head = await asyncio.wait_for(
+                    conn.reader.readuntil(b"\r\n\r\n"), self.timeout
+                )
+                break
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError) as e:
+                conn.close()
+                stale = reused and not isinstance(e, asyncio.TimeoutError)
+                if attempt == 0 and stale and method in _IDEMPOTENT_METHODS:
+                    continue
+                return await self._backend_failed(backend, writer, str(e) or repr(e), keep_alive)
+
+        # Interim 1xx heads (100 Continue, 103 Early Hints) are relayed as-is
+        # and the final response still follows on the same connection.
+        interim_sent = False
+        while True:
+            try:
+                status_line, resp_headers = _parse_head(status_head[:-4])
+                resp_version, status_code = status_line.split(" ", 2)[:2]
+                status = int(status_code)
+            except ValueError as e:
+                conn.close()
+                if interim_sent:
+                    backend.mark_failure()
+                    return False
+                return await self._backend_failed(backend, writer, f"bad response: {e}", keep_alive)
+            if not 100 <= status < 200 or status == 101:
+                break
+            writer.write(status_head)
+            interim_sent = True
+            try:
+                await writer.drain()
+                status_head = await asyncio.wait_for(
+                    conn.reader.readuntil(b"\r\n\r\n"), self.timeout
+                )
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError) as e:
+                conn.close()
+                backend.mark_failure()
+                self.log_message("ERROR backend %s after %d: %s",
+                                 backend.address, status, str(e) or repr(e))
+                return False
+
+        content_length = _get_header(resp_headers, "Content-Length")
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            mode = "none"
+        elif _is_chunked(resp_headers):
+            mode = "chunked"
+        elif content_length is not None:
+            mode = "length"
+        else:
+            mode = "close"
+        upstream_reusable = mode != "close" and _wants_keep_alive(resp_version, resp_headers)
+
+        chunked_out = mode == "chunked" and version == "HTTP/1.1"
+        if mode == "close" or (mode == "chunked" and not chunked_out):
+            keep_alive = False
+
+        out = [status_line]
+        for key, value in resp_headers:
+            lower = key.lower()
+            if lower in _HOP_BY_HOP or lower == "content-length":
+                continue
+            out.append(f"{key}: {value}")
+        if content_length is not None and mode in ("length", "none"):
+            out.append(f"Content-Length: {content_length}")
+        if chunked_out:
+            out.append("Transfer-Encoding: chunked")
+        out.append(f"X-Backend: {backend.address}")
+        if status >= 400:
+            out.append("X-Proxy-Error: backend-http-error")
+        out.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(out) + "\r\n\r\n").encode("latin-1"))
+
+        try:
+            if mode == "length":
+                sent = await self._relay_length(conn.reader, writer, int(content_length))
+            elif mode == "chunked":
+                sent = await self._relay_chunked(conn.reader, writer, chunked_out)
+            elif mode == "close":
+                sent = await self._relay_until_eof(conn.reader, writer)
+            else:
+                sent = 0
+                await writer.drain()
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, ValueError) as e:
+            # The response has started: nothing to do but drop both sides.
+            conn.close()
+            backend.mark_failure()
+            self.log_message("ERROR backend %s mid-response: %s", backend.address, str(e) or repr(e))
+            return False
+
+        pool.release(conn, upstream_reusable)
+        backend.mark_success()
+        self.log_message("PROXY %s -> %s [%d] %d bytes", target, backend.address, status, sent)
+        return keep_alive
+
+    async def _backend_failed(
+        self, backend: Backend, writer: asyncio.StreamWriter, error: str, keep_alive: bool
+    ) -> bool:
+        backend.mark_failure()
+        self.log_message("ERROR backend %s: %s", backend.address, error)
+        await self._send_error(writer, 502, f"Backend unavailable: {backend.address}", keep_alive)
+        return keep_alive
+
+    async def _relay_length(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, length: int
+    ) -> int:
+        remaining = length
+        while remaining > 0:
+            data = await asyncio.wait_for(
+                reader.read(min(self.relay_chunk, remaining)), self.timeout
+            )
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(data)
+            writer.write(data)
+            await writer.drain()
+        await writer.drain()
+        return length
+
+    async def _relay_chunked(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, chunked_out: bool
+    ) -> int:
+        sent = 0
+        while True:
+            size_line = await asyncio.wait_for(reader.readuntil(b"\r\n"), self.timeout)
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                while await asyncio.wait_for(reader.readuntil(b"\r\n"), self.timeout) != b"\r\n":
+                    pass
+                if chunked_out:
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+                return sent
+            data = await asyncio.wait_for(reader.readexactly(size + 2), self.timeout)
+            if chunked_out:
+                writer.write(b"%x\r\n" % size)
+                writer.write(data)
+            else:
+                writer.write(data[:-2])
+            sent += size
+            await writer.drain()
+
+    async def _relay_until_eof(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> int:
+        sent = 0
+        while True:
+            data = await asyncio.wait_for(reader.read(self.relay_chunk), self.timeout)
+            if not data:
+                await writer.drain()
+                return sent
+            sent += len(data)
+            writer.write(data)
+            await writer.drain()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PARSE_ARGUMENTS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -255,6 +914,28 @@ def parse_args() -> argparse.Namespace:
         default=5.0,
         help="Timeout for backend connections (default: 5.0s)"
     )
+    parser.add_argument(
+        "--engine",
+        choices=("classic", "async"),
+        default="classic",
+        help="Serving engine: classic HTTPServer or asyncio with pooled upstreams (default: classic)"
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=32,
+        help="Max idle upstream connections kept per backend, async engine (default: 32)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Classic engine: relay bodies in fixed-size chunks instead of buffering them"
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress request logging (useful when benchmarking)"
+    )
     return parser.parse_args()
 
 
@@ -266,15 +947,31 @@ def main() -> int:
     args = parse_args()
     
     lb = LoadBalancer(args.backends)
+
+    if args.engine == "async":
+        proxy = AsyncProxyServer(
+            lb, timeout=args.timeout, pool_size=args.pool_size, quiet=args.quiet
+        )
+        print(f"[proxy] Starting load balancer (async engine) on {args.listen_host}:{args.listen_port}")
+        print(f"[proxy] Backends: {[b.address for b in lb.backends]}")
+        print("[proxy] Special endpoint: /lb-status")
+        try:
+            asyncio.run(proxy.serve_forever(args.listen_host, args.listen_port))
+        except KeyboardInterrupt:
+            print("\n[proxy] Shutting down...")
+        return 0
+
     ProxyHandler.lb = lb
     ProxyHandler.timeout = args.timeout
+    ProxyHandler.quiet = args.quiet
+    ProxyHandler.stream = args.stream
     
     server_address = (args.listen_host, args.listen_port)
     httpd = HTTPServer(server_address, ProxyHandler)
     
     print(f"[proxy] Starting load balancer on {args.listen_host}:{args.listen_port}")
     print(f"[proxy] Backends: {[b.address for b in lb.backends]}")
-    print(f"[proxy] Special endpoint: /lb-status")
+    print("[proxy] Special endpoint: /lb-status")
     
     try:
         httpd.serve_forever()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""Local tests for the lb_proxy serving engines.
+
+NETWORKING class — ASE, CSIE | Computer Networks Laboratory
+by ing. dr. Antonio Clim
+
+Runs the async engine in a background event loop, and the classic engine
+as a subprocess, in front of in-process stub backends. No Docker is required.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.apps.lb_proxy import AsyncProxyServer, LoadBalancer  # noqa: E402
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TEST_FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    name = "stub"
+    connections: List[int] = [0]
+
+    def setup(self) -> None:
+        super().setup()
+        self.connections[0] += 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_bytes(self, total: int, chunked: bool) -> None:
+        self.send_response(200)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(total))
+        self.end_headers()
+        piece = b"z" * 65536
+        remaining = total
+        while remaining > 0:
+            part = piece[:min(remaining, len(piece))]
+            if chunked:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            else:
+                self.wfile.write(part)
+            remaining -= len(part)
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/big/"):
+            _, _, kind, size = self.path.split("/")
+            self._stream_bytes(int(size), chunked=(kind == "chunked"))
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (b"alpha-", b"beta-", b"gamma"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/xff":
+            self._reply(self.headers.get("X-Forwarded-For", "").encode())
+        else:
+            self._reply(self.name.encode())
+
+    def do_POST(self) -> None:
+        if self.path == "/count":
+            received = 0
+            if "chunked" in self.headers.get("Transfer-Encoding", ""):
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        break
+                    received += len(self.rfile.read(size))
+                    self.rfile.readline()
+            else:
+                remaining = int(self.headers.get("Content-Length", 0))
+                while remaining > 0:
+                    chunk = self.rfile.read(min(65536, remaining))
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                    remaining -= len(chunk)
+            self._reply(str(received).encode())
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        self._reply(self.rfile.read(length)[::-1])
+
+
+def _start_stub(name: str, counter: List[int]) -> ThreadingHTTPServer:
+    handler = type(f"Stub_{name}", (_StubHandler,), {"name": name, "connections": counter})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _unused_port() -> int:
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+class _AsyncProxyFixture:
+    def __init__(self, backends: str, timeout: float = 2.0):
+        self.lb = LoadBalancer(backends)
+        self.proxy = AsyncProxyServer(self.lb, timeout=timeout, quiet=True)
+        self.loop = asyncio.new_event_loop()
+        server = self.loop.run_until_complete(self.proxy.start("127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def request(
+        self, conn: http.client.HTTPConnection, method: str, path: str, body: bytes = b""
+    ) -> Tuple[int, dict, bytes]:
+        conn.request(method, path, body=body or None)
+        resp = conn.getresponse()
+        return resp.status, dict(resp.getheaders()), resp.read()
+
+    def close(self) -> None:
+        async def shutdown() -> None:
+            self.proxy.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            if tasks:
+                await asyncio.wait(tasks, timeout=2)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        self.loop.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HEALTHY_SNAPSHOT_TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+class TestHealthySnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lb = LoadBalancer("10.0.0.1:80,10.0.0.2:80,10.0.0.3:80")
+
+    def test_round_robin_order(self) -> None:
+        picks = [self.lb.get_next_backend().host for _ in range(6)]
+        self.assertEqual(picks, ["10.0.0.1", "10.0.0.2", "10.0.0.3"] * 2)
+
+    def test_republished_only_on_health_change(self) -> None:
+        version = self.lb.snapshot_version
+        self.lb.backends[1].mark_success()
+        self.lb.backends[1].mark_failure()
+        self.lb.backends[1].mark_failure()
+        self.assertEqual(self.lb.snapshot_version, version)
+
+        self.lb.backends[1].mark_failure()
+        self.assertEqual(self.lb.snapshot_version, version + 1)
+        picks = {self.lb.get_next_backend().host for _ in range(10)}
+        self.assertEqual(picks, {"10.0.0.1", "10.0.0.3"})
+
+        self.lb.backends[1].mark_success()
+        self.assertEqual(self.lb.snapshot_version, version + 2)
+        picks = {self.lb.get_next_backend().host for _ in range(10)}
+        self.assertIn("10.0.0.2", picks)
+
+    def test_falls_back_to_all_backends_when_none_healthy(self) -> None:
+        for backend in self.lb.backends:
+            for _ in range(3):
+                backend.mark_failure()
+        picks = {self.lb.get_next_backend().host for _ in range(6)}
+        self.assertEqual(len(picks), 3)
+
+    def test_concurrent_selection_is_balanced(self) -> None:
+        counts: dict = {}
+        lock = threading.Lock()
+
+        def worker() -> None:
+            local: dict = {}
+            for _ in range(3000):
+                host = self.lb.get_next_backend().host
+                local[host] = local.get(host, 0) + 1
+            with lock:
+                for host, n in local.items():
+                    counts[host] = counts.get(host, 0) + n
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sum(counts.values()), 24000)
+        self.assertEqual(set(counts.values()), {8000})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ASYNC_ENGINE_TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+class TestAsyncEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        self.counter = [0]
+        self.stubs = [_start_stub("app1", self.counter), _start_stub("app2", self.counter)]
+        self.fixture = _AsyncProxyFixture(
+            ",".join(f"127.0.0.1:{s.server_address[1]}" for s in self.stubs)
+        )
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.fixture.port, timeout=5)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        self.fixture.close()
+        for s in self.stubs:
+            s.shutdown()
+            s.server_close()
+
+    def test_round_robin_with_backend_header(self) -> None:
+        bodies = []
+        for _ in range(4):
+            status, headers, body = self.fixture.request(self.conn, "GET", "/")
+            self.assertEqual(status, 200)
+            self.assertIn("X-Backend", headers)
+            bodies.append(body)
+        self.assertEqual(bodies, [b"app1", b"app2", b"app1", b"app2"])
+
+    def test_upstream_connections_are_reused(self) -> None:
+        for _ in range(20):
+            status, _, _ = self.fixture.request(self.conn, "GET", "/")
+            self.assertEqual(status, 200)
+        self.assertLessEqual(self.counter[0], 2)
+
+    def test_forwarded_for_header(self) -> None:
+        _, _, body = self.fixture.request(self.conn, "GET", "/xff")
+        self.assertEqual(body, b"127.0.0.1")
+
+    def test_post_body_forwarded(self) -> None:
+        status, _, body = self.fixture.request(self.conn, "POST", "/", b"payload")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"daolyap")
+
+    def test_chunked_response_relayed(self) -> None:
+        status, _, body = self.fixture.request(self.conn, "GET", "/chunked")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b"alpha-beta-gamma")
+
+    def test_lb_status_endpoint(self) -> None:
+        status, headers, body = self.fixture.request(self.conn, "GET", "/lb-status")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "application/json")
+        self.assertEqual(len(json.loads(body)["backends"]), 2)
+
+
+class TestAsyncEngineFailures(unittest.TestCase):
+    def test_dead_backend_returns_502_and_is_marked_unhealthy(self) -> None:
+        fixture = _AsyncProxyFixture(f"127.0.0.1:{_unused_port()}")
+        conn = http.client.HTTPConnection("127.0.0.1", fixture.port, timeout=5)
+        try:
+            for _ in range(3):
+                status, _, _ = fixture.request(conn, "GET", "/")
+                self.assertEqual(status, 502)
+            self.assertFalse(fixture.lb.backends[0].healthy)
+        finally:
+            conn.close()
+            fixture.close()
+
+    def test_interim_response_does_not_leak_to_next_client(self) -> None:
+        # One backend, so the second client reuses the pooled upstream socket
+        stub = _start_stub("app1", [0])
+        fixture = _AsyncProxyFixture(f"127.0.0.1:{stub.server_address[1]}")
+        first = http.client.HTTPConnection("127.0.0.1", fixture.port, timeout=5)
+        second = http.client.HTTPConnection("127.0.0.1", fixture.port, timeout=5)
+        try:
+            first.request("POST", "/", body=b"payload", headers={"Expect": "100-continue"})
+            resp = first.getresponse()
+            self.assertEqual((resp.status, resp.read()), (200, b"daolyap"))
+            status, _, body = fixture.request(second, "GET", "/")
+            self.assertEqual((status, body), (200, b"app1"))
+        finally:
+            first.close()
+            second.close()
+            fixture.close()
+            stub.shutdown()
+            stub.server_close()
+
+    def test_silent_backend_times_out_with_502(self) -> None:
+        # Accepts connections but never answers
+        silent = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        silent.bind(("127.0.0.1", 0))
+        silent.listen(8)
+        fixture = _AsyncProxyFixture(f"127.0.0.1:{silent.getsockname()[1]}", timeout=0.3)
+        conn = http.client.HTTPConnection("127.0.0.1", fixture.port, timeout=5)
+        try:
+            status, _, _ = fixture.request(conn, "GET", "/")
+            self.assertEqual(status, 502)
+            self.assertEqual(fixture.lb.backends[0].consecutive_failures, 1)
+        finally:
+            conn.close()
+            fixture.close()
+            silent.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREAMING_RELAY_TESTS
+# ═══════════════════════════════════════════════════════════════════════════════
+def _peak_rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+        for line in fh:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmHWM not reported")
+
+
+def _wait_tcp(port: int, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.2)
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return True
+        time.sleep(0.05)
+    return False
+
+
+@unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc for peak RSS")
+class TestStreamingRelayMemory(unittest.TestCase):
+    """Large bodies through `lb_proxy.py --stream` must not raise peak RSS; bad framing gets a 400."""
+
+    BODY_SIZE = 48 * 1024 * 1024
+    CEILING_KIB = 16 * 1024
+
+    def setUp(self) -> None:
+        self.stub = _start_stub("big", [0])
+        self.port = _unused_port()
+        self.proc = subprocess.Popen(
+            [
+                sys.executable, "src/apps/lb_proxy.py",
+                "--listen-host", "127.0.0.1", "--listen-port", str(self.port),
+                "--backends", f"127.0.0.1:{self.stub.server_address[1]}",
+                "--stream", "--quiet",
+            ],
+            cwd=str(PROJECT_ROOT),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.assertTrue(_wait_tcp(self.port), "proxy did not start")
+
+    def tearDown(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self.stub.shutdown()
+        self.stub.server_close()
+
+    def _get_size(self, path: str) -> Tuple[int, dict]:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            total = 0
+            while True:
+                data = resp.read(65536)
+                if not data:
+                    break
+                total += len(data)
+            return total, dict(resp.getheaders())
+        finally:
+            conn.close()
+
+    def _post(self, body, chunked: bool) -> bytes:
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+        try:
+            headers = {} if chunked else {"Content-Length": str(self.BODY_SIZE)}
+            conn.request("POST", "/count", body=body, headers=headers, encode_chunked=chunked)
+            return conn.getresponse().read()
+        finally:
+            conn.close()
+
+    def test_invalid_content_length_is_rejected(self) -> None:
+        for value in ("-5", "abc"):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=5) as s:
+                s.sendall(f"POST /count HTTP/1.1\r\nHost: x\r\nContent-Length: {value}\r\n\r\n".encode())
+                self.assertTrue(s.recv(65536).startswith(b"HTTP/1.0 400 "), value)
+
+    def test_malformed_chunk_size_is_rejected(self) -> None:
+        for chunk in (b"zz\r\nabc\r\n0\r\n\r\n", b"-3\r\nabc\r\n0\r\n\r\n",
+                      b"3\r\nabcdef\r\n0\r\n\r\n"):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=5) as s:
+                s.sendall(b"POST /count HTTP/1.1\r\nHost: x\r\n"
+                          b"Transfer-Encoding: chunked\r\n\r\n" + chunk)
+                self.assertTrue(s.recv(65536).startswith(b"HTTP/1.0 400 "), chunk)
+        self.assertEqual(self._get_size("/big/length/10")[0], 10)
+
+    def test_peak_rss_stays_flat(self) -> None:
+        self._get_size("/big/length/1024")
+        baseline = _peak_rss_kib(self.proc.pid)
+
+        size, headers = self._get_size(f"/big/length/{self.BODY_SIZE}")
+        self.assertEqual(size, self.BODY_SIZE)
+        self.assertEqual(headers.get("Content-Length"), str(self.BODY_SIZE))
+
+        size, headers = self._get_size(f"/big/chunked/{self.BODY_SIZE}")
+        self.assertEqual(size, self.BODY_SIZE)
+        self.assertEqual(headers.get("Transfer-Encoding"), "chunked")
+
+        piece = b"u" * 65536
+        pieces = self.BODY_SIZE // len(piece)
+        self.assertEqual(self._post((piece for _ in range(pieces)), chunked=False), str(self.BODY_SIZE).encode())
+        self.assertEqual(self._post((piece for _ in range(pieces)), chunked=True), str(self.BODY_SIZE).encode())
+
+        growth = _peak_rss_kib(self.proc.pid) - baseline
+        self.assertLess(growth, self.CEILING_KIB, f"peak RSS grew by {growth} KiB")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)